@@ -0,0 +1,118 @@
+"""
+EFES ROTA X - Performans Testleri (pytest-benchmark)
+Qt olay döngüsü gerektirmez; veri setleri core.data_generator ile üretilip
+benchmarks/.data altında önbelleğe alınır.
+
+Kullanım:
+    python run_benchmarks.py --datasets small medium --save baseline
+    python run_benchmarks.py --datasets small medium --compare baseline --threshold 25
+    pytest benchmarks --datasets small --rounds 5
+"""
+
+import os
+import shutil
+import sys
+from datetime import datetime
+
+import pytest
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.dirname(BENCH_DIR)
+DATA_DIR = os.path.join(BENCH_DIR, ".data")
+
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from core.data_generator import FactoryDataGenerator, PRESETS  # noqa: E402
+
+DATASET_SEED = 42
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("rota", "EFES ROTA benchmark ayarları")
+    group.addoption("--datasets", nargs="+", default=["small"], choices=list(PRESETS),
+                    help="Ölçüm yapılacak veri setleri (varsayılan: small)")
+    group.addoption("--rounds", type=int, default=3, help="Her ölçüm için tur sayısı")
+    group.addoption("--regenerate", action="store_true", help="Önbellekteki veri setlerini yeniden üret")
+
+
+def pytest_generate_tests(metafunc):
+    if "dataset" in metafunc.fixturenames:
+        metafunc.parametrize("dataset", metafunc.config.getoption("datasets"), indirect=True, scope="session")
+
+
+def _dataset_path(preset, end_date):
+    return os.path.join(DATA_DIR, f"{preset}-s{DATASET_SEED}-{end_date:%Y%m%d}.db")
+
+
+@pytest.fixture(scope="session")
+def dataset(request):
+    """Üretilmiş (veya önbellekten alınan) veri setinin yolu"""
+    from core.db_manager import DatabaseManager
+
+    preset = request.param
+    end_date = datetime.now()
+    path = _dataset_path(preset, end_date)
+
+    if request.config.getoption("regenerate") and os.path.exists(path):
+        os.remove(path)
+
+    if not os.path.exists(path):
+        os.makedirs(DATA_DIR, exist_ok=True)
+        tmp_path = path + ".tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        FactoryDataGenerator(DatabaseManager(tmp_path), seed=DATASET_SEED, preset=preset, end_date=end_date).generate()
+        os.replace(tmp_path, path)
+
+    # Önbellekteki veri seti eski şemayla üretilmiş olabilir: yeni tablolar eklensin.
+    # Üretim özeti, uygulamadaki özet makinesi (ROTA_SUMMARY_HOST) gibi güncellenir.
+    DatabaseManager(path).refresh_station_output_summary()
+    return path
+
+
+@pytest.fixture
+def factory_db(dataset):
+    """Global db nesnesini ölçüm süresince üretilmiş veri setine yönlendir"""
+    from core.db_manager import db
+
+    original = db.db_path
+    db.db_path = dataset
+    try:
+        yield db
+    finally:
+        db.db_path = original
+
+
+@pytest.fixture
+def writable_db(dataset, tmp_path):
+    """Yazma ölçümleri için veri setinin geçici kopyası (önbellekteki set değişmesin)"""
+    from core.db_manager import db
+
+    path = str(tmp_path / os.path.basename(dataset))
+    shutil.copyfile(dataset, path)
+    original = db.db_path
+    db.db_path = path
+    try:
+        yield db
+    finally:
+        db.db_path = original
+
+
+@pytest.fixture
+def run(benchmark, request):
+    """benchmark.pedantic kısayolu: sabit tur sayısı, tur başına tek çağrı"""
+    rounds = request.config.getoption("rounds")
+
+    def _run(func, *args, **kwargs):
+        return benchmark.pedantic(func, args=args, kwargs=kwargs, rounds=rounds, iterations=1, warmup_rounds=1)
+
+    return _run
+
+
+@pytest.fixture
+def active_orders(factory_db):
+    """Karar destek ekranının yüklediği sıralı aktif sipariş listesi"""
+    from core.smart_planner import planner
+
+    return planner.optimize_production_sequence(factory_db.get_orders_by_status(["Beklemede", "Üretimde"]))
@@ -0,0 +1,144 @@
+"""DatabaseManager sorgu performansı"""
+
+
+def test_production_matrix_advanced(run, factory_db):
+    result = run(factory_db.get_production_matrix_advanced)
+    assert isinstance(result, list)
+
+
+def test_station_loads(run, factory_db):
+    result = run(factory_db.get_station_loads)
+    assert result
+
+
+def test_dashboard_stats(run, factory_db):
+    result = run(factory_db.get_dashboard_stats)
+    assert set(result) == {"active", "urgent", "fire"}
+
+
+def test_capacity_learning(run, factory_db):
+    """Üretim özetinden kapasite / hafta günü profilleri"""
+    from core.capacity_learning import CapacityLearner
+
+    profiles = run(CapacityLearner().learn)
+    assert profiles and all(p['capacity'] > 0 for p in profiles.values())
+
+
+def test_order_status_reconciliation(run, factory_db):
+    """update_statuses.py --dry-run: tek sorguda biten siparişler"""
+    count = run(factory_db.update_all_order_statuses, dry_run=True)
+    assert count == len(factory_db.find_completed_orders())
+
+
+def test_production_event(run, writable_db):
+    """Operatör terminali: okutmadan commit'e tek üretim kaydı (log + ilerleme + durum)"""
+    with writable_db.get_connection() as conn:
+        order = conn.execute("""
+            SELECT id, route FROM orders
+            WHERE status IN ('Beklemede', 'Üretimde') AND route != '' AND quantity > 1
+            ORDER BY id LIMIT 1
+        """).fetchone()
+    station = order['route'].split(',')[0].strip()
+
+    result = run(writable_db.record_production_event, order['id'], station, 1, "Benchmark")
+    assert result['logged'] == 1 and result['status'] in ('Üretimde', 'Tamamlandı')
+
+
+def test_scan_burst(run, writable_db, tmp_path):
+    """Vardiya değişimi: 50 okutma kuyruğa, toplu işlemlerle commit edilene kadar"""
+    import time
+    from core.offline_journal import OfflineJournal
+    from core.scan_ingest import ScanIngestQueue
+
+    with writable_db.get_connection() as conn:
+        orders = conn.execute("""
+            SELECT id, route, order_code FROM orders
+            WHERE status IN ('Beklemede', 'Üretimde') AND route != ''
+            ORDER BY id LIMIT 50
+        """).fetchall()
+
+    ingest = ScanIngestQueue(writable_db, OfflineJournal(str(tmp_path / "terminal_journal.db")))
+    ingest.start()
+
+    def burst():
+        for order in orders:
+            ingest.submit(order['id'], order['route'].split(',')[0].strip(), 1, "Benchmark", order['order_code'])
+        while ingest.pending_count():
+            time.sleep(0.005)
+
+    try:
+        run(burst)
+    finally:
+        ingest.stop()
+    stats = ingest.get_stats()
+    assert stats['pending'] == 0 and stats['batches'] < stats['acked']
+
+
+def test_journal_replay(run, writable_db, tmp_path):
+    """Terminal günlüğü: merkeze yazılıp işaretlenemeden kesilen toplu işlem tekrar oynatılınca
+    ikinci log satırı ve ikinci rework siparişi oluşmaz"""
+    import time
+    from core.offline_journal import OfflineJournal
+    from core.scan_ingest import ScanIngestQueue
+
+    with writable_db.get_connection() as conn:
+        orders = conn.execute("""
+            SELECT id, route, order_code FROM orders
+            WHERE status IN ('Beklemede', 'Üretimde') AND route != '' AND quantity > 2
+            ORDER BY id LIMIT 20
+        """).fetchall()
+
+    journal = OfflineJournal(str(tmp_path / "terminal_journal.db"))
+    for order in orders:
+        journal.append({'kind': 'production', 'order_id': order['id'], 'station_name': order['route'].split(',')[0].strip(),
+                        'qty': 1, 'operator_name': "Benchmark", 'code': order['order_code']})
+    fired = orders[0]
+    journal.append({'kind': 'fire', 'order_id': fired['id'], 'station_name': fired['route'].split(',')[0].strip(),
+                    'qty': 1, 'operator_name': "Benchmark", 'code': fired['order_code']})
+    events = journal.pending()
+    uuids = [e['event_uuid'] for e in events]
+
+    def counts():
+        with writable_db.get_connection() as conn:
+            logs = conn.execute(f"SELECT COUNT(*) FROM production_logs WHERE event_uuid IN ({', '.join('?' * len(uuids))})",
+                                uuids).fetchone()[0]
+            reworks = conn.execute("SELECT COUNT(*) FROM orders WHERE order_code LIKE ?",
+                                   (fired['order_code'] + "-R%",)).fetchone()[0]
+        return logs, reworks
+
+    before = counts()
+    writable_db.record_production_events(events)    # Merkeze yazıldı, günlükte işaretlenmedi
+    written = counts()
+    assert written == (len(events), before[1] + 1)
+
+    results = run(writable_db.record_production_events, journal.pending())
+    assert counts() == written
+    assert all(r['duplicate'] for r in results[:len(orders)]) and results[-1] is None
+
+    # Terminal yeniden açıldı: kuyruk günlükten geri yükleyip oynatır, yine tek kayıt
+    ingest = ScanIngestQueue(writable_db, journal)
+    ingest.start()
+    try:
+        deadline = time.monotonic() + 30
+        while journal.pending_count() and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        ingest.stop()
+    assert journal.pending_count() == 0 and not journal.failed()
+    assert counts() == written
+
+
+def test_db_service_matrix(run, dataset):
+    """Veritabanı servisi (localhost): üretim matrisi, havuzlu bağlantı + sürüm anahtarlı önbellek"""
+    from core.db_service import DatabaseClient, start_service
+
+    server = start_service(dataset, port=0)
+    try:
+        host, port = server.server_address[:2]
+        client = DatabaseClient(f"http://{host}:{port}")
+        client.get_production_matrix_advanced()
+        result = run(client.get_production_matrix_advanced)
+        assert isinstance(result, list) and server.service.cache.hits > 0
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,83 @@
+"""SmartPlanner ve karar destek motoru performansı"""
+
+from datetime import datetime, timedelta
+
+NEW_ORDER = {
+    'code': 'BENCH-001', 'customer': 'Benchmark', 'product': 'Temperli', 'thickness': 6,
+    'width': 120, 'height': 180, 'quantity': 40, 'total_m2': 86.4, 'priority': 'Normal',
+    'route': 'INTERMAC,CNC RODAJ,TEMPER A1,ISICAM B1,SEVKIYAT',
+    'date': (datetime.now() + timedelta(days=14)).strftime('%Y-%m-%d'),
+}
+
+
+def test_calculate_forecast(run, factory_db):
+    """Önbelleksiz tam simülasyon"""
+    from core.smart_planner import planner
+
+    def cold_forecast():
+        planner.invalidate_forecast()
+        return planner.calculate_forecast()
+
+    grid, details, loads = run(cold_forecast)
+    assert grid.keys() == details.keys() == loads.keys()
+
+
+def test_calculate_forecast_cached(run, factory_db):
+    """Girdiler değişmeden tekrar (PlanningView 10 sn yenilemesi)"""
+    from core.smart_planner import planner
+
+    planner.calculate_forecast()
+    misses = planner.forecast_cache_stats["misses"]
+    grid, details, loads = run(planner.calculate_forecast)
+    assert planner.forecast_cache_stats["misses"] == misses
+
+
+def test_calculate_impact(run, factory_db):
+    from core.smart_planner import planner
+
+    delivery_date, days, delayed = run(planner.calculate_impact, NEW_ORDER)
+    assert days >= 0
+
+
+def test_calculate_delivery_risk(run, factory_db):
+    """Monte Carlo teslim riski (P50 / P90)"""
+    from core.smart_planner import planner
+
+    risk = run(planner.calculate_delivery_risk, NEW_ORDER, runs=50)
+    summary = risk.summary('>>> HESAPLANAN <<<')
+    assert summary['p50_day'] <= summary['p90_day']
+
+
+def test_recommendation_engine_analyze(run, active_orders):
+    from core.decision_engine import SmartRecommendationEngine
+
+    engine = SmartRecommendationEngine()
+    recommendations = run(engine.analyze, active_orders)
+    assert isinstance(recommendations, list)
+
+
+def test_decision_table_pass(run, active_orders):
+    """load_orders + refresh_table hesaplari (tek ilerleme goruntusu)"""
+    from core.decision_engine import SmartRecommendationEngine
+
+    engine = SmartRecommendationEngine()
+
+    def table_pass():
+        engine.prepare(active_orders)
+        return [
+            (engine.cr_calculator.calculate_cr(order),
+             engine.cr_calculator.estimate_completion_date(order, row, active_orders),
+             engine.get_order_current_station(order))
+            for row, order in enumerate(active_orders)
+        ]
+
+    rows = run(table_pass)
+    assert len(rows) == len(active_orders)
+
+
+def test_cutting_optimizer(run, active_orders):
+    """Bekleyen kesim parçalarının giyotin yerleşimi"""
+    from core.cutting_optimizer import cutting_optimizer
+
+    plans = run(cutting_optimizer.optimize, active_orders)
+    assert all(not plan.unplaced for plan in plans.values())
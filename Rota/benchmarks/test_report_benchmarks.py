@@ -0,0 +1,26 @@
+"""PDF raporlama performansı"""
+
+import os
+
+import pytest
+
+
+def test_weekly_schedule_pdf(run, factory_db, tmp_path):
+    pytest.importorskip("reportlab")
+    from core.pdf_engine import PDFEngine
+    from core.smart_planner import planner
+
+    _, details, _ = planner.calculate_forecast()
+    engine = PDFEngine(str(tmp_path / "haftalik.pdf"))
+
+    success, msg = run(engine.generate_weekly_schedule_pdf, details)
+    assert success, msg
+
+
+def test_nightly_plan(run, factory_db, tmp_path):
+    """plan_cli: sıralama + karar destek + tahmin + PDF + CSV (PySide6'sız)"""
+    pytest.importorskip("reportlab")
+    from plan_cli import run_plan
+
+    files, timings = run(run_plan, str(tmp_path), log=lambda msg: None)
+    assert all(os.path.getsize(path) > 0 for path in files)
@@ -0,0 +1,191 @@
+"""
+EFES ROTA X - Üretim Geçmişinden Kapasite Öğrenme
+FactoryConfig'deki sabit kapasiteler yerine, production_logs'tan ölçülen gerçek
+m²/gün verimini çıkarır.
+
+Veri yolu:
+- db.refresh_station_output_summary(): logların yalnız yeni satırlarını
+  (filigrandan sonrası) istasyon / gün / vardiya özetine ekler; milyonlarca satırda
+  da her yenileme yalnız son eklenenleri okur.
+- Öğrenme, bu küçük özet tablosu üzerinden yapılır (son WINDOW_DAYS gün).
+
+Öğrenilenler (istasyon başına):
+- capacity: çalışılan günlerin CAPACITY_QUANTILE yüzdeliğindeki günlük m²
+  (talep az olan günler kapasiteyi düşük göstermesin diye ortalama değil)
+- weekday_profile: Pazartesi..Pazar ortalama üretimin en yoğun güne oranı
+- shift_share: vardiyaların (00-08, 08-16, 16-24) üretimdeki payı
+
+Arka plan işi (start/stop), REFRESH_SECONDS aralıkla:
+- ROTA_SUMMARY_HOST=1 olan tek makinede özeti günceller (yazma yalnız orada yapılır;
+  okuyan istemciler özet tablosuna yazmaz),
+- ROTA_LEARNED_CAPACITY=1 olan istemcilerde profilleri özetten yeniden öğrenir.
+İkisi de kapalıysa thread hiç başlamaz.
+
+Kullanım:
+    from core.capacity_learning import capacity_learner
+    capacity_learner.start()                          # Uygulama açılışında (ayarlara göre)
+    caps = capacity_learner.learned_capacities(factory_config.get_capacities())
+    capacity_learner.get_profile("CNC RODAJ")         # {'capacity', 'weekday_profile', ...}
+"""
+
+import os
+import statistics
+import threading
+import time
+from datetime import datetime
+
+try:
+    from core.db_manager import db
+except ImportError:
+    db = None
+
+
+class CapacityLearner:
+    """production_logs özetinden istasyon verimi ve gün / vardiya profilleri"""
+
+    WINDOW_DAYS = 28
+    MIN_ACTIVE_DAYS = 10        # Bundan az üretim günü olan istasyon için öğrenilmiş kapasite yok
+    CAPACITY_QUANTILE = 0.8
+    REFRESH_SECONDS = 300
+    SHIFTS = 3
+
+    def __init__(self):
+        self.profiles = {}
+        self.learned_at = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    # === ÖĞRENME ===
+
+    def learn(self, rows=None, window_days=None):
+        """
+        Özet satırlarından (istasyon, gün, vardiya) profilleri hesapla.
+        rows verilmezse özetin son window_days günü okunur (özet güncellenmez).
+        """
+        window_days = window_days or self.WINDOW_DAYS
+        if rows is None:
+            try:
+                rows = db.get_station_output_summary(window_days) if db else []
+            except Exception as e:
+                print(f"Üretim özeti okunamadı: {e}")
+                return self.profiles
+
+        daily = {}          # istasyon -> gün -> m²
+        shifts = {}         # istasyon -> [m² x vardiya]
+        for row in rows:
+            station = row['station_name']
+            m2 = row['done_m2'] or 0
+            if m2 <= 0:
+                continue
+            days = daily.setdefault(station, {})
+            days[row['day']] = days.get(row['day'], 0.0) + m2
+            shift = min(max(int(row['shift'] or 0), 0), self.SHIFTS - 1)
+            shifts.setdefault(station, [0.0] * self.SHIFTS)[shift] += m2
+
+        profiles = {}
+        for station, days in daily.items():
+            values = sorted(days.values())
+            # Hafta günü başına toplam üretim; hiç çalışılmayan gün 0 kalır
+            weekday_load = [0.0] * 7
+            for day, m2 in days.items():
+                weekday_load[datetime.strptime(day, '%Y-%m-%d').weekday()] += m2
+            peak = max(weekday_load) or 1.0
+            total_shift = sum(shifts[station]) or 1.0
+
+            profiles[station] = {
+                "capacity": self._quantile(values, self.CAPACITY_QUANTILE),
+                "mean": statistics.fmean(values),
+                "active_days": len(values),
+                "weekday_profile": [round(v / peak, 3) for v in weekday_load],
+                "shift_share": [round(v / total_shift, 3) for v in shifts[station]],
+            }
+
+        with self._lock:
+            self.profiles = profiles
+            self.learned_at = datetime.now()
+        return profiles
+
+    @staticmethod
+    def _quantile(sorted_values, q):
+        if not sorted_values:
+            return 0.0
+        idx = min(len(sorted_values) - 1, max(0, round(q * (len(sorted_values) - 1))))
+        return sorted_values[idx]
+
+    # === SORGULAR ===
+
+    def get_profile(self, station):
+        with self._lock:
+            return self.profiles.get(station)
+
+    def learned_capacities(self, base):
+        """
+        base (ayarlardaki kapasiteler) üzerine yeterli geçmişi olan istasyonların
+        öğrenilmiş kapasitesini yaz. Hiç öğrenilmemişse önce learn() çağrılır.
+        """
+        if self.learned_at is None:
+            self.learn()
+        with self._lock:
+            profiles = dict(self.profiles)
+        capacities = dict(base)
+        for station in capacities:
+            profile = profiles.get(station)
+            if profile and profile['active_days'] >= self.MIN_ACTIVE_DAYS and profile['capacity'] > 0:
+                capacities[station] = round(profile['capacity'])
+        return capacities
+
+    def factory_weekday_factors(self, stations=None):
+        """Fabrika geneli Pazartesi..Pazar katsayısı (yeterli geçmişi olan istasyonların toplamı)"""
+        with self._lock:
+            profiles = [p for name, p in self.profiles.items()
+                        if (stations is None or name in stations) and p['active_days'] >= self.MIN_ACTIVE_DAYS]
+        if not profiles:
+            return None
+        load = [sum(p['weekday_profile'][d] * p['capacity'] for p in profiles) for d in range(7)]
+        peak = max(load)
+        if peak <= 0:
+            return None
+        return [round(v / peak, 3) for v in load]
+
+    # === ARKA PLAN İŞİ ===
+
+    def start(self, interval=None):
+        """
+        Özet güncelleyiciyi (ROTA_SUMMARY_HOST=1) ve/veya öğrenmeyi (ROTA_LEARNED_CAPACITY=1)
+        arka planda çalıştır. Döner: thread başlatıldı mı
+        """
+        refresh = os.environ.get("ROTA_SUMMARY_HOST") == "1"
+        learn = os.environ.get("ROTA_LEARNED_CAPACITY") == "1"
+        if not (refresh or learn):
+            return False
+        if self._thread is not None and self._thread.is_alive():
+            return False
+        interval = interval or self.REFRESH_SECONDS
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, args=(interval, refresh, learn),
+                                        name="CapacityLearner", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def _loop(self, interval, refresh, learn):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                if refresh and db:
+                    db.refresh_station_output_summary()
+                if learn:
+                    self.learn()
+            except Exception as e:
+                print(f"Kapasite öğrenme hatası: {e}")
+            self._stop.wait(max(1.0, interval - (time.monotonic() - started)))
+
+
+# Singleton instance
+capacity_learner = CapacityLearner()
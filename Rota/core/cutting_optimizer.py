@@ -0,0 +1,319 @@
+"""
+EFES ROTA X - Giyotin Cam Kesim Optimizasyonu
+Kesim istasyonunda (INTERMAC / LIVA KESIM) bekleyen parçaları stoktaki plakalara
+yerleştirir; levha bazlı yerleşim, kesim sırası ve fire yüzdesi üretir.
+
+Kurallar (aa.md):
+- Camda yalnızca baştan sona düz kesim yapılır (giyotin); üretilen her yerleşim
+  ardışık giyotin kesimlerle gerçekten kesilebilir
+- Her kesimde kesim payı (kerf) kadar cam kaybolur
+- MIN_OFFCUT_CM altındaki artıklar tekrar kullanılamaz (tam fire)
+- Parçalar 90° döndürülebilir
+
+Yöntem:
+1. Parçalar büyükten küçüğe sıralanır; her parça tüm açık levhalardaki boş
+   dikdörtgenlerden alanı en uygun olana (Best Area Fit) yerleşir. Boş dikdörtgenler
+   alan sırasıyla tutulur, arama ikili aramayla başlar. Yeni levha gerekince önce
+   parçanın sığdığı en küçük artık (remnants), yoksa stoktaki plaka açılır.
+2. Yerleştirilen parça, bulunduğu boş dikdörtgeni kısa artık ekseni kuralıyla
+   (Shorter Leftover Axis) iki giyotin kesimle böler.
+3. İyileştirme: en düşük verimli levhaların parçaları diğer levhalara dağıtılır
+   (levha tamamen kalkar); kalan en boş levha stoktaki daha küçük plakaya sığıyorsa
+   küçük plakaya taşınır.
+4. Çoklu başlangıç (isteğe bağlı): farklı parça sıraları, döndürme politikaları,
+   plaka seçimleri ve bölme kuralları süreç havuzunda paralel denenir; süre
+   bütçesi dolunca en az fireli plan seçilir. Havuz ilk çağrıda açılır ve sonraki
+   çağrılarda yeniden kullanılır.
+
+Yerleştirme motoru (1-3) ve havuz işçisi veritabanı import etmeyen core.cutting_packing'dedir.
+
+Ölçüler cm'dir (plates tablosu ve siparişlerle aynı).
+
+Kullanım:
+    from core.cutting_optimizer import cutting_optimizer
+    plans = cutting_optimizer.optimize()             # {(kalınlık, cam tipi): CuttingPlan}
+    plan.get_summary()                               # Levha sayısı, fire %, artık m²
+    plan.sheets[0].cut_instructions()                # Usta için adım adım kesim
+    plans = cutting_optimizer.optimize(multi_start=True, time_budget=20)
+    plan.get_summary()['improvement_pct']            # Açgözlü plana göre fire kazancı
+
+Önbellek: aynı parça listesi, plaka / artık stoğu ve parametrelerle tekrar çağrılınca
+plan cutting_plan_cache tablosundan okunur (anahtar: girdilerin SHA-256 özeti).
+Plaka, artık veya sipariş değiştiren DB metotları önbelleği temizler.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+try:
+    from core.db_manager import db
+except ImportError:
+    db = None
+
+try:
+    from core.remnant_inventory import remnant_inventory
+except ImportError:
+    remnant_inventory = None
+
+from core.cutting_packing import (  # noqa: F401  (yerleştirme motoru; eski importlar için de)
+    DEFAULT_SHEET, ROTATION_POLICIES, SHEET_CHOICES, SORT_KEYS, SPLIT_RULES,
+    CuttingPlan, GuillotineCutter, SheetLayout, build_variants, pack_variant,
+)
+
+
+CUTTING_STATIONS = ("INTERMAC", "LIVA KESIM")
+PLATE_TYPE_FALLBACK = {"Temperli": "Düz Cam"}   # Temperli cam düz camdan kesilir
+CACHE_VERSION = 2                               # Plan yapısı / algoritma değişince artırılır
+
+
+class CuttingOptimizer:
+    """Bekleyen kesim işlerini kalınlık / cam tipi gruplarına ayırıp plakalara yerleştirir"""
+
+    KERF_CM = 0.3           # Kesim payı (3 mm)
+    MIN_OFFCUT_CM = 20      # Bu ölçünün altındaki artık tekrar kullanılamaz
+
+    # Çoklu başlangıç araması
+    MULTI_START_VARIANTS = 48       # Grup başına denenecek varyant
+    MULTI_START_BUDGET_S = 10.0     # Varsayılan süre bütçesi (saniye)
+    MIN_PARALLEL_PIECES = 500       # Bunun altında süreç açma maliyeti kazançtan büyük
+
+    def __init__(self):
+        self._executor = None           # Çoklu başlangıç süreç havuzu (ilk aramada açılır)
+        self._executor_workers = 0
+        self._executor_lock = threading.Lock()
+
+    def collect_pieces(self, orders, progress=None):
+        """{(kalınlık, cam tipi): [(order_id, kod, en, boy), ...]} - kesimi bitmemiş adetler"""
+        progress = progress or {}
+        groups = defaultdict(list)
+        for order in orders:
+            route = [s.strip() for s in (order.get('route') or '').split(',')]
+            stations = [s for s in route if s in CUTTING_STATIONS]
+            if not stations:
+                continue
+
+            quantity = order.get('quantity') or 0
+            done = progress.get(order.get('id'), {}) if not order.get('is_new') else {}
+            remaining = quantity - max((done.get(s, 0) or 0) for s in stations)
+            if remaining <= 0:
+                continue
+
+            w, h = order.get('width') or 0, order.get('height') or 0
+            if w <= 0 or h <= 0:
+                m2 = order.get('declared_total_m2') or 0
+                if m2 <= 0:
+                    continue
+                w = h = round((m2 / quantity * 10000) ** 0.5, 1)
+
+            piece = (order.get('id'), order.get('order_code'), w, h)
+            groups[(order.get('thickness'), order.get('product_type'))].extend([piece] * int(remaining))
+        return groups
+
+    def get_stock(self, thickness, glass_type, plates):
+        """Grubun kesileceği plakalar (cam tipi yoksa karşılığı)"""
+        for gtype in (glass_type, PLATE_TYPE_FALLBACK.get(glass_type)):
+            stock = [p for p in plates if p['thickness'] == thickness and p['glass_type'] == gtype and p['quantity'] > 0]
+            if stock:
+                return stock
+        return []
+
+    def get_remnants(self, thickness, glass_type, remnant_index, groups=()):
+        """
+        Grubun kullanabileceği artıklar: kendi tipi + plaka karşılığı tipi.
+        Karşılık tipin kendi grubu varsa artıklar ona kalır (bir artık tek gruba verilir).
+        """
+        if remnant_index is None:
+            return []
+        remnants = remnant_index.items(thickness, glass_type)
+        fallback = PLATE_TYPE_FALLBACK.get(glass_type)
+        if fallback and (thickness, fallback) not in groups:
+            remnants = remnants + remnant_index.items(thickness, fallback)
+        return remnants
+
+    def optimize(self, orders=None, progress=None, plates=None, sort_key="area", kerf=None, min_offcut=None,
+                 multi_start=False, time_budget=None, workers=None, variants=None,
+                 remnant_index=None, use_remnants=True, use_cache=True):
+        """
+        Tüm gruplar için kesim planı: {(kalınlık, cam tipi): CuttingPlan}
+        multi_start=True: açgözlü planın üstüne farklı varyantlar CPU çekirdeklerine
+        dağıtılarak time_budget saniye içinde denenir; en az fireli plan döner ve
+        plan.get_summary() temel plana göre iyileşmeyi raporlar.
+        use_remnants=True: stoktaki artıklar (remnant_index verilmezse DB'den) yeni
+        levhadan önce kullanılır.
+        use_cache=True: girdiler değişmediyse plan önbellekten döner.
+        """
+        kerf = self.KERF_CM if kerf is None else kerf
+        if min_offcut is None:
+            min_offcut = remnant_inventory.min_size if remnant_inventory else self.MIN_OFFCUT_CM
+
+        if orders is None:
+            orders = db.get_orders_by_status(["Beklemede", "Üretimde"]) if db else []
+        if progress is None:
+            ids = [o['id'] for o in orders if not o.get('is_new') and o.get('id') is not None]
+            progress = db.get_station_progress_map(ids) if db and ids else {}
+        if plates is None:
+            plates = db.get_all_plates() if db else []
+
+        groups = self.collect_pieces(orders, progress)
+        if not use_remnants:
+            remnant_index = None
+        elif remnant_index is None and remnant_inventory and groups:
+            remnant_index = remnant_inventory.load_index()
+        stocks = {key: self.get_stock(key[0], key[1], plates) for key in groups}
+        remnants = {key: self.get_remnants(key[0], key[1], remnant_index, groups) for key in groups}
+
+        fingerprint = None
+        if use_cache and db and groups:
+            params = {"sort_key": sort_key, "kerf": kerf, "min_offcut": min_offcut, "multi_start": multi_start,
+                      "time_budget": time_budget, "workers": workers, "variants": variants}
+            fingerprint = self.fingerprint(groups, stocks, remnants, params)
+            cached = self._load_cached(fingerprint)
+            if cached is not None:
+                return cached
+
+        plans = {}
+        for (thickness, glass_type), pieces in groups.items():
+            key = (thickness, glass_type)
+            plan = CuttingPlan(thickness, glass_type, kerf, min_offcut)
+            cutter = GuillotineCutter(stocks[key], kerf, min_offcut, sort_key, remnants=remnants[key])
+            plans[key] = cutter.pack(pieces, plan)
+
+        if multi_start and groups:
+            self._multi_start(plans, groups, stocks, remnants, kerf, min_offcut,
+                              self.MULTI_START_BUDGET_S if time_budget is None else time_budget,
+                              workers, variants or self.MULTI_START_VARIANTS)
+
+        # Stok dışı levhaların cam tipi: grubun kesildiği plaka tipi
+        for (thickness, glass_type), plan in plans.items():
+            for sheet in plan.sheets:
+                if sheet.glass_type is None:
+                    sheet.glass_type = PLATE_TYPE_FALLBACK.get(glass_type, glass_type)
+
+        if fingerprint:
+            self._store_cached(fingerprint, plans)
+        return plans
+
+    # === ÖNBELLEK ===
+
+    def fingerprint(self, groups, stocks, remnants, params):
+        """Parça listesi + plaka/artık stoğu + parametrelerin SHA-256 özeti"""
+        payload = {
+            "version": CACHE_VERSION,
+            "params": params,
+            "groups": [
+                [key, pieces,
+                 [(p['id'], p['width'], p['height'], p['quantity'], p.get('glass_type')) for p in stocks[key]],
+                 [(r['id'], r['width'], r['height']) for r in remnants[key]]]
+                for key, pieces in groups.items()
+            ],
+        }
+        text = json.dumps(payload, default=str, separators=(',', ':'))
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def _load_cached(self, fingerprint):
+        try:
+            payload = db.get_cutting_plan_cache(fingerprint)
+            if payload is None:
+                return None
+            plans = [CuttingPlan.from_dict(d) for d in json.loads(payload)]
+            return {(p.thickness, p.glass_type): p for p in plans}
+        except Exception as e:
+            print(f"Kesim planı önbelleği okunamadı: {e}")
+            return None
+
+    def _store_cached(self, fingerprint, plans):
+        try:
+            db.save_cutting_plan_cache(fingerprint, json.dumps([p.to_dict() for p in plans.values()]))
+        except Exception as e:
+            print(f"Kesim planı önbelleğe yazılamadı: {e}")
+
+    def _multi_start(self, plans, groups, stocks, remnants, kerf, min_offcut, time_budget, workers, variants):
+        """Varyantları süre bütçesi içinde dene, her grupta en iyi planı tut"""
+        deadline = time.monotonic() + time_budget
+        for plan in plans.values():
+            plan.baseline_waste_pct = plan.waste_pct
+            plan.baseline_sheets = len(plan.sheets)
+            plan.variants_evaluated = 1
+            plan.strategy = {"sort_key": "area", "rotation": "auto", "sheet_choice": "smallest", "split_rule": "SLAS"}
+
+        # Grupları sırayla dolaş: bütçe biterse her grup birkaç varyant görmüş olur
+        per_group = {key: build_variants(variants, stocks[key])[1:] for key in groups}
+        tasks = []
+        for i in range(max((len(v) for v in per_group.values()), default=0)):
+            for key, group_variants in per_group.items():
+                if i < len(group_variants):
+                    tasks.append((key, group_variants[i], stocks[key], remnants[key], groups[key], kerf, min_offcut))
+
+        def accept(key, candidate):
+            best = plans[key]
+            candidate.baseline_waste_pct = best.baseline_waste_pct
+            candidate.baseline_sheets = best.baseline_sheets
+            candidate.variants_evaluated = best.variants_evaluated + 1
+            if candidate.score() < best.score():
+                plans[key] = candidate
+            else:
+                best.variants_evaluated += 1
+
+        workers = workers or os.cpu_count() or 1
+        total_pieces = sum(len(p) for p in groups.values())
+        if workers > 1 and total_pieces >= self.MIN_PARALLEL_PIECES:
+            try:
+                executor = self._get_executor(workers)
+            except (OSError, NotImplementedError, ValueError):
+                executor = None
+            if executor is not None:
+                futures = []
+                try:
+                    futures = [executor.submit(pack_variant, task) for task in tasks]
+                    for future in as_completed(futures, timeout=max(0.0, deadline - time.monotonic())):
+                        try:
+                            accept(*future.result())
+                        except BrokenProcessPool:
+                            raise
+                        except Exception as e:
+                            print(f"Kesim varyantı hatası: {e}")
+                except FutureTimeout:
+                    pass
+                except BrokenProcessPool as e:
+                    print(f"Kesim süreç havuzu çöktü, sonraki aramada yeniden açılacak: {e}")
+                    self.shutdown()
+                except Exception as e:
+                    print(f"Paralel kesim araması durdu: {e}")
+                finally:
+                    # Havuz açık kalır; bütçe dolduğunda başlamamış varyantlar iptal edilir
+                    for future in futures:
+                        future.cancel()
+                return
+
+        for task in tasks:
+            if time.monotonic() >= deadline:
+                break
+            accept(*pack_variant(task))
+
+    def _get_executor(self, workers):
+        """Süreç havuzu: ilk çağrıda açılır, sonraki optimize() çağrılarında yeniden kullanılır"""
+        with self._executor_lock:
+            if self._executor is not None and self._executor_workers != workers:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=workers)
+                self._executor_workers = workers
+            return self._executor
+
+    def shutdown(self):
+        """Süreç havuzunu kapat (uygulama kapanışı / havuz çöktüğünde)"""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+# Singleton instance
+cutting_optimizer = CuttingOptimizer()
@@ -0,0 +1,558 @@
+"""
+EFES ROTA X - Giyotin Yerleştirme Motoru
+core.cutting_optimizer'ın veritabanından bağımsız çekirdeği: levha / plan yapıları,
+GuillotineCutter, artık kovası (RemnantBucket) ve çoklu başlangıç varyantları.
+
+Çoklu başlangıç araması bu modüldeki pack_variant'ı süreç havuzunda çalıştırır.
+Modül core.db_manager import etmez: spawn ile açılan işçi süreçleri yalnız bunu
+yüklediği için her işçide DatabaseManager kurulmaz.
+
+Kullanım:
+    from core.cutting_packing import CuttingPlan, GuillotineCutter
+    plan = GuillotineCutter(stock, kerf=0.3, min_offcut=20).pack(pieces, CuttingPlan(6, "Düz Cam"))
+"""
+
+import bisect
+import random
+from collections import defaultdict
+
+
+DEFAULT_SHEET = (321, 225)                      # Stok yoksa varsayılan jumbo levha (cm)
+
+
+class RemnantBucket:
+    """Tek kalınlık / cam tipindeki artıklar, alan sıralı"""
+
+    def __init__(self, remnants=()):
+        self._entries = []      # (alan, uzun, kısa, id)
+        self._items = {}        # id -> remnant dict
+        for remnant in remnants:
+            self.add(remnant)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, remnant):
+        w, h = remnant['width'], remnant['height']
+        bisect.insort(self._entries, (w * h, max(w, h), min(w, h), remnant['id']))
+        self._items[remnant['id']] = remnant
+
+    def remove(self, remnant_id):
+        remnant = self._items.pop(remnant_id, None)
+        if remnant is None:
+            return None
+        w, h = remnant['width'], remnant['height']
+        entry = (w * h, max(w, h), min(w, h), remnant_id)
+        i = bisect.bisect_left(self._entries, entry)
+        if i < len(self._entries) and self._entries[i] == entry:
+            del self._entries[i]
+        return remnant
+
+    def find(self, w, h):
+        """W×H (döndürülebilir) parçanın sığdığı en küçük alanlı artık"""
+        long_side, short_side = max(w, h), min(w, h)
+        entries = self._entries
+        for i in range(bisect.bisect_left(entries, (w * h,)), len(entries)):
+            _, r_long, r_short, remnant_id = entries[i]
+            if r_long >= long_side and r_short >= short_side:
+                return self._items[remnant_id]
+        return None
+
+    def take(self, w, h):
+        """find() + remove(): bulunan artığı bucket'tan düşer"""
+        remnant = self.find(w, h)
+        if remnant is not None:
+            self.remove(remnant['id'])
+        return remnant
+
+    def items(self):
+        return [self._items[e[3]] for e in self._entries]
+
+
+SORT_KEYS = {
+    "area": lambda p: (p[2] * p[3], max(p[2], p[3])),
+    "long_side": lambda p: (max(p[2], p[3]), p[2] * p[3]),
+    "perimeter": lambda p: (p[2] + p[3], p[2] * p[3]),
+    "width": lambda p: (p[2], p[3]),
+}
+
+
+class SheetLayout:
+    """Tek levhanın kesim planı"""
+
+    def __init__(self, index, width, height, plate_id=None, remnant_id=None, glass_type=None):
+        self.index = index
+        self.width = width
+        self.height = height
+        self.plate_id = plate_id        # None: stok dışı (satın alınacak) levha veya artık
+        self.remnant_id = remnant_id    # Artıktan açıldıysa remnants.id
+        self.glass_type = glass_type    # Levhanın gerçek cam tipi (temperli iş düz camdan kesilir)
+        self.placements = []            # (order_id, order_code, x, y, en, boy, döndürüldü)
+        self.cuts = []                  # (yön, x, y, uzunluk) - yön: 'Y' yatay, 'D' dikey
+        self.scrap = []                 # Parça sığmayacak kadar küçük kalan dikdörtgenler
+        self.free_rects = []            # Plan bitince: tüm boş dikdörtgenler (x, y, en, boy)
+        self.removed = False
+
+    @property
+    def area(self):
+        return self.width * self.height
+
+    @property
+    def used_area(self):
+        return sum(p[4] * p[5] for p in self.placements)
+
+    @property
+    def utilization(self):
+        return self.used_area / self.area if self.area else 0.0
+
+    @property
+    def waste_pct(self):
+        return (1 - self.utilization) * 100
+
+    def pieces(self):
+        """Yerleşen parçalar ilk ölçüleriyle (order_id, kod, en, boy): döndürme geri alınır"""
+        return [(p[0], p[1], p[5], p[4]) if p[6] else (p[0], p[1], p[4], p[5]) for p in self.placements]
+
+    def offcuts(self, min_offcut):
+        """Tekrar kullanılabilir artıklar (iki kenarı da min_offcut ve üstü)"""
+        return [r for r in self.free_rects if min(r[2], r[3]) >= min_offcut]
+
+    def to_dict(self):
+        return {
+            "index": self.index, "width": self.width, "height": self.height,
+            "plate_id": self.plate_id, "remnant_id": self.remnant_id, "glass_type": self.glass_type,
+            "placements": self.placements, "cuts": self.cuts, "scrap": self.scrap, "free_rects": self.free_rects,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        sheet = cls(data["index"], data["width"], data["height"], data.get("plate_id"),
+                    data.get("remnant_id"), data.get("glass_type"))
+        sheet.placements = [tuple(p) for p in data["placements"]]
+        sheet.cuts = [tuple(c) for c in data["cuts"]]
+        sheet.scrap = [tuple(r) for r in data["scrap"]]
+        sheet.free_rects = [tuple(r) for r in data["free_rects"]]
+        return sheet
+
+    def cut_instructions(self):
+        """Kesim ustası için sıralı talimatlar"""
+        steps = []
+        for no, (direction, x, y, length) in enumerate(self.cuts, 1):
+            if direction == 'Y':
+                steps.append(f"{no}. Kesim: ({x:g}, {y:g}) noktasından yatay {length:g} cm")
+            else:
+                steps.append(f"{no}. Kesim: ({x:g}, {y:g}) noktasından dikey {length:g} cm")
+        return steps
+
+
+class CuttingPlan:
+    """Bir kalınlık / cam tipi grubunun kesim planı"""
+
+    def __init__(self, thickness=None, glass_type=None, kerf=0.3, min_offcut=20):
+        self.thickness = thickness
+        self.glass_type = glass_type
+        self.kerf = kerf
+        self.min_offcut = min_offcut
+        self.sheets = []
+        self.unplaced = []              # Hiçbir levhaya sığmayan parçalar
+        self.removed_sheets = 0         # İyileştirmenin kaldırdığı levha
+        self.downsized_sheets = 0       # Daha küçük plakaya taşınan levha
+        self.stock_used = defaultdict(int)  # plate_id -> kullanılan adet (None: stok dışı)
+        self.remnants_used = []         # Levha yerine kullanılan artık id'leri
+        self.strategy = {}              # Planı üreten varyant (çoklu başlangıç)
+        self.baseline_waste_pct = None  # Açgözlü tek geçişin firesi (çoklu başlangıçta)
+        self.baseline_sheets = None
+        self.variants_evaluated = 0
+
+    @property
+    def sheet_area(self):
+        return sum(s.area for s in self.sheets)
+
+    @property
+    def piece_area(self):
+        return sum(s.used_area for s in self.sheets)
+
+    @property
+    def waste_pct(self):
+        return (1 - self.piece_area / self.sheet_area) * 100 if self.sheet_area else 0.0
+
+    def to_dict(self):
+        return {
+            "thickness": self.thickness, "glass_type": self.glass_type,
+            "kerf": self.kerf, "min_offcut": self.min_offcut,
+            "sheets": [s.to_dict() for s in self.sheets],
+            "unplaced": self.unplaced,
+            "removed_sheets": self.removed_sheets, "downsized_sheets": self.downsized_sheets,
+            "stock_used": list(self.stock_used.items()),
+            "remnants_used": self.remnants_used,
+            "strategy": self.strategy,
+            "baseline_waste_pct": self.baseline_waste_pct,
+            "baseline_sheets": self.baseline_sheets,
+            "variants_evaluated": self.variants_evaluated,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        plan = cls(data["thickness"], data["glass_type"], data["kerf"], data["min_offcut"])
+        plan.sheets = [SheetLayout.from_dict(s) for s in data["sheets"]]
+        plan.unplaced = [tuple(p) for p in data["unplaced"]]
+        plan.removed_sheets = data["removed_sheets"]
+        plan.downsized_sheets = data["downsized_sheets"]
+        plan.stock_used.update({pid: n for pid, n in data["stock_used"]})
+        plan.remnants_used = list(data["remnants_used"])
+        plan.strategy = data["strategy"]
+        plan.baseline_waste_pct = data["baseline_waste_pct"]
+        plan.baseline_sheets = data["baseline_sheets"]
+        plan.variants_evaluated = data["variants_evaluated"]
+        return plan
+
+    @property
+    def offcut_area(self):
+        return sum(r[2] * r[3] for s in self.sheets for r in s.offcuts(self.min_offcut))
+
+    def score(self):
+        """Küçük olan daha iyi: yerleşmeyen parça, levha alanı, stok dışı levha, artık (büyük iyi)"""
+        return (len(self.unplaced), round(self.sheet_area, 2), self.stock_used.get(None, 0), -self.offcut_area)
+
+    def get_summary(self):
+        offcut_area = self.offcut_area
+        sheet_area = self.sheet_area
+        summary = {
+            "thickness": self.thickness,
+            "glass_type": self.glass_type,
+            "sheets": len(self.sheets),
+            "pieces": sum(len(s.placements) for s in self.sheets),
+            "unplaced": len(self.unplaced),
+            "piece_m2": round(self.piece_area / 10000, 2),
+            "sheet_m2": round(sheet_area / 10000, 2),
+            "waste_pct": round(self.waste_pct, 2),
+            # Tekrar kullanılabilir artıklar düşülmüş gerçek fire
+            "net_waste_pct": round((sheet_area - self.piece_area - offcut_area) / sheet_area * 100, 2) if sheet_area else 0.0,
+            "offcut_m2": round(offcut_area / 10000, 2),
+            "off_stock_sheets": self.stock_used.get(None, 0),
+            "remnant_sheets": len(self.remnants_used),
+            "removed_sheets": self.removed_sheets,
+            "downsized_sheets": self.downsized_sheets,
+        }
+        if self.baseline_waste_pct is not None:
+            summary.update({
+                "baseline_waste_pct": round(self.baseline_waste_pct, 2),
+                "improvement_pct": round(self.baseline_waste_pct - self.waste_pct, 2),
+                "saved_sheets": self.baseline_sheets - len(self.sheets),
+                "variants_evaluated": self.variants_evaluated,
+                "strategy": dict(self.strategy),
+            })
+        return summary
+
+
+ROTATION_POLICIES = ("auto", "normal", "rotated")     # İki yön de sığınca seçim
+SHEET_CHOICES = ("smallest", "largest", "most_stock")   # Yeni levha açarken plaka seçimi
+SPLIT_RULES = ("SLAS", "LLAS")                          # Kısa / uzun artık ekseni bölme
+
+
+class GuillotineCutter:
+    """
+    Tek grup (aynı kalınlık ve cam tipi) için giyotin yerleştirici.
+    stock: [{'id', 'width', 'height', 'quantity'}] - quantity None ise sınırsız
+    pieces: [(order_id, order_code, en, boy), ...] (her adet ayrı eleman)
+    order_seed verilirse sıralama anahtarı ±ORDER_NOISE oranında rastgele bozulur
+    (çoklu başlangıç araması için farklı parça sıraları).
+    """
+
+    IMPROVE_SHEETS = 10         # Dağıtılmaya çalışılacak en düşük verimli levha sayısı
+    IMPROVE_MAX_UTIL = 0.7      # Bu verimin üstündeki levhalar dağıtılmaz
+    ORDER_NOISE = 0.15
+
+    def __init__(self, stock, kerf=0.3, min_offcut=20, sort_key="area", allow_off_stock=True,
+                 rotation="auto", sheet_choice="smallest", split_rule="SLAS", order_seed=None,
+                 remnants=None):
+        self.remnants = list(remnants or [])    # Yeni levhadan önce denenecek artıklar
+        self.kerf = kerf
+        self.min_offcut = min_offcut
+        self.sort_key = sort_key
+        self.allow_off_stock = allow_off_stock
+        self.rotation = rotation
+        self.sheet_choice = sheet_choice
+        self.split_rule = split_rule
+        self.order_seed = order_seed
+
+        if sheet_choice == "largest":
+            self.stock = sorted(stock, key=lambda p: -p['width'] * p['height'])
+        elif sheet_choice == "most_stock":
+            self.stock = sorted(stock, key=lambda p: (-(p['quantity'] or 0), p['width'] * p['height']))
+        else:
+            self.stock = sorted(stock, key=lambda p: p['width'] * p['height'])
+
+    # === ANA AKIŞ ===
+
+    def pack(self, pieces, plan=None, improve=True):
+        plan = plan or CuttingPlan(kerf=self.kerf, min_offcut=self.min_offcut)
+        self._plan = plan
+        self._free = []     # Alan sıralı: (alan, sıra, x, y, en, boy, levha_no)
+        self._seq = 0
+        self._stock_left = {p['id']: p['quantity'] for p in self.stock}
+        self._remnants = RemnantBucket(self.remnants) if self.remnants else None
+        self._min_side = min((min(p[2], p[3]) for p in pieces), default=0)
+
+        for piece in self._ordered(pieces):
+            if not self._place_piece(piece):
+                plan.unplaced.append(piece)
+
+        if improve:
+            self._improve()
+        self._finalize()
+        return plan
+
+    def _ordered(self, pieces):
+        key = SORT_KEYS[self.sort_key]
+        if self.order_seed is None:
+            return sorted(pieces, key=key, reverse=True)
+        rng = random.Random(self.order_seed)
+        noise = self.ORDER_NOISE
+        decorated = [(key(p)[0] * rng.uniform(1 - noise, 1 + noise), i) for i, p in enumerate(pieces)]
+        decorated.sort(reverse=True)
+        return [pieces[i] for _, i in decorated]
+
+    # === YERLEŞTİRME ===
+
+    def _place_piece(self, piece, allow_new_sheet=True):
+        _, _, w, h = piece
+        found = self._find(w, h)
+        if found is None:
+            if not allow_new_sheet or not self._open_sheet(w, h):
+                return False
+            found = self._find(w, h)
+            if found is None:
+                return False
+        self._place(found[0], found[1], piece)
+        return True
+
+    def _find(self, w, h):
+        """En küçük alanlı uygun boş dikdörtgen: (indeks, döndür)"""
+        free = self._free
+        for j in range(bisect.bisect_left(free, (w * h,)), len(free)):
+            fw, fh = free[j][4], free[j][5]
+            normal = w <= fw and h <= fh
+            rotated = h <= fw and w <= fh
+            if normal or rotated:
+                if normal and rotated:
+                    if self.rotation == "normal":
+                        return j, False
+                    if self.rotation == "rotated":
+                        return j, True
+                    # Kısa kenar artığı az olan yön
+                    return j, min(fw - h, fh - w) < min(fw - w, fh - h)
+                return j, rotated
+        return None
+
+    def _place(self, j, rotated, piece):
+        order_id, code, w, h = piece
+        _, _, x, y, fw, fh, si = self._free.pop(j)
+        sheet = self._plan.sheets[si]
+        pw, ph = (h, w) if rotated else (w, h)
+
+        # Kesim payı; levha/dikdörtgen kenarına denk gelirse kesim yok
+        ow = min(pw + self.kerf, fw)
+        oh = min(ph + self.kerf, fh)
+        left_w, left_h = fw - ow, fh - oh
+
+        if (left_w <= left_h) == (self.split_rule == "SLAS"):
+            # Önce tam boy yatay kesim, sonra parçanın sağından dikey
+            if left_h > 0:
+                sheet.cuts.append(('Y', x, y + oh, fw))
+            if left_w > 0:
+                sheet.cuts.append(('D', x + ow, y, oh))
+            rects = ((x + ow, y, left_w, oh), (x, y + oh, fw, left_h))
+        else:
+            # Önce tam boy dikey kesim, sonra parçanın üstünden yatay
+            if left_w > 0:
+                sheet.cuts.append(('D', x + ow, y, fh))
+            if left_h > 0:
+                sheet.cuts.append(('Y', x, y + oh, ow))
+            rects = ((x + ow, y, left_w, fh), (x, y + oh, ow, left_h))
+
+        sheet.placements.append((order_id, code, x, y, pw, ph, rotated))
+        for rx, ry, rw, rh in rects:
+            if rw <= 0 or rh <= 0:
+                continue
+            if min(rw, rh) < self._min_side:
+                sheet.scrap.append((rx, ry, rw, rh))
+            else:
+                self._add_free(rx, ry, rw, rh, si)
+
+    def _add_free(self, x, y, w, h, si):
+        self._seq += 1
+        bisect.insort(self._free, (w * h, self._seq, x, y, w, h, si))
+
+    def _choose_plate(self, w, h):
+        """Parçanın sığdığı, stokta kalan ilk plaka (sheet_choice sırasıyla)"""
+        for plate in self.stock:
+            left = self._stock_left.get(plate['id'])
+            if left is not None and left <= 0:
+                continue
+            pw, ph = plate['width'], plate['height']
+            if (w <= pw and h <= ph) or (h <= pw and w <= ph):
+                return plate
+        return None
+
+    def _open_sheet(self, w, h):
+        remnant = self._remnants.take(w, h) if self._remnants else None
+        plate = None if remnant else self._choose_plate(w, h)
+        if remnant is not None:
+            width, height, plate_id = remnant['width'], remnant['height'], None
+            glass_type = remnant.get('glass_type')
+        elif plate is not None:
+            width, height, plate_id = plate['width'], plate['height'], plate['id']
+            glass_type = plate.get('glass_type')
+            if self._stock_left.get(plate_id) is not None:
+                self._stock_left[plate_id] -= 1
+        elif self.allow_off_stock:
+            # Stok bitti: bilinen plaka ölçülerinden sığan en küçüğü satın alınacak
+            sizes = sorted({DEFAULT_SHEET} | {(p['width'], p['height']) for p in self.stock},
+                           key=lambda size: size[0] * size[1])
+            size = next((sz for sz in sizes if (w <= sz[0] and h <= sz[1]) or (h <= sz[0] and w <= sz[1])), None)
+            if size is None:
+                return False
+            width, height = size
+            plate_id = glass_type = None
+        else:
+            return False
+
+        si = len(self._plan.sheets)
+        self._plan.sheets.append(SheetLayout(si, width, height, plate_id,
+                                             remnant['id'] if remnant else None, glass_type))
+        self._add_free(0, 0, width, height, si)
+        return True
+
+    # === İYİLEŞTİRME ===
+
+    def _improve(self):
+        plan = self._plan
+        worst = sorted((s for s in plan.sheets if s.utilization < self.IMPROVE_MAX_UTIL),
+                       key=lambda s: s.utilization)[:self.IMPROVE_SHEETS]
+        for sheet in worst:
+            if self._eliminate(sheet):
+                plan.removed_sheets += 1
+
+        # Artıklar zaten sığan en küçük parçadır; küçültme yalnız plakalar için
+        remaining = [s for s in plan.sheets if not s.removed and s.remnant_id is None]
+        if remaining:
+            if self._downsize(min(remaining, key=lambda s: s.utilization)):
+                plan.downsized_sheets += 1
+
+    def _eliminate(self, sheet):
+        """Levhanın parçalarını diğer levhalara dağıt; olmazsa geri al"""
+        si = sheet.index
+        saved_free = self._free
+        saved_lengths = {s.index: (len(s.placements), len(s.cuts), len(s.scrap))
+                         for s in self._plan.sheets if not s.removed and s.index != si}
+        self._free = [r for r in self._free if r[6] != si]
+
+        pieces = sheet.pieces()
+        for piece in self._ordered(pieces):
+            if not self._place_piece(piece, allow_new_sheet=False):
+                # Geri al
+                self._free = saved_free
+                for s in self._plan.sheets:
+                    if s.index in saved_lengths:
+                        n_p, n_c, n_s = saved_lengths[s.index]
+                        del s.placements[n_p:]
+                        del s.cuts[n_c:]
+                        del s.scrap[n_s:]
+                return False
+
+        sheet.removed = True
+        if sheet.remnant_id is not None:
+            self._remnants.add(next(r for r in self.remnants if r['id'] == sheet.remnant_id))
+        elif sheet.plate_id is not None and self._stock_left.get(sheet.plate_id) is not None:
+            self._stock_left[sheet.plate_id] += 1
+        return True
+
+    def _downsize(self, sheet):
+        """Levhanın parçaları daha küçük bir plakaya sığıyorsa oraya taşı"""
+        pieces = sheet.pieces()
+        used = sheet.used_area
+        for plate in sorted(self.stock, key=lambda p: p['width'] * p['height']):
+            if plate['width'] * plate['height'] >= sheet.area or plate['width'] * plate['height'] < used:
+                continue
+            left = self._stock_left.get(plate['id'])
+            if left is not None and left <= 0:
+                continue
+            trial = GuillotineCutter([dict(plate, quantity=1)], self.kerf, self.min_offcut,
+                                     self.sort_key, allow_off_stock=False, rotation=self.rotation,
+                                     split_rule=self.split_rule)
+            result = trial.pack(pieces, improve=False)
+            if result.unplaced or len(result.sheets) != 1:
+                continue
+
+            new = result.sheets[0]
+            sheet.width, sheet.height = new.width, new.height
+            sheet.glass_type = plate.get('glass_type', sheet.glass_type)
+            if sheet.plate_id is not None and self._stock_left.get(sheet.plate_id) is not None:
+                self._stock_left[sheet.plate_id] += 1
+            sheet.plate_id = plate['id']
+            if left is not None:
+                self._stock_left[plate['id']] -= 1
+            sheet.placements, sheet.cuts, sheet.scrap = new.placements, new.cuts, []
+            self._free = [r for r in self._free if r[6] != sheet.index]
+            for r in new.free_rects:
+                if min(r[2], r[3]) < self._min_side:
+                    sheet.scrap.append(r)
+                else:
+                    self._add_free(r[0], r[1], r[2], r[3], sheet.index)
+            return True
+        return False
+
+    # === SONUÇ ===
+
+    def _finalize(self):
+        plan = self._plan
+        by_sheet = defaultdict(list)
+        for r in self._free:
+            by_sheet[r[6]].append((r[2], r[3], r[4], r[5]))
+
+        kept = [s for s in plan.sheets if not s.removed]
+        for s in kept:
+            s.free_rects = by_sheet.get(s.index, []) + s.scrap
+        for new_index, s in enumerate(kept):
+            s.index = new_index
+            if s.remnant_id is not None:
+                plan.remnants_used.append(s.remnant_id)
+            else:
+                plan.stock_used[s.plate_id] += 1
+        plan.sheets = kept
+
+
+def build_variants(count, stock=None):
+    """
+    Çoklu başlangıç varyantları: ilk eleman açgözlü temel ayar, ardından sıralama /
+    döndürme / plaka seçimi / bölme kuralı kombinasyonları, sonra rastgele sıralı tekrarlar.
+    Stokta tek plaka ölçüsü varsa plaka seçimi varyantları atlanır.
+    """
+    sizes = {(p['width'], p['height']) for p in stock or []}
+    choices = SHEET_CHOICES if len(sizes) > 1 else SHEET_CHOICES[:1]
+
+    baseline = {"sort_key": "area", "rotation": "auto", "sheet_choice": "smallest", "split_rule": "SLAS"}
+    combos = [
+        {"sort_key": k, "rotation": r, "sheet_choice": c, "split_rule": sr}
+        for k in SORT_KEYS for r in ROTATION_POLICIES for c in choices for sr in SPLIT_RULES
+    ]
+    combos = [v for v in combos if v != baseline]
+    random.Random(0).shuffle(combos)
+
+    variants = [baseline] + combos[:max(0, count - 1)]
+    seed = 1
+    while len(variants) < count:
+        base = combos[seed % len(combos)] if combos else baseline
+        variants.append(dict(base, order_seed=seed))
+        seed += 1
+    return variants
+
+
+def pack_variant(task):
+    """Süreç havuzu işçisi: (grup, varyant, stok, artıklar, parçalar, kerf, min_offcut) -> (grup, plan)"""
+    key, variant, stock, remnants, pieces, kerf, min_offcut = task
+    plan = CuttingPlan(key[0], key[1], kerf, min_offcut)
+    GuillotineCutter(stock, kerf, min_offcut, remnants=remnants, **variant).pack(pieces, plan)
+    plan.strategy = variant
+    return key, plan
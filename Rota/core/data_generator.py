@@ -0,0 +1,397 @@
+"""
+EFES ROTA X - Sentetik Fabrika Verisi Üretici
+Yük testleri ve performans ölçümleri için gerçekçi büyük veri setleri üretir.
+
+- Aynı seed + aynı bitiş tarihi => birebir aynı veritabanı
+- Rotalar FactoryConfig.DEFAULT_STATIONS üzerinden fabrika sırasıyla kurulur
+- Fire/Kırık zincirleri (-R1, -R2 ...), paletler, projeler ve plakalar üretilir
+- Tüm yazma işlemleri DatabaseManager API'leri ile yapılır
+
+Kullanım:
+    from core.db_manager import DatabaseManager
+    from core.data_generator import FactoryDataGenerator
+
+    gen = FactoryDataGenerator(DatabaseManager("buyuk_test.db"), seed=42, preset="large")
+    stats = gen.generate()
+"""
+
+import bisect
+import math
+import random
+from datetime import datetime, timedelta, timezone
+
+try:
+    from core.factory_config import FactoryConfig, StationGroup
+except ImportError:
+    from factory_config import FactoryConfig, StationGroup
+
+
+# Hazır veri seti boyutları
+PRESETS = {
+    "small":  dict(years=1, orders=2_000,   logs=40_000,    projects=20,    customers=80,   plates=60),
+    "medium": dict(years=2, orders=20_000,  logs=450_000,   projects=150,   customers=300,  plates=120),
+    "large":  dict(years=5, orders=200_000, logs=5_000_000, projects=1_200, customers=1_500, plates=240),
+}
+
+PRODUCTS = [("Düz Cam", 45), ("Temperli", 25), ("Lamine", 12), ("Satina", 7), ("Renkli", 6), ("Ayna", 5)]
+THICKNESSES = [(4, 15), (5, 10), (6, 30), (8, 25), (10, 12), (12, 6), (19, 2)]
+PRIORITIES = [("Normal", 75), ("Acil", 15), ("Cok Acil", 5), ("Kritik", 5)]
+PLATE_SIZES = [(321, 244), (321, 600), (225, 321), (260, 321), (200, 321)]
+
+COMPANY_WORDS = ["Yapı", "İnşaat", "Cam", "Alüminyum", "Mimarlık", "Dekorasyon", "Mobilya", "Proje", "Pencere", "Cephe"]
+COMPANY_NAMES = ["Akdeniz", "Anadolu", "Başkent", "Doğu", "Ege", "Güneş", "Kartal", "Marmara", "Toros", "Yıldız",
+                 "Efes", "Kuzey", "Lider", "Ufuk", "Zirve", "Karadeniz", "Aydın", "Özgür", "Demir", "Çınar"]
+PERSON_NAMES = ["Ahmet", "Mehmet", "Ayşe", "Fatma", "Mustafa", "Emine", "Ali", "Hüseyin", "Zeynep", "Murat",
+                "Elif", "Hasan", "İbrahim", "Hatice", "Osman", "Yusuf", "Kemal", "Serkan", "Derya", "Burak"]
+
+SHIFT_START, SHIFT_END = 8, 18
+DATE_FMT = "%Y-%m-%d %H:%M:%S"
+
+
+class FactoryDataGenerator:
+    """
+    Deterministik sentetik veri üretici
+
+    Parametreler (preset değerlerini ezer):
+        years, orders, logs, projects, customers, plates
+        fire_rate: Bir siparişte fire çıkma olasılığı
+        end_date: Verinin biteceği gün (varsayılan: bugün)
+    """
+
+    CHUNK_SIZE = 2000
+
+    # Rework siparişinin ana siparişten devraldığı alanlar (report_fire ile aynı)
+    INHERITED_KEYS = ('code', 'customer', 'product', 'thickness', 'width', 'height', 'route', 'date', 'project_id')
+
+    def __init__(self, db_manager, seed=42, preset="small", end_date=None, fire_rate=0.04,
+                 progress=None, **overrides):
+        if preset not in PRESETS:
+            raise ValueError(f"Bilinmeyen preset: {preset} ({', '.join(PRESETS)})")
+
+        self.db = db_manager
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.params = dict(PRESETS[preset])
+        self.params.update({k: v for k, v in overrides.items() if v is not None})
+        self.fire_rate = fire_rate
+        self.progress = progress
+
+        end = end_date or datetime.now()
+        if isinstance(end, str):
+            end = datetime.strptime(end, "%Y-%m-%d")
+        self.end = end.replace(hour=SHIFT_END, minute=0, second=0, microsecond=0)
+        self.start = self.end - timedelta(days=int(365 * self.params['years']))
+
+        self.stations = sorted(FactoryConfig.DEFAULT_STATIONS.values(), key=lambda s: s.order_index)
+        self.stats = {"orders": 0, "reworks": 0, "logs": 0, "pallets": 0, "projects": 0, "plates": 0, "users": 0}
+
+        self._order_seq = 0
+        self._queue_seq = 0
+        self._pallet_seq = 0
+
+    # === YARDIMCILAR ===
+
+    def _weighted(self, choices):
+        items, weights = zip(*choices)
+        return self.rng.choices(items, weights=weights)[0]
+
+    def _to_shift(self, dt):
+        """Zamanı mesai saatine ve iş gününe kaydır (Pazar çalışılmaz)"""
+        if dt.hour >= SHIFT_END:
+            dt = (dt + timedelta(days=1)).replace(hour=SHIFT_START, minute=self.rng.randint(0, 59))
+        elif dt.hour < SHIFT_START:
+            dt = dt.replace(hour=SHIFT_START, minute=self.rng.randint(0, 59))
+        if dt.weekday() == 6:
+            dt += timedelta(days=1)
+        return dt
+
+    def _report(self, stage, done, total):
+        if self.progress:
+            self.progress(stage, done, total)
+
+    def _names(self):
+        """Müşteri ve operatör isim havuzlarını oluştur"""
+        customers = []
+        for i in range(self.params['customers']):
+            name = f"{self.rng.choice(COMPANY_NAMES)} {self.rng.choice(COMPANY_WORDS)}"
+            customers.append(name if name not in customers else f"{name} {i}")
+        self.customers = customers
+
+        self.operators = {}
+        for station in self.stations:
+            if station.group == StationGroup.SEVKIYAT:
+                continue
+            self.operators[station.name] = [
+                f"{self.rng.choice(PERSON_NAMES)} {chr(65 + self.rng.randint(0, 25))}." for _ in range(2)
+            ]
+
+    def build_route(self, product):
+        """Ürün tipine göre fabrika sırasında gerçekçi bir rota üret"""
+        rng = self.rng
+        picked = []
+
+        if product == "Lamine":
+            picked.append("LAMINE KESIM")
+        else:
+            picked.append("INTERMAC" if rng.random() < 0.7 else "LIVA KESIM")
+
+        edge = [s for s in ("CNC RODAJ", "DOUBLEDGER", "ZIMPARA") if rng.random() < 0.35]
+        if not edge and rng.random() < 0.85:
+            edge = [rng.choice(["CNC RODAJ", "DOUBLEDGER", "ZIMPARA"])]
+        picked += edge
+
+        if rng.random() < 0.55:
+            picked.append(rng.choice(["TESIR A1", "TESIR B1", "TESIR B1-1", "TESIR B1-2"]))
+        if rng.random() < 0.25:
+            picked.append("DELIK")
+        if rng.random() < 0.08:
+            picked.append("OYGU")
+
+        if product == "Temperli" or rng.random() < 0.35:
+            picked.append("TEMPER BOMBE" if rng.random() < 0.05 else rng.choice(["TEMPER A1", "TEMPER A1", "TEMPER B1"]))
+
+        if product == "Lamine":
+            picked.append("LAMINE A1")
+        if rng.random() < 0.3:
+            picked.append("ISICAM B1")
+        if product == "Satina" and rng.random() < 0.5:
+            picked.append("KUMLAMA")
+        picked.append("SEVKIYAT")
+
+        return ",".join(s.name for s in self.stations if s.name in picked)
+
+    # === ÜRETİM ===
+
+    def generate(self):
+        """Tüm veri setini üret, istatistikleri döndür"""
+        self._names()
+        self._generate_users()
+        self._generate_plates()
+        projects = self._generate_projects()
+        self._generate_orders(projects)
+        return self.stats
+
+    def _generate_users(self):
+        for station, names in self.operators.items():
+            for i, full_name in enumerate(names):
+                username = f"{station.lower().replace(' ', '_')}_{i + 1}"
+                ok, _ = self.db.add_new_user(username, "1234", "operator", full_name, station)
+                if ok:
+                    self.stats['users'] += 1
+
+    def _generate_plates(self):
+        combos = [(t, p) for t, _ in THICKNESSES for p, _ in PRODUCTS if p != "Temperli"]
+        for i in range(self.params['plates']):
+            thickness, glass_type = combos[i % len(combos)]
+            width, height = PLATE_SIZES[(i // len(combos)) % len(PLATE_SIZES)]
+            location = f"Depo {chr(65 + i % 6)}-{1 + i % 20}"
+            if self.db.add_plate(thickness, glass_type, width, height, self.rng.randint(0, 40), location):
+                self.stats['plates'] += 1
+
+    def _generate_projects(self):
+        projects = []
+        span = (self.end - self.start).days
+        for i in range(self.params['projects']):
+            customer = self.rng.choice(self.customers)
+            created = self.start + timedelta(days=self.rng.randint(0, max(1, span - 30)))
+            prefix = f"PR{i + 1:04d}"
+            pid = self.db.add_project({
+                'project_name': f"{customer} {self.rng.choice(['Rezidans', 'Plaza', 'Villa', 'AVM', 'Ofis', 'Konut'])}",
+                'customer_name': customer,
+                'delivery_date': (created + timedelta(days=self.rng.randint(30, 180))).strftime("%Y-%m-%d"),
+                'priority': self._weighted(PRIORITIES),
+                'order_prefix': prefix,
+            })
+            if pid:
+                projects.append({'id': pid, 'customer': customer, 'prefix': prefix, 'created': created, 'seq': 0})
+                self.stats['projects'] += 1
+        projects.sort(key=lambda p: p['created'])
+        return projects
+
+    def _generate_orders(self, projects):
+        total = self.params['orders']
+        span_seconds = (self.end - self.start).total_seconds()
+
+        # Sipariş başına log hedefi -> tamamlanan istasyon başına ortalama kayıt sayısı
+        avg_route = 5.2
+        self._entries_per_station = max(1.0, self.params['logs'] / max(1, total) / avg_route)
+
+        starts = [p['created'] for p in projects]
+        i = 0
+        while i < total:
+            chunk = []
+            while len(chunk) < self.CHUNK_SIZE and i < total:
+                created = self._to_shift(self.start + timedelta(seconds=span_seconds * i / total
+                                                                + self.rng.uniform(0, 3600)))
+                project = None
+                if projects and self.rng.random() < 0.3:
+                    # Son açılan projelerden birine bağla
+                    upto = bisect.bisect_right(starts, created)
+                    if upto:
+                        project = projects[self.rng.randrange(max(0, upto - 50), upto)]
+                chunk.extend(self._build_order_chain(created, project))
+                i = self.stats['orders'] + len(chunk)
+            self._flush_chunk(chunk)
+            self._report("orders", self.stats['orders'], total)
+
+            # Log hedefine yaklaşmak için kayıt yoğunluğunu geri beslemeyle ayarla
+            expected = self.params['logs'] * self.stats['orders'] / total
+            if self.stats['logs']:
+                ratio = min(2.0, max(0.5, expected / self.stats['logs']))
+                self._entries_per_station = max(1.0, self._entries_per_station * ratio)
+
+    def _build_order_chain(self, created, project, parent=None, depth=0):
+        """Tek sipariş (ve varsa rework zinciri) için sipariş + log kayıtlarını üret"""
+        rng = self.rng
+
+        if parent:
+            order = {k: v for k, v in parent['order'].items() if k in self.INHERITED_KEYS}
+            order.update(code=self._rework_code(order['code']), priority='Kritik', is_rework=True,
+                         created_at=created.strftime(DATE_FMT), quantity=parent['broken'])
+            order['total_m2'] = round(parent['unit_m2'] * parent['broken'], 2)
+        else:
+            product = self._weighted(PRODUCTS)
+            width, height = rng.randint(30, 321), rng.randint(30, 244)
+            quantity = max(1, int(math.exp(rng.uniform(0, math.log(120)))))
+            if project:
+                project['seq'] += 1
+                code = f"{project['prefix']}-{project['seq']:04d}"
+                customer = project['customer']
+            else:
+                self._order_seq += 1
+                code = f"SP{created.year % 100:02d}-{self._order_seq:06d}"
+                customer = rng.choice(self.customers)
+            order = {
+                'code': code, 'customer': customer, 'product': product,
+                'thickness': self._weighted(THICKNESSES), 'quantity': quantity,
+                'width': width, 'height': height, 'total_m2': round(width * height * quantity / 10000, 2),
+                'date': (created + timedelta(days=rng.randint(3, 21))).strftime("%Y-%m-%d"),
+                'priority': self._weighted(PRIORITIES), 'route': self.build_route(product),
+                'project_id': project['id'] if project else None,
+                'created_at': created.strftime(DATE_FMT),
+            }
+
+        route = order['route'].split(',')
+        quantity = order['quantity']
+        unit_m2 = order['total_m2'] / quantity if quantity else 0
+
+        # İlerleme: sipariş yaşına göre kaç istasyon bitti?
+        lead_days = rng.uniform(2, 14)
+        age_days = (self.end - created).total_seconds() / 86400
+        progress = age_days / lead_days
+        done_count = len(route) if progress >= 1 else int(len(route) * progress * rng.uniform(0.6, 1.1))
+        done_count = max(0, min(len(route), done_count))
+        step = timedelta(days=lead_days / len(route))
+
+        logs = []
+        chain = []
+        fire_at = rng.randrange(done_count) if done_count and rng.random() < self.fire_rate and depth < 3 else None
+        target = quantity
+        clock = created
+
+        for idx, station in enumerate(route):
+            if idx > done_count:
+                break
+            clock = self._to_shift(clock + step * rng.uniform(0.5, 1.5))
+            if clock > self.end:
+                done_count = min(done_count, idx)
+                break
+
+            if idx == fire_at and target > 1:
+                broken = max(1, int(target * rng.uniform(0.02, 0.15)))
+                target -= broken
+                order['quantity'] = target
+                order['total_m2'] = round(unit_m2 * target, 2)
+                order['rework_count'] = broken
+                order['has_breakage'] = 1
+                logs.append((station, 'Fire/Kırık', broken, self._operator(station), self._log_time(clock)))
+                chain.append((clock, broken))
+
+            # Bitmiş istasyon tüm adedi, sıradaki istasyon kısmi adedi üretmiş olabilir
+            produced = target if idx < done_count else int(target * rng.uniform(0, 0.9))
+            logs.extend(self._split_station_logs(station, produced, clock))
+
+        if done_count >= len(route):
+            shipped = age_days > lead_days + 3 and rng.random() < 0.97
+            order['status'] = 'Sevk Edildi' if shipped else 'Tamamlandı'
+            order['_ship_day'] = clock
+        elif done_count > 0 or any(l[1] == 'Tamamlandi' for l in logs):
+            order['status'] = 'Üretimde'
+        else:
+            order['status'] = 'Beklemede'
+
+        if order['status'] in ('Beklemede', 'Üretimde'):
+            self._queue_seq += 1
+            order['queue_position'] = self._queue_seq
+
+        result = [{'order': order, 'logs': logs}]
+        for fire_clock, broken in chain:
+            result.extend(self._build_order_chain(
+                fire_clock, project, parent={'order': order, 'broken': broken, 'unit_m2': unit_m2}, depth=depth + 1))
+        return result
+
+    @staticmethod
+    def _log_time(clock):
+        """production_logs.timestamp, uygulamadaki CURRENT_TIMESTAMP gibi UTC tutulur"""
+        return clock.astimezone(timezone.utc).strftime(DATE_FMT)
+
+    def _split_station_logs(self, station, produced, clock):
+        """Bir istasyondaki üretimi birkaç kısmi 'Tamamlandi' kaydına böl"""
+        if produced <= 0:
+            return []
+        parts = min(produced, max(1, int(round(self.rng.expovariate(1 / self._entries_per_station)))))
+        base, extra = divmod(produced, parts)
+        logs = []
+        t = clock
+        for p in range(parts):
+            logs.append((station, 'Tamamlandi', base + (1 if p < extra else 0), self._operator(station), self._log_time(t)))
+            t += timedelta(minutes=self.rng.randint(3, 45))
+        return logs
+
+    def _operator(self, station):
+        names = self.operators.get(station)
+        if not names or self.rng.random() < 0.1:
+            return "Sistem"
+        return self.rng.choice(names)
+
+    @staticmethod
+    def _rework_code(code):
+        """report_fire ile aynı adlandırma: KOD-R1, KOD-R2 ..."""
+        if "-R" in code:
+            try:
+                base, ver = code.rsplit("-R", 1)
+                return f"{base}-R{int(ver) + 1}"
+            except ValueError:
+                pass
+        return f"{code}-R1"
+
+    def _flush_chunk(self, chunk):
+        """Paletleri, siparişleri ve logları veritabanına yaz"""
+        # Sevk edilen / hazırlanan siparişleri müşteri + hafta bazında paletle
+        groups = {}
+        for item in chunk:
+            o = item['order']
+            if o['status'] == 'Sevk Edildi' or (o['status'] == 'Tamamlandı' and self.rng.random() < 0.5):
+                week = (o['_ship_day'] - timedelta(days=o['_ship_day'].weekday())).strftime("%Y-%m-%d")
+                groups.setdefault((o['customer'], week, o['status']), []).append(o)
+
+        keys = list(groups.keys())
+        pallets = []
+        for customer, week, status in keys:
+            ship_day = max(o['_ship_day'] for o in groups[(customer, week, status)])
+            self._pallet_seq += 1
+            pallets.append((f"PLT-{self._pallet_seq:06d}", customer, ship_day.strftime(DATE_FMT),
+                            'Sevk Edildi' if status == 'Sevk Edildi' else 'Hazırlanıyor'))
+        pallet_ids = self.db.add_pallets_bulk(pallets)
+        for key, pid in zip(keys, pallet_ids):
+            for o in groups[key]:
+                o['pallet_id'] = pid
+        self.stats['pallets'] += len(pallet_ids)
+
+        order_ids = self.db.add_orders_bulk([item['order'] for item in chunk])
+        logs = [(oid, station, action, qty, operator, ts)
+                for oid, item in zip(order_ids, chunk)
+                for station, action, qty, operator, ts in item['logs']]
+        self.stats['logs'] += self.db.add_production_logs_bulk(logs)
+        self.stats['orders'] += len(order_ids)
+        self.stats['reworks'] += sum(1 for item in chunk if item['order'].get('is_rework'))
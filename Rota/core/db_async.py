@@ -4,10 +4,11 @@ QThread ile arka planda veritabanı sorguları çalıştırır.
 UI donmasını önler.
 """
 
-from PySide6.QtCore import QThread, Signal, QObject, QMutex, QMutexLocker
+from PySide6.QtCore import QThread, QRunnable, Signal, QObject, QMutex, QMutexLocker
 from typing import Any, Callable, Optional, List, Dict
 from dataclasses import dataclass
 from enum import Enum
+import threading
 import traceback
 
 
@@ -104,6 +105,110 @@ class DatabaseWorker(QThread):
         self.wait()
 
 
+class BackgroundTask(QThread):
+    """
+    Uzun süren tek bir hesaplamayı (simülasyon vb.) arka planda çalıştırır
+
+    Kullanım:
+        task = BackgroundTask(planner.calculate_delivery_risk, order_data,
+                              runs=300, progress_callback=BackgroundTask.PROGRESS)
+        task.finished_ok.connect(self.on_risk_ready)
+        task.progress_updated.connect(self.on_risk_progress)
+        task.start()
+
+    progress_callback=BackgroundTask.PROGRESS verilirse, işin ilerleme bildirimi
+    (biten, toplam) progress_updated sinyaline bağlanır.
+    """
+
+    PROGRESS = object()     # progress_callback yer tutucusu
+
+    finished_ok = Signal(object)            # Sonuç
+    failed = Signal(str)                    # Hata mesajı
+    progress_updated = Signal(int, int)     # biten, toplam
+
+    def __init__(self, fn: Callable, *args, parent=None, **kwargs):
+        super().__init__(parent)
+        self._fn = fn
+        self._args = args
+        self._kwargs = kwargs
+        if kwargs.get("progress_callback") is self.PROGRESS:
+            self._kwargs["progress_callback"] = self.progress_updated.emit
+
+    def run(self):
+        try:
+            self.finished_ok.emit(self._fn(*self._args, **self._kwargs))
+        except Exception as e:
+            traceback.print_exc()
+            self.failed.emit(str(e))
+
+
+class PoolTaskSignals(QObject):
+    """PoolTask sinyalleri (QRunnable QObject olmadığı için ayrı nesne)"""
+    finished_ok = Signal(object)        # Sonuç
+    failed = Signal(str)                # Hata mesajı
+    cancelled = Signal()
+    partial = Signal(object)            # Ara sonuç (progress_callback argümanları, tuple)
+
+
+class PoolTask(QRunnable):
+    """
+    QThreadPool'da çalışan, iptal edilebilir ve ara sonuç bildirebilen hesaplama
+
+    Kullanım:
+        task = PoolTask(planner.calculate_forecast,
+                        progress_callback=PoolTask.PARTIAL, should_stop=PoolTask.SHOULD_STOP)
+        task.signals.partial.connect(self.on_partial)
+        task.signals.finished_ok.connect(self.on_ready)
+        pool.start(task)
+        ...
+        task.cancel()   # Daha yeni bir istek geldiğinde
+
+    should_stop=PoolTask.SHOULD_STOP iptal sorgusunu, progress_callback=PoolTask.PARTIAL
+    partial sinyalini işe geçirir. İptal edilen işin sonucu / hatası yerine
+    yalnız cancelled yayınlanır. Referansı iş bitene kadar tutulmalıdır.
+    """
+
+    PARTIAL = object()      # progress_callback yer tutucusu
+    SHOULD_STOP = object()  # should_stop yer tutucusu
+
+    def __init__(self, fn: Callable, *args, **kwargs):
+        super().__init__()
+        self.signals = PoolTaskSignals()
+        self._fn = fn
+        self._args = args
+        self._kwargs = kwargs
+        self._cancel = threading.Event()
+        if kwargs.get("progress_callback") is self.PARTIAL:
+            self._kwargs["progress_callback"] = self._emit_partial
+        if kwargs.get("should_stop") is self.SHOULD_STOP:
+            self._kwargs["should_stop"] = self.is_cancelled
+
+    def cancel(self):
+        self._cancel.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def _emit_partial(self, *payload):
+        if not self.is_cancelled():
+            self.signals.partial.emit(payload)
+
+    def run(self):
+        try:
+            result = self._fn(*self._args, **self._kwargs)
+        except Exception as e:
+            if self.is_cancelled():
+                self.signals.cancelled.emit()
+                return
+            traceback.print_exc()
+            self.signals.failed.emit(str(e))
+            return
+        if self.is_cancelled():
+            self.signals.cancelled.emit()
+        else:
+            self.signals.finished_ok.emit(result)
+
+
 class AsyncDatabaseManager(QObject):
     """
     Asenkron veritabanı yöneticisi
@@ -12,6 +12,12 @@ try:
 except ImportError:
     SECURITY_AVAILABLE = False
 
+# === SORGU İZLEME (ROTA_SQL_TRACE=1) ===
+try:
+    from core.query_tracer import query_tracer
+except ImportError:
+    query_tracer = None
+
 
 class DatabaseManager:
     """
@@ -21,22 +27,30 @@ class DatabaseManager:
     - Fire/Rework ve Loglama tam fonksiyonludur.
     """
     
+    VERSIONED_TABLES = ("orders", "production_logs")   # data_versions sayacı tutulan tablolar
+
     def __init__(self, db_name="efes_factory.db"):
         base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         self.db_path = os.path.join(base_dir, db_name)
         
         self.init_database()
         self._migrate_tables() # Otomatik onarım
+        self._create_indexes() # Migrasyondan sonra (project_id gibi yeni kolonlar için)
         self.create_default_users() 
         self.init_default_stocks()
         self.init_machine_capacities()
         self.init_default_prices()
 
     @contextmanager
-    def get_connection(self):
-        conn = sqlite3.connect(self.db_path)
+    def get_connection(self, immediate=False):
+        factory = query_tracer.connection_factory() if query_tracer else sqlite3.Connection
+        conn = sqlite3.connect(self.db_path, factory=factory)
         conn.row_factory = sqlite3.Row 
         try:
+            if immediate:
+                # Yazma kilidi baştan alınır: okuma→yazma yükseltmesinde SQLITE_BUSY olmaz,
+                # aynı anda yazan terminaller busy timeout içinde sıraya girer
+                conn.execute("BEGIN IMMEDIATE")
             yield conn
             conn.commit()
         except Exception as e:
@@ -122,14 +136,71 @@ class DatabaseManager:
                 )
             """)
 
-            # İndeksler
-            try:
-                cursor.execute("CREATE INDEX IF NOT EXISTS idx_orders_status ON orders(status)")
-                cursor.execute("CREATE INDEX IF NOT EXISTS idx_orders_customer ON orders(customer_name)")
-                cursor.execute("CREATE INDEX IF NOT EXISTS idx_logs_order_id ON production_logs(order_id)")
-                cursor.execute("CREATE INDEX IF NOT EXISTS idx_logs_station ON production_logs(station_name)")
-                cursor.execute("CREATE INDEX IF NOT EXISTS idx_plates_thickness_type ON plates(thickness, glass_type)")
-            except: pass
+            # Kesimden kalan tekrar kullanılabilir artıklar (ölçüler cm)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS remnants (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    thickness INTEGER NOT NULL,
+                    glass_type TEXT NOT NULL,
+                    width REAL NOT NULL,
+                    height REAL NOT NULL,
+                    location TEXT,
+                    source_plate_id INTEGER,
+                    status TEXT DEFAULT 'Stokta',
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    used_at TIMESTAMP
+                )
+            """)
+
+            # Kesim planı önbelleği (anahtar: parça + plaka + artık + parametre özeti)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS cutting_plan_cache (
+                    fingerprint TEXT PRIMARY KEY,
+                    payload TEXT NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+
+            # production_logs özeti: istasyon / gün / vardiya başına üretim (kapasite öğrenme)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS station_output_summary (
+                    station_name TEXT NOT NULL,
+                    day TEXT NOT NULL,
+                    shift INTEGER NOT NULL,
+                    done_m2 REAL DEFAULT 0,
+                    done_qty INTEGER DEFAULT 0,
+                    fire_qty INTEGER DEFAULT 0,
+                    PRIMARY KEY (station_name, day, shift)
+                ) WITHOUT ROWID
+            """)
+
+            # Artımlı özetlerin işlediği son kaynak satırı
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS summary_watermarks (
+                    name TEXT PRIMARY KEY,
+                    last_id INTEGER NOT NULL DEFAULT 0,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+
+            # Veri sürümleri: tablo her değiştiğinde tetikleyici sayacı artırır
+            # (planlama önbellekleri girdinin değişip değişmediğini buradan anlar)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS data_versions (
+                    name TEXT PRIMARY KEY,
+                    version INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            for table in self.VERSIONED_TABLES:
+                cursor.execute("INSERT OR IGNORE INTO data_versions (name, version) VALUES (?, 0)", (table,))
+                for event in ("INSERT", "UPDATE", "DELETE"):
+                    cursor.execute(f"""
+                        CREATE TRIGGER IF NOT EXISTS trg_{table}_version_{event.lower()}
+                        AFTER {event} ON {table}
+                        BEGIN
+                            UPDATE data_versions SET version = version + 1 WHERE name = '{table}';
+                        END
+                    """)
 
     def _migrate_tables(self):
         """Eski veritabanı dosyalarını yeni yapıya uygun hale getirir (Eksik kolonları ekler)"""
@@ -182,6 +253,51 @@ class DatabaseManager:
             except Exception as e:
                 print(f"Proje kolonları eklenirken hata: {e}")
 
+            # Terminal olay kimliği: çevrimdışı günlükten tekrar oynatmada aynı olay iki kez yazılmasın
+            try:
+                log_cols = [row['name'] for row in conn.execute("PRAGMA table_info(production_logs)").fetchall()]
+                if 'event_uuid' not in log_cols:
+                    conn.execute("ALTER TABLE production_logs ADD COLUMN event_uuid TEXT")
+                    print("Onarım: 'event_uuid' kolonu eklendi.")
+                conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_logs_event_uuid ON production_logs(event_uuid) WHERE event_uuid IS NOT NULL")
+            except Exception as e:
+                print(f"Olay kimliği kolonu eklenirken hata: {e}")
+
+    # Sorgu karışımına göre ayarlanmış indeksler (bkz. index_advisor.py)
+    INDEXES = {
+        # get_station_progress / get_completed_stations_list: tamamı indeksten okunur (covering)
+        "idx_logs_order_action_station": "production_logs(order_id, action, station_name, quantity)",
+        # Log ekranı, raporlar ve operatör performansı: zaman aralığı ve ORDER BY timestamp
+        "idx_logs_timestamp": "production_logs(timestamp)",
+        "idx_logs_station": "production_logs(station_name)",
+        "idx_orders_status_created": "orders(status, created_at)",
+        "idx_orders_queue": "orders(queue_position, delivery_date)",
+        "idx_orders_customer": "orders(customer_name)",
+        "idx_orders_code": "orders(order_code)",
+        "idx_orders_pallet": "orders(pallet_id)",
+        "idx_orders_project": "orders(project_id, created_at)",
+        "idx_plates_thickness_type": "plates(thickness, glass_type)",
+        "idx_remnants_status_type": "remnants(status, thickness, glass_type)",
+    }
+
+    # Yeni bileşik indekslerin ön eki olduğu için gereksizleşen eski indeksler
+    OBSOLETE_INDEXES = ["idx_orders_status", "idx_logs_order_id"]
+
+    def _create_indexes(self):
+        """İndeksleri oluştur, gereksiz kalanları kaldır"""
+        with self.get_connection() as conn:
+            for name, target in self.INDEXES.items():
+                try: conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+                except Exception as e: print(f"İndeks oluşturulamadı ({name}): {e}")
+
+            for name in self.OBSOLETE_INDEXES:
+                try: conn.execute(f"DROP INDEX IF EXISTS {name}")
+                except: pass
+
+            # Planlayıcı istatistiklerini güncel tut (sadece gerekirse ANALYZE çalıştırır)
+            try: conn.execute("PRAGMA optimize")
+            except: pass
+
     # --- BAŞLANGIÇ VERİLERİ ---
     def init_machine_capacities(self):
         defaults = {"INTERMAC": 800, "LIVA KESIM": 800, "LAMINE KESIM": 600, "CNC RODAJ": 100, "DOUBLEDGER": 400, "ZIMPARA": 300, "TESIR A1": 400, "TESIR B1": 400, "DELİK": 200, "OYGU": 200, "TEMPER A1": 550, "TEMPER B1": 750, "LAMINE A1": 250, "ISICAM B1": 500, "SEVKİYAT": 5000}
@@ -288,6 +404,7 @@ class DatabaseManager:
                 # Stok düş
                 p_name = f"{data['thickness']}mm {data['product']}"
                 conn.execute("UPDATE stocks SET quantity_m2 = quantity_m2 - ? WHERE product_name = ?", (total_m2, p_name))
+                self._invalidate_cutting_cache(conn)
                 return True
             except Exception as e:
                 print(e)
@@ -304,7 +421,9 @@ class DatabaseManager:
         with self.get_connection() as conn: return [dict(r) for r in conn.execute("SELECT * FROM orders ORDER BY created_at DESC").fetchall()]
 
     def update_order_status(self, oid, st):
-        with self.get_connection() as conn: conn.execute("UPDATE orders SET status=? WHERE id=?", (st, oid))
+        with self.get_connection() as conn:
+            conn.execute("UPDATE orders SET status=? WHERE id=?", (st, oid))
+            self._invalidate_cutting_cache(conn)
 
     def get_order_by_code(self, code):
         """Hata korumalı sipariş getirme (Sütun eksik olsa bile çalışır)"""
@@ -321,53 +440,66 @@ class DatabaseManager:
             }
 
     # --- ÜRETİM VE FİRE (CRITICAL) ---
-    def report_fire(self, oid, qty, station_name="Bilinmiyor", operator_name="Sistem"):
+    def report_fire(self, oid, qty, station_name="Bilinmiyor", operator_name="Sistem", event_uuid=None):
         """Fire bildiriminde Adet Düşürme ve Rework"""
-        with self.get_connection() as conn: 
-            # 1. Logla
-            conn.execute("""
-                INSERT INTO production_logs (order_id, station_name, action, quantity, operator_name)
-                VALUES (?, ?, 'Fire/Kırık', ?, ?)
-            """, (oid, station_name, qty, operator_name))
-            
-            # 2. ASIL SİPARİŞİ GÜNCELLE: Adedi düşür
-            orig = conn.execute("SELECT * FROM orders WHERE id=?", (oid,)).fetchone()
-            if not orig: return
-            
-            current_qty = orig['quantity']
-            new_qty = max(0, current_qty - qty)
-            current_m2 = orig['declared_total_m2']
-            unit_m2 = current_m2 / current_qty if current_qty > 0 else 0
-            new_m2 = unit_m2 * new_qty
-            
-            conn.execute("UPDATE orders SET quantity=?, declared_total_m2=?, rework_count=rework_count+?, has_breakage=1 WHERE id=?", (new_qty, new_m2, qty, oid))
-            
-            # 3. YENİ REWORK SİPARİŞİ
-            base_code = orig['order_code']
-            if "-R" in base_code:
-                try:
-                    parts = base_code.split("-R")
-                    new_ver = int(parts[1]) + 1
-                    new_code = f"{parts[0]}-R{new_ver}"
-                except: new_code = f"{base_code}-R1"
-            else:
-                new_code = f"{base_code}-R1"
-            
-            rework_m2 = unit_m2 * qty
-            
-            conn.execute("""
-                INSERT INTO orders (
-                    order_code, customer_name, product_type, thickness, width, height,
-                    quantity, declared_total_m2, route, priority, status, delivery_date,
-                    sale_price, total_price, currency, created_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 'Kritik', 'Beklemede', ?, 0, 0, ?, CURRENT_TIMESTAMP)
-            """, (
-                new_code, orig['customer_name'], orig['product_type'], orig['thickness'],
-                orig['width'], orig['height'], qty, rework_m2, orig['route'],
-                orig['delivery_date'], orig['currency']
-            ))
+        with self.get_connection(immediate=True) as conn: 
+            return self._apply_fire_event(conn, oid, qty, station_name, operator_name, event_uuid)
+
+    def _apply_fire_event(self, conn, oid, qty, station_name, operator_name, event_uuid=None):
+        """
+        Açık işlem içinde fire: log + adet düşürme + rework siparişi.
+        Döner: rework kodu (tekrar gelen olayda None). Sipariş yoksa ValueError, hiçbir şey yazılmaz.
+        """
+        # Terminal günlüğünden tekrar gelen olay: rework ikinci kez açılmasın
+        if event_uuid and conn.execute("SELECT 1 FROM production_logs WHERE event_uuid=?", (event_uuid,)).fetchone():
+            return None
+
+        orig = conn.execute("SELECT * FROM orders WHERE id=?", (oid,)).fetchone()
+        if not orig:
+            raise ValueError(f"Sipariş bulunamadı: {oid}")
+
+        # 1. Logla
+        conn.execute("""
+            INSERT INTO production_logs (order_id, station_name, action, quantity, operator_name, event_uuid)
+            VALUES (?, ?, 'Fire/Kırık', ?, ?, ?)
+        """, (oid, station_name, qty, operator_name, event_uuid))
+        
+        # 2. ASIL SİPARİŞİ GÜNCELLE: Adedi düşür
+        current_qty = orig['quantity']
+        new_qty = max(0, current_qty - qty)
+        current_m2 = orig['declared_total_m2']
+        unit_m2 = current_m2 / current_qty if current_qty > 0 else 0
+        new_m2 = unit_m2 * new_qty
+        
+        conn.execute("UPDATE orders SET quantity=?, declared_total_m2=?, rework_count=rework_count+?, has_breakage=1 WHERE id=?", (new_qty, new_m2, qty, oid))
+        
+        # 3. YENİ REWORK SİPARİŞİ
+        base_code = orig['order_code']
+        if "-R" in base_code:
+            try:
+                parts = base_code.split("-R")
+                new_ver = int(parts[1]) + 1
+                new_code = f"{parts[0]}-R{new_ver}"
+            except: new_code = f"{base_code}-R1"
+        else:
+            new_code = f"{base_code}-R1"
+        
+        rework_m2 = unit_m2 * qty
+        
+        conn.execute("""
+            INSERT INTO orders (
+                order_code, customer_name, product_type, thickness, width, height,
+                quantity, declared_total_m2, route, priority, status, delivery_date,
+                sale_price, total_price, currency, created_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 'Kritik', 'Beklemede', ?, 0, 0, ?, CURRENT_TIMESTAMP)
+        """, (
+            new_code, orig['customer_name'], orig['product_type'], orig['thickness'],
+            orig['width'], orig['height'], qty, rework_m2, orig['route'],
+            orig['delivery_date'], orig['currency']
+        ))
         
         if SECURITY_AVAILABLE: logger.warning(f"Fire: {orig['order_code']} ({qty} adet) - Rework açıldı.")
+        return new_code
 
     def get_station_progress(self, order_id, station_name):
         with self.get_connection() as conn:
@@ -387,38 +519,133 @@ class DatabaseManager:
                 if row[1] >= target: completed.append(row[0])
             return completed
 
-    def register_production(self, order_id, station_name, qty_done, operator_name="Sistem"):
-        with self.get_connection() as conn:
-            conn.execute("INSERT INTO production_logs (order_id, station_name, action, quantity, operator_name) VALUES (?, ?, 'Tamamlandi', ?, ?)", 
-                       (order_id, station_name, qty_done, operator_name))
-            
-            if self._check_all_stations_completed(order_id):
-                conn.execute("UPDATE orders SET status='Tamamlandı' WHERE id=?", (order_id,))
-            else:
-                conn.execute("UPDATE orders SET status='Üretimde' WHERE id=? AND status!='Tamamlandı'", (order_id,))
+    def get_completed_stations_map(self, order_ids):
+        """Birden çok sipariş için tamamlanmış istasyonlar, tek bağlantıda: {order_id: [istasyon, ...]}"""
+        ids = list(dict.fromkeys(order_ids))
+        completed = {order_id: [] for order_id in ids}
+        if not ids: return completed
 
-    def complete_station_process(self, order_id, station_name):
         with self.get_connection() as conn:
-            done = self.get_station_progress(order_id, station_name)
-            target = conn.execute("SELECT quantity FROM orders WHERE id=?", (order_id,)).fetchone()[0]
-            rem = target - done
-            if rem > 0:
-                conn.execute("INSERT INTO production_logs (order_id, station_name, action, quantity, operator_name) VALUES (?, ?, 'Tamamlandi', ?, 'Sistem')", (order_id, station_name, rem))
-            
-            if self._check_all_stations_completed(order_id):
-                conn.execute("UPDATE orders SET status='Tamamlandı' WHERE id=?", (order_id,))
-            else:
-                conn.execute("UPDATE orders SET status='Üretimde' WHERE id=? AND status!='Tamamlandı'", (order_id,))
+            # SQLite parametre sınırı için parçalı sorgu
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                p = ','.join(['?'] * len(chunk))
+                rows = conn.execute(f"""
+                    SELECT pl.order_id, pl.station_name
+                    FROM production_logs pl
+                    JOIN orders o ON o.id = pl.order_id
+                    WHERE pl.order_id IN ({p}) AND pl.action = 'Tamamlandi'
+                    GROUP BY pl.order_id, pl.station_name
+                    HAVING SUM(pl.quantity) >= MAX(o.quantity)
+                """, chunk).fetchall()
+                for row in rows:
+                    completed[row[0]].append(row[1])
+        return completed
+
+    def get_station_progress_map(self, order_ids):
+        """Birden çok sipariş için istasyon ilerlemesi, tek bağlantıda: {order_id: {istasyon: adet}}"""
+        ids = list(dict.fromkeys(order_ids))
+        progress = {order_id: {} for order_id in ids}
+        if not ids: return progress
 
-    def _check_all_stations_completed(self, order_id):
         with self.get_connection() as conn:
-            o = conn.execute("SELECT route FROM orders WHERE id=?", (order_id,)).fetchone()
-            if not o or not o['route']: return False
-            stations = [s.strip() for s in o['route'].split(',')]
-            completed = self.get_completed_stations_list(order_id)
-            for s in stations:
-                if s not in completed: return False
-            return True
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                p = ','.join(['?'] * len(chunk))
+                rows = conn.execute(f"""
+                    SELECT order_id, station_name, SUM(quantity)
+                    FROM production_logs
+                    WHERE order_id IN ({p}) AND action = 'Tamamlandi'
+                    GROUP BY order_id, station_name
+                """, chunk).fetchall()
+                for row in rows:
+                    progress[row[0]][row[1]] = row[2] or 0
+        return progress
+
+    def record_production_event(self, order_id, station_name, qty=None, operator_name="Sistem"):
+        """
+        Üretim olayı yazma yolu: log kaydı, istasyon ilerlemesi ve sipariş durumu geçişi
+        tek bağlantıda, tek işlemde (BEGIN IMMEDIATE). Durum kontrolü yeni kaydı görür.
+        qty=None ise istasyonda kalan adet tamamlanır.
+        Döner: {'logged': adet, 'station_done': adet, 'status': durum} (sipariş yoksa None)
+        """
+        with self.get_connection(immediate=True) as conn:
+            return self._apply_production_event(conn, order_id, station_name, qty, operator_name)
+
+    def record_production_events(self, events):
+        """
+        Toplu terminal olayları (okutma kuyruğu / çevrimdışı günlük): hepsi tek işlemde, sırayla.
+        events: [{'kind': 'production' | 'fire', 'order_id', 'station_name', 'qty' (None = kalan),
+                  'operator_name', 'event_uuid'}, ...]
+        Aynı event_uuid ikinci kez gelirse yeniden yazılmaz (idempotent tekrar oynatma).
+        Döner: olay başına record_production_event sonucu (fire için rework kodu).
+        Fire olayının siparişi yoksa ValueError: işlem geri alınır (kuyruk olayları tek tek dener)
+        """
+        results = []
+        with self.get_connection(immediate=True) as conn:
+            for e in events:
+                operator = e.get('operator_name') or "Sistem"
+                if e.get('kind') == 'fire':
+                    results.append(self._apply_fire_event(conn, e['order_id'], e['qty'], e['station_name'],
+                                                          operator, e.get('event_uuid')))
+                else:
+                    results.append(self._apply_production_event(conn, e['order_id'], e['station_name'], e.get('qty'),
+                                                                operator, e.get('event_uuid')))
+        return results
+
+    def _apply_production_event(self, conn, order_id, station_name, qty, operator_name, event_uuid=None):
+        """Açık işlem içinde tek üretim olayı: log + ilerleme + durum geçişi"""
+        order = conn.execute("SELECT quantity, route, status FROM orders WHERE id=?", (order_id,)).fetchone()
+        if not order: return None
+        target = order['quantity']
+        duplicate = bool(event_uuid) and conn.execute(
+            "SELECT 1 FROM production_logs WHERE event_uuid=?", (event_uuid,)).fetchone() is not None
+
+        progress = {r[0]: r[1] or 0 for r in conn.execute(
+            "SELECT station_name, SUM(quantity) FROM production_logs WHERE order_id=? AND action='Tamamlandi' GROUP BY station_name",
+            (order_id,)).fetchall()}
+        done = progress.get(station_name, 0)
+        if duplicate:
+            qty = 0
+        elif qty is None:
+            qty = max(0, target - done)
+        if qty > 0:
+            conn.execute("INSERT INTO production_logs (order_id, station_name, action, quantity, operator_name, event_uuid) VALUES (?, ?, 'Tamamlandi', ?, ?, ?)",
+                         (order_id, station_name, qty, operator_name, event_uuid))
+            progress[station_name] = done + qty
+
+        # Sevk edilmiş / fire siparişin durumuna dokunulmaz (geç gelen günlük olayı geri almasın)
+        if order['status'] in ('Sevk Edildi', 'Hatalı/Fire'):
+            status = order['status']
+        elif self._route_completed(order['route'], target, progress):
+            status = 'Tamamlandı'
+            conn.execute("UPDATE orders SET status='Tamamlandı' WHERE id=? AND status NOT IN ('Tamamlandı', 'Sevk Edildi', 'Hatalı/Fire')", (order_id,))
+            if conn.execute("SELECT changes()").fetchone()[0]:
+                self._invalidate_cutting_cache(conn)
+        else:
+            status = order['status'] if order['status'] == 'Tamamlandı' else 'Üretimde'
+            conn.execute("UPDATE orders SET status='Üretimde' WHERE id=? AND status NOT IN ('Tamamlandı', 'Üretimde', 'Sevk Edildi', 'Hatalı/Fire')", (order_id,))
+
+        return {'logged': max(qty, 0), 'station_done': progress.get(station_name, 0), 'status': status, 'duplicate': duplicate}
+
+    @staticmethod
+    def _route_completed(route, quantity, progress):
+        """
+        _COMPLETED_ORDERS_CTE ile aynı kural: boş rota hiç, boş rota parçası ("A,,B") hiçbir
+        zaman bitmez; adedi 0 olan sipariş tamamlanmış sayılmaz.
+        progress: {istasyon: tamamlanan adet}
+        """
+        route = route or ''
+        if (quantity or 0) <= 0 or not route.strip(' \t\n\r'):
+            return False
+        return all(progress.get(s.strip(' \t\n\r'), 0) >= quantity for s in route.split(','))
+
+    def register_production(self, order_id, station_name, qty_done, operator_name="Sistem"):
+        return self.record_production_event(order_id, station_name, qty_done, operator_name)
+
+    def complete_station_process(self, order_id, station_name, operator_name="Sistem"):
+        """İstasyonda kalan adedin tamamını bitir"""
+        return self.record_production_event(order_id, station_name, None, operator_name)
 
     # --- DASHBOARD & MATRİS ---
     def get_production_matrix_advanced(self):
@@ -477,6 +704,16 @@ class DatabaseManager:
             res.append({"name": station, "percent": min(percent, 100), "status": status})
         return res
 
+    def get_dashboard_snapshot(self):
+        """Ana ekranın bir yenilemede okuduğu her şey (servis üzerinden tek istek)"""
+        return {
+            "stats": self.get_dashboard_stats(),
+            "active_projects": self.get_active_projects_count(),
+            "orders": self.get_all_orders(),
+            "today_completed": self.get_today_completed_count(),
+            "station_loads": self.get_station_loads(),
+        }
+
     # --- LOGLAMA ve RAPORLAMA (EKSİK OLANLAR EKLENDİ) ---
     def get_system_logs(self, limit=50):
         with self.get_connection() as conn:
@@ -506,7 +743,7 @@ class DatabaseManager:
                        pl.action as islem, pl.operator_name as operator 
                 FROM production_logs pl 
                 JOIN orders o ON pl.order_id = o.id 
-                WHERE date(pl.timestamp) BETWEEN ? AND ? 
+                WHERE pl.timestamp >= ? AND pl.timestamp < date(?, '+1 day')
                 ORDER BY pl.timestamp DESC
             """, (d1, d2)).fetchall()]
 
@@ -531,6 +768,109 @@ class DatabaseManager:
                 ORDER BY fire_adedi DESC
             """).fetchall()]
 
+    # Vardiya: 0 = 00-08, 1 = 08-16, 2 = 16-24 (yerel saat; timestamp UTC CURRENT_TIMESTAMP)
+    SUMMARY_BATCH_ROWS = 50000      # Tek işlemde (yazma kilidi altında) özetlenen en fazla log satırı
+    SUMMARY_WATERMARK = "station_output_local"
+    OBSOLETE_SUMMARY_WATERMARKS = ("station_output",)   # UTC gün/vardiya ile üretilmiş eski özet
+    # Özet ve doğrudan log okuması aynı toplamları kullanır (done_m2, done_qty, fire_qty)
+    _STATION_OUTPUT_SUMS = """
+        SUM(CASE WHEN pl.action = 'Tamamlandi'
+                 THEN pl.quantity * o.declared_total_m2 / MAX(o.quantity, 1) ELSE 0 END) as done_m2,
+        SUM(CASE WHEN pl.action = 'Tamamlandi' THEN pl.quantity ELSE 0 END) as done_qty,
+        SUM(CASE WHEN pl.action LIKE '%Fire%' OR pl.action LIKE '%Kırık%'
+                 THEN pl.quantity ELSE 0 END) as fire_qty"""
+
+    def refresh_station_output_summary(self, batch_rows=None):
+        """
+        production_logs'un yalnız son özetten sonra eklenen satırlarını (id > filigran)
+        station_output_summary'ye ekler. Büyük geçmiş parça parça işlenir; her parça
+        filigranıyla birlikte tek işlemde yazılır. Döner: işlenen log satırı sayısı.
+
+        Filigran okuma, özet ekleme ve filigran güncelleme aynı BEGIN IMMEDIATE işlemindedir:
+        aynı anda yenileyen iki süreç aynı aralığı iki kez özetleyemez.
+        """
+        batch_rows = batch_rows or self.SUMMARY_BATCH_ROWS
+        processed = 0
+        while True:
+            with self.get_connection(immediate=True) as conn:
+                row = conn.execute("SELECT last_id FROM summary_watermarks WHERE name = ?",
+                                   (self.SUMMARY_WATERMARK,)).fetchone()
+                if row is None:
+                    # Filigran yok: özet baştan (yerel saatle) kurulur, eski kovalar silinir
+                    conn.execute("DELETE FROM station_output_summary")
+                    conn.executemany("DELETE FROM summary_watermarks WHERE name = ?",
+                                     [(name,) for name in self.OBSOLETE_SUMMARY_WATERMARKS])
+                last_id = row['last_id'] if row else 0
+                max_id = conn.execute("SELECT MAX(id) FROM production_logs").fetchone()[0] or 0
+                if max_id <= last_id:
+                    return processed
+                upper = min(max_id, last_id + batch_rows)
+
+                conn.execute("""
+                    INSERT INTO station_output_summary (station_name, day, shift, done_m2, done_qty, fire_qty)
+                    SELECT pl.station_name, date(pl.timestamp, 'localtime'),
+                           CAST(strftime('%H', pl.timestamp, 'localtime') AS INTEGER) / 8,
+                           """ + self._STATION_OUTPUT_SUMS + """
+                    FROM production_logs pl
+                    JOIN orders o ON pl.order_id = o.id
+                    WHERE pl.id > ? AND pl.id <= ? AND pl.station_name IS NOT NULL AND pl.timestamp IS NOT NULL
+                    GROUP BY 1, 2, 3
+                    ON CONFLICT (station_name, day, shift) DO UPDATE SET
+                        done_m2 = done_m2 + excluded.done_m2,
+                        done_qty = done_qty + excluded.done_qty,
+                        fire_qty = fire_qty + excluded.fire_qty
+                """, (last_id, upper))
+                conn.execute("""
+                    INSERT INTO summary_watermarks (name, last_id, updated_at) VALUES (?, ?, CURRENT_TIMESTAMP)
+                    ON CONFLICT (name) DO UPDATE SET last_id = excluded.last_id, updated_at = excluded.updated_at
+                """, (self.SUMMARY_WATERMARK, upper))
+                processed += upper - last_id
+
+    def get_station_output_summary(self, days=90):
+        """Son N günün özet satırları (istasyon, gün, vardiya). Salt okuma: özeti güncellemez"""
+        with self.get_connection() as conn:
+            return [dict(r) for r in conn.execute("""
+                SELECT station_name, day, shift, done_m2, done_qty, fire_qty
+                FROM station_output_summary
+                WHERE day >= date('now', 'localtime', '-' || ? || ' days')
+            """, (days,)).fetchall()]
+
+    def get_station_daily_output(self, days=90):
+        """
+        Son N günde istasyon/gün bazlı üretilen m², adet ve fire adedi (risk modeli için, salt okuma).
+        Özet yalnız ROTA_SUMMARY_HOST makinesinde yenilenir: filigrandan sonraki loglar
+        doğrudan production_logs'tan eklenir, filigran hiç yoksa tamamı loglardan hesaplanır.
+        """
+        with self.get_connection() as conn:
+            row = conn.execute("SELECT last_id FROM summary_watermarks WHERE name = ?",
+                               (self.SUMMARY_WATERMARK,)).fetchone()
+            last_id = row['last_id'] if row else 0
+            summary = """
+                SELECT station_name, day, done_m2, done_qty, fire_qty
+                FROM station_output_summary
+                WHERE day >= date('now', 'localtime', '-' || :days || ' days')
+                UNION ALL
+            """ if row else ""
+            return [dict(r) for r in conn.execute("""
+                SELECT station_name, day,
+                       SUM(done_m2) as done_m2, SUM(done_qty) as done_qty, SUM(fire_qty) as fire_qty
+                FROM (""" + summary + """
+                    SELECT pl.station_name as station_name, date(pl.timestamp, 'localtime') as day,
+                           """ + self._STATION_OUTPUT_SUMS + """
+                    FROM production_logs pl
+                    JOIN orders o ON pl.order_id = o.id
+                    WHERE pl.id > :last_id AND pl.station_name IS NOT NULL
+                      AND date(pl.timestamp, 'localtime') >= date('now', 'localtime', '-' || :days || ' days')
+                    GROUP BY 1, 2
+                )
+                GROUP BY station_name, day
+            """, {"days": days, "last_id": last_id}).fetchall()]
+
+    def get_data_versions(self):
+        """Sürümlenen tabloların değişiklik sayaçları: {'orders': n, 'production_logs': m}"""
+        with self.get_connection() as conn:
+            return {r['name']: r['version'] for r in conn.execute("SELECT name, version FROM data_versions").fetchall()}
+
     # --- KAPASİTE & AYARLAR ---
     def get_all_capacities(self):
         """Kapasiteleri factory_config'den al (merkezi sistem)"""
@@ -600,15 +940,61 @@ class DatabaseManager:
     def get_shipped_orders(self):
         with self.get_connection() as conn: return [dict(r) for r in conn.execute("SELECT * FROM orders WHERE status = 'Sevk Edildi' ORDER BY order_code DESC").fetchall()]
 
-    def update_all_order_statuses(self):
+    # Rotasındaki her istasyonda tamamlanan adet >= sipariş adedi olan açık siparişler.
+    # Rota virgülle bölünür (özyinelemeli CTE); her adımın ilerlemesi kapsayan
+    # indeksten (idx_logs_order_action_station) okunur. Boş adım tamamlanamaz; adedi 0 olan
+    # (fire ile tamamen düşmüş) sipariş üretimle bitmiş sayılmaz. Python tarafı: _route_completed
+    _COMPLETED_ORDERS_CTE = """
+        WITH RECURSIVE steps(order_id, station, rest) AS (
+            SELECT id, NULL, route || ','
+            FROM orders
+            WHERE status NOT IN ('Sevk Edildi', 'Hatalı/Fire', 'Tamamlandı')
+              AND route IS NOT NULL AND trim(route) != ''
+              AND quantity > 0
+            UNION ALL
+            SELECT order_id,
+                   trim(substr(rest, 1, instr(rest, ',') - 1), char(32, 9, 10, 13)),
+                   substr(rest, instr(rest, ',') + 1)
+            FROM steps
+            WHERE rest != ''
+        ),
+        completed(order_id) AS (
+            SELECT s.order_id
+            FROM (SELECT DISTINCT order_id, station FROM steps WHERE station IS NOT NULL) s
+            JOIN orders o ON o.id = s.order_id
+            GROUP BY s.order_id
+            HAVING MIN(COALESCE((
+                SELECT SUM(pl.quantity) FROM production_logs pl
+                WHERE pl.order_id = s.order_id AND pl.action = 'Tamamlandi' AND pl.station_name = s.station
+            ), 0) >= o.quantity) = 1
+        )
+    """
+
+    def find_completed_orders(self):
+        """Tüm istasyonları bitmiş ama durumu henüz 'Tamamlandı' olmayan siparişler (id, kod, durum)"""
         with self.get_connection() as conn:
-            orders = conn.execute("SELECT id, status FROM orders WHERE status NOT IN ('Sevk Edildi', 'Hatalı/Fire')").fetchall()
-            count = 0
-            for order in orders:
-                if self._check_all_stations_completed(order['id']):
-                    if order['status'] != 'Tamamlandı':
-                        conn.execute("UPDATE orders SET status = 'Tamamlandı' WHERE id = ?", (order['id'],))
-                        count += 1
+            return [dict(r) for r in conn.execute(self._COMPLETED_ORDERS_CTE + """
+                SELECT o.id, o.order_code, o.status
+                FROM completed c JOIN orders o ON o.id = c.order_id
+                ORDER BY o.id
+            """).fetchall()]
+
+    def update_all_order_statuses(self, dry_run=False):
+        """
+        Tüm istasyonları bitmiş açık siparişleri tek sorguda bulup tek UPDATE ile
+        'Tamamlandı' yapar. dry_run=True ise yalnız sayar. Döner: (güncellenecek) sipariş sayısı
+        """
+        with self.get_connection() as conn:
+            if dry_run:
+                return conn.execute(self._COMPLETED_ORDERS_CTE + "SELECT COUNT(*) FROM completed").fetchone()[0]
+            conn.execute(self._COMPLETED_ORDERS_CTE + """
+                UPDATE orders SET status = 'Tamamlandı'
+                WHERE id IN (SELECT order_id FROM completed)
+            """)
+            # WITH ile başlayan DML'de cursor.rowcount -1 döner
+            count = conn.execute("SELECT changes()").fetchone()[0]
+            if count:
+                self._invalidate_cutting_cache(conn)
             return count
     def get_today_completed_count(self):
         """Bugün tamamlanan (statüsü 'Tamamlandı' olan) sipariş sayısını üretim loglarından bulur"""
@@ -632,7 +1018,8 @@ class DatabaseManager:
                 JOIN production_logs pl ON o.id = pl.order_id
                 WHERE o.status = 'Tamamlandı' 
                 AND pl.action = 'Tamamlandi'
-                AND date(pl.timestamp) = date('now', 'localtime')
+                AND pl.timestamp >= date('now', 'localtime')
+                AND pl.timestamp < date('now', 'localtime', '+1 day')
             """
             result = conn.execute(query).fetchone()
             return result[0] if result else 0
@@ -646,6 +1033,7 @@ class DatabaseManager:
                     INSERT INTO plates (thickness, glass_type, width, height, quantity, location)
                     VALUES (?, ?, ?, ?, ?, ?)
                 """, (thickness, glass_type, width, height, quantity, location))
+                self._invalidate_cutting_cache(conn)
                 return True
             except Exception as e:
                 print(f"Plaka ekleme hatası: {e}")
@@ -679,6 +1067,7 @@ class DatabaseManager:
                         last_updated = CURRENT_TIMESTAMP
                     WHERE id = ?
                 """, (quantity_change, plate_id))
+                self._invalidate_cutting_cache(conn)
                 return True
             except Exception as e:
                 print(f"Plaka güncelleme hatası: {e}")
@@ -707,6 +1096,89 @@ class DatabaseManager:
                 ORDER BY thickness, glass_type
             """).fetchall()]
 
+    # --- ARTIK (REMNANT) YÖNETİMİ ---
+    def add_remnant(self, thickness, glass_type, width, height, location="", source_plate_id=None):
+        """Depoya artık parça ekle, yeni kaydın id'sini döndür"""
+        with self.get_connection() as conn:
+            try:
+                cursor = conn.execute("""
+                    INSERT INTO remnants (thickness, glass_type, width, height, location, source_plate_id)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, (thickness, glass_type, width, height, location, source_plate_id))
+                self._invalidate_cutting_cache(conn)
+                return cursor.lastrowid
+            except Exception as e:
+                print(f"Artık ekleme hatası: {e}")
+                return None
+
+    def get_available_remnants(self, thickness=None, glass_type=None):
+        """Stoktaki artıklar (isteğe bağlı kalınlık / tip filtresi)"""
+        query = "SELECT * FROM remnants WHERE status = 'Stokta'"
+        params = []
+        if thickness is not None:
+            query += " AND thickness = ?"
+            params.append(thickness)
+        if glass_type is not None:
+            query += " AND glass_type = ?"
+            params.append(glass_type)
+        with self.get_connection() as conn:
+            return [dict(r) for r in conn.execute(query + " ORDER BY width * height", params).fetchall()]
+
+    def apply_cutting_result(self, used_remnant_ids, plate_usage, new_remnants):
+        """
+        Kesim planını stoğa tek işlemde yansıt.
+        used_remnant_ids: kullanılan artık id'leri
+        plate_usage: {plate_id: adet} - plakalardan düşülecek
+        new_remnants: [(thickness, glass_type, width, height, location, source_plate_id), ...]
+        """
+        # Hata olursa get_connection tümünü geri alır (yarım kalmış kesim kaydı olmaz)
+        with self.get_connection() as conn:
+            conn.executemany("""
+                UPDATE remnants SET status = 'Kullanıldı', used_at = CURRENT_TIMESTAMP
+                WHERE id = ? AND status = 'Stokta'
+            """, [(rid,) for rid in used_remnant_ids])
+            conn.executemany("""
+                UPDATE plates SET quantity = MAX(quantity - ?, 0), last_updated = CURRENT_TIMESTAMP
+                WHERE id = ?
+            """, [(n, pid) for pid, n in plate_usage.items()])
+            conn.executemany("""
+                INSERT INTO remnants (thickness, glass_type, width, height, location, source_plate_id)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, new_remnants)
+            self._invalidate_cutting_cache(conn)
+        return True
+
+    # --- KESİM PLANI ÖNBELLEĞİ ---
+    CUTTING_CACHE_MAX_ENTRIES = 20
+
+    def get_cutting_plan_cache(self, fingerprint):
+        """Önbellekteki kesim planı (JSON metni) veya None"""
+        with self.get_connection() as conn:
+            row = conn.execute("SELECT payload FROM cutting_plan_cache WHERE fingerprint = ?", (fingerprint,)).fetchone()
+            return row[0] if row else None
+
+    def save_cutting_plan_cache(self, fingerprint, payload):
+        """Planı kaydet; en yeni CUTTING_CACHE_MAX_ENTRIES kayıt tutulur"""
+        with self.get_connection() as conn:
+            conn.execute("""
+                INSERT OR REPLACE INTO cutting_plan_cache (fingerprint, payload, created_at)
+                VALUES (?, ?, CURRENT_TIMESTAMP)
+            """, (fingerprint, payload))
+            conn.execute("""
+                DELETE FROM cutting_plan_cache WHERE fingerprint NOT IN (
+                    SELECT fingerprint FROM cutting_plan_cache ORDER BY created_at DESC, rowid DESC LIMIT ?
+                )
+            """, (self.CUTTING_CACHE_MAX_ENTRIES,))
+
+    def clear_cutting_plan_cache(self):
+        with self.get_connection() as conn:
+            self._invalidate_cutting_cache(conn)
+
+    def _invalidate_cutting_cache(self, conn):
+        """Plaka / artık / sipariş değişince kesim planları geçersiz (aynı işlem içinde)"""
+        try: conn.execute("DELETE FROM cutting_plan_cache")
+        except: pass
+
     # --- PROJE YÖNETİMİ ---
     def add_project(self, data):
         """Yeni proje ekle - data dictionary veya dict-like object alır"""
@@ -844,5 +1316,65 @@ class DatabaseManager:
             """).fetchone()
             return result[0] if result else 0
 
+    # --- TOPLU VERİ YÜKLEME (Aktarım / Test Verisi) ---
+    def add_orders_bulk(self, orders):
+        """
+        Çok sayıda siparişi tek işlemde ekle, eklenen id listesini sırayla döndür.
+        Anahtarlar add_new_order ile aynıdır; ek olarak status, created_at,
+        queue_position, rework_count, has_breakage, pallet_id kabul edilir.
+        Stok düşümü yapılmaz (geçmiş veri aktarımı içindir).
+        """
+        if not orders: return []
+        rows = [(
+            o['code'], o.get('customer'), o.get('product'), o.get('thickness'), o['quantity'],
+            o.get('date'), o.get('priority', 'Normal'), o.get('status', 'Beklemede'), o.get('route', ''),
+            o.get('total_m2') or 0, o.get('width', 0), o.get('height', 0), o.get('notes', ''),
+            o.get('project_id'), o.get('created_at') or datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            o.get('queue_position', 9999), o.get('rework_count', 0), o.get('has_breakage', 0), o.get('pallet_id')
+        ) for o in orders]
+
+        with self.get_connection() as conn:
+            conn.executemany("""
+                INSERT INTO orders (order_code, customer_name, product_type, thickness, quantity,
+                                   delivery_date, priority, status, route, declared_total_m2, width, height,
+                                   notes, project_id, created_at, queue_position, rework_count, has_breakage, pallet_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+            # Tek işlem içinde AUTOINCREMENT id'leri ardışıktır
+            last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+            return list(range(last_id - len(rows) + 1, last_id + 1))
+
+    def add_production_logs_bulk(self, logs):
+        """Üretim loglarını toplu ekle: (order_id, station_name, action, quantity, operator_name, timestamp)"""
+        if not logs: return 0
+        with self.get_connection() as conn:
+            conn.executemany("""
+                INSERT INTO production_logs (order_id, station_name, action, quantity, operator_name, timestamp)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, logs)
+            return len(logs)
+
+    def add_pallets_bulk(self, pallets):
+        """Paletleri toplu ekle: (pallet_name, customer_name, created_at, status). Id listesi döndürür."""
+        if not pallets: return []
+        with self.get_connection() as conn:
+            conn.executemany("""
+                INSERT INTO shipments (pallet_name, customer_name, created_at, status)
+                VALUES (?, ?, ?, ?)
+            """, pallets)
+            last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+            return list(range(last_id - len(pallets) + 1, last_id + 1))
+
 # Global instance
-db = DatabaseManager()
\ No newline at end of file
+# ROTA_DB_PATH tanımlıysa varsayılan efes_factory.db yerine o dosya açılır (plan_cli --db, testler).
+# ROTA_DB_SERVICE_URL tanımlıysa metotlar veritabanı servisine gider (bkz. core/db_service.py);
+# serviste olmayanlar ve ham get_connection() kullanan ekranlar yerel dosyayı kullanmaya devam eder
+# (yerel DatabaseManager ilk böyle erişimde kurulur, açılışta paylaşımdaki dosyaya dokunulmaz)
+DEFAULT_DB_NAME = os.environ.get("ROTA_DB_PATH") or "efes_factory.db"
+
+if os.environ.get("ROTA_DB_SERVICE_URL"):
+    from core.db_service import DatabaseClient
+    db = DatabaseClient(os.environ["ROTA_DB_SERVICE_URL"],
+                        fallback_factory=lambda db_name=DEFAULT_DB_NAME: DatabaseManager(db_name))
+else:
+    db = DatabaseManager(DEFAULT_DB_NAME)
\ No newline at end of file
@@ -0,0 +1,457 @@
+"""
+EFES ROTA X - Veritabanı Servisi (HTTP/JSON)
+Birden çok PC'nin aynı SQLite dosyasını ağ paylaşımından açması yerine, dosyanın
+bulunduğu makinede tek bir servis süreci çalışır; istemciler DatabaseManager
+metotlarını aynı adlarla HTTP üzerinden çağırır.
+
+Çalışma şekli:
+- Sunucu: ThreadingHTTPServer, istek başına bir thread. Bağlantılar havuzdan
+  alınır (PooledDatabaseManager), her çağrıda yeni dosya açılmaz.
+- Okuma yanıtları önbellekte tutulur; anahtar (metot, argümanlar) + data_versions
+  sayaçlarıdır. orders / production_logs değişince sayaç artar, eski yanıt
+  kendiliğinden geçersiz olur (zaman aşımı yok).
+- İstemci (DatabaseClient): bilinen metotları POST /rpc/<metot> ile çağırır,
+  thread başına kalıcı (keep-alive) bağlantı kullanır. Servise ulaşılamazsa
+  sqlite3.OperationalError türevi hata verir; okutma kuyruğu bunu çevrimdışı sayar.
+  Kopan keep-alive bağlantıda yalnız okumalar ve event_uuid taşıyan olaylar
+  kendiliğinden yeniden gönderilir; diğer yazmalar iki kez uygulanmasın diye hata verir.
+  Serviste olmayan metotlar (ve get_connection ile ham SQL yazan ekranlar)
+  fallback ile verilen yerel DatabaseManager'a gider. fallback_factory verilirse
+  yerel DatabaseManager ilk böyle erişimde kurulur: yalnız servis metotlarını
+  kullanan istemci açılışta paylaşımdaki dosyaya dokunmaz.
+
+Ayarlar (ortam değişkenleri):
+    ROTA_DB_SERVICE_URL=http://127.0.0.1:8765   Tanımlıysa core.db_manager.db servisi kullanır
+    ROTA_DB_SERVICE_TOKEN=...                   Tanımlıysa istekler X-Rota-Token ile doğrulanır
+                                                (127.0.0.1 dışındaki adreste zorunlu)
+
+Kullanım:
+    python -m core.db_service                                    # 127.0.0.1:8765, efes_factory.db
+    ROTA_DB_SERVICE_TOKEN=gizli python -m core.db_service --db D:/efes/efes_factory.db --host 0.0.0.0 --port 8765
+
+    from core.db_service import DatabaseClient
+    client = DatabaseClient("http://127.0.0.1:8765")
+    client.get_dashboard_stats()
+"""
+
+import argparse
+import hmac
+import http.client
+import ipaddress
+import json
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from core.db_manager import DatabaseManager
+
+try:
+    from core.query_tracer import query_tracer
+except ImportError:
+    query_tracer = None
+
+try:
+    from core.logger import logger
+    LOGGER_AVAILABLE = True
+except ImportError:
+    LOGGER_AVAILABLE = False
+
+
+DEFAULT_PORT = 8765
+
+# Yalnız orders / production_logs okuyan metotlar: data_versions ile önbelleklenir
+CACHED_METHODS = frozenset({
+    "get_orders_by_status", "get_all_orders", "get_order_by_code",
+    "get_production_matrix_advanced", "get_dashboard_stats",
+    "get_station_progress", "get_station_progress_map",
+    "get_completed_stations_list", "get_completed_stations_map",
+    "get_system_logs", "find_completed_orders",
+})
+
+# Başka tablolara da bakan (kapasite, proje) ya da güne bağlı okumalar: her seferinde sorgulanır
+READ_METHODS = frozenset({
+    "get_station_loads", "get_dashboard_snapshot", "get_today_completed_count",
+    "get_all_capacities", "get_data_versions",
+})
+
+WRITE_METHODS = frozenset({
+    "add_new_order", "update_order_status", "update_all_order_statuses",
+    "record_production_event", "record_production_events",
+    "register_production", "complete_station_process", "report_fire",
+})
+
+SERVICE_METHODS = CACHED_METHODS | READ_METHODS | WRITE_METHODS
+
+
+def _retry_safe(method, args, kwargs):
+    """
+    Kopan keep-alive bağlantıda istek sunucuda uygulanmış olabilir: yalnız okumalar
+    ve event_uuid taşıyan (tekrarında ikinci kez yazılmayan) olaylar yeniden gönderilir.
+    """
+    if method in CACHED_METHODS or method in READ_METHODS:
+        return True
+    if method == "report_fire":
+        return bool(kwargs.get("event_uuid") or (args[4] if len(args) > 4 else None))
+    if method == "record_production_events":
+        events = args[0] if args else kwargs.get("events")
+        return bool(events) and all(event.get("event_uuid") for event in events)
+    return False
+
+
+class DatabaseServiceError(Exception):
+    """Serviste çalışan metot hata verdi"""
+
+
+class ServiceUnavailableError(sqlite3.OperationalError):
+    """Servise ulaşılamadı / veritabanı kilitli (geçici: tekrar denenebilir)"""
+
+
+# === JSON ===
+# JSON nesne anahtarları yalnız metin olabilir; {order_id: ...} gibi sözlükler
+# {"__map__": [[anahtar, değer], ...]} olarak taşınır ve istemcide geri çevrilir.
+
+def _to_json(value):
+    if isinstance(value, dict):
+        if all(isinstance(k, str) for k in value):
+            return {k: _to_json(v) for k, v in value.items()}
+        return {"__map__": [[k, _to_json(v)] for k, v in value.items()]}
+    if isinstance(value, (list, tuple)):
+        return [_to_json(v) for v in value]
+    if isinstance(value, sqlite3.Row):
+        return {k: value[k] for k in value.keys()}
+    return value
+
+
+def _from_json(obj):
+    if len(obj) == 1 and "__map__" in obj:
+        return {k: v for k, v in obj["__map__"]}
+    return obj
+
+
+def dumps(value):
+    return json.dumps(_to_json(value), ensure_ascii=False, default=str).encode("utf-8")
+
+
+def loads(data):
+    return json.loads(data.decode("utf-8"), object_hook=_from_json)
+
+
+# === SUNUCU ===
+
+class PooledDatabaseManager(DatabaseManager):
+    """Bağlantıları yeniden kullanan DatabaseManager (servis süreci için)"""
+
+    def __init__(self, db_name="efes_factory.db", pool_size=8):
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+        super().__init__(db_name)
+
+    def _connect(self):
+        factory = query_tracer.connection_factory() if query_tracer else sqlite3.Connection
+        conn = sqlite3.connect(self.db_path, factory=factory, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @contextmanager
+    def get_connection(self, immediate=False):
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        try:
+            if immediate:
+                conn.execute("BEGIN IMMEDIATE")
+            yield conn
+            conn.commit()
+        except Exception as e:
+            try: conn.rollback()
+            except sqlite3.Error: pass
+            print(f"❌ Veritabanı Hatası: {e}")
+            if LOGGER_AVAILABLE:
+                logger.error(f"Veritabanı Hatası: {e}")
+            raise e
+        finally:
+            try:
+                self._pool.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+    def close_all(self):
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class ResponseCache:
+    """Serileştirilmiş okuma yanıtları: (metot, argümanlar) -> (sürümler, JSON)"""
+
+    MAX_ENTRIES = 256
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, versions):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == versions:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def put(self, key, versions, payload):
+        with self._lock:
+            self._entries[key] = (versions, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.MAX_ENTRIES:
+                self._entries.popitem(last=False)
+
+
+class DatabaseService:
+    """Metot çağrısı → JSON yanıtı (önbellek + bağlantı havuzu)"""
+
+    def __init__(self, manager, token=None):
+        self.db = manager
+        self.token = token
+        self.cache = ResponseCache()
+        self.calls = 0
+
+    def call(self, method, args=(), kwargs=None):
+        """Döner: {"result": ...} JSON baytları"""
+        kwargs = kwargs or {}
+        self.calls += 1
+        if method in CACHED_METHODS:
+            key = json.dumps([method, args, kwargs], sort_keys=True, default=str)
+            versions = tuple(sorted(self.db.get_data_versions().items()))
+            payload = self.cache.get(key, versions)
+            if payload is None:
+                payload = dumps({"result": getattr(self.db, method)(*args, **kwargs)})
+                self.cache.put(key, versions, payload)
+            return payload
+        return dumps({"result": getattr(self.db, method)(*args, **kwargs)})
+
+    def health(self):
+        return {
+            "status": "ok",
+            "db": self.db.db_path,
+            "calls": self.calls,
+            "cache": {"hits": self.cache.hits, "misses": self.cache.misses},
+            "versions": self.db.get_data_versions(),
+        }
+
+
+class ServiceRequestHandler(BaseHTTPRequestHandler):
+    """POST /rpc/<metot> {"args": [...], "kwargs": {...}}  |  GET /health"""
+
+    protocol_version = "HTTP/1.1"       # Keep-alive: istemci bağlantıyı yeniden kullanır
+    disable_nagle_algorithm = True      # Başlık + gövde ayrı yazılınca gecikmeli ACK ile ~40 ms beklenmesin
+
+    def _send(self, status, payload):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _authorized(self):
+        token = self.server.service.token
+        return not token or hmac.compare_digest(self.headers.get("X-Rota-Token", "").encode(), token.encode())
+
+    def do_GET(self):
+        if not self._authorized():
+            return self._send(401, dumps({"error": "Yetkisiz", "type": "PermissionError"}))
+        if self.path != "/health":
+            return self._send(404, dumps({"error": f"Bilinmeyen adres: {self.path}", "type": "LookupError"}))
+        self._send(200, dumps(self.server.service.health()))
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if not self._authorized():
+            return self._send(401, dumps({"error": "Yetkisiz", "type": "PermissionError"}))
+
+        method = self.path[len("/rpc/"):] if self.path.startswith("/rpc/") else ""
+        if method not in SERVICE_METHODS:
+            return self._send(404, dumps({"error": f"Serviste olmayan metot: {method}", "type": "AttributeError"}))
+        try:
+            request = loads(body) if body else {}
+        except ValueError as e:
+            return self._send(400, dumps({"error": f"Geçersiz JSON: {e}", "type": "ValueError"}))
+
+        try:
+            payload = self.server.service.call(method, request.get("args", []), request.get("kwargs", {}))
+        except Exception as e:
+            return self._send(500, dumps({"error": str(e), "type": type(e).__name__}))
+        self._send(200, payload)
+
+    def log_message(self, format, *args):
+        pass                            # İstek başına satır basma (yüksek trafik)
+
+
+def _is_loopback(host):
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def start_service(db_path=None, host="127.0.0.1", port=DEFAULT_PORT, pool_size=8, token=None):
+    """
+    Servisi arka plan thread'inde başlat. Döner: sunucu (server.server_address, server.shutdown())
+    Yazma metotları ağa doğrulamasız açılmasın: loopback dışı adres token ister (PermissionError).
+    """
+    if not token and not _is_loopback(host):
+        raise PermissionError(f"{host} adresinde servis için ROTA_DB_SERVICE_TOKEN tanımlanmalı")
+    manager = PooledDatabaseManager(os.path.abspath(db_path) if db_path else "efes_factory.db", pool_size)
+    server = ThreadingHTTPServer((host, port), ServiceRequestHandler)
+    server.daemon_threads = True
+    server.service = DatabaseService(manager, token)
+    threading.Thread(target=server.serve_forever, name="DatabaseService", daemon=True).start()
+    return server
+
+
+# === İSTEMCİ ===
+
+class DatabaseClient:
+    """
+    DatabaseManager ile aynı metot adları, çağrılar servise gider.
+    Serviste olmayan öznitelikler fallback (yerel DatabaseManager) varsa ona yönlendirilir;
+    fallback_factory (ör. DatabaseManager sınıfı) verilirse fallback ilk gerektiğinde kurulur.
+    """
+
+    def __init__(self, base_url, fallback=None, timeout=10.0, token=None, fallback_factory=None):
+        parts = urlsplit(base_url if "//" in base_url else f"http://{base_url}")
+        self.base_url = base_url
+        self.host = parts.hostname or "127.0.0.1"
+        self.port = parts.port or DEFAULT_PORT
+        self.timeout = timeout
+        self.token = token if token is not None else os.environ.get("ROTA_DB_SERVICE_TOKEN")
+        self._fallback = fallback
+        self._fallback_factory = fallback_factory
+        self._fallback_path = None      # fallback kurulmadan atanan db_path
+        self._fallback_lock = threading.Lock()
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            self._local.conn = conn
+            self._local.reused = False
+        return conn
+
+    def _drop_connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+        self._local.conn = None
+
+    def _request(self, verb, path, body=None, retry=True):
+        headers = {"Content-Type": "application/json"}
+        if self.token:
+            headers["X-Rota-Token"] = self.token
+        while True:
+            conn = self._connection()
+            reused = self._local.reused
+            try:
+                conn.request(verb, path, body, headers)
+                response = conn.getresponse()
+                data = response.read()
+                self._local.reused = True
+                return response.status, loads(data)
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError) as e:
+                # Sunucunun kapattığı keep-alive bağlantı: tekrarı güvenliyse bir kez yeni bağlantıyla dene
+                self._drop_connection()
+                if not reused or not retry:
+                    raise ServiceUnavailableError(f"Veritabanı servisine ulaşılamadı ({self.base_url}): {e}") from e
+            except (OSError, http.client.HTTPException) as e:
+                self._drop_connection()
+                raise ServiceUnavailableError(f"Veritabanı servisine ulaşılamadı ({self.base_url}): {e}") from e
+
+    def call(self, method, *args, **kwargs):
+        status, payload = self._request("POST", f"/rpc/{method}", dumps({"args": args, "kwargs": kwargs}),
+                                        retry=_retry_safe(method, args, kwargs))
+        if status == 200:
+            return payload["result"]
+        if payload.get("type") == "OperationalError":
+            raise ServiceUnavailableError(payload.get("error"))
+        raise DatabaseServiceError(f"{method}: {payload.get('error')}")
+
+    def health(self):
+        return self._request("GET", "/health")[1]
+
+    @property
+    def fallback(self):
+        """Yerel DatabaseManager (fallback_factory ile ilk erişimde kurulur) veya None"""
+        if self._fallback is None and self._fallback_factory is not None:
+            with self._fallback_lock:
+                if self._fallback is None:
+                    args = (self._fallback_path,) if self._fallback_path else ()
+                    self._fallback = self._fallback_factory(*args)
+        return self._fallback
+
+    @property
+    def db_path(self):
+        fallback = self.fallback
+        return fallback.db_path if fallback is not None else self.base_url
+
+    @db_path.setter
+    def db_path(self, path):
+        if self._fallback is not None:
+            self._fallback.db_path = path
+        elif self._fallback_factory is not None:
+            self._fallback_path = path      # Kurulunca bu dosyayla açılır
+        else:
+            raise AttributeError("db_path: fallback olmadan servis istemcisinde değiştirilemez")
+
+    def __getattr__(self, name):
+        if name in SERVICE_METHODS:
+            return partial(self.call, name)
+        if name.startswith("_"):
+            raise AttributeError(name)
+        fallback = self.fallback
+        if fallback is None:
+            raise AttributeError(name)
+        return getattr(fallback, name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EFES ROTA veritabanı servisi (HTTP/JSON)")
+    parser.add_argument('--db', help="Veritabanı dosyası (varsayılan: efes_factory.db)")
+    parser.add_argument('--host', default="127.0.0.1", help="Dinlenecek adres (ağ için 0.0.0.0)")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--pool', type=int, default=8, help="Bağlantı havuzu boyutu")
+    args = parser.parse_args()
+
+    try:
+        server = start_service(args.db, args.host, args.port, args.pool, os.environ.get("ROTA_DB_SERVICE_TOKEN"))
+    except PermissionError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+    host, port = server.server_address[:2]
+    print(f"🗄️  EFES ROTA veritabanı servisi: http://{host}:{port}  ({server.service.db.db_path})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+        server.service.db.close_all()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,712 @@
+"""
+EFES ROTA X - Karar Destek Motoru (arayuzsuz)
+DecisionView'in hesap katmani: istasyon kuyruklari, Critical Ratio, alternatif
+rota ve firin / batch onerileri. PySide6 gerektirmez; ekran ve komut satiri
+(plan_cli.py) ayni motoru kullanir.
+
+Kullanim:
+    from core.decision_engine import SmartRecommendationEngine
+    engine = SmartRecommendationEngine()
+    engine.prepare(orders)                          # Tek DB gecisi
+    cr, status = engine.cr_calculator.calculate_cr(order)
+    recommendations = engine.analyze(orders)
+"""
+
+from datetime import datetime, timedelta
+from collections import defaultdict
+
+try:
+    from core.db_manager import db
+    from core.smart_planner import planner
+except ImportError:
+    db = None
+    planner = None
+
+try:
+    from core.furnace_batcher import furnace_batcher
+except ImportError:
+    furnace_batcher = None
+
+try:
+    from core.factory_config import factory_config
+except ImportError:
+    factory_config = None
+
+from core.scheduler import MINUTES_PER_DAY     # Ayar dakikasini gune cevirmek icin
+
+
+# Istasyon durum renkleri (ekrandaki istasyon cubuklari)
+STATUS_COLORS = {
+    "idle": "#4CAF50",      # Bos
+    "normal": "#2196F3",    # Normal
+    "busy": "#FF9800",      # Yogun
+    "overload": "#F44336",  # Asiri yuk
+}
+
+
+# =============================================================================
+# FABRIKA YAPISI VE KURALLARI
+# =============================================================================
+class FactoryConfig:
+    """Cam fabrikasi yapilandirmasi"""
+    
+    # Istasyon gruplari
+    STATION_GROUPS = {
+        "KESIM": ["INTERMAC", "LIVA KESIM", "LAMINE KESIM"],
+        "ISLEME": ["CNC RODAJ", "DOUBLEDGER", "ZIMPARA"],
+        "YUZEY": ["TESIR A1", "TESIR B1", "TESIR B1-1", "TESIR B1-2", "DELIK", "OYGU"],
+        "TEMPER": ["TEMPER A1", "TEMPER B1", "TEMPER BOMBE"],
+        "BIRLESTIRME": ["LAMINE A1", "ISICAM B1"],
+        "SEVKIYAT": ["SEVKIYAT"]
+    }
+    
+    # Alternatif istasyonlar (ayni isi yapabilenler)
+    ALTERNATIVE_STATIONS = {
+        "INTERMAC": ["LIVA KESIM"],
+        "LIVA KESIM": ["INTERMAC"],
+        "TEMPER A1": ["TEMPER B1"],
+        "TEMPER B1": ["TEMPER A1"],
+        "TESIR A1": ["TESIR B1", "TESIR B1-1", "TESIR B1-2"],
+        "TESIR B1": ["TESIR A1", "TESIR B1-1", "TESIR B1-2"],
+        "TESIR B1-1": ["TESIR A1", "TESIR B1", "TESIR B1-2"],
+        "TESIR B1-2": ["TESIR A1", "TESIR B1", "TESIR B1-1"],
+    }
+    
+    # Gunluk kapasiteler (m2/gun)
+    DEFAULT_CAPACITIES = {
+        "INTERMAC": 800, "LIVA KESIM": 800, "LAMINE KESIM": 600,
+        "CNC RODAJ": 100, "DOUBLEDGER": 400, "ZIMPARA": 300,
+        "TESIR A1": 400, "TESIR B1": 400, "TESIR B1-1": 400, "TESIR B1-2": 400,
+        "DELIK": 200, "OYGU": 200,
+        "TEMPER A1": 550, "TEMPER B1": 750, "TEMPER BOMBE": 300,
+        "LAMINE A1": 250, "ISICAM B1": 500, "SEVKIYAT": 5000
+    }
+    
+    # Istasyon sirasi (uretim akisi)
+    STATION_ORDER = [
+        "INTERMAC", "LIVA KESIM", "LAMINE KESIM",
+        "CNC RODAJ", "DOUBLEDGER", "ZIMPARA",
+        "TESIR A1", "TESIR B1", "TESIR B1-1", "TESIR B1-2", "DELIK", "OYGU",
+        "TEMPER A1", "TEMPER B1", "TEMPER BOMBE",
+        "LAMINE A1", "ISICAM B1",
+        "SEVKIYAT"
+    ]
+    
+    # Batch islemleri icin istasyonlar (kalinlik bazli gruplama)
+    BATCH_STATIONS = ["TEMPER A1", "TEMPER B1", "TEMPER BOMBE"]
+    
+    @classmethod
+    def get_station_group(cls, station_name):
+        for group, stations in cls.STATION_GROUPS.items():
+            if station_name in stations:
+                return group
+        return None
+    
+    @classmethod
+    def get_alternatives(cls, station_name):
+        return cls.ALTERNATIVE_STATIONS.get(station_name, [])
+    
+    @classmethod
+    def is_cutting_station(cls, station_name):
+        return station_name in cls.STATION_GROUPS.get("KESIM", [])
+
+
+# =============================================================================
+# SIPARIS ILERLEME GORUNTUSU (Yukleme basina tek DB gecisi)
+# =============================================================================
+class OrderProgressSnapshot:
+    """
+    load_orders() basina bir kez olusturulan ilerleme goruntusu.
+    Tamamlanmis istasyonlar tek sorguda cekilir; kalan sure ve mevcut istasyon
+    ilk istekte hesaplanip saklanir. Tablo yenileme ve siralama DB'ye gitmez.
+    """
+
+    def __init__(self, completed_map=None):
+        self.completed = completed_map or {}   # order_id -> [istasyon]
+        self.remaining_days = {}               # order_id -> gun (kuyruk yukune bagli)
+        self.current_station = {}              # order_id -> istasyon / None
+
+    @classmethod
+    def from_orders(cls, orders):
+        """Siparislerin ilerlemesini tek seferde cek"""
+        completed_map = {}
+        if db:
+            try:
+                completed_map = db.get_completed_stations_map([o['id'] for o in orders])
+            except:
+                pass
+        return cls(completed_map)
+
+    def covers(self, orders):
+        """Tum siparisler bu goruntude var mi?"""
+        return all(o['id'] in self.completed for o in orders)
+
+    def get_completed(self, order):
+        """Tamamlanmis istasyonlar (goruntude yoksa None)"""
+        return self.completed.get(order['id'])
+
+    def invalidate_loads(self):
+        """Kuyruk yukleri degisti: yuke bagli kalan sureleri unut"""
+        self.remaining_days.clear()
+
+
+def get_completed_stations(order, snapshot=None):
+    """Goruntuden oku, yoksa tek siparis icin DB'ye sor"""
+    if snapshot is not None:
+        completed = snapshot.get_completed(order)
+        if completed is not None:
+            return completed
+    if db:
+        try:
+            return db.get_completed_stations_list(order['id'])
+        except:
+            pass
+    return []
+
+
+# =============================================================================
+# ISTASYON KUYRUK YONETICISI
+# =============================================================================
+class StationQueueManager:
+    """Her istasyon icin kuyruk yonetimi"""
+    
+    def __init__(self):
+        self.capacities = FactoryConfig.DEFAULT_CAPACITIES.copy()
+        self.queues = defaultdict(list)  # station -> [orders]
+        self.loads = defaultdict(float)   # station -> total m2
+        self.setup_days = defaultdict(float)  # station -> kuyruk sirasindaki ayar suresi (gun)
+        self.snapshot = None              # OrderProgressSnapshot
+        
+        if db:
+            try:
+                self.capacities = db.get_all_capacities()
+                # Planlayici ogrenilmis kapasite kullaniyorsa kuyruk suresi de ona gore
+                if planner and planner.USE_LEARNED_CAPACITIES:
+                    self.capacities = planner.get_planning_capacities()
+            except:
+                pass
+    
+    def build_queues(self, orders):
+        """Siparislerden istasyon kuyruklarini olustur"""
+        self.queues = defaultdict(list)
+        self.loads = defaultdict(float)
+        self.setup_days = defaultdict(float)
+        if self.snapshot is not None:
+            self.snapshot.invalidate_loads()
+        
+        for order in orders:
+            route = order.get('route', '')
+            m2 = order.get('declared_total_m2', 0)
+            
+            if not route:
+                continue
+            
+            # Tamamlanmis istasyonlari al
+            completed = get_completed_stations(order, self.snapshot)
+            
+            # Rotadaki her istasyon icin
+            for station in route.split(','):
+                station = station.strip()
+                if station and station not in completed:
+                    self.queues[station].append(order)
+                    self.loads[station] += m2
+        
+        self._charge_changeovers()
+    
+    def _charge_changeovers(self):
+        """Kuyruk sirasinda kalinlik / urun degisimlerinin ayar suresini hesapla"""
+        if not factory_config:
+            return
+        for station, queue in self.queues.items():
+            minutes = 0
+            prev = None
+            for order in queue:
+                cls = (order.get('thickness'), order.get('product_type'))
+                minutes += factory_config.get_changeover_minutes(station, prev, cls)
+                prev = cls
+            self.setup_days[station] = minutes / MINUTES_PER_DAY
+    
+    def get_station_status(self, station_name):
+        """Istasyon durumunu dondur"""
+        cap = self.capacities.get(station_name, 500)
+        load = self.loads.get(station_name, 0)
+        queue_count = len(self.queues.get(station_name, []))
+        
+        if cap <= 0:
+            cap = 500
+        
+        # Ayar suresi de kuyrugu uzatir (kapasite harcar, m2 uretmez)
+        setup_days = self.setup_days.get(station_name, 0)
+        ratio = load / cap + setup_days
+        queue_days = ratio
+        
+        if load == 0:
+            status = "idle"
+            color = STATUS_COLORS["idle"]
+        elif ratio <= 1:
+            status = "normal"
+            color = STATUS_COLORS["normal"]
+        elif ratio <= 2:
+            status = "busy"
+            color = STATUS_COLORS["busy"]
+        else:
+            status = "overload"
+            color = STATUS_COLORS["overload"]
+        
+        return {
+            "station": station_name,
+            "load_m2": load,
+            "capacity": cap,
+            "ratio": ratio,
+            "queue_days": queue_days,
+            "setup_days": setup_days,
+            "queue_count": queue_count,
+            "status": status,
+            "color": color
+        }
+    
+    def get_all_station_statuses(self):
+        """Tum istasyonlarin durumunu dondur"""
+        statuses = []
+        for station in FactoryConfig.STATION_ORDER:
+            statuses.append(self.get_station_status(station))
+        return statuses
+    
+    def get_idle_stations(self):
+        """Bos istasyonlari dondur"""
+        idle = []
+        for station in FactoryConfig.STATION_ORDER:
+            if station == "SEVKIYAT":
+                continue
+            status = self.get_station_status(station)
+            if status['status'] == 'idle':
+                idle.append(station)
+        return idle
+    
+    def get_bottlenecks(self):
+        """Darbogaz istasyonlari dondur"""
+        bottlenecks = []
+        for station in FactoryConfig.STATION_ORDER:
+            status = self.get_station_status(station)
+            if status['ratio'] > 2:  # 2 gunluk kuyruktan fazla
+                bottlenecks.append(status)
+        return sorted(bottlenecks, key=lambda x: x['ratio'], reverse=True)
+
+
+# =============================================================================
+# CRITICAL RATIO HESAPLAYICI
+# =============================================================================
+class CriticalRatioCalculator:
+    """
+    Critical Ratio (CR) = (Teslim Tarihi - Bugun) / Kalan Islem Suresi
+    
+    CR < 1.0: Gecikme riski (oncelikli)
+    CR = 1.0: Tam zamaninda
+    CR > 1.0: Guvenli
+    
+    Stokastik mod (set_risk): kalan sure, Monte Carlo sonucunun RISK_QUANTILE
+    yuzdeligindeki bitis gunudur (nominal kuyruk tahmini yerine).
+    """
+    
+    RISK_QUANTILE = 0.9
+    
+    def __init__(self, queue_manager):
+        self.queue_manager = queue_manager
+        self.snapshot = None
+        self.risk = None                  # RiskResult (stokastik mod)
+    
+    def set_risk(self, risk):
+        """Monte Carlo sonucunu kullan (None: nominal moda don)"""
+        self.risk = risk
+    
+    def calculate_remaining_time(self, order):
+        """Kalan islem suresini gun olarak hesapla"""
+        risk = self.risk
+        if risk is not None and order.get('order_code') in risk:
+            return max(risk.quantile(order['order_code'], self.RISK_QUANTILE), 0.1)
+        
+        snapshot = self.snapshot
+        if snapshot is not None and order['id'] in snapshot.remaining_days:
+            return snapshot.remaining_days[order['id']]
+        
+        route = order.get('route', '')
+        m2 = order.get('declared_total_m2', 0)
+        
+        if not route or m2 <= 0:
+            return 0
+        
+        # Tamamlanmis istasyonlar
+        completed = get_completed_stations(order, self.snapshot)
+        
+        total_days = 0
+        capacities = self.queue_manager.capacities
+        
+        for station in route.split(','):
+            station = station.strip()
+            if station and station not in completed:
+                cap = capacities.get(station, 500)
+                if cap > 0:
+                    # Kuyruk bekleme suresi (ayarlar dahil) + islem suresi
+                    queue_load = self.queue_manager.loads.get(station, 0)
+                    queue_wait = queue_load / cap + self.queue_manager.setup_days.get(station, 0)
+                    process_time = m2 / cap
+                    total_days += queue_wait + process_time
+        
+        total_days = max(total_days, 0.1)  # Minimum 0.1 gun
+        if snapshot is not None:
+            snapshot.remaining_days[order['id']] = total_days
+        return total_days
+    
+    def calculate_cr(self, order):
+        """Critical Ratio hesapla"""
+        delivery_str = order.get('delivery_date', '')
+        
+        if not delivery_str:
+            return None, "unknown"
+        
+        try:
+            delivery_date = datetime.strptime(delivery_str, '%Y-%m-%d')
+            today = datetime.now()
+            
+            # Kalan gun
+            days_until_due = (delivery_date - today).days
+            
+            # Kalan islem suresi
+            remaining_time = self.calculate_remaining_time(order)
+            
+            if remaining_time <= 0:
+                remaining_time = 0.1
+            
+            cr = days_until_due / remaining_time
+            
+            # Durum belirleme
+            if cr < 0:
+                status = "late"  # Zaten gecmis
+            elif cr < 0.8:
+                status = "critical"  # Kritik gecikme riski
+            elif cr < 1.0:
+                status = "risk"  # Risk altinda
+            elif cr < 1.5:
+                status = "tight"  # Sikisik ama yapilabilir
+            else:
+                status = "safe"  # Guvenli
+            
+            return round(cr, 2), status
+            
+        except:
+            return None, "unknown"
+    
+    def estimate_completion_date(self, order, queue_position, all_orders):
+        """Tahmini tamamlanma tarihi"""
+        remaining_days = self.calculate_remaining_time(order)
+        completion_date = datetime.now() + timedelta(days=remaining_days)
+        return completion_date, remaining_days
+
+
+# =============================================================================
+# ALTERNATIF ROTA OPTIMIZER
+# =============================================================================
+class AlternativeRouteOptimizer:
+    """Alternatif rota ve istasyon onerileri"""
+    
+    def __init__(self, queue_manager):
+        self.queue_manager = queue_manager
+        self.snapshot = None
+    
+    def find_alternative_routes(self, order):
+        """Siparis icin alternatif rota onerileri"""
+        suggestions = []
+        route = order.get('route', '')
+        
+        if not route:
+            return suggestions
+        
+        # Tamamlanmis istasyonlar
+        completed = get_completed_stations(order, self.snapshot)
+        
+        for station in route.split(','):
+            station = station.strip()
+            if not station or station in completed:
+                continue
+            
+            # Mevcut istasyon durumu
+            current_status = self.queue_manager.get_station_status(station)
+            
+            # Alternatif istasyonlar
+            alternatives = FactoryConfig.get_alternatives(station)
+            
+            for alt in alternatives:
+                alt_status = self.queue_manager.get_station_status(alt)
+                
+                # Alternatif daha bossa oner
+                if alt_status['ratio'] < current_status['ratio'] - 0.5:
+                    time_saved = current_status['queue_days'] - alt_status['queue_days']
+                    suggestions.append({
+                        "order_code": order['order_code'],
+                        "current_station": station,
+                        "alternative_station": alt,
+                        "current_queue_days": round(current_status['queue_days'], 1),
+                        "alt_queue_days": round(alt_status['queue_days'], 1),
+                        "time_saved_days": round(time_saved, 1),
+                        "message": f"{order['order_code']}: {station} yerine {alt} kullanilabilir ({time_saved:.1f} gun kazanc)"
+                    })
+        
+        return suggestions
+
+
+# =============================================================================
+# BATCH OPTIMIZER (Kalinlik Bazli Gruplama)
+# =============================================================================
+class BatchOptimizer:
+    """Temper icin firin yuku (yoksa kalinlik bazli gruplama) onerileri"""
+    
+    MAX_LOADS_PER_STATION = 3   # Istasyon basina gosterilecek en yakin yuk sayisi
+    
+    def __init__(self, queue_manager):
+        self.queue_manager = queue_manager
+        self.snapshot = None
+    
+    def find_batch_opportunities(self, orders):
+        """Batch firsatlarini bul"""
+        if furnace_batcher and furnace_batcher.get_furnaces():
+            return self.find_furnace_loads(orders)
+        
+        suggestions = []
+        
+        # Temper bekleyen siparisleri kalinliga gore grupla
+        thickness_groups = defaultdict(list)
+        
+        for order in orders:
+            route = order.get('route', '')
+            thickness = order.get('thickness', 0)
+            
+            # Temper istasyonu rotada var mi?
+            has_temper = any(st in route for st in FactoryConfig.BATCH_STATIONS)
+            
+            if has_temper and thickness:
+                # Tamamlanmis istasyonlar
+                completed = get_completed_stations(order, self.snapshot)
+                
+                # Temper henuz yapilmamissa
+                temper_pending = any(
+                    st in route and st not in completed 
+                    for st in FactoryConfig.BATCH_STATIONS
+                )
+                
+                if temper_pending:
+                    thickness_groups[thickness].append(order)
+        
+        # 2'den fazla siparis olan gruplari oner
+        for thickness, group_orders in thickness_groups.items():
+            if len(group_orders) >= 2:
+                total_m2 = sum(o.get('declared_total_m2', 0) for o in group_orders)
+                order_codes = [o['order_code'] for o in group_orders[:5]]
+                
+                suggestions.append({
+                    "type": "batch",
+                    "thickness": thickness,
+                    "count": len(group_orders),
+                    "total_m2": round(total_m2, 1),
+                    "orders": order_codes,
+                    "message": f"Temper Batch: {len(group_orders)} siparis {thickness}mm kalinlikta ({total_m2:.0f} m2). Birlikte islenmeli."
+                })
+        
+        return suggestions
+    
+    def find_furnace_loads(self, orders):
+        """Bekleyen parcalari firin yuklerine yerlestir, birden cok siparisli ilk yukleri oner"""
+        # Tamamlanan istasyonlar goruntuden; yarim kalan ilerleme yok sayilir
+        progress = {}
+        for order in orders:
+            completed = get_completed_stations(order, self.snapshot)
+            progress[order['id']] = {st: order.get('quantity', 0) for st in completed}
+        
+        plan = furnace_batcher.plan(orders, progress)
+        codes = {o['id']: o['order_code'] for o in orders}
+        
+        suggestions = []
+        for station, loads in plan.loads.items():
+            shown = 0
+            for no, load in enumerate(loads, 1):
+                if shown >= self.MAX_LOADS_PER_STATION:
+                    break
+                order_ids = load.order_ids
+                if len(order_ids) < 2:
+                    continue
+                shown += 1
+                order_codes = [codes.get(oid, str(oid)) for oid in order_ids]
+                suggestions.append({
+                    "type": "batch",
+                    "station": station,
+                    "thickness": load.thickness,
+                    "count": len(order_ids),
+                    "total_m2": round(load.used_m2, 1),
+                    "fill": round(load.fill * 100),
+                    "orders": order_codes[:5],
+                    "message": f"{station} yuk #{no}: {load.thickness}mm, {len(order_ids)} siparis "
+                               f"({', '.join(order_codes[:3])}{'...' if len(order_codes) > 3 else ''}) - "
+                               f"{load.used_m2:.1f} m2, %{load.fill * 100:.0f} dolu. Ayni cevrimde firinlanmali."
+                })
+        
+        return suggestions
+
+
+# =============================================================================
+# AKILLI ONERI MOTORU
+# =============================================================================
+class SmartRecommendationEngine:
+    """Tum analizleri birlestiren oneri motoru"""
+    
+    # Uretim plani CSV kolonlari (ekran disa aktarimi ve plan_cli ayni format)
+    PLAN_COLUMNS = ["SIRA", "KOD", "MUSTERI", "URUN", "M2", "CR", "TERMIN", "TAHMINI", "FARK", "DURUM", "ISTASYON"]
+    
+    def __init__(self):
+        self.queue_manager = StationQueueManager()
+        self.cr_calculator = CriticalRatioCalculator(self.queue_manager)
+        self.route_optimizer = AlternativeRouteOptimizer(self.queue_manager)
+        self.batch_optimizer = BatchOptimizer(self.queue_manager)
+        self.snapshot = None
+    
+    def set_snapshot(self, snapshot):
+        """Tum analizcilere ayni ilerleme goruntusunu ver"""
+        self.snapshot = snapshot
+        for part in (self.queue_manager, self.cr_calculator,
+                     self.route_optimizer, self.batch_optimizer):
+            part.snapshot = snapshot
+    
+    def prepare(self, orders):
+        """Yukleme basina tek DB gecisi: ilerleme goruntusu + kuyruklar"""
+        self.set_snapshot(OrderProgressSnapshot.from_orders(orders))
+        self.queue_manager.build_queues(orders)
+        return self.snapshot
+    
+    def analyze(self, orders):
+        """Kapsamli analiz yap"""
+        # Kuyruklari olustur (goruntu bu siparisleri kapsamiyorsa yeniden cek)
+        if self.snapshot is None or not self.snapshot.covers(orders):
+            self.prepare(orders)
+        else:
+            self.queue_manager.build_queues(orders)
+        
+        recommendations = []
+        
+        # 1. Critical Ratio analizi
+        for order in orders:
+            cr, status = self.cr_calculator.calculate_cr(order)
+            if status in ["late", "critical"]:
+                recommendations.append({
+                    "type": "critical",
+                    "priority": 1,
+                    "message": f"{order['order_code']}: CR={cr:.2f} - Gecikme riski yuksek! Hemen one alinmali."
+                })
+            elif status == "risk":
+                recommendations.append({
+                    "type": "warning",
+                    "priority": 2,
+                    "message": f"{order['order_code']}: CR={cr:.2f} - Teslim tarihine yakin, dikkat."
+                })
+        
+        # 2. Darbogaz analizi
+        bottlenecks = self.queue_manager.get_bottlenecks()
+        for bn in bottlenecks[:3]:  # En kritik 3 darbogaz
+            recommendations.append({
+                "type": "warning",
+                "priority": 3,
+                "message": f"Darbogaz: {bn['station']} - {bn['load_m2']:.0f} m2 yuk, {bn['queue_days']:.1f} gunluk kuyruk"
+            })
+        
+        # 3. Alternatif rota onerileri
+        for order in orders[:10]:  # Ilk 10 siparis icin
+            alt_routes = self.route_optimizer.find_alternative_routes(order)
+            for alt in alt_routes:
+                if alt['time_saved_days'] >= 0.5:  # Yarim gun veya daha fazla kazanc
+                    recommendations.append({
+                        "type": "info",
+                        "priority": 4,
+                        "message": alt['message']
+                    })
+        
+        # 4. Batch onerileri
+        batch_suggestions = self.batch_optimizer.find_batch_opportunities(orders)
+        for batch in batch_suggestions:
+            recommendations.append({
+                "type": "info",
+                "priority": 5,
+                "message": batch['message']
+            })
+        
+        # 5. Bos istasyonlar
+        idle = self.queue_manager.get_idle_stations()
+        if idle:
+            recommendations.append({
+                "type": "info",
+                "priority": 6,
+                "message": f"Bos istasyonlar: {', '.join(idle)}"
+            })
+        
+        # Oncelik sirasina gore sirala
+        recommendations.sort(key=lambda x: x['priority'])
+        
+        return recommendations
+    
+    def get_order_current_station(self, order):
+        """Siparisin mevcut istasyonunu bul"""
+        snapshot = self.snapshot
+        if snapshot is not None and order['id'] in snapshot.current_station:
+            return snapshot.current_station[order['id']]
+        
+        route = order.get('route', '')
+        if not route:
+            return None
+        
+        if not db and (snapshot is None or snapshot.get_completed(order) is None):
+            return None
+
+        try:
+            completed = get_completed_stations(order, snapshot)
+            
+            current = None
+            for station in route.split(','):
+                station = station.strip()
+                if station and station not in completed:
+                    current = station
+                    break
+            
+            if snapshot is not None:
+                snapshot.current_station[order['id']] = current
+            return current
+        except:
+            return None
+    
+    def can_reorder(self, order_to_move, target_order):
+        """Siparis yer degistirebilir mi?"""
+        if order_to_move.get('status') == 'Beklemede':
+            return True, ""
+        
+        current_station = self.get_order_current_station(order_to_move)
+        if current_station and FactoryConfig.is_cutting_station(current_station):
+            return False, f"Siparis {current_station} istasyonunda, one alinamaz"
+        
+        return True, ""
+    
+    def plan_rows(self, orders):
+        """Sirali siparisler icin PLAN_COLUMNS satirlari (prepare() sonrasi DB'ye gitmez)"""
+        rows = []
+        for idx, order in enumerate(orders):
+            cr, _ = self.cr_calculator.calculate_cr(order)
+            est_date, _ = self.cr_calculator.estimate_completion_date(order, idx, orders)
+            current_st = self.get_order_current_station(order)
+            rows.append([
+                idx + 1,
+                order['order_code'],
+                order.get('customer_name') or '',
+                order.get('product_type') or '',
+                f"{order.get('declared_total_m2', 0) or 0:.1f}",
+                cr if cr else '',
+                order.get('delivery_date', ''),
+                est_date.strftime('%Y-%m-%d') if est_date else '',
+                '',
+                order.get('status', 'Beklemede'),
+                current_st or '',
+            ])
+        return rows
@@ -37,6 +37,10 @@ class StationInfo:
     is_batch_station: bool = False      # Batch işlem yapılan istasyon mu?
     show_in_shipping: bool = False      # Sevkiyat ekranında gösterilsin mi?
     color_code: str = "#3498DB"         # Renk kodu (Gantt için)
+    bed_width: int = 0                  # Fırın yatağı eni (cm, batch istasyonları)
+    bed_length: int = 0                 # Fırın yatağı boyu (cm)
+    cycle_minutes: int = 0              # 6mm cam için bir fırın çevrimi (dk)
+    changeover: Dict[str, Dict[str, int]] = field(default_factory=dict)  # Ayar süreleri (dk)
 
 
 class FactoryConfig:
@@ -54,6 +58,15 @@ class FactoryConfig:
         
         # İstasyon sırasını al
         order = factory_config.get_station_order()
+        
+        # 4mm Düz Cam'dan 10mm Temperli'ye geçişte TEMPER A1 ayar süresi (dk)
+        minutes = factory_config.get_changeover_minutes("TEMPER A1", (4, "Düz Cam"), (10, "Temperli"))
+    
+    Ayar (changeover) matrisi:
+        {"thickness": {"*": 40, "4>10": 60}, "product": {"*": 15}}
+        Sınıf = (kalınlık, ürün tipi). Kalınlık değişirse "thickness", ürün değişirse
+        "product" tablosundan süre alınır ve toplanır; önce "eski>yeni" çifti,
+        yoksa "*" (varsayılan) kullanılır.
     """
     
     # Varsayılan istasyon tanımları
@@ -65,7 +78,8 @@ class FactoryConfig:
             default_capacity=800,
             order_index=1,
             alternatives=["LIVA KESIM"],
-            color_code="#2ECC71"
+            color_code="#2ECC71",
+            changeover={"thickness": {"*": 15}, "product": {"*": 10}}
         ),
         "LIVA KESIM": StationInfo(
             name="LIVA KESIM",
@@ -73,14 +87,16 @@ class FactoryConfig:
             default_capacity=800,
             order_index=2,
             alternatives=["INTERMAC"],
-            color_code="#27AE60"
+            color_code="#27AE60",
+            changeover={"thickness": {"*": 15}, "product": {"*": 10}}
         ),
         "LAMINE KESIM": StationInfo(
             name="LAMINE KESIM",
             group=StationGroup.KESIM,
             default_capacity=600,
             order_index=3,
-            color_code="#1ABC9C"
+            color_code="#1ABC9C",
+            changeover={"thickness": {"*": 20}, "product": {"*": 10}}
         ),
         
         # İŞLEME GRUBU
@@ -89,21 +105,24 @@ class FactoryConfig:
             group=StationGroup.ISLEME,
             default_capacity=100,
             order_index=10,
-            color_code="#3498DB"
+            color_code="#3498DB",
+            changeover={"thickness": {"*": 20}}
         ),
         "DOUBLEDGER": StationInfo(
             name="DOUBLEDGER",
             group=StationGroup.ISLEME,
             default_capacity=400,
             order_index=11,
-            color_code="#2980B9"
+            color_code="#2980B9",
+            changeover={"thickness": {"*": 25}}
         ),
         "ZIMPARA": StationInfo(
             name="ZIMPARA",
             group=StationGroup.ISLEME,
             default_capacity=300,
             order_index=12,
-            color_code="#1F618D"
+            color_code="#1F618D",
+            changeover={"thickness": {"*": 10}}
         ),
         
         # YÜZEY İŞLEME GRUBU
@@ -144,14 +163,16 @@ class FactoryConfig:
             group=StationGroup.YUZEY,
             default_capacity=200,
             order_index=24,
-            color_code="#A569BD"
+            color_code="#A569BD",
+            changeover={"thickness": {"*": 10}}
         ),
         "OYGU": StationInfo(
             name="OYGU",
             group=StationGroup.YUZEY,
             default_capacity=200,
             order_index=25,
-            color_code="#BB8FCE"
+            color_code="#BB8FCE",
+            changeover={"thickness": {"*": 10}}
         ),
         
         # TEMPERLEME GRUBU
@@ -162,7 +183,11 @@ class FactoryConfig:
             order_index=30,
             alternatives=["TEMPER B1"],
             is_batch_station=True,
-            color_code="#E74C3C"
+            color_code="#E74C3C",
+            bed_width=244,
+            bed_length=420,
+            cycle_minutes=18,
+            changeover={"thickness": {"*": 40}, "product": {"*": 15}}
         ),
         "TEMPER B1": StationInfo(
             name="TEMPER B1",
@@ -171,7 +196,11 @@ class FactoryConfig:
             order_index=31,
             alternatives=["TEMPER A1"],
             is_batch_station=True,
-            color_code="#C0392B"
+            color_code="#C0392B",
+            bed_width=280,
+            bed_length=500,
+            cycle_minutes=18,
+            changeover={"thickness": {"*": 40}, "product": {"*": 15}}
         ),
         "TEMPER BOMBE": StationInfo(
             name="TEMPER BOMBE",
@@ -179,7 +208,11 @@ class FactoryConfig:
             default_capacity=300,
             order_index=32,
             is_batch_station=True,
-            color_code="#A93226"
+            color_code="#A93226",
+            bed_width=200,
+            bed_length=300,
+            cycle_minutes=20,
+            changeover={"thickness": {"*": 45}, "product": {"*": 15}}
         ),
         
         # BİRLEŞTİRME GRUBU
@@ -188,14 +221,16 @@ class FactoryConfig:
             group=StationGroup.BIRLESTIRME,
             default_capacity=250,
             order_index=40,
-            color_code="#F39C12"
+            color_code="#F39C12",
+            changeover={"thickness": {"*": 15}, "product": {"*": 30}}
         ),
         "ISICAM B1": StationInfo(
             name="ISICAM B1",
             group=StationGroup.BIRLESTIRME,
             default_capacity=500,
             order_index=41,
-            color_code="#E67E22"
+            color_code="#E67E22",
+            changeover={"thickness": {"*": 20}, "product": {"*": 15}}
         ),
         "KUMLAMA": StationInfo(
             name="KUMLAMA",
@@ -246,10 +281,13 @@ class FactoryConfig:
                     self._create_stations_table(conn)
                     return
                 
+                self._migrate_stations_table(conn)
+                
                 # Özelleştirilmiş istasyonları yükle
                 rows = conn.execute("""
                     SELECT name, display_name, group_name, capacity, 
-                           order_index, is_active, alternatives, color_code
+                           order_index, is_active, alternatives, color_code,
+                           bed_width, bed_length, cycle_minutes, changeover
                     FROM stations
                 """).fetchall()
                 
@@ -264,6 +302,15 @@ class FactoryConfig:
                         station.color_code = row['color_code'] or station.color_code
                         if row['alternatives']:
                             station.alternatives = json.loads(row['alternatives'])
+                        # Fırın ölçüleri girilmemişse varsayılan kalır
+                        if row['bed_width'] and row['bed_length']:
+                            station.bed_width = row['bed_width']
+                            station.bed_length = row['bed_length']
+                        if row['cycle_minutes']:
+                            station.cycle_minutes = row['cycle_minutes']
+                        # Ayar matrisi girilmemişse varsayılan kalır
+                        if row['changeover']:
+                            station.changeover = json.loads(row['changeover'])
                     else:
                         # Yeni istasyon ekle (kullanıcı tanımlı)
                         group = StationGroup[row['group_name']] if row['group_name'] else StationGroup.ISLEME
@@ -274,7 +321,11 @@ class FactoryConfig:
                             order_index=row['order_index'],
                             is_active=bool(row['is_active']),
                             alternatives=json.loads(row['alternatives']) if row['alternatives'] else [],
-                            color_code=row['color_code'] or "#3498DB"
+                            color_code=row['color_code'] or "#3498DB",
+                            bed_width=row['bed_width'] or 0,
+                            bed_length=row['bed_length'] or 0,
+                            cycle_minutes=row['cycle_minutes'] or 0,
+                            changeover=json.loads(row['changeover']) if row['changeover'] else {}
                         )
                         
         except Exception as e:
@@ -293,6 +344,10 @@ class FactoryConfig:
                 is_active INTEGER DEFAULT 1,
                 alternatives TEXT,
                 color_code TEXT,
+                bed_width INTEGER DEFAULT 0,
+                bed_length INTEGER DEFAULT 0,
+                cycle_minutes INTEGER DEFAULT 0,
+                changeover TEXT,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         """)
@@ -301,8 +356,9 @@ class FactoryConfig:
         for name, info in self.DEFAULT_STATIONS.items():
             conn.execute("""
                 INSERT OR IGNORE INTO stations 
-                (name, display_name, group_name, capacity, order_index, is_active, alternatives, color_code)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                (name, display_name, group_name, capacity, order_index, is_active, alternatives, color_code,
+                 bed_width, bed_length, cycle_minutes, changeover)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, (
                 name, 
                 info.name,
@@ -311,9 +367,22 @@ class FactoryConfig:
                 info.order_index,
                 1 if info.is_active else 0,
                 json.dumps(info.alternatives),
-                info.color_code
+                info.color_code,
+                info.bed_width,
+                info.bed_length,
+                info.cycle_minutes,
+                json.dumps(info.changeover)
             ))
     
+    def _migrate_stations_table(self, conn):
+        """Eski stations tablosuna fırın ve ayar matrisi kolonlarını ekle"""
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(stations)").fetchall()}
+        for column in ("bed_width", "bed_length", "cycle_minutes"):
+            if column not in columns:
+                conn.execute(f"ALTER TABLE stations ADD COLUMN {column} INTEGER DEFAULT 0")
+        if "changeover" not in columns:
+            conn.execute("ALTER TABLE stations ADD COLUMN changeover TEXT")
+    
     # === GETTER METODLARI ===
     
     def get_all_stations(self, active_only: bool = True) -> Dict[str, StationInfo]:
@@ -364,6 +433,40 @@ class FactoryConfig:
         """Tüm kapasiteleri döndür (eski kod ile uyumluluk için)"""
         return {name: info.default_capacity for name, info in self._stations.items() if info.is_active}
     
+    def get_changeover_matrix(self, station_name: str) -> Dict[str, Dict[str, int]]:
+        """İstasyonun ayar matrisini döndür (tanımsızsa boş)"""
+        station = self._stations.get(station_name)
+        return station.changeover if station else {}
+    
+    def get_changeover_minutes(self, station_name: str, from_class: Optional[Tuple], to_class: Optional[Tuple]) -> int:
+        """
+        (kalınlık, ürün tipi) sınıfından diğerine geçişte istasyonun ayar süresi (dk).
+        İlk iş (from_class None) veya aynı sınıf için 0.
+        """
+        return self.changeover_from_matrix(self.get_changeover_matrix(station_name), from_class, to_class)
+    
+    @classmethod
+    def changeover_from_matrix(cls, matrix: Dict[str, Dict[str, int]], from_class: Optional[Tuple],
+                               to_class: Optional[Tuple]) -> int:
+        """get_changeover_minutes'ın matris üzerinden hali (süreç işçileri için)"""
+        if from_class is None or to_class is None or not matrix:
+            return 0
+        
+        minutes = 0
+        for axis, old, new in (("thickness", from_class[0], to_class[0]), ("product", from_class[1], to_class[1])):
+            if old == new:
+                continue
+            table = matrix.get(axis) or {}
+            minutes += table.get(f"{cls._class_key(old)}>{cls._class_key(new)}", table.get("*", 0))
+        return minutes
+    
+    @staticmethod
+    def _class_key(value) -> str:
+        """Matris anahtarı: 6.0 ve 6 aynı kalınlıktır"""
+        if isinstance(value, (int, float)):
+            return f"{value:g}"
+        return str(value)
+    
     def get_capacity(self, station_name: str) -> int:
         """Belirli bir istasyonun kapasitesini döndür"""
         station = self._stations.get(station_name)
@@ -429,7 +532,11 @@ class FactoryConfig:
                             order_index = ?,
                             is_active = ?,
                             alternatives = ?,
-                            color_code = ?
+                            color_code = ?,
+                            bed_width = ?,
+                            bed_length = ?,
+                            cycle_minutes = ?,
+                            changeover = ?
                         WHERE name = ?
                     """, (
                         station.default_capacity,
@@ -437,6 +544,10 @@ class FactoryConfig:
                         1 if station.is_active else 0,
                         json.dumps(station.alternatives),
                         station.color_code,
+                        station.bed_width,
+                        station.bed_length,
+                        station.cycle_minutes,
+                        json.dumps(station.changeover),
                         station_name
                     ))
                 return True
@@ -466,11 +577,14 @@ class FactoryConfig:
                 with self._db.get_connection() as conn:
                     conn.execute("""
                         INSERT INTO stations 
-                        (name, display_name, group_name, capacity, order_index, is_active, alternatives, color_code)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                        (name, display_name, group_name, capacity, order_index, is_active, alternatives, color_code,
+                         bed_width, bed_length, cycle_minutes, changeover)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                     """, (
                         name, name, group.name, capacity, order_index, 
-                        1, json.dumps(station.alternatives), station.color_code
+                        1, json.dumps(station.alternatives), station.color_code,
+                        station.bed_width, station.bed_length, station.cycle_minutes,
+                        json.dumps(station.changeover)
                     ))
                 return True
             except Exception as e:
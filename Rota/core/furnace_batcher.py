@@ -0,0 +1,385 @@
+"""
+EFES ROTA X - Temper Fırını Yük Planlayıcı
+Bekleyen parçaları fırın yüklerine (çevrimlerine) yerleştirir.
+
+Kurallar:
+- Bir yükte yalnızca aynı kalınlıktaki camlar olur (ısıtma süresi kalınlığa bağlıdır)
+- Yükteki en erken ve en geç termin arası DUE_WINDOW_DAYS günü geçemez
+- Parçalar yatağa raf (shelf) düzeninde, gerekirse 90° döndürülerek ve aralarında
+  PIECE_GAP_CM boşluk bırakılarak dizilir
+
+Yöntem:
+1. Termin sırasıyla (aynı gün içinde büyük parça önce) First-Fit yerleştirme
+2. İyileştirme: en boş yüklerin parçaları pencere uyumlu diğer yüklere dağıtılır;
+   hepsi sığarsa o yük (bir fırın çevrimi) tamamen kalkar
+
+Sipariş başına fırın süresi (yüklerdeki alan payı x çevrim süresi) SmartPlanner
+çizelgesine geri beslenir; böylece fırın yükü m²/gün yerine gerçek doluluğa göre hesaplanır.
+
+Kullanım:
+    from core.furnace_batcher import furnace_batcher
+    plan = furnace_batcher.plan(orders)
+    plan.get_summary()          # İstasyon bazlı yük sayısı, doluluk, m²/çevrim
+    plan.order_minutes()        # {(order_id, istasyon): dakika}
+"""
+
+from collections import defaultdict
+from datetime import date, datetime
+
+try:
+    from core.db_manager import db
+except ImportError:
+    db = None
+
+try:
+    from core.factory_config import factory_config
+except ImportError:
+    factory_config = None
+
+from core.scheduler import MINUTES_PER_DAY
+
+
+NO_DUE = date.max.toordinal()
+
+
+def _due_ordinal(date_str):
+    if not date_str:
+        return NO_DUE
+    try:
+        return datetime.strptime(date_str, '%Y-%m-%d').date().toordinal()
+    except (TypeError, ValueError):
+        return NO_DUE
+
+
+class FurnaceLoad:
+    """Tek fırın çevrimi: yatak üzerinde raflara dizilmiş parçalar"""
+
+    def __init__(self, station, thickness, bed_width, bed_length, cycle_minutes, gap):
+        self.station = station
+        self.thickness = thickness
+        self.bed_width = bed_width
+        self.bed_length = bed_length
+        self.cycle_minutes = cycle_minutes
+        self.gap = gap
+
+        self.shelves = []                       # [y, yükseklik, kullanılan_en]
+        self.pieces = []                        # (order_id, order_code, en, boy, x, y, döndürüldü, termin)
+        self.used_cm2 = 0.0
+        self.due_min = None
+        self.due_max = None
+        self.order_cm2 = defaultdict(float)     # order_id -> yükteki alan
+
+    # === ÖLÇÜLER ===
+
+    @property
+    def bed_m2(self):
+        return self.bed_width * self.bed_length / 10000.0
+
+    @property
+    def used_m2(self):
+        return self.used_cm2 / 10000.0
+
+    @property
+    def fill(self):
+        return self.used_cm2 / (self.bed_width * self.bed_length) if self.bed_width and self.bed_length else 0.0
+
+    @property
+    def free_cm2(self):
+        return self.bed_width * self.bed_length - self.used_cm2
+
+    @property
+    def order_ids(self):
+        return list(self.order_cm2.keys())
+
+    def accepts_due(self, due, window):
+        if self.due_min is None:
+            return True
+        return max(self.due_max, due) - min(self.due_min, due) <= window
+
+    # === YERLEŞTİRME ===
+
+    def fits_empty(self, w, h):
+        return (w <= self.bed_width and h <= self.bed_length) or (h <= self.bed_width and w <= self.bed_length)
+
+    def try_place(self, order_id, order_code, w, h, due):
+        """Parçayı yerleştirmeyi dene (en az raf boşluğu bırakan konum)"""
+        orientations = ((w, h, False), (h, w, True)) if w != h else ((w, h, False),)
+
+        best = None
+        for shelf in self.shelves:
+            for pw, ph, rotated in orientations:
+                x = shelf[2] + (self.gap if shelf[2] else 0)
+                if ph <= shelf[1] and x + pw <= self.bed_width:
+                    waste = shelf[1] - ph
+                    if best is None or waste < best[0]:
+                        best = (waste, shelf, x, pw, ph, rotated)
+
+        if best is not None:
+            _, shelf, x, pw, ph, rotated = best
+            shelf[2] = x + pw
+            self._add(order_id, order_code, pw, ph, x, shelf[0], rotated, due)
+            return True
+
+        # Yeni raf: rafı ince tutmak için kısa kenar boyuna
+        y = (self.shelves[-1][0] + self.shelves[-1][1] + self.gap) if self.shelves else 0
+        if len(orientations) == 2 and h > w:
+            orientations = orientations[::-1]
+        for pw, ph, rotated in orientations:
+            if pw <= self.bed_width and y + ph <= self.bed_length:
+                self.shelves.append([y, ph, pw])
+                self._add(order_id, order_code, pw, ph, 0, y, rotated, due)
+                return True
+        return False
+
+    def _add(self, order_id, order_code, w, h, x, y, rotated, due):
+        self.pieces.append((order_id, order_code, w, h, x, y, rotated, due))
+        self.used_cm2 += w * h
+        self.order_cm2[order_id] += w * h
+        self.due_min = due if self.due_min is None else min(self.due_min, due)
+        self.due_max = due if self.due_max is None else max(self.due_max, due)
+
+    # === GERİ ALMA (iyileştirme denemeleri için) ===
+
+    def savepoint(self):
+        return ([list(s) for s in self.shelves], len(self.pieces), self.used_cm2,
+                self.due_min, self.due_max, dict(self.order_cm2))
+
+    def restore(self, state):
+        shelves, count, used, due_min, due_max, order_cm2 = state
+        self.shelves = shelves
+        del self.pieces[count:]
+        self.used_cm2 = used
+        self.due_min, self.due_max = due_min, due_max
+        self.order_cm2 = defaultdict(float, order_cm2)
+
+
+class FurnacePlan:
+    """Fırın yük planı"""
+
+    def __init__(self):
+        self.loads = defaultdict(list)      # istasyon -> [FurnaceLoad]
+        self.oversize = []                  # Yatağa sığmayan parçalar
+        self.removed_loads = 0              # İyileştirmenin kaldırdığı çevrim sayısı
+
+    def order_minutes(self):
+        """{(order_id, istasyon): dakika} - yükteki alan payı x çevrim süresi"""
+        minutes = defaultdict(float)
+        for station, loads in self.loads.items():
+            for load in loads:
+                if load.used_cm2 <= 0:
+                    continue
+                for order_id, cm2 in load.order_cm2.items():
+                    minutes[(order_id, station)] += load.cycle_minutes * cm2 / load.used_cm2
+        return dict(minutes)
+
+    def get_summary(self):
+        """İstasyon bazlı özet"""
+        summary = {}
+        for station, loads in self.loads.items():
+            if not loads:
+                continue
+            used = sum(l.used_m2 for l in loads)
+            bed = sum(l.bed_m2 for l in loads)
+            summary[station] = {
+                "loads": len(loads),
+                "pieces": sum(len(l.pieces) for l in loads),
+                "m2": round(used, 1),
+                "avg_fill": round(used / bed * 100, 1) if bed else 0.0,
+                "cycle_minutes": round(sum(l.cycle_minutes for l in loads), 1),
+                "m2_per_cycle": round(used / len(loads), 2),
+            }
+        return summary
+
+
+class FurnaceBatchPlanner:
+    """Bekleyen siparişleri batch istasyonlarının fırın yüklerine böl"""
+
+    DUE_WINDOW_DAYS = 3         # Aynı yükteki termin farkı üst sınırı
+    PIECE_GAP_CM = 3            # Parçalar arası boşluk
+    IMPROVE_FILL_LIMIT = 0.6    # Bu doluluğun altındaki yükler dağıtılmaya çalışılır
+    IMPROVE_MAX_PIECES = 4      # ... ve en fazla bu kadar parçası olanlar (dağıtılabilme şansı olanlar)
+    IMPROVE_MAX_FAILURES = 200  # Art arda bu kadar başarısız denemede iyileştirme durur
+    MAX_OPEN_LOADS = 40         # Aynı anda açık tutulan yük (Next-k-Fit; büyük listede hız için)
+    REFERENCE_THICKNESS = 6     # cycle_minutes bu kalınlık içindir
+
+    def __init__(self, config=None):
+        self.config = config or factory_config
+
+    def get_furnaces(self):
+        """Yatak ölçüsü ve çevrim süresi tanımlı batch istasyonları"""
+        furnaces = {}
+        if not self.config:
+            return furnaces
+        for name in self.config.get_batch_stations():
+            info = self.config.get_station(name)
+            if info and info.bed_width > 0 and info.bed_length > 0 and info.cycle_minutes > 0:
+                furnaces[name] = info
+        return furnaces
+
+    def cycle_minutes(self, info, thickness):
+        """Isıtma süresi kalınlıkla doğru orantılı kabul edilir"""
+        return info.cycle_minutes * max(thickness or self.REFERENCE_THICKNESS, 3) / self.REFERENCE_THICKNESS
+
+    # === PARÇA TOPLAMA ===
+
+    def collect_pieces(self, orders, progress, furnaces):
+        """
+        {(istasyon, kalınlık): [[termin, sıra, order_id, kod, en, boy, adet], ...]}
+        progress: {order_id: {istasyon: tamamlanan_adet}}
+        """
+        groups = defaultdict(list)
+        for rank, order in enumerate(orders):
+            route = [s.strip() for s in (order.get('route') or '').split(',')]
+            stations = [s for s in route if s in furnaces]
+            if not stations:
+                continue
+
+            quantity = order.get('quantity') or 0
+            if quantity <= 0:
+                continue
+
+            w, h = order.get('width') or 0, order.get('height') or 0
+            if w <= 0 or h <= 0:
+                # Ölçü yoksa beyan edilen m²'den kare parça varsay
+                m2 = order.get('declared_total_m2') or 0
+                if m2 <= 0:
+                    continue
+                w = h = (m2 / quantity * 10000) ** 0.5
+
+            done = progress.get(order.get('id'), {}) if not order.get('is_new') else {}
+            due = _due_ordinal(order.get('delivery_date'))
+            for station in stations:
+                remaining = quantity - (done.get(station, 0) or 0)
+                if remaining > 0:
+                    groups[(station, order.get('thickness') or 0)].append(
+                        [due, rank, order.get('id'), order.get('order_code'), w, h, int(remaining)])
+        return groups
+
+    # === PLANLAMA ===
+
+    def plan(self, orders, progress=None):
+        """Siparişleri (planlayıcı sırasında) fırın yüklerine yerleştir"""
+        result = FurnacePlan()
+        furnaces = self.get_furnaces()
+        if not furnaces or not orders:
+            return result
+
+        if progress is None:
+            progress = {}
+            ids = [o['id'] for o in orders if not o.get('is_new') and o.get('id') is not None]
+            if db and ids:
+                try:
+                    progress = db.get_station_progress_map(ids)
+                except Exception:
+                    progress = {}
+
+        for (station, thickness), items in self.collect_pieces(orders, progress, furnaces).items():
+            info = furnaces[station]
+            loads = self._first_fit(result, station, thickness, info, items)
+            result.removed_loads += self._improve(loads)
+            result.loads[station].extend(loads)
+        return result
+
+    def order_work_days(self, plan):
+        """{(order_id, istasyon): gün} - çizelgeleyiciye verilecek fırın süresi"""
+        return {key: minutes / MINUTES_PER_DAY for key, minutes in plan.order_minutes().items()}
+
+    def _new_load(self, station, thickness, info):
+        return FurnaceLoad(station, thickness, info.bed_width, info.bed_length,
+                           self.cycle_minutes(info, thickness), self.PIECE_GAP_CM)
+
+    def _first_fit(self, result, station, thickness, info, items):
+        """Termin sırasıyla First-Fit; penceresi geçen yükler kapanır"""
+        window = self.DUE_WINDOW_DAYS
+        items.sort(key=lambda it: (it[0], it[1], -(it[4] * it[5])))
+
+        loads = []
+        open_loads = []
+        probe = self._new_load(station, thickness, info)
+
+        for due, _, order_id, code, w, h, count in items:
+            if not probe.fits_empty(w, h):
+                result.oversize.append({"code": code, "station": station, "width": w, "height": h, "quantity": count})
+                continue
+
+            # Termin penceresi dışına düşen yükleri kapat (termin artan sırada)
+            open_loads = [l for l in open_loads if l.accepts_due(due, window)]
+
+            area = w * h
+            full = set()    # Bu ölçüdeki parçanın artık sığmadığı yükler
+            for _ in range(count):
+                placed = False
+                for load in open_loads:
+                    if id(load) in full or load.free_cm2 < area:
+                        continue
+                    if load.try_place(order_id, code, w, h, due):
+                        placed = True
+                        break
+                    full.add(id(load))
+                if not placed:
+                    load = self._new_load(station, thickness, info)
+                    load.try_place(order_id, code, w, h, due)
+                    loads.append(load)
+                    open_loads.append(load)
+                    if len(open_loads) > self.MAX_OPEN_LOADS:
+                        # En dolu yükü kapat
+                        open_loads.remove(max(open_loads, key=lambda l: l.used_cm2))
+        return loads
+
+    def _improve(self, loads):
+        """En boş yükleri diğer yüklere dağıt; tamamen boşalan yükü kaldır"""
+        window = self.DUE_WINDOW_DAYS
+        # Yükler termin sırasıyla açıldı; aynı dönemde açık olan komşulara bak
+        span = self.MAX_OPEN_LOADS
+        removed = set()
+        failures = 0
+        candidates = sorted((i for i, l in enumerate(loads)
+                             if l.fill < self.IMPROVE_FILL_LIMIT and len(l.pieces) <= self.IMPROVE_MAX_PIECES),
+                            key=lambda i: loads[i].used_cm2)
+
+        for idx in candidates:
+            if failures >= self.IMPROVE_MAX_FAILURES:
+                break
+            load = loads[idx]
+            lo = max(0, idx - span)
+            others = [o for j, o in enumerate(loads[lo:idx + span + 1], lo)
+                      if j != idx and j not in removed and o.free_cm2 > 0
+                      and max(o.due_max, load.due_max) - min(o.due_min, load.due_min) <= window]
+            if not others or sum(o.free_cm2 for o in others) < load.used_cm2:
+                failures += 1
+                continue
+
+            # En çok dolu yükten başla (boşlukları kapat)
+            others.sort(key=lambda o: -o.used_cm2)
+            others = others[:self.MAX_OPEN_LOADS]
+            saved = {}      # Yalnızca değişen yükler geri alınır
+            moved = True
+            for order_id, code, w, h, _, _, _, due in sorted(load.pieces, key=lambda p: -(p[2] * p[3])):
+                placed = False
+                for o in others:
+                    if o.free_cm2 < w * h:
+                        continue
+                    if id(o) not in saved:
+                        saved[id(o)] = (o, o.savepoint())
+                    if o.try_place(order_id, code, w, h, due):
+                        placed = True
+                        break
+                if not placed:
+                    moved = False
+                    break
+
+            if moved:
+                removed.add(idx)
+                failures = 0
+            else:
+                failures += 1
+                for o, state in saved.values():
+                    o.restore(state)
+
+        if removed:
+            loads[:] = [l for i, l in enumerate(loads) if i not in removed]
+        return len(removed)
+
+
+# Singleton instance
+furnace_batcher = FurnaceBatchPlanner()
@@ -104,6 +104,24 @@ class AppLogger:
             datefmt='%Y-%m-%d %H:%M:%S'
         ))
         self.production_logger.addHandler(prod_handler)
+        
+        # Performans log dosyası (arayüz takılmaları, kare süreleri)
+        self.performance_logger = logging.getLogger('EFES_PERFORMANCE')
+        self.performance_logger.setLevel(logging.INFO)
+        self.performance_logger.propagate = False
+        
+        perf_file = os.path.join(self.log_dir, 'performance.log')
+        perf_handler = RotatingFileHandler(
+            perf_file,
+            maxBytes=5*1024*1024,  # 5 MB
+            backupCount=5,
+            encoding='utf-8'
+        )
+        perf_handler.setFormatter(logging.Formatter(
+            '%(asctime)s | %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S'
+        ))
+        self.performance_logger.addHandler(perf_handler)
     
     def _format_extra(self, **kwargs) -> str:
         """Ekstra parametreleri formatla"""
@@ -248,6 +266,21 @@ class AppLogger:
         """Performans metriği logu"""
         self.debug(f"Performans: {metric_name} = {value}{unit}")
     
+    def ui_stall(self, duration_ms: float, slot: str, stack: str = ""):
+        """Arayüz (GUI thread) takılma logu"""
+        self.warning("Arayüz takıldı", duration=f"{duration_ms:.0f}ms", slot=slot)
+        message = f"UI_TAKILMA | Süre:{duration_ms:.0f}ms | Yer:{slot}"
+        if stack:
+            message += "\n" + stack.rstrip()
+        self.performance_logger.info(message)
+    
+    def ui_frame_stats(self, samples: int, p50_ms: float, p95_ms: float, p99_ms: float, max_ms: float, stalls: int):
+        """Olay döngüsü gecikme özeti"""
+        self.performance_logger.info(
+            f"UI_KARE | Örnek:{samples} | p50:{p50_ms:.1f}ms | p95:{p95_ms:.1f}ms | "
+            f"p99:{p99_ms:.1f}ms | Maks:{max_ms:.1f}ms | Takılma:{stalls}"
+        )
+    
     # === YARDIMCI METODLAR ===
     
     def get_log_files(self) -> list:
@@ -0,0 +1,159 @@
+"""
+EFES ROTA X - Terminal Olay Günlüğü (Çevrimdışı Çalışma)
+Operatör terminalindeki üretim / fire olaylarını önce yerel bir SQLite dosyasına yazar.
+Merkezi veritabanı (ağ paylaşımındaki efes_factory.db) yavaş ya da erişilemez olsa da
+okutmalar bekletilmez; core.scan_ingest olayları arka planda merkeze aktarır.
+
+Her olayın bir event_uuid'i vardır; merkezde production_logs.event_uuid ile eşleşen
+olay ikinci kez yazılmaz, böylece yarıda kalan aktarım güvenle tekrar oynatılabilir.
+
+Günlük makineye özeldir (varsayılan %LOCALAPPDATA%/EfesRota veya ~/.rota altında,
+dosya adında bilgisayar adı): program klasörü ağ paylaşımında (SMB) olabilir ve
+SQLite WAL kipi ağ dosya sistemlerinde güvenilir çalışmaz.
+
+Ayarlar (ortam değişkenleri):
+    ROTA_TERMINAL_JOURNAL=...   Günlük dosyası (varsayılan: default_journal_path())
+
+Kullanım:
+    from core.offline_journal import OfflineJournal
+    journal = OfflineJournal()
+    event_uuid = journal.append({'kind': 'production', 'order_id': 12, 'station_name': 'TEMPER', 'qty': None})
+    journal.pending()                 # Aktarılmayı bekleyenler (sırayla)
+    journal.mark_synced([event_uuid])
+    journal.failed()                  # Merkezde uygulanamayanlar: operatöre gösterilir
+    journal.purge_synced()            # KEEP_SYNCED_DAYS'ten eski aktarılmışları sil
+"""
+
+import os
+import socket
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, timedelta
+
+
+EVENT_FIELDS = ("event_uuid", "kind", "order_id", "station_name", "qty", "operator_name", "code", "created_at")
+
+
+def default_journal_path():
+    """Makineye özel yerel günlük yolu (ağ paylaşımı değil)"""
+    local = os.environ.get("LOCALAPPDATA")
+    folder = os.path.join(local, "EfesRota") if local else os.path.join(os.path.expanduser("~"), ".rota")
+    host = "".join(c if c.isalnum() or c in "-_" else "_" for c in socket.gethostname()) or "terminal"
+    return os.path.join(folder, f"terminal_journal_{host}.db")
+
+
+class OfflineJournal:
+    """Yerel olay günlüğü: ekle → bekleyenleri oku → aktarıldı / hatalı işaretle"""
+
+    KEEP_SYNCED_DAYS = 7        # Aktarılmış olaylar bu kadar gün sonra silinir
+
+    def __init__(self, path=None):
+        self.path = path or os.environ.get("ROTA_TERMINAL_JOURNAL") or default_journal_path()
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connection(self):
+        """Tek yerel bağlantı (GUI ve aktarım thread'i ortak kullanır, kilitle korunur)"""
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=FULL")     # Elektrik kesintisinde de okutma kaybolmasın
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS events (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    event_uuid TEXT UNIQUE NOT NULL,
+                    kind TEXT NOT NULL,
+                    order_id INTEGER,
+                    station_name TEXT,
+                    qty INTEGER,
+                    operator_name TEXT,
+                    code TEXT,
+                    created_at TEXT,
+                    synced_at TEXT,
+                    attempts INTEGER DEFAULT 0,
+                    last_error TEXT,
+                    failed INTEGER DEFAULT 0
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_events_pending ON events(seq) WHERE synced_at IS NULL AND failed = 0")
+            self._conn = conn
+        return self._conn
+
+    def append(self, event):
+        """Olayı kalıcı olarak yaz. event_uuid / created_at yoksa üretilir. Döner: event_uuid"""
+        event.setdefault('event_uuid', uuid.uuid4().hex)
+        event.setdefault('created_at', datetime.now().isoformat(timespec='seconds'))
+        with self._lock:
+            self._connection().execute(
+                f"INSERT OR IGNORE INTO events ({', '.join(EVENT_FIELDS)}) VALUES ({', '.join('?' * len(EVENT_FIELDS))})",
+                tuple(event.get(field) for field in EVENT_FIELDS))
+        return event['event_uuid']
+
+    def pending(self, limit=None):
+        """Merkeze aktarılmamış (ve kalıcı hata almamış) olaylar, yazılış sırasıyla"""
+        sql = f"SELECT {', '.join(EVENT_FIELDS)} FROM events WHERE synced_at IS NULL AND failed = 0 ORDER BY seq"
+        params = ()
+        if limit:
+            sql += " LIMIT ?"
+            params = (limit,)
+        with self._lock:
+            return [dict(r) for r in self._connection().execute(sql, params).fetchall()]
+
+    def pending_count(self):
+        with self._lock:
+            return self._connection().execute(
+                "SELECT COUNT(*) FROM events WHERE synced_at IS NULL AND failed = 0").fetchone()[0]
+
+    def mark_synced(self, event_uuids):
+        if not event_uuids:
+            return
+        now = datetime.now().isoformat(timespec='seconds')
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN")
+            conn.executemany("UPDATE events SET synced_at=?, attempts=attempts+1 WHERE event_uuid=?",
+                             [(now, event_uuid) for event_uuid in event_uuids])
+            conn.execute("COMMIT")
+
+    def mark_failed(self, event_uuid, error):
+        """Merkezde uygulanamayan olay (ör. silinmiş sipariş): kuyruğu tıkamasın, incelemek için kalsın"""
+        with self._lock:
+            self._connection().execute(
+                "UPDATE events SET failed=1, attempts=attempts+1, last_error=? WHERE event_uuid=?",
+                (str(error), event_uuid))
+
+    def failed(self):
+        """Kalıcı hata almış olaylar (last_error ile), yazılış sırasıyla"""
+        with self._lock:
+            return [dict(r) for r in self._connection().execute(
+                "SELECT * FROM events WHERE failed = 1 ORDER BY seq").fetchall()]
+
+    def failed_count(self):
+        with self._lock:
+            return self._connection().execute("SELECT COUNT(*) FROM events WHERE failed = 1").fetchone()[0]
+
+    def requeue_failed(self):
+        """Hatalı olayları yeniden aktarılacak şekilde işaretle (ör. sipariş geri yüklendi). Döner: sayı"""
+        with self._lock:
+            return self._connection().execute("UPDATE events SET failed = 0 WHERE failed = 1").rowcount
+
+    def discard_failed(self):
+        """Operatörün gördüğü hatalı olayları sil. Döner: silinen sayısı"""
+        with self._lock:
+            return self._connection().execute("DELETE FROM events WHERE failed = 1").rowcount
+
+    def purge_synced(self, days=None):
+        """Eski aktarılmış olayları sil. Döner: silinen sayısı"""
+        cutoff = (datetime.now() - timedelta(days=self.KEEP_SYNCED_DAYS if days is None else days)).isoformat(timespec='seconds')
+        with self._lock:
+            return self._connection().execute(
+                "DELETE FROM events WHERE synced_at IS NOT NULL AND synced_at < ?", (cutoff,)).rowcount
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -12,6 +12,8 @@ class PDFEngine:
     EFES ROTA - Raporlama Motoru
     DÜZELTİLMİŞ VERSİYON: Dinamik Makine Listesi ✅
     """
+
+    MAX_JOB_LINES_PER_ROW = 30  # Daha uzun iş listesi sayfaya sığmaz: satırlara bölünür
     
     def __init__(self, filename="Rapor.pdf"):
         self.filename = filename
@@ -104,17 +106,18 @@ class PDFEngine:
                         line = f"<b>{code}</b> - {cust} ({m2:.0f}m²) <font color='blue'>{batch}</font>"
                         job_lines.append(line)
                     
-                    content = "<br/>".join(job_lines)
-                    
-                    # Tabloya satır ekle
-                    table_data.append([
-                        Paragraph(machine, style_cell_bold),
-                        Paragraph(content, style_cell_normal)
-                    ])
+                    # Tabloya satır ekle (uzun listeler sayfalar arası bölünebilsin diye parçalı)
+                    step = self.MAX_JOB_LINES_PER_ROW
+                    for start in range(0, len(job_lines), step):
+                        label = machine if start == 0 else f"{machine} (devam)"
+                        table_data.append([
+                            Paragraph(label, style_cell_bold),
+                            Paragraph("<br/>".join(job_lines[start:start + step]), style_cell_normal)
+                        ])
 
             if has_data_for_day:
                 # Tablo Stili
-                t = Table(table_data, colWidths=[120, 380])
+                t = Table(table_data, colWidths=[120, 380], repeatRows=1)
                 t.setStyle(TableStyle([
                     ('BACKGROUND', (0, 0), (-1, 0), colors.whitesmoke), # Header arkaplan
                     ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),       # Izgara çizgileri
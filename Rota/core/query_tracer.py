@@ -0,0 +1,355 @@
+"""
+EFES ROTA X - SQL Sorgu İzleyici
+get_connection() ile açılan bağlantılardaki her ifadenin süresini, döndürdüğü
+satır sayısını ve çağrıldığı yeri (ekran -> db metodu) kaydeder.
+
+- Kapalıyken ek maliyet yoktur (standart sqlite3.Connection kullanılır)
+- ROTA_SQL_TRACE=1 ortam değişkeni veya query_tracer.enable() ile açılır
+- ROTA_SQL_SLOW_MS ile yavaş sorgu eşiği ayarlanır (varsayılan 50 ms)
+
+Kullanım:
+    from core.query_tracer import query_tracer
+
+    query_tracer.enable()
+    ...
+    query_tracer.get_call_site_stats()   # Hangi ekran veritabanını ne kadar meşgul ediyor?
+    query_tracer.dump_json()              # logs/sql_trace_*.json
+"""
+
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+try:
+    from core.logger import logger
+    LOGGER_AVAILABLE = True
+except ImportError:
+    LOGGER_AVAILABLE = False
+
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Histogram sınırları (ms)
+HISTOGRAM_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+TABLE_RE = re.compile(r"\b(?:FROM|INTO|UPDATE|JOIN)\s+([A-Za-z_]\w*)", re.IGNORECASE)
+
+# Çağrı yeri aranırken atlanacak dosyalar
+_SKIP_FILES = (os.path.abspath(__file__), "contextlib.py", os.path.join("sqlite3", ""))
+
+
+def _histogram_label(index):
+    if index == 0:
+        return f"<{HISTOGRAM_BUCKETS[0]}ms"
+    if index == len(HISTOGRAM_BUCKETS):
+        return f">={HISTOGRAM_BUCKETS[-1]}ms"
+    return f"{HISTOGRAM_BUCKETS[index - 1]}-{HISTOGRAM_BUCKETS[index]}ms"
+
+
+def _bucket_index(duration_ms):
+    for i, limit in enumerate(HISTOGRAM_BUCKETS):
+        if duration_ms < limit:
+            return i
+    return len(HISTOGRAM_BUCKETS)
+
+
+def _frame_name(frame):
+    module = os.path.splitext(os.path.basename(frame.f_code.co_filename))[0]
+    qualname = getattr(frame.f_code, "co_qualname", frame.f_code.co_name)
+    return f"{module}.{qualname}"
+
+
+def find_call_site():
+    """
+    Çağrı yerini bul: (ekran, metot)
+    ekran: views/ altındaki veya kök dizindeki ilk çağıran fonksiyon
+    metot: core/ altındaki ilk çağıran fonksiyon (örn. db_manager.DatabaseManager.get_system_logs)
+    """
+    screen = method = None
+    frame = sys._getframe(2)
+    while frame is not None and screen is None:
+        filename = frame.f_code.co_filename
+        if not any(skip in filename for skip in _SKIP_FILES) and filename.startswith(BASE_DIR):
+            rel = os.path.relpath(filename, BASE_DIR)
+            if rel.startswith("core" + os.sep):
+                if method is None and frame.f_code.co_name != "get_connection":
+                    method = _frame_name(frame)
+            else:
+                screen = _frame_name(frame)
+        frame = frame.f_back
+    return screen or "-", method or "-"
+
+
+class _Pending:
+    """Satırları henüz okunmamış ifade"""
+    __slots__ = ("sql", "screen", "method", "elapsed", "rows")
+
+    def __init__(self, sql, screen, method, elapsed):
+        self.sql = sql
+        self.screen = screen
+        self.method = method
+        self.elapsed = elapsed
+        self.rows = 0
+
+
+class TracedCursor(sqlite3.Cursor):
+    """Süreyi execute + fetch toplamı olarak ölçen imleç (SQLite satırları tembel üretir)"""
+
+    def _start(self, sql):
+        self._finish()
+        screen, method = find_call_site()
+        self._pending = _Pending(sql, screen, method, 0.0)
+        self.connection._track(self)
+
+    def _finish(self, rows=None):
+        pending = getattr(self, "_pending", None)
+        if pending is None:
+            return
+        self._pending = None
+        self.connection._untrack(self)
+        if rows is not None:
+            pending.rows = rows
+        query_tracer.record(pending.sql, pending.elapsed * 1000, pending.rows, pending.screen, pending.method)
+
+    def _timed(self, func, *args):
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            pending = getattr(self, "_pending", None)
+            if pending is not None:
+                pending.elapsed += time.perf_counter() - start
+
+    def execute(self, sql, parameters=()):
+        self._start(sql)
+        self._timed(super().execute, sql, parameters)
+        if self.description is None:
+            # DML / DDL: satır döndürmez
+            self._finish(rows=max(self.rowcount, 0))
+        return self
+
+    def executemany(self, sql, seq_of_parameters):
+        self._start(sql)
+        self._timed(super().executemany, sql, seq_of_parameters)
+        self._finish(rows=max(self.rowcount, 0))
+        return self
+
+    def fetchone(self):
+        row = self._timed(super().fetchone)
+        pending = getattr(self, "_pending", None)
+        if row is None:
+            self._finish()
+        elif pending is not None:
+            pending.rows += 1
+        return row
+
+    def fetchmany(self, size=None):
+        rows = self._timed(super().fetchmany, size if size is not None else self.arraysize)
+        pending = getattr(self, "_pending", None)
+        if pending is not None:
+            pending.rows += len(rows)
+        if not rows:
+            self._finish()
+        return rows
+
+    def fetchall(self):
+        rows = self._timed(super().fetchall)
+        pending = getattr(self, "_pending", None)
+        if pending is not None:
+            pending.rows += len(rows)
+        self._finish()
+        return rows
+
+    def __next__(self):
+        row = self.fetchone()
+        if row is None:
+            raise StopIteration
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+
+class TracedConnection(sqlite3.Connection):
+    """sqlite3.connect(factory=TracedConnection) ile kullanılan izlenen bağlantı"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # fetchone() ile tek satır okunup bırakılan imleçler kapanışta kaydedilir
+        self._open_cursors = set()
+
+    def _track(self, cursor):
+        self._open_cursors.add(cursor)
+
+    def _untrack(self, cursor):
+        self._open_cursors.discard(cursor)
+
+    def cursor(self, factory=TracedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def close(self):
+        # Sonuna kadar okunmamış imleçleri de kaydet
+        for cursor in list(self._open_cursors):
+            cursor._finish()
+        super().close()
+
+
+class QueryTracer:
+    """İfade bazlı istatistik, histogram ve yavaş sorgu kaydı"""
+
+    MAX_SLOW_QUERIES = 200
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.enabled = os.environ.get("ROTA_SQL_TRACE", "").lower() in ("1", "true", "yes", "on")
+        try:
+            self.slow_threshold_ms = float(os.environ.get("ROTA_SQL_SLOW_MS", 50))
+        except ValueError:
+            self.slow_threshold_ms = 50.0
+        self.reset()
+
+    # === AÇ / KAPAT ===
+
+    def enable(self, slow_threshold_ms=None):
+        if slow_threshold_ms is not None:
+            self.slow_threshold_ms = slow_threshold_ms
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def connection_factory(self):
+        """get_connection() için bağlantı sınıfı (kapalıyken standart bağlantı)"""
+        return TracedConnection if self.enabled else sqlite3.Connection
+
+    def reset(self):
+        with self._lock:
+            self.started_at = datetime.now()
+            self._statements = {}
+            self._call_sites = {}
+            self._slow = deque(maxlen=self.MAX_SLOW_QUERIES)
+
+    # === KAYIT ===
+
+    def record(self, sql, duration_ms, rows, screen="-", method="-"):
+        key = " ".join(sql.split())
+        site = f"{screen} → {method}"
+        slow = duration_ms >= self.slow_threshold_ms
+
+        with self._lock:
+            stat = self._statements.get(key)
+            if stat is None:
+                match = TABLE_RE.search(key)
+                stat = self._statements[key] = {
+                    "sql": key, "table": match.group(1) if match else "-",
+                    "count": 0, "total_ms": 0.0, "max_ms": 0.0, "rows": 0,
+                    "histogram": [0] * (len(HISTOGRAM_BUCKETS) + 1), "call_sites": {},
+                }
+            stat["count"] += 1
+            stat["total_ms"] += duration_ms
+            stat["max_ms"] = max(stat["max_ms"], duration_ms)
+            stat["rows"] += rows
+            stat["histogram"][_bucket_index(duration_ms)] += 1
+            stat["call_sites"][site] = stat["call_sites"].get(site, 0) + 1
+
+            cs = self._call_sites.get(site)
+            if cs is None:
+                cs = self._call_sites[site] = {"screen": screen, "method": method, "count": 0,
+                                               "total_ms": 0.0, "max_ms": 0.0, "rows": 0}
+            cs["count"] += 1
+            cs["total_ms"] += duration_ms
+            cs["max_ms"] = max(cs["max_ms"], duration_ms)
+            cs["rows"] += rows
+
+            if slow:
+                self._slow.append({
+                    "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    "duration_ms": round(duration_ms, 2), "rows": rows,
+                    "screen": screen, "method": method, "sql": key,
+                })
+
+        if slow and LOGGER_AVAILABLE:
+            logger.db_operation(f"YAVAŞ SORGU ({site})", stat["table"], duration_ms)
+
+    # === RAPOR ===
+
+    def get_statement_stats(self, limit=None):
+        """İfadeler, toplam süreye göre azalan"""
+        with self._lock:
+            stats = [dict(s, call_sites=dict(s["call_sites"]), histogram=list(s["histogram"]))
+                     for s in self._statements.values()]
+        for s in stats:
+            s["avg_ms"] = s["total_ms"] / s["count"] if s["count"] else 0
+        stats.sort(key=lambda s: s["total_ms"], reverse=True)
+        return stats[:limit] if limit else stats
+
+    def get_call_site_stats(self, limit=None):
+        """Çağrı yerleri (ekran → metot), toplam süreye göre azalan"""
+        with self._lock:
+            stats = [dict(s) for s in self._call_sites.values()]
+        for s in stats:
+            s["avg_ms"] = s["total_ms"] / s["count"] if s["count"] else 0
+        stats.sort(key=lambda s: s["total_ms"], reverse=True)
+        return stats[:limit] if limit else stats
+
+    def get_slow_queries(self, limit=None):
+        """En yeni yavaş sorgular önce"""
+        with self._lock:
+            slow = list(reversed(self._slow))
+        return slow[:limit] if limit else slow
+
+    def get_summary(self):
+        with self._lock:
+            count = sum(s["count"] for s in self._statements.values())
+            total = sum(s["total_ms"] for s in self._statements.values())
+            return {
+                "enabled": self.enabled,
+                "since": self.started_at.strftime("%Y-%m-%d %H:%M:%S"),
+                "statement_count": count,
+                "distinct_statements": len(self._statements),
+                "total_ms": round(total, 2),
+                "slow_count": len(self._slow),
+                "slow_threshold_ms": self.slow_threshold_ms,
+            }
+
+    def dump_json(self, path=None):
+        """Tüm istatistikleri JSON dosyasına yaz, dosya yolunu döndür"""
+        if path is None:
+            log_dir = os.path.join(BASE_DIR, "logs")
+            os.makedirs(log_dir, exist_ok=True)
+            path = os.path.join(log_dir, f"sql_trace_{datetime.now():%Y%m%d_%H%M%S}.json")
+
+        statements = self.get_statement_stats()
+        for s in statements:
+            s["histogram"] = {_histogram_label(i): n for i, n in enumerate(s["histogram"]) if n}
+
+        data = {
+            "summary": self.get_summary(),
+            "call_sites": self.get_call_site_stats(),
+            "statements": statements,
+            "slow_queries": self.get_slow_queries(),
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+        if LOGGER_AVAILABLE:
+            logger.performance_metric("SQL izleme ifade sayısı", data["summary"]["statement_count"])
+            logger.info("SQL izleme dökümü kaydedildi", file=path)
+        return path
+
+
+# Singleton instance
+query_tracer = QueryTracer()
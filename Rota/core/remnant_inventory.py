@@ -0,0 +1,103 @@
+"""
+EFES ROTA X - Artık (Remnant) Envanteri
+Kesimden kalan, MIN_SIZE_CM üstündeki parçaları kaydeder ve kesim optimizasyonunda
+yeni levhadan önce kullanılmalarını sağlar.
+
+Dizin yapısı:
+- (kalınlık, cam tipi) başına bir RemnantBucket
+- Bucket içinde artıklar alan sırasıyla tutulur; kenarlar (uzun, kısa) olarak
+  normalize edilir, böylece döndürülerek sığan artıklar da bulunur
+- "W×H'e sığan en küçük artık" sorgusu ikili aramayla alanı yetenlerden başlar
+
+Kullanım:
+    from core.remnant_inventory import remnant_inventory
+    index = remnant_inventory.load_index()
+    remnant = index.find(6, "Düz Cam", 80, 120)     # Sığan en küçük artık veya None
+    remnant_inventory.commit_plan(plan, location="A-3")  # Plan kesildi: stoğu güncelle
+"""
+
+try:
+    from core.db_manager import db
+except ImportError:
+    db = None
+
+from core.cutting_packing import RemnantBucket      # Veritabanısız: kesim işçileri de kullanır
+
+
+class RemnantIndex:
+    """(kalınlık, cam tipi) anahtarlı artık dizini"""
+
+    def __init__(self, remnants=()):
+        self._buckets = {}
+        for remnant in remnants:
+            self.add(remnant)
+
+    def __len__(self):
+        return sum(len(b) for b in self._buckets.values())
+
+    def bucket(self, thickness, glass_type):
+        key = (thickness, glass_type)
+        if key not in self._buckets:
+            self._buckets[key] = RemnantBucket()
+        return self._buckets[key]
+
+    def add(self, remnant):
+        self.bucket(remnant['thickness'], remnant['glass_type']).add(remnant)
+
+    def remove(self, remnant):
+        return self.bucket(remnant['thickness'], remnant['glass_type']).remove(remnant['id'])
+
+    def find(self, thickness, glass_type, w, h):
+        bucket = self._buckets.get((thickness, glass_type))
+        return bucket.find(w, h) if bucket else None
+
+    def items(self, thickness, glass_type):
+        bucket = self._buckets.get((thickness, glass_type))
+        return bucket.items() if bucket else []
+
+
+class RemnantInventory:
+    """Artık stoğu: dizin yükleme ve kesilen planı stoğa işleme"""
+
+    MIN_SIZE_CM = 20    # İki kenarı da bu ölçü ve üstündeki artıklar kaydedilir
+
+    def __init__(self):
+        self.min_size = self.MIN_SIZE_CM
+
+    def load_index(self):
+        """Stoktaki tüm artıklardan dizin kur (tek sorgu)"""
+        try:
+            return RemnantIndex(db.get_available_remnants() if db else [])
+        except Exception as e:
+            # Artık tablosu olmayan eski veritabanı: artıksız devam
+            print(f"Artık stoğu okunamadı: {e}")
+            return RemnantIndex()
+
+    def collect_offcuts(self, plan, min_size=None, location=""):
+        """Plandaki kaydedilecek artıklar: [(kalınlık, tip, en, boy, konum, kaynak_plaka), ...]"""
+        min_size = self.min_size if min_size is None else min_size
+        rows = []
+        for sheet in plan.sheets:
+            glass_type = sheet.glass_type or plan.glass_type
+            for _, _, w, h in sheet.offcuts(min_size):
+                rows.append((plan.thickness, glass_type, round(w, 1), round(h, 1), location, sheet.plate_id))
+        return rows
+
+    def commit_plan(self, plan, location="", min_size=None):
+        """
+        Kesilen planı stoğa yansıt: kullanılan artıklar düşülür, plakalar azaltılır,
+        yeni artıklar kaydedilir. Döner: {'remnants_used', 'plates_used', 'remnants_added'}
+        """
+        plate_usage = {pid: n for pid, n in plan.stock_used.items() if pid is not None}
+        offcuts = self.collect_offcuts(plan, min_size, location)
+        if db:
+            db.apply_cutting_result(plan.remnants_used, plate_usage, offcuts)
+        return {
+            "remnants_used": len(plan.remnants_used),
+            "plates_used": sum(plate_usage.values()),
+            "remnants_added": len(offcuts),
+        }
+
+
+# Singleton instance
+remnant_inventory = RemnantInventory()
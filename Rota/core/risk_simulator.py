@@ -0,0 +1,243 @@
+"""
+EFES ROTA X - Monte Carlo Teslim Tarihi Risk Simülasyonu
+Nominal kapasitelerle tek noktalı tahmin yerine, geçmiş üretimden ölçülen
+değişkenlikle yüzlerce çizelge simülasyonu çalıştırır ve her sipariş için
+P50 / P90 bitiş tarihi verir (satış, teslim tarihini güven seviyesiyle verebilsin).
+
+Model (production_logs geçmişinden):
+- Kapasite: istasyonun günlük üretilen m²'sinin değişkenlik katsayısı (CV).
+  Bir koşuda her istasyon, ortalaması 1 olan log-normal bir katsayıyla çalışır;
+  günlük dalgalanma hafta içinde kısmen dengelendiği için CV / √AVERAGING_DAYS kullanılır.
+- Fire: istasyonun fire oranı Beta(fire + 1, tamamlanan + önsel) dağılımından çekilir;
+  siparişin kırılan adedi rotadaki toplam fire olasılığıyla binom çekilir ve kırılanlar
+  rotayı yeniden dolaşacağı için siparişin m²'si o oranda büyür.
+- Her koşu, planlayıcının aynı iş listesiyle FiniteCapacityScheduler çalıştırır.
+
+Koşular süreç havuzunda paralel çalışır (az koşuda sıralı); işçi fonksiyonu
+veritabanı import etmeyen core.risk_worker'dadır. Arayüzden çağrılırken
+bir arka plan iş parçacığında (core.db_async.BackgroundTask) çalıştırılmalıdır.
+
+Kullanım:
+    from core.smart_planner import planner
+    risk = planner.calculate_delivery_risk(new_order_data, runs=300)
+    risk.summary('>>> HESAPLANAN <<<')  # {'p50_date', 'p90_date', 'on_time_prob', ...}
+"""
+
+import math
+import os
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta
+
+try:
+    from core.db_manager import db
+except ImportError:
+    db = None
+
+from core.risk_worker import simulate_runs
+
+
+class RiskResult:
+    """Sipariş bazlı bitiş günü örnekleri ve yüzdelikleri"""
+
+    def __init__(self, finishes, due_days, start_date, runs, elapsed=0.0):
+        self.finishes = {code: sorted(days) for code, days in finishes.items()}
+        self.due_days = due_days        # order_code -> termin (başlangıçtan gün)
+        self.start_date = start_date
+        self.runs = runs
+        self.elapsed = elapsed
+
+    def __contains__(self, code):
+        return bool(self.finishes.get(code))
+
+    def quantile(self, code, q):
+        """q yüzdeliğindeki bitiş günü (en yakın sıra yöntemi)"""
+        days = self.finishes.get(code)
+        if not days:
+            return None
+        idx = min(len(days) - 1, max(0, math.ceil(q * len(days)) - 1))
+        return days[idx]
+
+    def date_of(self, day):
+        return self.start_date + timedelta(days=math.ceil(day))
+
+    def on_time_probability(self, code):
+        days = self.finishes.get(code)
+        due = self.due_days.get(code)
+        if not days or due is None:
+            return None
+        return sum(1 for d in days if math.ceil(d) <= due) / len(days)
+
+    def summary(self, code):
+        if code not in self:
+            return None
+        p50, p90 = self.quantile(code, 0.5), self.quantile(code, 0.9)
+        return {
+            "code": code,
+            "p50_day": p50,
+            "p90_day": p90,
+            "p50_date": self.date_of(p50),
+            "p90_date": self.date_of(p90),
+            "on_time_prob": self.on_time_probability(code),
+        }
+
+    def summaries(self):
+        """Tüm siparişler, P90 bitişi en geç olandan başlayarak"""
+        rows = [self.summary(code) for code in self.finishes if code in self]
+        return sorted(rows, key=lambda r: r['p90_day'], reverse=True)
+
+
+class DeliveryRiskSimulator:
+    """production_logs'tan değişkenlik öğrenip Monte Carlo çizelge koşuları yapar"""
+
+    RUNS = 300
+    MIN_PARALLEL_RUNS = 40      # Bunun altında süreç açma maliyeti kazançtan büyük
+    HISTORY_DAYS = 90
+    MIN_HISTORY_DAYS = 5        # Daha az üretim günü olan istasyon DEFAULT_CV kullanır
+    AVERAGING_DAYS = 5
+    DEFAULT_CV = 0.10
+    MAX_CV = 0.50
+    MIN_FACTOR = 0.2            # Kapasite katsayısı alt sınırı
+    FIRE_PRIOR_RATE = 0.01      # Geçmişi olmayan istasyonda beklenen fire oranı
+    FIRE_PRIOR_WEIGHT = 100     # Önselin adet cinsinden ağırlığı
+    FIT_TTL_SECONDS = 600
+
+    def __init__(self):
+        self.variability = None
+        self._fitted_at = 0.0
+
+    # === MODEL ===
+
+    def fit(self, rows=None):
+        """
+        İstasyon bazlı değişkenlik: {istasyon: {'cv', 'fire_alpha', 'fire_beta', 'days'}}
+        rows verilmezse son HISTORY_DAYS günün production_logs özetinden okunur.
+        """
+        if rows is None:
+            try:
+                rows = db.get_station_daily_output(self.HISTORY_DAYS) if db else []
+            except Exception as e:
+                print(f"Üretim geçmişi okunamadı: {e}")
+                rows = []
+
+        daily, done, broken = {}, {}, {}
+        for row in rows:
+            station = row['station_name']
+            if (row['done_m2'] or 0) > 0:
+                daily.setdefault(station, []).append(row['done_m2'])
+            done[station] = done.get(station, 0) + (row['done_qty'] or 0)
+            broken[station] = broken.get(station, 0) + (row['fire_qty'] or 0)
+
+        prior_fire = self.FIRE_PRIOR_RATE * self.FIRE_PRIOR_WEIGHT
+        variability = {}
+        for station in set(daily) | set(done):
+            values = daily.get(station, [])
+            cv = self.DEFAULT_CV
+            if len(values) >= self.MIN_HISTORY_DAYS:
+                mean = statistics.fmean(values)
+                if mean > 0:
+                    cv = statistics.pstdev(values) / mean / math.sqrt(self.AVERAGING_DAYS)
+            variability[station] = {
+                "cv": min(cv, self.MAX_CV),
+                "fire_alpha": broken.get(station, 0) + prior_fire,
+                "fire_beta": done.get(station, 0) + self.FIRE_PRIOR_WEIGHT - prior_fire,
+                "days": len(values),
+            }
+
+        self.variability = variability
+        self._fitted_at = time.monotonic()
+        return variability
+
+    def get_variability(self):
+        if self.variability is None or time.monotonic() - self._fitted_at > self.FIT_TTL_SECONDS:
+            self.fit()
+        return self.variability
+
+    # === SİMÜLASYON ===
+
+    def simulate(self, jobs, capacities, alternatives=None, weekday_factors=None, holidays=None,
+                 changeover=None, runs=None, workers=None, seed=0, progress_callback=None):
+        """
+        jobs: SmartPlanner sırasında çizelge işleri; changeover: {istasyon: ayar matrisi}
+        progress_callback(biten_koşu, toplam) koşular bittikçe çağrılır.
+        Döner: RiskResult
+        """
+        started = time.monotonic()
+        runs = runs or self.RUNS
+        today = datetime.now().date()
+        variability = self.get_variability()
+
+        # Süreçlere yalnız çizelgenin kullandığı alanlar gider
+        slim_jobs, due_days = [], {}
+        for job in jobs:
+            order = job['order']
+            code = order.get('order_code')
+            slim_jobs.append({
+                'order': {
+                    'order_code': code,
+                    'quantity': order.get('quantity'),
+                    'thickness': order.get('thickness'),
+                    'product_type': order.get('product_type'),
+                },
+                'steps': job['steps'],
+            })
+            try:
+                due_days[code] = (datetime.strptime(order.get('delivery_date') or '', '%Y-%m-%d').date() - today).days
+            except ValueError:
+                pass
+
+        default = {
+            "cv": self.DEFAULT_CV,
+            "fire_alpha": self.FIRE_PRIOR_RATE * self.FIRE_PRIOR_WEIGHT,
+            "fire_beta": self.FIRE_PRIOR_WEIGHT * (1 - self.FIRE_PRIOR_RATE),
+        }
+        model = {
+            "jobs": slim_jobs,
+            "capacities": dict(capacities),
+            "alternatives": alternatives or {},
+            "weekday_factors": weekday_factors,
+            "holidays": list(holidays or []),
+            "start_date": today,
+            "changeover": changeover,
+            "variability": {s: variability.get(s, default) for s in capacities},
+            "min_factor": self.MIN_FACTOR,
+        }
+
+        seeds = [seed * 1000003 + i for i in range(runs)]
+        finishes = {}
+
+        def merge(part):
+            for code, days in part.items():
+                finishes.setdefault(code, []).extend(days)
+
+        workers = workers or os.cpu_count() or 1
+        done = 0
+        if workers > 1 and runs >= self.MIN_PARALLEL_RUNS:
+            chunk = max(1, math.ceil(runs / (workers * 4)))
+            tasks = [(model, seeds[i:i + chunk]) for i in range(0, runs, chunk)]
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    futures = {executor.submit(simulate_runs, task): len(task[1]) for task in tasks}
+                    for future in as_completed(futures):
+                        merge(future.result())
+                        done += futures[future]
+                        if progress_callback:
+                            progress_callback(done, runs)
+                return RiskResult(finishes, due_days, today, runs, time.monotonic() - started)
+            except (OSError, NotImplementedError, ValueError) as e:
+                print(f"Paralel risk simülasyonu açılamadı, sıralı devam: {e}")
+                finishes, done = {}, 0
+
+        chunk = max(1, runs // 20)
+        for i in range(0, runs, chunk):
+            part = seeds[i:i + chunk]
+            merge(simulate_runs((model, part)))
+            done += len(part)
+            if progress_callback:
+                progress_callback(done, runs)
+        return RiskResult(finishes, due_days, today, runs, time.monotonic() - started)
+
+
+# Singleton instance
+risk_simulator = DeliveryRiskSimulator()
@@ -0,0 +1,81 @@
+"""
+EFES ROTA X - Risk Simülasyonu Süreç İşçisi
+core.risk_simulator'ın süreç havuzunda çalışan Monte Carlo koşuları.
+
+Bu modül veritabanı (core.db_manager) import etmez: spawn ile açılan her işçi
+süreci modülü yeniden yüklediğinde DatabaseManager kurulmaz, paylaşımdaki
+efes_factory.db'ye dokunulmaz. İşçinin ihtiyacı olan her şey model sözlüğüyle gelir.
+
+Kullanım:
+    from core.risk_worker import simulate_runs
+    finishes = simulate_runs((model, seeds))   # {order_code: [bitiş günü, ...]}
+"""
+
+import math
+import random
+
+from core.factory_config import FactoryConfig
+from core.scheduler import FiniteCapacityScheduler, ShiftCalendar
+
+
+def _sample_factor(rng, cv, min_factor):
+    """Ortalaması 1, değişkenlik katsayısı cv olan log-normal kapasite katsayısı"""
+    if cv <= 0:
+        return 1.0
+    sigma = math.sqrt(math.log(1 + cv * cv))
+    return max(min_factor, rng.lognormvariate(-sigma * sigma / 2, sigma))
+
+
+def _binomial(rng, n, p):
+    if n <= 0 or p <= 0:
+        return 0
+    if n <= 50:
+        return sum(1 for _ in range(n) if rng.random() < p)
+    k = round(rng.gauss(n * p, math.sqrt(n * p * (1 - p))))
+    return min(n, max(0, k))
+
+
+def simulate_runs(task):
+    """Süreç havuzu işçisi: (model, tohumlar) -> {order_code: [bitiş günü, ...]}"""
+    model, seeds = task
+    matrices = model['changeover']
+    changeover = None
+    if matrices:
+        changeover = lambda m, a, b: FactoryConfig.changeover_from_matrix(matrices.get(m), a, b)
+
+    finishes = {}
+    for seed in seeds:
+        rng = random.Random(seed)
+        factors, fire = {}, {}
+        for station, v in model['variability'].items():
+            factors[station] = _sample_factor(rng, v['cv'], model['min_factor'])
+            fire[station] = rng.betavariate(v['fire_alpha'], v['fire_beta'])
+        capacities = {m: c * factors.get(m, 1.0) for m, c in model['capacities'].items()}
+
+        jobs = []
+        for job in model['jobs']:
+            survive = 1.0
+            for step in job['steps']:
+                survive *= 1.0 - fire.get(step[0], 0.0)
+            qty = job['order'].get('quantity') or 1
+            inflate = 1.0 + _binomial(rng, qty, 1.0 - survive) / qty
+
+            steps = []
+            for step in job['steps']:
+                if len(step) > 2:
+                    # Fırın süresi nominal kapasite içindir: katsayıyla ölçekle
+                    steps.append((step[0], step[1] * inflate, step[2] * inflate / factors.get(step[0], 1.0)))
+                else:
+                    steps.append((step[0], step[1] * inflate))
+            jobs.append({'order': job['order'], 'steps': steps})
+
+        scheduler = FiniteCapacityScheduler(
+            capacities,
+            alternatives=model['alternatives'],
+            calendar=ShiftCalendar(model['weekday_factors'], model['holidays'], model['start_date']),
+            horizon_days=0,     # Izgaralar gerekmiyor, yalnız bitiş zamanları
+            changeover=changeover
+        )
+        for code, day in scheduler.run(jobs).order_finish_times.items():
+            finishes.setdefault(code, []).append(day)
+    return finishes
@@ -0,0 +1,307 @@
+"""
+EFES ROTA X - Barkod Okutma Kuyruğu ve Merkeze Aktarım (Operatör Terminali)
+Okutmaları anında kabul eder, arka planda küçük toplu işlemlerle merkezi veritabanına yazar.
+
+Çalışma şekli:
+- submit() / submit_fire() olayı terminalin yerel günlüğüne (core.offline_journal)
+  yazar, ardından bellekteki kuyruğa koyar; merkezi veritabanı kilidi beklenmez.
+- Arka plan thread'i ilk olaydan sonra BATCH_WINDOW_S kadar bekleyip en fazla
+  BATCH_SIZE olayı tek BEGIN IMMEDIATE işleminde uygular (db.record_production_events).
+- Kilit / bağlantı hatasında (sqlite3.OperationalError) terminal çevrimdışı sayılır,
+  toplu işlem artan aralıklarla yeniden denenir; olaylar günlükte durduğu için program
+  kapansa da kaybolmaz, bir sonraki start() aktarılmamış olayları yeniden kuyruğa alır.
+- Olaylar event_uuid taşır: merkeze yazılıp günlükte işaretlenemeden kesilen olay
+  tekrar oynatıldığında ikinci kez yazılmaz.
+- Merkezde uygulanamayan olaylar (ör. silinmiş sipariş) günlükte hatalı kalır;
+  failed_events() ile operatöre gösterilir, retry_failed() / discard_failed() ile kapatılır.
+- Aktarılmış olaylar start()'ta ve saatte bir günlükten temizlenir (KEEP_SYNCED_DAYS).
+- Her olay için kabul (submit süresi) ve onay (okutma → commit) gecikmesi ölçülür.
+
+Kullanım:
+    from core.scan_ingest import scan_queue
+    scan_queue.add_listener(on_ack)    # on_ack(olay, sonuç, hata) - arka plan thread'inden çağrılır
+    scan_queue.start()
+    scan_queue.submit(order_id, "TEMPER", None, "Ali Veli")   # None = istasyonda kalan adet
+    scan_queue.submit_fire(order_id, 2, "TEMPER", "Ali Veli")
+    scan_queue.get_stats()
+    scan_queue.failed_events()         # [{'code', 'station_name', 'last_error', ...}]
+"""
+
+import queue
+import sqlite3
+import threading
+import time
+
+from core.offline_journal import OfflineJournal
+
+try:
+    from core.db_manager import db
+except ImportError:
+    db = None
+
+try:
+    from core.logger import logger
+    LOGGER_AVAILABLE = True
+except ImportError:
+    LOGGER_AVAILABLE = False
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class ScanIngestQueue:
+    """Yerel günlük destekli okutma kuyruğu + merkeze toplu yazan arka plan thread'i"""
+
+    BATCH_SIZE = 25             # Tek işlemde en fazla olay
+    BATCH_WINDOW_S = 0.2        # İlk olaydan sonra toplu işlem için bekleme
+    RETRY_DELAYS_S = (0.5, 1, 2, 5)
+    HISTORY = 1000              # Persentiller için tutulan son gecikme ölçümü
+    PURGE_INTERVAL_S = 3600     # Aktarılmış olayların günlükten temizlenme aralığı
+
+    def __init__(self, db_manager=None, journal=None, batch_size=None, batch_window_s=None):
+        self.db = db_manager or db
+        self.journal = journal or OfflineJournal()
+        self.batch_size = batch_size or self.BATCH_SIZE
+        self.batch_window_s = self.BATCH_WINDOW_S if batch_window_s is None else batch_window_s
+        self.online = True              # Son aktarım denemesi merkeze ulaştı mı
+        self.last_error = None
+
+        self._queue = queue.Queue()
+        self._pending = set()           # Aktarılmamış olayların event_uuid'leri
+        self._pending_lock = threading.Lock()
+        self._listeners = []
+        self._thread = None
+        self._stop = threading.Event()
+        self._next_purge = 0.0
+
+        self._accept_ms = []
+        self._ack_ms = []
+        self._batches = 0
+        self._acked = 0
+        self._retries = 0
+
+    # === AÇ / KAPAT ===
+
+    def start(self):
+        """Aktarılmamış olayları günlükten geri yükle ve yazıcı thread'ini başlat"""
+        if self._thread is not None and self._thread.is_alive():
+            return False
+
+        restored = self._restore_journal()
+        self._purge_journal()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="ScanIngest", daemon=True)
+        self._thread.start()
+
+        if LOGGER_AVAILABLE and restored:
+            logger.info("Okutma kuyruğu geri yüklendi", pending=restored)
+        return True
+
+    def stop(self, timeout=5.0):
+        """Kuyruktakileri yazmayı dener; yazılamayanlar günlükte bir sonraki start()'a kalır"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def add_listener(self, callback):
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    # === KABUL ===
+
+    def submit(self, order_id, station_name, qty=None, operator_name="Sistem", code=None):
+        """Üretim okutmasını kabul et (günlüğe yaz + kuyruğa koy). Döner: event_uuid"""
+        return self._accept({'kind': 'production', 'order_id': order_id, 'station_name': station_name,
+                             'qty': qty, 'operator_name': operator_name, 'code': code})
+
+    def submit_fire(self, order_id, qty, station_name, operator_name="Sistem", code=None):
+        """Fire bildirimini kabul et (rework siparişi aktarımda açılır). Döner: event_uuid"""
+        return self._accept({'kind': 'fire', 'order_id': order_id, 'station_name': station_name,
+                             'qty': qty, 'operator_name': operator_name, 'code': code})
+
+    def _accept(self, event):
+        started = time.perf_counter()
+        event_uuid = self.journal.append(event)
+        with self._pending_lock:
+            self._pending.add(event_uuid)
+        self._queue.put((event, started))
+        self._remember(self._accept_ms, (time.perf_counter() - started) * 1000)
+        return event_uuid
+
+    def pending_count(self):
+        with self._pending_lock:
+            return len(self._pending)
+
+    def _restore_journal(self):
+        restored = 0
+        for event in self.journal.pending():
+            with self._pending_lock:
+                if event['event_uuid'] in self._pending:
+                    continue
+                self._pending.add(event['event_uuid'])
+            self._queue.put((event, time.perf_counter()))
+            restored += 1
+        return restored
+
+    def _purge_journal(self):
+        self._next_purge = time.monotonic() + self.PURGE_INTERVAL_S
+        try:
+            self.journal.purge_synced()
+        except sqlite3.Error as e:
+            if LOGGER_AVAILABLE:
+                logger.error("Terminal günlüğü temizlenemedi", error=str(e))
+
+    # === HATALI OLAYLAR ===
+
+    def failed_events(self):
+        """Merkezde uygulanamamış olaylar (operatöre gösterilir)"""
+        return self.journal.failed()
+
+    def failed_count(self):
+        return self.journal.failed_count()
+
+    def retry_failed(self):
+        """Hatalı olayları tekrar kuyruğa al. Döner: kuyruğa alınan sayısı"""
+        self.journal.requeue_failed()
+        return self._restore_journal()
+
+    def discard_failed(self):
+        return self.journal.discard_failed()
+
+    # === YAZICI THREAD ===
+
+    def _run(self):
+        while True:
+            try:
+                first = self._queue.get(timeout=0.25)
+            except queue.Empty:
+                if self._stop.is_set():
+                    return
+                if time.monotonic() >= self._next_purge:
+                    self._purge_journal()
+                continue
+
+            batch = [first]
+            deadline = time.perf_counter() + self.batch_window_s
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0 or self._stop.is_set():
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            if not self._commit(batch):
+                return                  # Durduruldu, veritabanına ulaşılamadı: olaylar günlükte
+
+    def _commit(self, batch):
+        events = [event for event, _ in batch]
+        results = []
+        errors = {}
+        attempt = 0
+        stopped = False
+        while len(results) < len(events):
+            pending = events[len(results):]
+            try:
+                results.extend(self.db.record_production_events(pending))
+                self.online, self.last_error = True, None
+                continue
+            except sqlite3.OperationalError as e:
+                # Kilitli / erişilemeyen veritabanı: çevrimdışı, kalan olaylar sonra tekrar
+                self.online, self.last_error = False, str(e)
+            except Exception:
+                # Hatalı olay tüm toplu işlemi düşürmesin: tek tek uygula
+                for event in pending:
+                    try:
+                        results.append(self.db.record_production_events([event])[0])
+                    except sqlite3.OperationalError as e:
+                        # Geçici hata kalıcı hata sayılmaz: kalanlar beklemede, yeniden denenir
+                        self.online, self.last_error = False, str(e)
+                        break
+                    except Exception as e:
+                        results.append(None)
+                        errors[event['event_uuid']] = str(e)
+                else:
+                    self.online, self.last_error = True, None
+                    continue
+
+            if self._stop.is_set():
+                with self._pending_lock:    # Sonraki start() günlükten yeniden alsın
+                    self._pending.difference_update(
+                        event['event_uuid'] for event in events[len(results):])
+                stopped = True
+                break
+            self._retries += 1
+            time.sleep(self.RETRY_DELAYS_S[min(attempt, len(self.RETRY_DELAYS_S) - 1)])
+            attempt += 1
+
+        # Durdurulduysa yalnızca uygulanmış olaylar onaylanır
+        events, batch = events[:len(results)], batch[:len(results)]
+        if not events:
+            return not stopped
+
+        # Üretimde None = sipariş yok; fire'da None = tekrar oynatma (siparişi yoksa hata verir)
+        for event, result in zip(events, results):
+            if result is None and event['kind'] == 'production' and event['event_uuid'] not in errors:
+                errors[event['event_uuid']] = "Sipariş bulunamadı"
+
+        self.journal.mark_synced([e['event_uuid'] for e in events if e['event_uuid'] not in errors])
+        for event_uuid, error in errors.items():
+            self.journal.mark_failed(event_uuid, error)
+        with self._pending_lock:
+            self._pending.difference_update(e['event_uuid'] for e in events)
+
+        done = time.perf_counter()
+        self._batches += 1
+        self._acked += len(events)
+        for (event, started), result in zip(batch, results):
+            latency_ms = (done - started) * 1000
+            self._remember(self._ack_ms, latency_ms)
+            event = dict(event, ack_ms=latency_ms)
+            error = errors.get(event['event_uuid'])
+            if error and LOGGER_AVAILABLE:
+                logger.error("Okutma yazılamadı", code=event.get('code'), error=error)
+            for callback in list(self._listeners):
+                try:
+                    callback(event, result, error)
+                except Exception:
+                    pass
+        return not stopped
+
+    # === İSTATİSTİK ===
+
+    def _remember(self, values, value):
+        values.append(value)
+        if len(values) > self.HISTORY:
+            del values[:len(values) - self.HISTORY]
+
+    def get_stats(self):
+        """Kabul / onay gecikmeleri (ms) ve toplu işlem sayıları"""
+        accept = sorted(self._accept_ms)
+        ack = sorted(self._ack_ms)
+        return {
+            'acked': self._acked,
+            'pending': self.pending_count(),
+            'batches': self._batches,
+            'avg_batch': self._acked / self._batches if self._batches else 0.0,
+            'retries': self._retries,
+            'online': self.online,
+            'accept_p95_ms': _percentile(accept, 95),
+            'ack_p50_ms': _percentile(ack, 50),
+            'ack_p95_ms': _percentile(ack, 95),
+            'ack_max_ms': ack[-1] if ack else 0.0,
+        }
+
+
+# Singleton instance
+scan_queue = ScanIngestQueue()
@@ -0,0 +1,489 @@
+"""
+EFES ROTA X - Sonlu Kapasiteli Ayrık Olay Çizelgeleyici
+Rota adımlarını makinelere, alternatif istasyonları da kullanarak dağıtır.
+
+Çalışma şekli:
+- Her sipariş rotasındaki bekleyen adımlar sırayla "hazır" olur (öncül adım bitince).
+- Hazır adım kendi istasyonunun kuyruğuna girer; kuyruk, planlayıcı sırasına
+  (öncelik) göre dizilidir.
+- Boşalan her makine, hizmet verebildiği kuyruklardan (kendi istasyonu + kendisini
+  alternatif gösteren istasyonlar) en öncelikli işi alır. Alternatif makine işi
+  ancak ana istasyonun mevcut birikmiş işini eritmesinden önce bitirebilecekse alır.
+- Süreler vardiya takvimine göre hesaplanır: gün katsayısı 0 ise makine çalışmaz,
+  0.5 ise o gün yarım kapasite üretir.
+- changeover verilirse makine, bir önceki işinden farklı sınıfta (kalınlık, ürün)
+  bir işe geçerken ayar süresi harcar; bu süre kapasiteyi tüketir ama m² üretmez.
+
+Olaylar tek bir heap üzerinden işlenir; binlerce operasyonda O(n log n).
+Olaylar zaman sırasıyla işlendiği için simülasyon saati N. güne geçtiğinde ilk N
+günün ızgaraları kesinleşir: partial_days verilirse bu anda ara sonuç bildirilir.
+should_stop verilirse belirli aralıklarla sorulur; True dönerse ScheduleCancelled.
+
+Kullanım:
+    scheduler = FiniteCapacityScheduler(capacities, alternatives, ShiftCalendar(), horizon_days=30,
+                                        changeover=factory_config.get_changeover_minutes)
+    result = scheduler.run(jobs)
+    result.forecast_grid, result.details_grid, result.loads_grid, result.gantt
+    result.details_grid["INTERMAC"][3]             # Seyrek (DayDetails), liste gibi okunur
+    result.setup_days, result.changeover_count     # Ayar kayıpları
+
+    # İlk 7 gün hazır olunca ara ızgaralar, iptal edilebilir
+    scheduler.run(jobs, partial_days=[7], partial_callback=on_partial, should_stop=lambda: cancelled)
+"""
+
+import heapq
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+
+
+MINUTES_PER_DAY = 1320      # Günlük üretim süresi (22 saat): ayar / çevrim dakikasını güne çevirir
+
+# Olay türleri (aynı anda önce hazır olan işler kuyruğa girer, sonra makine seçer)
+_READY = 0
+_FREE = 1
+
+
+class ScheduleCancelled(Exception):
+    """Çizelge should_stop ile yarıda kesildi"""
+
+
+class ShiftCalendar:
+    """
+    Gün bazlı vardiya kapasitesi.
+    weekday_factors: Pazartesi..Pazar için kapasite katsayısı (1.0 = tam vardiya)
+    holidays: çalışılmayan tarihler (date veya 'YYYY-MM-DD')
+    """
+
+    def __init__(self, weekday_factors=None, holidays=None, start_date=None):
+        factors = list(weekday_factors) if weekday_factors else [1.0] * 7
+        if len(factors) != 7:
+            raise ValueError("weekday_factors 7 elemanlı olmalı (Pazartesi..Pazar)")
+        # Hiç çalışılmayan bir hafta sonsuz döngü demektir
+        if not any(f > 0 for f in factors):
+            factors = [1.0] * 7
+        self.weekday_factors = [max(0.0, float(f)) for f in factors]
+
+        start = start_date or datetime.now().date()
+        self.start_date = start.date() if isinstance(start, datetime) else start
+
+        self.holidays = set()
+        for h in holidays or []:
+            self.holidays.add(datetime.strptime(h, '%Y-%m-%d').date() if isinstance(h, str) else h)
+        self._cache = {}
+
+    def factor(self, day_idx):
+        """Başlangıçtan itibaren day_idx. günün kapasite katsayısı"""
+        f = self._cache.get(day_idx)
+        if f is None:
+            day = self.start_date + timedelta(days=day_idx)
+            f = 0.0 if day in self.holidays else self.weekday_factors[day.weekday()]
+            self._cache[day_idx] = f
+        return f
+
+    def date_of(self, day_idx):
+        return self.start_date + timedelta(days=int(day_idx))
+
+    def advance(self, start, work_days):
+        """
+        start anından itibaren tam kapasitede work_days günlük işi bitir.
+        Döner: (bitiş, [(gün, parça_başı, parça_sonu, katsayı), ...])
+        """
+        chunks = []
+        t = start
+        remaining = work_days
+        while remaining > 1e-9:
+            day_idx = int(t)
+            f = self.factor(day_idx)
+            if f <= 0:
+                t = day_idx + 1
+                continue
+            span = min(day_idx + 1 - t, remaining / f)
+            chunks.append((day_idx, t, t + span, f))
+            remaining -= span * f
+            t += span
+        return t, chunks
+
+    def finish_time(self, start, work_days):
+        """advance() ile aynı, parça listesi üretmeden"""
+        t = start
+        remaining = work_days
+        while remaining > 1e-9:
+            day_idx = int(t)
+            f = self.factor(day_idx)
+            if f <= 0:
+                t = day_idx + 1
+                continue
+            span = min(day_idx + 1 - t, remaining / f)
+            remaining -= span * f
+            t += span
+        return t
+
+
+class _Operation:
+    """Bir siparişin tek rota adımı"""
+    __slots__ = ("job", "step", "station", "m2", "rank", "seq", "work_days", "setup_class")
+
+    def __init__(self, job, step, station, m2, rank, seq, work_days=None, setup_class=None):
+        self.job = job
+        self.step = step
+        self.station = station
+        self.m2 = m2
+        self.rank = rank
+        self.seq = seq
+        self.work_days = work_days      # Ana istasyonda tam kapasite süresi (None: m2 / kapasite)
+        self.setup_class = setup_class  # (kalınlık, ürün tipi): ayar matrisi sınıfı
+
+
+class DayDetails:
+    """
+    Bir makinenin gün bazlı iş listesi, seyrek saklanır (uzun ufukta bellek için).
+    Her kayıt (operasyon) bilgisi bir kez, sıkışık demet olarak tutulur (FIELDS);
+    çalışılan ardışık günleri (kayıt no, ilk gün, son gün) aralığı olarak tamsayı
+    dizilerindedir. Sözlükler yalnız sorgulanan gün için kurulur.
+    Liste gibi okunur: details[gün] -> o gün işlenen işler (sipariş başına bir kez,
+    kayıt sırasıyla). len() ufuk gün sayısıdır.
+    """
+
+    FIELDS = ("code", "customer", "m2", "batch", "notes", "from_station")
+
+    __slots__ = ("horizon_days", "infos", "_info", "_first", "_last", "_max_span", "_index")
+
+    def __init__(self, horizon_days):
+        self.horizon_days = horizon_days
+        self.infos = []
+        self._info = array('i')
+        self._first = array('i')
+        self._last = array('i')
+        self._max_span = 0
+        self._index = None      # (ilk güne göre sıra, ilk günler) - ilk sorguda kurulur
+
+    def add(self, info, days):
+        """info kaydını (FIELDS sırasında demet) artan sıralı günlere ekle; ardışık günler tek aralık olur"""
+        idx = len(self.infos)
+        self.infos.append(info)
+        first = prev = days[0]
+        for day in days[1:]:
+            if day != prev + 1:
+                self._append(idx, first, prev)
+                first = day
+            prev = day
+        self._append(idx, first, prev)
+        self._index = None
+
+    def _append(self, idx, first, last):
+        self._info.append(idx)
+        self._first.append(first)
+        self._last.append(last)
+        if last - first > self._max_span:
+            self._max_span = last - first
+
+    def copy(self, horizon_days=None):
+        other = DayDetails(self.horizon_days if horizon_days is None else horizon_days)
+        other.infos = list(self.infos)
+        other._info = array('i', self._info)
+        other._first = array('i', self._first)
+        other._last = array('i', self._last)
+        other._max_span = self._max_span
+        return other
+
+    def day(self, day_idx):
+        """day_idx. gün işlenen işlerin bilgi sözlükleri"""
+        if self._index is None:
+            order = sorted(range(len(self._first)), key=self._first.__getitem__)
+            self._index = (order, [self._first[i] for i in order])
+        order, firsts = self._index
+        # Aralık en fazla _max_span gün geriden başlamış olabilir
+        lo = bisect_left(firsts, day_idx - self._max_span)
+        hi = bisect_right(firsts, day_idx)
+        hits = sorted(self._info[order[k]] for k in range(lo, hi) if self._last[order[k]] >= day_idx)
+
+        result, seen = [], set()
+        for idx in hits:
+            info = self.infos[idx]
+            if info[0] not in seen:
+                seen.add(info[0])
+                details = dict(zip(self.FIELDS, info))
+                if info[5] is None:
+                    del details["from_station"]     # Ana istasyonda işlenmiş
+                result.append(details)
+        return result
+
+    def __len__(self):
+        return self.horizon_days
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [self.day(d) for d in range(*key.indices(self.horizon_days))]
+        if key < 0:
+            key += self.horizon_days
+        if not 0 <= key < self.horizon_days:
+            raise IndexError("gün ufuk dışında")
+        return self.day(key)
+
+    def __iter__(self):
+        for day_idx in range(self.horizon_days):
+            yield self.day(day_idx)
+
+
+class ScheduleResult:
+    """Çizelge çıktısı: SmartPlanner ızgaraları + makine bazlı Gantt çubukları"""
+
+    def __init__(self, machines, horizon_days):
+        self.horizon_days = horizon_days
+        self.forecast_grid = {m: [0.0] * horizon_days for m in machines}   # Doluluk %
+        self.loads_grid = {m: [0.0] * horizon_days for m in machines}      # m²
+        self.details_grid = {m: DayDetails(horizon_days) for m in machines}    # Seyrek
+        self.gantt = {m: [] for m in machines}
+        self.order_finish_times = {}    # order_code -> bitiş günü
+        self.operation_count = 0
+        self.alternative_count = 0      # Alternatif makineye kayan operasyon sayısı
+        self.setup_days = {m: 0.0 for m in machines}    # Ayar için harcanan tam kapasite günü
+        self.changeover_count = 0       # Sınıf değişimi (ayar) sayısı
+
+    def total_setup_days(self):
+        return sum(self.setup_days.values())
+
+
+class FiniteCapacityScheduler:
+    """Heap tabanlı, öncelik sıralı, alternatif makine destekli çizelgeleyici"""
+
+    CANCEL_CHECK_EVENTS = 256   # should_stop bu kadar olayda bir sorulur
+
+    def __init__(self, capacities, alternatives=None, calendar=None, horizon_days=30, changeover=None):
+        self.capacities = {m: (c if c and c > 0 else 1) for m, c in capacities.items()}
+        self.calendar = calendar or ShiftCalendar()
+        self.horizon_days = horizon_days
+        # changeover(makine, eski_sınıf, yeni_sınıf) -> dakika (None: ayar süresi yok)
+        self.changeover = changeover
+        self._setup_cache = {}
+        self._last_class = {}       # makine -> son işlenen sınıf
+
+        # İstasyon -> uygun makineler (kendisi önce)
+        self.eligible = {}
+        for station in self.capacities:
+            alts = [a for a in (alternatives or {}).get(station, []) if a in self.capacities and a != station]
+            self.eligible[station] = [station] + alts
+
+        # Makine -> hizmet verdiği istasyon kuyrukları
+        self.serves = {m: [m] for m in self.capacities}
+        for station, machines in self.eligible.items():
+            for m in machines[1:]:
+                self.serves[m].append(station)
+
+    # === ANA DÖNGÜ ===
+
+    def run(self, jobs, partial_days=(), partial_callback=None, should_stop=None):
+        """
+        jobs: öncelik sırasında [{'order': dict, 'steps': [(istasyon, m2), ...]}, ...]
+        Adım (istasyon, m2, gün) de olabilir: süre m2 / kapasite yerine verilen
+        gündür (örn. fırın yüklerinden gelen çevrim süresi).
+        Ayar sınıfı job['setup_class'] ile verilmezse siparişin (kalınlık, ürün tipi) alınır.
+        Kapasite tablosunda olmayan istasyonlar atlanır.
+        partial_callback(gün, ScheduleResult): saat partial_days'teki her güne ulaşınca
+        o güne kadarki kesin ızgaralarla çağrılır (Gantt / bitiş zamanları eksiktir).
+        """
+        result = ScheduleResult(self.capacities.keys(), self.horizon_days)
+        self._last_class = {}
+
+        ops = []            # job -> [_Operation]
+        events = []         # (zaman, tür, sıra, yük)
+        queues = {s: [] for s in self.capacities}
+        queued_m2 = {s: 0.0 for s in self.capacities}   # Kuyrukta bekleyen iş (m² eşdeğeri)
+        busy_until = {m: 0.0 for m in self.capacities}
+        running = {}        # makine -> (_Operation, başlangıç)
+        counter = 0
+
+        for job_idx, job in enumerate(jobs):
+            job_ops = []
+            setup_class = job.get('setup_class')
+            if setup_class is None:
+                setup_class = (job['order'].get('thickness'), job['order'].get('product_type'))
+            for step in job['steps']:
+                station, m2 = step[0], step[1]
+                if station not in self.capacities or m2 <= 0:
+                    continue
+                counter += 1
+                work_days = step[2] if len(step) > 2 else None
+                job_ops.append(_Operation(job_idx, len(job_ops), station, m2, job_idx, counter, work_days, setup_class))
+            ops.append(job_ops)
+            if job_ops:
+                heapq.heappush(events, (0.0, _READY, job_ops[0].seq, job_ops[0]))
+            else:
+                result.order_finish_times[job['order'].get('order_code')] = 0.0
+
+        milestones = sorted(d for d in partial_days if 0 < d <= self.horizon_days) if partial_callback else []
+        processed = 0
+
+        while events:
+            now, kind, _, payload = heapq.heappop(events)
+
+            processed += 1
+            if should_stop is not None and processed % self.CANCEL_CHECK_EVENTS == 0 and should_stop():
+                raise ScheduleCancelled()
+            while milestones and now >= milestones[0]:
+                day = milestones.pop(0)
+                partial_callback(day, self._snapshot(result, jobs, running, busy_until, day))
+
+            if kind == _READY:
+                op = payload
+                self._enqueue(op, queues, queued_m2)
+                # Boştaki uygun makineler, bu işi en erken bitirecek olandan başlayarak
+                idle = [m for m in self.eligible[op.station] if m not in running]
+                idle.sort(key=lambda m: self._finish(m, now, op))
+                for m in idle:
+                    self._dispatch(m, now, queues, queued_m2, busy_until, running, events)
+                continue
+
+            # _FREE: makine işini bitirdi
+            machine = payload
+            op, start, setup_days = running.pop(machine)
+            self._record(result, jobs, op, machine, start, now, setup_days)
+
+            job_ops = ops[op.job]
+            if op.step + 1 < len(job_ops):
+                nxt = job_ops[op.step + 1]
+                self._enqueue(nxt, queues, queued_m2)
+                for m in self.eligible[nxt.station]:
+                    if m != machine and m not in running:
+                        self._dispatch(m, now, queues, queued_m2, busy_until, running, events)
+            else:
+                result.order_finish_times[jobs[op.job]['order'].get('order_code')] = now
+
+            self._dispatch(machine, now, queues, queued_m2, busy_until, running, events)
+
+        return result
+
+    # === YARDIMCILAR ===
+
+    def _snapshot(self, result, jobs, running, busy_until, days):
+        """İlk days günün ızgaraları: kaydedilmiş işler + hâlâ makinede olan işler"""
+        partial = ScheduleResult(self.capacities.keys(), days)
+        for m in self.capacities:
+            partial.forecast_grid[m] = result.forecast_grid[m][:days]
+            partial.loads_grid[m] = result.loads_grid[m][:days]
+            partial.details_grid[m] = result.details_grid[m].copy(days)
+        for machine, (op, start, setup_days) in running.items():
+            self._record(partial, jobs, op, machine, start, busy_until[machine], setup_days)
+        return partial
+
+    def _work_days(self, machine, op):
+        if op.work_days is not None:
+            # Verilen süre ana istasyon içindir; alternatifte kapasite oranıyla ölçekle
+            return op.work_days * self.capacities[op.station] / self.capacities[machine]
+        return op.m2 / self.capacities[machine]
+
+    def _setup_days(self, machine, op):
+        """Makinenin son işinden bu işin sınıfına geçiş ayarı (tam kapasite günü)"""
+        if self.changeover is None:
+            return 0.0
+        prev = self._last_class.get(machine)
+        if prev is None or prev == op.setup_class:
+            return 0.0
+        key = (machine, prev, op.setup_class)
+        days = self._setup_cache.get(key)
+        if days is None:
+            days = (self.changeover(machine, prev, op.setup_class) or 0) / MINUTES_PER_DAY
+            self._setup_cache[key] = days
+        return days
+
+    def _finish(self, machine, start, op):
+        return self.calendar.finish_time(start, self._setup_days(machine, op) + self._work_days(machine, op))
+
+    def _enqueue(self, op, queues, queued_m2):
+        heapq.heappush(queues[op.station], (op.rank, op.seq, op))
+        queued_m2[op.station] += self._work_days(op.station, op) * self.capacities[op.station]
+
+    def _backlog_end(self, station, now, queued_m2, busy_until, running):
+        """Ana istasyonun elindeki iş + kuyruğunu bitireceği yaklaşık an"""
+        start = max(busy_until[station], now) if station in running else now
+        return self.calendar.finish_time(start, queued_m2[station] / self.capacities[station])
+
+    def _dispatch(self, machine, now, queues, queued_m2, busy_until, running, events):
+        """Boş makineye hizmet verdiği kuyruklardan en öncelikli uygun işi ver"""
+        if machine in running:
+            return
+        best = None
+        for station in self.serves[machine]:
+            queue = queues[station]
+            if not queue:
+                continue
+            rank, seq, op = queue[0]
+            if best is not None and (rank, seq) >= (best[0], best[1]):
+                continue
+            if station != machine:
+                # Alternatif makine: ana istasyon birikmiş işini eritmeden bitiremiyorsa alma
+                if self._finish(machine, now, op) >= self._backlog_end(station, now, queued_m2, busy_until, running):
+                    continue
+            best = (rank, seq, station)
+
+        if best is None:
+            return
+
+        _, _, station = best
+        _, _, op = heapq.heappop(queues[station])
+        queued_m2[station] -= self._work_days(station, op) * self.capacities[station]
+        setup_days = self._setup_days(machine, op)
+        end = self.calendar.finish_time(now, setup_days + self._work_days(machine, op))
+        self._last_class[machine] = op.setup_class
+        running[machine] = (op, now, setup_days)
+        busy_until[machine] = end
+        heapq.heappush(events, (end, _FREE, op.seq, machine))
+
+    def _record(self, result, jobs, op, machine, start, end, setup_days=0.0):
+        order = jobs[op.job]['order']
+        code = order.get('order_code')
+        result.operation_count += 1
+        if machine != op.station:
+            result.alternative_count += 1
+        if setup_days > 0:
+            result.changeover_count += 1
+            result.setup_days[machine] += setup_days
+
+        result.gantt[machine].append({
+            "code": code,
+            "customer": order.get('customer_name', 'Tahmini'),
+            "station": op.station,
+            "machine": machine,
+            "start": start,
+            "end": end,
+            "m2": op.m2,
+            "is_alternative": machine != op.station,
+            "setup_days": setup_days,
+        })
+
+        horizon = result.horizon_days
+        if start >= horizon:
+            return
+
+        if setup_days > 0:
+            # Ayar süresi makineyi doldurur ama m² üretmez
+            start, chunks = self.calendar.advance(start, setup_days)
+            for day_idx, chunk_start, chunk_end, _ in chunks:
+                if day_idx >= horizon:
+                    break
+                result.forecast_grid[machine][day_idx] += (chunk_end - chunk_start) * 100
+
+        work_days = self._work_days(machine, op)
+        _, chunks = self.calendar.advance(start, work_days)
+        worked_days = []
+        for day_idx, chunk_start, chunk_end, factor in chunks:
+            if day_idx >= horizon:
+                break
+            span = chunk_end - chunk_start
+            result.forecast_grid[machine][day_idx] += span * 100
+            # İşlenen m² (fırında çevrim doluluğuna göre kapasiteden az olabilir)
+            result.loads_grid[machine][day_idx] += op.m2 * span * factor / work_days
+            if not worked_days or worked_days[-1] != day_idx:
+                worked_days.append(day_idx)
+
+        if worked_days:
+            result.details_grid[machine].add((
+                code,
+                order.get('customer_name', 'Tahmini'),
+                op.m2,
+                sys.intern(f"{order.get('thickness')}mm"),
+                order.get('notes', ''),
+                op.station if machine != op.station else None,
+            ), worked_days)
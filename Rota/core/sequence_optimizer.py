@@ -0,0 +1,318 @@
+"""
+EFES ROTA X - Yerel Arama ile Üretim Sırası Optimizasyonu
+Kural tabanlı sıralamayı (kırmızı / yeşil / gri hat) başlangıç kabul edip toplam
+gecikme + ayar (kalınlık / ürün değişimi) maliyetini düşüren yerel arama.
+
+Model (simülasyon yerine hızlı vekil):
+- Her sipariş, rotasındaki en yüklü istasyonda kalan m² / kapasite kadar gün sürer
+- Sıradaki ardışık iki sipariş arasında kalınlık veya ürün değişirse ayar süresi eklenir
+  (changeover verilirse istasyon ayar matrisinden, yoksa sabit süreler)
+- Amaç = Σ ağırlık × gecikme(gün) + SETUP_WEIGHT × Σ ayar(gün)
+  (ağırlık önceliğe göre: Kritik siparişin bir günlük gecikmesi Normal'in 10 katı)
+
+Arama:
+- Takas (swap) ve araya alma (insert) hamleleri, en fazla MAX_MOVE_DISTANCE uzaklığa
+- Hamle maliyeti artımlı hesaplanır: yalnız değişen aralık yeniden hesaplanır, sonraki
+  siparişlerin kayması (δ) gecikmeye göre sıralı bloklar üzerinden O(√n log n) bulunur
+- Süre bütçesi dolunca veya uzun süre iyileşme olmayınca durur
+
+Kullanım:
+    sequencer = LocalSearchSequencer(capacities, progress)
+    sequence, report = sequencer.optimize(orders, time_budget=2.0)
+    report['delta']      # Amaç fonksiyonundaki değişim (negatif = iyileşme)
+"""
+
+import bisect
+import math
+import random
+import time
+from datetime import datetime
+
+
+PRIORITY_WEIGHTS = {"Kritik": 10.0, "Çok Acil": 5.0, "Acil": 2.0, "Normal": 1.0}
+
+
+class LocalSearchSequencer:
+    """Toplam ağırlıklı gecikme + ayar maliyeti için swap/insert yerel araması"""
+
+    THICKNESS_SETUP_DAYS = 0.05     # Kalınlık değişimi (~1 saat / 22 saatlik gün)
+    PRODUCT_SETUP_DAYS = 0.03       # Ürün (cam tipi) değişimi
+    SETUP_WEIGHT = 1.0              # Ayar gününün gecikme gününe göre maliyeti
+    MAX_MOVE_DISTANCE = 25
+    STALL_FACTOR = 30               # n × STALL_FACTOR başarısız denemede dur
+    NO_DUE_DAYS = 3650              # Termini olmayan sipariş
+
+    def __init__(self, capacities, progress=None, seed=0, changeover=None):
+        self.capacities = capacities or {}
+        self.progress = progress or {}
+        self.seed = seed
+        # changeover(eski_sınıf, yeni_sınıf) -> gün; sınıf = (kalınlık, ürün tipi)
+        self.changeover = changeover
+        self._setup_cache = {}
+
+    # === MODEL ===
+
+    def _job_data(self, orders):
+        today = datetime.now().date()
+        p, d, w, fam = [], [], [], []
+        for order in orders:
+            m2 = order.get('declared_total_m2') or 0
+            if m2 <= 0:
+                m2 = (order.get('width') or 0) * (order.get('height') or 0) * (order.get('quantity') or 0) / 10000.0
+
+            total_qty = order.get('quantity') or 1
+            done = self.progress.get(order.get('id'), {}) if not order.get('is_new') else {}
+            days = 0.0
+            for station in (order.get('route') or '').split(','):
+                station = station.strip()
+                cap = self.capacities.get(station)
+                if not cap:
+                    continue
+                ratio = 1.0 - (done.get(station, 0) or 0) / total_qty
+                if ratio > 0:
+                    days = max(days, m2 * ratio / cap)
+            p.append(days)
+
+            try:
+                due = (datetime.strptime(order.get('delivery_date') or '', '%Y-%m-%d').date() - today).days
+            except ValueError:
+                due = self.NO_DUE_DAYS
+            d.append(float(due))
+            w.append(PRIORITY_WEIGHTS.get(order.get('priority'), 1.0))
+            fam.append((order.get('thickness'), order.get('product_type')))
+        return p, d, w, fam
+
+    def _setup(self, a, b):
+        if a is None or b is None:
+            return 0.0
+        fa, fb = self._fam[a], self._fam[b]
+        if fa == fb:
+            return 0.0
+        if self.changeover is not None:
+            s = self._setup_cache.get((fa, fb))
+            if s is None:
+                s = self.changeover(fa, fb)
+                self._setup_cache[(fa, fb)] = s
+            return s
+        s = 0.0
+        if fa[0] != fb[0]:
+            s += self.THICKNESS_SETUP_DAYS
+        if fa[1] != fb[1]:
+            s += self.PRODUCT_SETUP_DAYS
+        return s
+
+    def evaluate(self, orders):
+        """Verilen sıranın amaç değeri ve bileşenleri (sıra değiştirilmez)"""
+        self._p, self._d, self._w, self._fam = self._job_data(orders)
+        self._seq = list(range(len(orders)))
+        self._rebuild(0)
+        return self._components()
+
+    def _components(self):
+        tardiness = self._tard_prefix[-1]
+        setup_days = sum(self._setup(self._seq[k - 1], self._seq[k]) for k in range(1, len(self._seq)))
+        return {
+            "cost": tardiness + self.SETUP_WEIGHT * setup_days,
+            "tardiness": tardiness,
+            "setup_days": setup_days,
+            "setups": sum(1 for k in range(1, len(self._seq)) if self._setup(self._seq[k - 1], self._seq[k]) > 0),
+            "late_orders": sum(1 for k, j in enumerate(self._seq) if self._C[k] > self._d[j] + 1e-9),
+        }
+
+    # === DURUM (tamamlanma, gecikme blokları) ===
+
+    def _rebuild(self, start):
+        """start pozisyonundan itibaren tamamlanma süreleri ve tüm blokları yenile"""
+        seq = self._seq
+        n = len(seq)
+        if start == 0:
+            self._C = [0.0] * n
+            self._L = [0.0] * n
+            self._tard_prefix = [0.0] * (n + 1)
+            self._block = max(8, int(math.sqrt(n)))
+            self._blocks = [None] * ((n + self._block - 1) // self._block)
+            self._offsets = [0.0] * len(self._blocks)
+
+        self._recompute(start, n - 1)
+        self._refresh_tardiness(start)
+        for b in range(start // self._block, len(self._blocks)):
+            self._sort_block(b)
+
+    def _recompute(self, start, end):
+        """start..end pozisyonlarının tamamlanma / gecikme değerleri (ayar dahil)"""
+        seq, p, d = self._seq, self._p, self._d
+        t = self._C[start - 1] if start > 0 else 0.0
+        prev = seq[start - 1] if start > 0 else None
+        for k in range(start, end + 1):
+            j = seq[k]
+            t += self._setup(prev, j) + p[j]
+            self._C[k] = t
+            self._L[k] = t - d[j]
+            prev = j
+
+    def _refresh_tardiness(self, start):
+        seq, w, L, prefix = self._seq, self._w, self._L, self._tard_prefix
+        for k in range(start, len(seq)):
+            lateness = L[k]
+            prefix[k + 1] = prefix[k] + (w[seq[k]] * lateness if lateness > 0 else 0.0)
+
+    def _sort_block(self, b):
+        """Bloğun gecikmelerini sırala, ağırlık önek toplamlarını kur (ofset sıfırlanır)"""
+        n = len(self._seq)
+        w, seq = self._w, self._seq
+        lo, hi = b * self._block, min(n, (b + 1) * self._block)
+        pairs = sorted((self._L[k], w[seq[k]]) for k in range(lo, hi))
+        ls, pw, pwl = [], [0.0], [0.0]
+        for lateness, weight in pairs:
+            ls.append(lateness)
+            pw.append(pw[-1] + weight)
+            pwl.append(pwl[-1] + weight * lateness)
+        self._blocks[b] = (ls, pw, pwl)
+        self._offsets[b] = 0.0
+
+    def _apply(self, a, b, segment):
+        """
+        Kabul edilen hamleyi uygula. Yalnız [a, b]'yi kapsayan bloklar yeniden sıralanır;
+        sonraki bloklardaki tüm siparişler aynı miktarda kaydığı için ofsetleri artar.
+        """
+        n = len(self._seq)
+        old_next = self._C[b + 1] if b + 1 < n else 0.0
+        self._seq[a:b + 1] = segment
+        end = min(n - 1, b + 1)
+        self._recompute(a, end)
+        shift = self._C[b + 1] - old_next if b + 1 < n else 0.0
+
+        for k in range(end + 1, n):
+            self._C[k] += shift
+            self._L[k] += shift
+        self._refresh_tardiness(a)
+
+        last_block = end // self._block
+        for blk in range(a // self._block, last_block + 1):
+            self._sort_block(blk)
+        if shift:
+            for blk in range(last_block + 1, len(self._blocks)):
+                self._offsets[blk] += shift
+
+    def _suffix_shift_delta(self, start, delta):
+        """start'tan sonraki tüm siparişler delta gün kayarsa gecikme maliyeti değişimi"""
+        n = len(self._seq)
+        if delta == 0 or start >= n:
+            return 0.0
+        total = 0.0
+        size = self._block
+        first_full = (start + size - 1) // size
+        # Kısmi blok: tek tek
+        for k in range(start, min(n, first_full * size)):
+            lateness = self._L[k]
+            total += self._w[self._seq[k]] * (max(0.0, lateness + delta) - max(0.0, lateness))
+        # Tam bloklar: sıralı gecikme + önek toplamları (gerçek gecikme = ls + ofset)
+        for b in range(first_full, len(self._blocks)):
+            ls, pw, pwl = self._blocks[b]
+            off = self._offsets[b]
+            if delta > 0:
+                i = bisect.bisect_right(ls, -delta - off)   # L > -δ olanlar etkilenir
+                i0 = max(i, bisect.bisect_left(ls, -off))   # L >= 0: tam δ
+                total += delta * (pw[-1] - pw[i]) + (pwl[i0] - pwl[i]) + off * (pw[i0] - pw[i])
+            else:
+                i = bisect.bisect_left(ls, -delta - off)    # L >= -δ: gecikme δ kadar azalır
+                i0 = bisect.bisect_right(ls, -off)          # 0 < L < -δ: gecikme sıfırlanır
+                i = max(i, i0)
+                total += delta * (pw[-1] - pw[i]) - (pwl[i] - pwl[i0]) - off * (pw[i] - pw[i0])
+        return total
+
+    # === HAMLELER ===
+
+    def _move_delta(self, a, b, segment):
+        """[a, b] aralığı segment ile değişirse amaç değişimi"""
+        seq, p, d, w = self._seq, self._p, self._d, self._w
+        n = len(seq)
+        before = seq[a - 1] if a > 0 else None
+        after = seq[b + 1] if b + 1 < n else None
+
+        t = self._C[a - 1] if a > 0 else 0.0
+        prev = before
+        new_tard = 0.0
+        new_setup = 0.0
+        for j in segment:
+            s = self._setup(prev, j)
+            new_setup += s
+            t += s + p[j]
+            new_tard += w[j] * max(0.0, t - d[j])
+            prev = j
+        new_setup += self._setup(prev, after)
+
+        old_setup = self._setup(before, seq[a]) + self._setup(seq[b], after)
+        for k in range(a + 1, b + 1):
+            old_setup += self._setup(seq[k - 1], seq[k])
+        old_tard = self._tard_prefix[b + 1] - self._tard_prefix[a]
+
+        # Sonraki siparişlerin kayması: segment bitişi + sonraki ayar farkı
+        shift = (t + self._setup(prev, after)) - (self._C[b] + self._setup(seq[b], after))
+        return (new_tard - old_tard) + self.SETUP_WEIGHT * (new_setup - old_setup) \
+            + self._suffix_shift_delta(b + 1, shift)
+
+    def _propose(self, rng, n):
+        """Rastgele takas veya araya alma hamlesi: (a, b, yeni segment)"""
+        i = rng.randrange(n)
+        j = min(n - 1, max(0, i + rng.randint(-self.MAX_MOVE_DISTANCE, self.MAX_MOVE_DISTANCE)))
+        if i == j:
+            return None
+        a, b = min(i, j), max(i, j)
+        seg = self._seq[a:b + 1]
+        kind = rng.random()
+        if kind < 0.4:
+            seg[0], seg[-1] = seg[-1], seg[0]                   # Takas
+        elif i < j:
+            seg = seg[1:] + seg[:1]                             # i'yi j'nin arkasına al
+        else:
+            seg = seg[-1:] + seg[:-1]                           # i'yi j'nin önüne al
+        return a, b, seg
+
+    # === ANA DÖNGÜ ===
+
+    def optimize(self, orders, time_budget=2.0):
+        """
+        Döner: (yeni sıra [order dict], rapor)
+        rapor: initial/final bileşenleri, delta (final - initial), hamle sayıları
+        """
+        orders = list(orders)
+        initial = self.evaluate(orders)
+        n = len(orders)
+        report = {"initial": initial, "final": initial, "delta": 0.0,
+                  "iterations": 0, "accepted_moves": 0, "elapsed": 0.0}
+        if n < 2:
+            return orders, report
+
+        rng = random.Random(self.seed)
+        start = time.monotonic()
+        deadline = start + time_budget
+        stall_limit = n * self.STALL_FACTOR
+        stall = 0
+        iterations = accepted = 0
+
+        while stall < stall_limit:
+            # Saat kontrolü her 64 denemede bir (monotonic çağrısı da maliyetli)
+            if iterations & 63 == 0 and time.monotonic() >= deadline:
+                break
+            iterations += 1
+            move = self._propose(rng, n)
+            if move is None:
+                continue
+            a, b, seg = move
+            if self._move_delta(a, b, seg) < -1e-9:
+                self._apply(a, b, seg)
+                accepted += 1
+                stall = 0
+            else:
+                stall += 1
+
+        final = self._components()
+        report.update({
+            "final": final,
+            "delta": final["cost"] - initial["cost"],
+            "iterations": iterations,
+            "accepted_moves": accepted,
+            "elapsed": time.monotonic() - start,
+        })
+        return [orders[j] for j in self._seq], report
@@ -1,4 +1,9 @@
+import hashlib
+import json
 import math
+import os
+import threading
+from dataclasses import asdict
 from datetime import datetime, timedelta
 from collections import defaultdict
 
@@ -7,6 +12,33 @@ try:
 except ImportError:
     pass
 
+try:
+    from core.factory_config import factory_config
+except ImportError:
+    factory_config = None
+
+try:
+    from core.furnace_batcher import furnace_batcher
+except ImportError:
+    furnace_batcher = None
+
+try:
+    from core.capacity_learning import capacity_learner
+except ImportError:
+    capacity_learner = None
+
+try:
+    from core.sequence_optimizer import LocalSearchSequencer
+except ImportError:
+    LocalSearchSequencer = None
+
+try:
+    from core.risk_simulator import risk_simulator
+except ImportError:
+    risk_simulator = None
+
+from core.scheduler import FiniteCapacityScheduler, ShiftCalendar, ScheduleCancelled, MINUTES_PER_DAY
+
 class SmartPlanner:
     """
     AKILLI PLANLAMA MOTORU v16 (VADE PENCERELİ HİBRİT OPTİMİZASYON) 🧠
@@ -17,9 +49,29 @@ class SmartPlanner:
     """
     
     def __init__(self):
-        self.FORECAST_DAYS = 30
-        self.BATCH_BONUS_SCORE = 5  # Batch katkı puanı
+        self.MAX_FORECAST_DAYS = 180
+        # Varsayılan tahmin ufku (gün); ROTA_FORECAST_DAYS ile değiştirilebilir
+        self.FORECAST_DAYS = self._horizon(os.environ.get("ROTA_FORECAST_DAYS", 30))
+        self.BATCH_BONUS_SCORE = 5  # Batch katkı puanı (ayar matrisi yoksa sipariş başına)
+        self.SETUP_MINUTES_PER_POINT = 12  # Ayar matrisiyle: kazanılan her 12 dk ayar = 1 puan
         self.LOOKAHEAD_WINDOW = 30   # Gün: Sadece önümüzdeki 30 günün işlerini grupla (Batch yap)
+        self.SHIFT_FACTORS = [1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0]  # Pzt..Paz vardiya katsayısı (0 = kapalı)
+        self.HOLIDAYS = []           # Çalışılmayan günler ('YYYY-MM-DD')
+        self.last_schedule = None    # Son simülasyonun çizelgesi (Gantt çubukları dahil)
+        self.last_furnace_plan = None  # Son simülasyonun fırın yük planı
+        self.SEQUENCE_TIME_BUDGET = 2.0  # Saniye: yerel arama süre bütçesi
+        self.last_sequence_report = None # Son yerel aramanın amaç / iyileşme raporu
+        self.last_risk = None            # Son Monte Carlo risk sonucu (RiskResult)
+        # Üretim geçmişinden öğrenilen kapasiteler (ROTA_LEARNED_CAPACITY=1 ile açılır)
+        self.USE_LEARNED_CAPACITIES = os.environ.get("ROTA_LEARNED_CAPACITY") == "1"
+        self.NON_WORKING_FACTOR = 0.05   # Öğrenilen hafta günü katsayısı bunun altındaysa gün kapalı
+        # Temel (yeni siparişsiz) simülasyon önbelleği: (girdi anahtarı, sonuç, çizelge, fırın planı)
+        self._forecast_cache = None
+        self.forecast_cache_stats = {"hits": 0, "misses": 0}
+        self.PARTIAL_FORECAST_DAYS = [7]  # Arka plan tahmininde önce bildirilecek günler
+        # Simülasyonlar planlayıcı durumunu (kapasite, son çizelge) değiştirir: arka plan
+        # işçisi ile arayüz iş parçacığı aynı anda çalıştırmasın
+        self._lock = threading.RLock()
         
         try:
             self.capacities = db.get_all_capacities()
@@ -44,10 +96,16 @@ class SmartPlanner:
         except:
             return datetime.max.date()
 
-    def optimize_production_sequence(self, orders):
+    def optimize_production_sequence(self, orders, mode="rules", time_budget=None):
         """
         Gelişmiş Fabrika Sıralama Algoritması
+        mode="local_search": kural tabanlı sıra, gecikme + ayar maliyetini düşüren
+        yerel aramayla iyileştirilir (rapor: self.last_sequence_report)
         """
+        if mode == "local_search":
+            sequence, _ = self.improve_sequence(self.optimize_production_sequence(orders), time_budget)
+            return sequence
+
         red_orders = []      # Acil / Gecikmiş (Dokunulmaz)
         green_orders = []    # Yakın tarihli Normal (Batch yapılacak)
         grey_orders = []     # Uzak tarihli Normal (Batch yapılmayacak, sona atılacak)
@@ -92,8 +150,13 @@ class SmartPlanner:
         for key, batch_list in batches.items():
             # Batch Puanlama
             avg_days = sum([(self._parse_date(o.get('delivery_date')) - today).days for o in batch_list]) / len(batch_list)
-            # Kalabalık gruplar öne, tarihi çok uzak olan gruplar biraz geriye
-            batch_score = (len(batch_list) * self.BATCH_BONUS_SCORE) - (avg_days * 2)
+            # Kalabalık gruplar öne (kazandırdığı ayar süresi kadar), tarihi çok uzak olan gruplar biraz geriye
+            saved_minutes = self._batch_setup_saving(key, batch_list, batches.keys())
+            if saved_minutes is None:
+                batch_bonus = len(batch_list) * self.BATCH_BONUS_SCORE
+            else:
+                batch_bonus = saved_minutes / self.SETUP_MINUTES_PER_POINT
+            batch_score = batch_bonus - (avg_days * 2)
             
             # Batch içi sıralama (Tarihe göre)
             batch_list.sort(key=lambda x: x.get('delivery_date', '9999-12-31'))
@@ -125,7 +188,62 @@ class SmartPlanner:
             
         return final_sequence
 
-    def _run_simulation(self, new_order=None):
+    def _batch_setup_saving(self, key, batch_list, all_keys):
+        """
+        Grubun birlikte işlenmesiyle kazanılan ayar süresi (dk).
+        Dağınık sırada grubun her siparişi (ilki hariç) rotasındaki her istasyonda
+        diğer gruplardan bu gruba ortalama bir geçiş ayarı öder; grup halinde ödemez.
+        Ayar matrisi yoksa None (sabit BATCH_BONUS_SCORE kullanılır).
+        """
+        if not factory_config:
+            return None
+        others = [k for k in all_keys if k != key]
+        if not others or len(batch_list) < 2:
+            return 0.0
+
+        switch_cost = {}
+        saved = 0.0
+        for order in batch_list[1:]:
+            for station in (order.get('route') or '').split(','):
+                station = station.strip()
+                if station not in self.capacities:
+                    continue
+                if station not in switch_cost:
+                    switch_cost[station] = sum(
+                        factory_config.get_changeover_minutes(station, other, key) for other in others
+                    ) / len(others)
+                saved += switch_cost[station]
+        return saved
+
+    def _sequence_setup_days(self, from_class, to_class):
+        """Yerel arama vekili için ayar: en uzun istasyon ayarı (gün)"""
+        minutes = max((factory_config.get_changeover_minutes(station, from_class, to_class)
+                       for station in self.capacities), default=0)
+        return minutes / MINUTES_PER_DAY
+
+    def improve_sequence(self, orders, time_budget=None):
+        """
+        Verilen sırayı (örn. kural tabanlı veya ekrandaki sıra) yerel aramayla iyileştir.
+        Döner: (yeni sıra, rapor) - rapor['delta'] < 0 ise amaç iyileşmiştir
+        """
+        if LocalSearchSequencer is None:
+            raise RuntimeError("Sıra optimizasyonu modülü (core.sequence_optimizer) yüklenemedi")
+        sequence = list(orders)
+        ids = [o['id'] for o in sequence if not o.get('is_new') and o.get('id') is not None]
+        try:
+            progress = db.get_station_progress_map(ids) if ids else {}
+        except Exception:
+            progress = {}
+
+        sequencer = LocalSearchSequencer(self.capacities, progress,
+                                         changeover=self._sequence_setup_days if factory_config else None)
+        budget = self.SEQUENCE_TIME_BUDGET if time_budget is None else time_budget
+        sequence, report = sequencer.optimize(sequence, time_budget=budget)
+        self.last_sequence_report = report
+        return sequence, report
+
+    def _build_jobs(self, new_order=None):
+        """Aktif siparişler (+ varsa yeni sipariş) için planlayıcı sırasında çizelge işleri"""
         # 1. Mevcut İşleri Çek
         active_orders = db.get_orders_by_status(["Beklemede", "Üretimde"])
         
@@ -151,16 +269,20 @@ class SmartPlanner:
         # 3. YENİ OPTİMİZE SIRALAMA
         active_orders = self.optimize_production_sequence(active_orders)
 
-        # 4. SİMÜLASYON DEĞİŞKENLERİ
-        forecast_grid = {k: [0.0]*self.FORECAST_DAYS for k in self.capacities.keys()}
-        loads_grid = {k: [0.0]*self.FORECAST_DAYS for k in self.capacities.keys()}
-        details_grid = {k: [[] for _ in range(self.FORECAST_DAYS)] for k in self.capacities.keys()}
-        machine_free_time = {k: 0.0 for k in self.capacities.keys()}
-        
-        order_finish_times = {} 
-        target_finish_day = 0
+        # 4. İLERLEME (Tek sorguda)
+        progress = {}
+        existing_ids = [o['id'] for o in active_orders if not o.get('is_new')]
+        if existing_ids:
+            progress = db.get_station_progress_map(existing_ids)
+
+        # Fırın yükleri: batch istasyonlarında süre m²/kapasite yerine çevrim süresinden
+        furnace_days = {}
+        if furnace_batcher:
+            self.last_furnace_plan = furnace_batcher.plan(active_orders, progress)
+            furnace_days = furnace_batcher.order_work_days(self.last_furnace_plan)
 
-        # 5. MOTOR ÇALIŞIYOR
+        # 5. OPERASYONLAR: rotadaki bekleyen adımlar ve kalan m²
+        jobs = []
         for order in active_orders:
             m2 = order.get('declared_total_m2', 0)
             if not m2 or m2 <= 0:
@@ -171,81 +293,166 @@ class SmartPlanner:
             
             if m2 <= 0: continue
             
-            total_qty = order.get('quantity', 1)
-            route_str = order.get('route', '')
-            route_steps = route_str.split(',')
+            total_qty = order.get('quantity', 1) or 1
+            done_map = progress.get(order['id'], {}) if not order.get('is_new') else {}
             
-            completed_stops = []
-            if not order.get('is_new'):
-                completed_stops = db.get_completed_stations_list(order['id'])
-            
-            current_order_ready_time = 0.0 
-            
-            for station in route_steps:
+            steps = []
+            for station in order.get('route', '').split(','):
                 station = station.strip()
                 if station not in self.capacities: continue
-                if station in completed_stops: continue 
 
-                daily_cap = self.capacities[station]
-                if daily_cap <= 0: daily_cap = 1
-                
-                done_qty = 0
-                if not order.get('is_new'):
-                    done_qty = db.get_station_progress(order['id'], station)
-                
-                remaining_ratio = 1.0 - (done_qty / total_qty)
-                if remaining_ratio <= 0: continue
+                remaining_ratio = 1.0 - (done_map.get(station, 0) / total_qty)
+                if remaining_ratio <= 0: continue   # İstasyon tamamlanmış
 
-                remaining_m2 = m2 * remaining_ratio
-                duration_days = remaining_m2 / daily_cap
-                
-                start_day = max(current_order_ready_time, machine_free_time[station])
-                end_day = start_day + duration_days
-                
-                temp_start = start_day
-                while temp_start < end_day:
-                    day_idx = int(temp_start)
-                    if day_idx >= self.FORECAST_DAYS: break 
-                    
-                    chunk_end = min(end_day, day_idx + 1)
-                    work_amount = chunk_end - temp_start
-                    
-                    forecast_grid[station][day_idx] += (work_amount * 100)
-                    loads_grid[station][day_idx] += (work_amount * daily_cap)
-                    
-                    info = {
-                        "code": order['order_code'],
-                        "customer": order.get('customer_name', 'Tahmini'),
-                        "m2": remaining_m2,
-                        "batch": f"{order.get('thickness')}mm",
-                        "notes": order.get('notes', '')
-                    }
-                    exists = any(x['code'] == info['code'] for x in details_grid[station][day_idx])
-                    if not exists:
-                        details_grid[station][day_idx].append(info)
-                    
-                    temp_start = chunk_end
-                
-                machine_free_time[station] = end_day
-                current_order_ready_time = end_day
-            
-            order_finish_times[order.get('order_code')] = current_order_ready_time
-            if order.get('is_new'):
-                target_finish_day = current_order_ready_time
+                work_days = furnace_days.get((order['id'], station))
+                if work_days:
+                    steps.append((station, m2 * remaining_ratio, work_days))
+                else:
+                    steps.append((station, m2 * remaining_ratio))
+
+            jobs.append({'order': order, 'steps': steps})
+
+        return jobs
+
+    def _horizon(self, days=None):
+        """Tahmin ufku: 1..MAX_FORECAST_DAYS gün (None: FORECAST_DAYS)"""
+        try:
+            days = int(days if days is not None else self.FORECAST_DAYS)
+        except (TypeError, ValueError):
+            days = 30
+        return max(1, min(days, self.MAX_FORECAST_DAYS))
+
+    def _run_simulation(self, new_order=None, partial_callback=None, should_stop=None, horizon_days=None):
+        jobs = self._build_jobs(new_order)
+        if should_stop is not None and should_stop():
+            raise ScheduleCancelled()
+
+        # 6. MOTOR ÇALIŞIYOR (Sonlu kapasite + alternatif makineler + vardiya takvimi)
+        scheduler = FiniteCapacityScheduler(
+            self.capacities,
+            alternatives=self._get_alternatives(),
+            calendar=ShiftCalendar(self._weekday_factors(), self.HOLIDAYS),
+            horizon_days=self._horizon(horizon_days),
+            changeover=factory_config.get_changeover_minutes if factory_config else None
+        )
+        on_partial = None
+        if partial_callback:
+            on_partial = lambda day, part: partial_callback(day, (part.forecast_grid, part.details_grid, part.loads_grid))
+        schedule = scheduler.run(jobs, partial_days=self.PARTIAL_FORECAST_DAYS,
+                                 partial_callback=on_partial, should_stop=should_stop)
+        self.last_schedule = schedule
+
+        forecast_grid = schedule.forecast_grid
+        details_grid = schedule.details_grid
+        loads_grid = schedule.loads_grid
+        order_finish_times = schedule.order_finish_times
+        target_finish_day = order_finish_times.get('>>> HESAPLANAN <<<', 0) if new_order else 0
 
         return forecast_grid, details_grid, loads_grid, target_finish_day, order_finish_times
 
-    def calculate_forecast(self):
+    def get_planning_capacities(self):
+        """Ayarlardaki kapasiteler; açıksa yeterli geçmişi olan istasyonlarda öğrenilmiş verim"""
         try: self.capacities = db.get_all_capacities()
         except: pass
-        grid, details, loads, _, _ = self._run_simulation(new_order=None)
-        return grid, details, loads
+        if self.USE_LEARNED_CAPACITIES and capacity_learner:
+            self.capacities = capacity_learner.learned_capacities(self.capacities)
+        return self.capacities
+
+    def _weekday_factors(self):
+        """Vardiya katsayıları; öğrenme açıksa geçmişte hiç üretim yapılmayan günler kapalı"""
+        factors = list(self.SHIFT_FACTORS)
+        if self.USE_LEARNED_CAPACITIES and capacity_learner:
+            learned = capacity_learner.factory_weekday_factors(self.capacities)
+            if learned:
+                factors = [0.0 if l < self.NON_WORKING_FACTOR else f for f, l in zip(factors, learned)]
+        return factors
+
+    def _get_alternatives(self):
+        """İstasyon -> alternatif istasyonlar (factory_config'den)"""
+        if not factory_config:
+            return {}
+        return {name: factory_config.get_alternatives(name) for name in self.capacities}
+
+    def _forecast_key(self, horizon_days):
+        """
+        Temel simülasyonun tüm girdilerinin özeti: sipariş / log veri sürümleri,
+        kapasiteler, istasyon ayarları (alternatif, fırın, ayar matrisi), takvim ve
+        planlama parametreleri. Veri sürümü okunamazsa None (önbellek kullanılmaz).
+        """
+        try:
+            versions = db.get_data_versions()
+        except Exception:
+            return None
+
+        stations = {}
+        if factory_config:
+            stations = {name: asdict(info) for name, info in factory_config.get_all_stations(active_only=False).items()}
+        payload = {
+            "db": db.db_path,
+            "versions": versions,
+            "today": datetime.now().date().isoformat(),
+            "capacities": self.capacities,
+            "stations": stations,
+            "weekdays": self._weekday_factors(),
+            "holidays": sorted(self.HOLIDAYS),
+            "params": [horizon_days, self.LOOKAHEAD_WINDOW,
+                       self.BATCH_BONUS_SCORE, self.SETUP_MINUTES_PER_POINT],
+        }
+        return hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+    def _baseline_simulation(self, partial_callback=None, should_stop=None, horizon_days=None):
+        """
+        Yeni siparişsiz simülasyon; girdiler (ve ufuk) değişmediyse önceki sonuç döner.
+        Dönen ızgaralar paylaşılır: çağıranlar değiştirmemelidir.
+        """
+        horizon_days = self._horizon(horizon_days)
+        key = self._forecast_key(horizon_days)
+        cached = self._forecast_cache
+        if key is not None and cached is not None and cached[0] == key:
+            self.forecast_cache_stats["hits"] += 1
+            _, result, self.last_schedule, self.last_furnace_plan = cached
+            return result
+
+        self.forecast_cache_stats["misses"] += 1
+        result = self._run_simulation(new_order=None, partial_callback=partial_callback,
+                                      should_stop=should_stop, horizon_days=horizon_days)
+        if key is not None:
+            self._forecast_cache = (key, result, self.last_schedule, self.last_furnace_plan)
+        return result
+
+    def invalidate_forecast(self):
+        """Önbelleği elle boşalt (veri sürümüne yansımayan değişiklikler için)"""
+        self._forecast_cache = None
+
+    def calculate_schedule(self, new_order=None):
+        """Izgaralar + makine bazlı Gantt çubukları (ScheduleResult)"""
+        with self._lock:
+            self.get_planning_capacities()
+            if new_order:
+                self._run_simulation(new_order=new_order)
+            else:
+                self._baseline_simulation()
+            return self.last_schedule
+
+    def calculate_forecast(self, progress_callback=None, should_stop=None, horizon_days=None):
+        """
+        Isı haritası ızgaraları (önbellekli: girdiler değişmedikçe yeniden hesaplanmaz).
+        horizon_days: ufuk (en fazla MAX_FORECAST_DAYS, None: FORECAST_DAYS). details
+        seyrek saklanır (scheduler.DayDetails): details[istasyon][gün] liste gibi okunur.
+        progress_callback(gün, (grid, details, loads)): yeniden hesaplanırken ilk
+        PARTIAL_FORECAST_DAYS gün kesinleşince çağrılır. should_stop() True dönerse
+        scheduler.ScheduleCancelled fırlatılır (önbellek değişmez).
+        """
+        with self._lock:
+            self.get_planning_capacities()
+            grid, details, loads, _, _ = self._baseline_simulation(progress_callback, should_stop, horizon_days)
+            return grid, details, loads
 
     def calculate_impact(self, new_order_data):
-        try: self.capacities = db.get_all_capacities()
-        except: pass
-        _, _, _, _, base_finish_times = self._run_simulation(new_order=None)
-        _, _, _, target_day, new_finish_times = self._run_simulation(new_order=new_order_data)
+        with self._lock:
+            self.get_planning_capacities()
+            _, _, _, _, base_finish_times = self._baseline_simulation()
+            _, _, _, target_day, new_finish_times = self._run_simulation(new_order=new_order_data)
         
         delayed_orders = []
         for code, base_time in base_finish_times.items():
@@ -263,6 +470,39 @@ class SmartPlanner:
         delivery_date = today + timedelta(days=math.ceil(target_day))
         return delivery_date, math.ceil(target_day), delayed_orders
 
+    def calculate_delivery_risk(self, new_order_data=None, runs=None, workers=None, progress_callback=None):
+        """
+        Stokastik mod: kapasite / fire değişkenliğiyle Monte Carlo çizelge koşuları.
+        Döner: RiskResult (sipariş bazlı P50 / P90 bitiş tarihi, zamanında bitme olasılığı).
+        Yeni sipariş '>>> HESAPLANAN <<<' koduyla sonuçtadır. Uzun sürer: arayüz
+        iş parçacığından çağırmayın.
+        """
+        if risk_simulator is None:
+            raise RuntimeError("Risk simülasyonu modülü (core.risk_simulator) yüklenemedi")
+        # Tahmin thread'i kapasiteleri değiştirebilir: koşu girdileri kilit altında kopyalanır
+        with self._lock:
+            self.get_planning_capacities()
+            jobs = self._build_jobs(new_order=new_order_data)
+            capacities = dict(self.capacities)
+            alternatives = self._get_alternatives()
+            weekday_factors = self._weekday_factors()
+            holidays = list(self.HOLIDAYS)
+            changeover = None
+            if factory_config:
+                changeover = {name: {key: dict(row) for key, row in factory_config.get_changeover_matrix(name).items()}
+                              for name in capacities}
+
+        self.last_risk = risk_simulator.simulate(
+            jobs, capacities,
+            alternatives=alternatives,
+            weekday_factors=weekday_factors,
+            holidays=holidays,
+            changeover=changeover,
+            runs=runs, workers=workers,
+            progress_callback=progress_callback
+        )
+        return self.last_risk
+
     def fix_route_order(self, user_route_str):
         if not user_route_str: return ""
         selected = [s.strip() for s in user_route_str.split(',')]
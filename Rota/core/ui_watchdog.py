@@ -0,0 +1,227 @@
+"""
+EFES ROTA X - Arayüz Takılma Dedektörü (UI Watchdog)
+GUI thread'inin olay döngüsü gecikmesini ölçer ve N ms'den uzun süren
+bloklamaları Python yığınıyla birlikte logs/performance.log dosyasına yazar.
+
+Çalışma şekli:
+- GUI thread'inde bir QTimer düzenli "kalp atışı" üretir; atışlar arasındaki
+  beklenenden fazla süre olay döngüsü gecikmesidir (kare süresi).
+- Ayrı bir izleme thread'i son atıştan bu yana geçen süreyi kontrol eder;
+  eşik aşılınca sys._current_frames() ile GUI thread'inin yığınını örnekler.
+- Döngü tekrar döndüğünde takılma süresi ve örneklenen yığın loglanır.
+
+Ayarlar (ortam değişkenleri):
+    ROTA_UI_WATCHDOG=0      Kapat
+    ROTA_UI_STALL_MS=200    Takılma eşiği (ms)
+
+Kullanım:
+    from core.ui_watchdog import ui_watchdog
+    ui_watchdog.start()        # QApplication oluşturulduktan sonra
+    ui_watchdog.get_report()
+"""
+
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+try:
+    from core.logger import logger
+    LOGGER_AVAILABLE = True
+except ImportError:
+    LOGGER_AVAILABLE = False
+
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def describe_stack(frame, limit=25):
+    """
+    Yığını metne çevir ve takılmaya sebep olan uygulama çerçevesini bul.
+    Döner: (yer, yığın_metni) -> yer örn. "dashboard_view.py:214 DashboardView.update_dashboard"
+    """
+    entries = traceback.extract_stack(frame, limit=limit)
+    slot = f"{os.path.basename(entries[-1].filename)}:{entries[-1].lineno} {entries[-1].name}" if entries else "-"
+    # En içteki uygulama (views/ veya core/) çerçevesi; bu dosya hariç
+    for entry in reversed(entries):
+        if entry.filename.startswith(BASE_DIR) and entry.filename != os.path.abspath(__file__):
+            slot = f"{os.path.basename(entry.filename)}:{entry.lineno} {entry.name}"
+            break
+    return slot, "".join(traceback.format_list(entries))
+
+
+class UIWatchdog(QObject):
+    """Olay döngüsü gecikme ölçer + takılma yakalayıcı"""
+
+    stall_detected = Signal(dict)
+
+    HEARTBEAT_MS = 50           # Kalp atışı aralığı
+    SUMMARY_INTERVAL_S = 300    # Kare süresi özetinin loglanma aralığı
+    MAX_SAMPLES_PER_STALL = 5   # Uzun takılmada en fazla kaç yığın örneği alınır
+    HISTORY = 3000              # Persentiller için tutulan son gecikme ölçümü
+
+    def __init__(self, stall_threshold_ms=None):
+        super().__init__()
+        if stall_threshold_ms is None:
+            try:
+                stall_threshold_ms = float(os.environ.get("ROTA_UI_STALL_MS", 200))
+            except ValueError:
+                stall_threshold_ms = 200.0
+        self.stall_threshold_ms = stall_threshold_ms
+        self.enabled = os.environ.get("ROTA_UI_WATCHDOG", "1").lower() not in ("0", "false", "no", "off")
+
+        self._timer = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._gui_thread_id = None
+
+        self._last_beat = 0.0
+        self._samples = []              # Süren takılmanın yığın örnekleri (yer, yığın)
+        self._latencies = deque(maxlen=self.HISTORY)
+        self._stalls = deque(maxlen=100)
+        self._stall_count = 0
+        self._last_summary = 0.0
+
+    # === AÇ / KAPAT ===
+
+    def start(self):
+        """GUI thread'inden çağrılmalı (QApplication oluşturulduktan sonra)"""
+        if not self.enabled or self._timer is not None:
+            return False
+
+        self._gui_thread_id = threading.get_ident()
+        self._last_beat = self._last_summary = time.perf_counter()
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(self.HEARTBEAT_MS)
+        self._timer.timeout.connect(self._beat)
+        self._timer.start()
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name="UIWatchdog", daemon=True)
+        self._thread.start()
+
+        if LOGGER_AVAILABLE:
+            logger.info("Arayüz izleyici başlatıldı", threshold=f"{self.stall_threshold_ms:.0f}ms")
+        return True
+
+    def stop(self):
+        if self._timer is not None:
+            self._timer.stop()
+            self._timer = None
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    # === GUI THREAD ===
+
+    def _beat(self):
+        now = time.perf_counter()
+        gap_ms = (now - self._last_beat) * 1000
+        self._last_beat = now
+        latency_ms = max(0.0, gap_ms - self.HEARTBEAT_MS)
+
+        with self._lock:
+            self._latencies.append(latency_ms)
+            samples, self._samples = self._samples, []
+
+        if latency_ms >= self.stall_threshold_ms:
+            self._report_stall(latency_ms, samples)
+
+        if now - self._last_summary >= self.SUMMARY_INTERVAL_S:
+            self._last_summary = now
+            self._log_summary()
+
+    def _report_stall(self, duration_ms, samples):
+        # İlk örnek takılmanın başladığı yeri, diğerleri devamını gösterir
+        slot = samples[0][0] if samples else "-"
+        places = []
+        for place, _ in samples:
+            if place not in places:
+                places.append(place)
+        stall = {
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "duration_ms": round(duration_ms, 1),
+            "slot": slot,
+            "places": places,
+            "stack": samples[0][1] if samples else "",
+        }
+        with self._lock:
+            self._stalls.append(stall)
+            self._stall_count += 1
+
+        if LOGGER_AVAILABLE:
+            logger.ui_stall(duration_ms, " > ".join(places) or slot, stall["stack"])
+        self.stall_detected.emit(stall)
+
+    def _log_summary(self):
+        if not LOGGER_AVAILABLE:
+            return
+        report = self.get_report(include_stalls=False)
+        if report["samples"]:
+            logger.ui_frame_stats(report["samples"], report["p50_ms"], report["p95_ms"],
+                                  report["p99_ms"], report["max_ms"], report["stall_count"])
+
+    # === İZLEME THREAD'İ ===
+
+    def _watch(self):
+        poll = self.HEARTBEAT_MS / 2000
+        next_sample_ms = self.stall_threshold_ms
+        while not self._stop.wait(poll):
+            blocked_ms = (time.perf_counter() - self._last_beat) * 1000
+            if blocked_ms < self.HEARTBEAT_MS + self.stall_threshold_ms:
+                next_sample_ms = self.stall_threshold_ms
+                continue
+            if blocked_ms - self.HEARTBEAT_MS < next_sample_ms:
+                continue
+
+            frame = sys._current_frames().get(self._gui_thread_id)
+            if frame is None:
+                continue
+            sample = describe_stack(frame)
+            with self._lock:
+                if len(self._samples) < self.MAX_SAMPLES_PER_STALL:
+                    self._samples.append(sample)
+            # Uzun takılmalarda her eşik katında yeni örnek al
+            next_sample_ms += self.stall_threshold_ms
+
+    # === RAPOR ===
+
+    def get_report(self, include_stalls=True):
+        """Kare süresi istatistikleri ve son takılmalar"""
+        with self._lock:
+            values = sorted(self._latencies)
+            stalls = list(reversed(self._stalls)) if include_stalls else []
+            stall_count = self._stall_count
+        report = {
+            "enabled": self.enabled,
+            "running": self._timer is not None,
+            "threshold_ms": self.stall_threshold_ms,
+            "samples": len(values),
+            "p50_ms": round(_percentile(values, 50), 1),
+            "p95_ms": round(_percentile(values, 95), 1),
+            "p99_ms": round(_percentile(values, 99), 1),
+            "max_ms": round(values[-1], 1) if values else 0.0,
+            "stall_count": stall_count,
+        }
+        if include_stalls:
+            report["stalls"] = stalls
+        return report
+
+
+# Singleton instance
+ui_watchdog = UIWatchdog()
@@ -0,0 +1,88 @@
+"""
+EFES ROTA X - Sentetik Test Verisi Üretici
+Boş bir veritabanını büyük ölçekli, gerçekçi fabrika verisiyle doldurur.
+Aynı seed ve bitiş tarihi her zaman aynı veritabanını üretir.
+
+Kullanım:
+    python generate_test_data.py --preset small  --db test_small.db
+    python generate_test_data.py --preset large  --db buyuk_test.db --seed 7 --end-date 2025-12-31
+    python generate_test_data.py --orders 50000 --logs 1000000 --years 3 --db ozel.db
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from core.data_generator import FactoryDataGenerator, PRESETS
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Yük testi için sentetik fabrika verisi üret")
+    parser.add_argument('--db', required=True, help="Oluşturulacak veritabanı dosyası")
+    parser.add_argument('--preset', choices=list(PRESETS), default='small', help="Hazır veri seti boyutu")
+    parser.add_argument('--seed', type=int, default=42, help="Rastgelelik tohumu")
+    parser.add_argument('--end-date', help="Verinin biteceği gün (YYYY-AA-GG, varsayılan: bugün)")
+    parser.add_argument('--years', type=float, help="Kaç yıllık geçmiş")
+    parser.add_argument('--orders', type=int, help="Sipariş sayısı (rework dahil)")
+    parser.add_argument('--logs', type=int, help="Yaklaşık üretim log sayısı")
+    parser.add_argument('--projects', type=int, help="Proje sayısı")
+    parser.add_argument('--customers', type=int, help="Müşteri sayısı")
+    parser.add_argument('--plates', type=int, help="Plaka çeşidi sayısı")
+    parser.add_argument('--fire-rate', type=float, default=0.04, help="Siparişte fire çıkma olasılığı")
+    parser.add_argument('--force', action='store_true', help="Var olan dosyanın üzerine yaz")
+    args = parser.parse_args()
+
+    db_path = os.path.join(BASE_DIR, args.db)
+    if os.path.basename(db_path) == 'efes_factory.db':
+        print("❌ Canlı veritabanına test verisi yazılamaz. Farklı bir dosya adı verin.")
+        return 2
+    if os.path.exists(db_path):
+        if not args.force:
+            print(f"❌ {args.db} zaten var. Üzerine yazmak için --force kullanın.")
+            return 2
+        os.remove(db_path)
+
+    from core.db_manager import DatabaseManager
+    manager = DatabaseManager(db_path)
+
+    started = time.perf_counter()
+
+    def progress(stage, done, total):
+        elapsed = time.perf_counter() - started
+        print(f"\r   ⏳ {stage}: {done:,}/{total:,} ({elapsed:.0f} sn)", end='', flush=True)
+
+    generator = FactoryDataGenerator(
+        manager, seed=args.seed, preset=args.preset, end_date=args.end_date,
+        fire_rate=args.fire_rate, progress=progress,
+        years=args.years, orders=args.orders, logs=args.logs,
+        projects=args.projects, customers=args.customers, plates=args.plates,
+    )
+
+    print("🏭 EFES ROTA - Sentetik Veri Üretimi")
+    print("=" * 60)
+    print(f"📁 Veritabanı : {db_path}")
+    print(f"🎲 Seed      : {args.seed}  |  Preset: {args.preset}")
+    print(f"📅 Aralık    : {generator.start:%d.%m.%Y} - {generator.end:%d.%m.%Y}")
+    print()
+
+    stats = generator.generate()
+    elapsed = time.perf_counter() - started
+
+    print("\n")
+    print("=" * 60)
+    print(f"✅ Tamamlandı ({elapsed:.1f} sn)")
+    print(f"   📦 Sipariş   : {stats['orders']:,} (rework: {stats['reworks']:,})")
+    print(f"   📝 Log       : {stats['logs']:,}")
+    print(f"   🚚 Palet     : {stats['pallets']:,}")
+    print(f"   📂 Proje     : {stats['projects']:,}")
+    print(f"   🪟 Plaka     : {stats['plates']:,}")
+    print(f"   👷 Operatör  : {stats['users']:,}")
+    print(f"   💾 Boyut     : {os.path.getsize(db_path) / 1024 / 1024:.1f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,255 @@
+"""
+EFES ROTA X - İndeks Danışmanı
+core/db_manager.py ve views/ altındaki tüm SQL ifadelerini bulur,
+her biri için EXPLAIN QUERY PLAN çalıştırır ve sorunlu planları raporlar:
+
+- Tam tablo taraması (SCAN tablo, indeks kullanılmadan)
+- Geçici sıralama ağacı (USE TEMP B-TREE FOR ORDER BY / GROUP BY)
+- İndeks kullanamayan (non-sargable) koşullar: date(kolon) = ..., LIKE '%...'
+
+Kullanım:
+    python index_advisor.py                      # efes_factory.db üzerinde
+    python index_advisor.py --db buyuk_test.db   # sentetik büyük veritabanı
+    python index_advisor.py --json rapor.json --strict
+"""
+
+import argparse
+import ast
+import json
+import os
+import re
+import sqlite3
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Taranacak kaynaklar
+SOURCES = ['core/db_manager.py', 'views']
+
+# Plan analizi yapılacak ifade türleri (DDL ve PRAGMA atlanır)
+EXPLAINABLE = ('SELECT', 'WITH', 'UPDATE', 'DELETE', 'INSERT')
+
+NON_SARGABLE_PATTERNS = [
+    (re.compile(r"\bdate\s*\(\s*[\w.]*timestamp\s*\)", re.IGNORECASE),
+     "date(timestamp) indeksi kullanamaz, aralık koşulu kullanın: ts >= ? AND ts < date(?, '+1 day')"),
+    (re.compile(r"LIKE\s+'%", re.IGNORECASE),
+     "Baştaki % joker karakteri indeks kullanamaz"),
+]
+
+
+def _literal_sql(node):
+    """AST düğümünden SQL metnini çıkar (f-string parçaları '?' olur)"""
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value, False
+    if isinstance(node, ast.JoinedStr):
+        parts = []
+        for value in node.values:
+            if isinstance(value, ast.Constant):
+                parts.append(str(value.value))
+            else:
+                parts.append('?')
+        return ''.join(parts), True
+    return None, False
+
+
+class SQLCollector(ast.NodeVisitor):
+    """execute()/executemany() çağrılarındaki SQL metinlerini toplar"""
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.statements = []
+        self._scopes = [{}]
+        self._functions = []
+
+    def visit_FunctionDef(self, node):
+        self._scopes.append({})
+        self._functions.append(node.name)
+        self.generic_visit(node)
+        self._functions.pop()
+        self._scopes.pop()
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_Assign(self, node):
+        sql, dynamic = _literal_sql(node.value)
+        if sql is not None:
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    self._scopes[-1][target.id] = (sql, dynamic)
+        self.generic_visit(node)
+
+    def visit_Call(self, node):
+        func = node.func
+        if isinstance(func, ast.Attribute) and func.attr in ('execute', 'executemany') and node.args:
+            arg = node.args[0]
+            sql, dynamic = _literal_sql(arg)
+            if sql is None and isinstance(arg, ast.Name):
+                sql, dynamic = self._scopes[-1].get(arg.id, (None, False))
+            if sql is not None:
+                self.statements.append({
+                    'file': self.filename,
+                    'line': node.lineno,
+                    'function': self._functions[-1] if self._functions else '<modül>',
+                    'sql': ' '.join(sql.split()),
+                    'dynamic': dynamic,
+                })
+        self.generic_visit(node)
+
+
+def collect_statements(base_dir=BASE_DIR):
+    """Kaynak dosyalardaki tüm SQL ifadelerini topla"""
+    files = []
+    for source in SOURCES:
+        path = os.path.join(base_dir, source)
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, f) for f in sorted(os.listdir(path)) if f.endswith('.py'))
+        elif os.path.exists(path):
+            files.append(path)
+
+    statements = []
+    for filepath in files:
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                tree = ast.parse(f.read(), filename=filepath)
+        except (SyntaxError, OSError) as e:
+            print(f"⚠️  Okunamadı {filepath}: {e}")
+            continue
+        collector = SQLCollector(os.path.relpath(filepath, base_dir))
+        collector.visit(tree)
+        statements.extend(collector.statements)
+    return statements
+
+
+def explain(conn, sql):
+    """EXPLAIN QUERY PLAN çıktısını satır listesi olarak döndür"""
+    params = (None,) * sql.count('?')
+    rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+    return [row[3] for row in rows]
+
+
+PLAN_TABLE_RE = re.compile(r"^(?:SCAN|SEARCH) (\w+)")
+
+
+def analyze_plan(plan, row_counts, min_rows):
+    """Plan satırlarındaki sorunları bul (küçük tablolar göz ardı edilir)"""
+    tables = {m.group(1) for m in (PLAN_TABLE_RE.match(d) for d in plan) if m}
+    large = any(row_counts.get(t, 0) >= min_rows for t in tables)
+
+    issues = []
+    for detail in plan:
+        match = PLAN_TABLE_RE.match(detail)
+        if detail.startswith('SCAN') and 'INDEX' not in detail and match:
+            if row_counts.get(match.group(1), 0) >= min_rows:
+                issues.append(f"Tam tarama: {detail}")
+        elif 'USE TEMP B-TREE' in detail and large:
+            issues.append(f"Geçici sıralama: {detail}")
+    return issues
+
+
+def table_row_counts(conn):
+    """Tablo başına satır sayısı"""
+    counts = {}
+    for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type='table'").fetchall():
+        try: counts[name] = conn.execute(f'SELECT COUNT(*) FROM "{name}"').fetchone()[0]
+        except sqlite3.Error: pass
+    return counts
+
+
+def analyze_statements(db_path, statements, min_rows=1000):
+    """Her ifadeyi veritabanında açıkla ve sorunları işaretle"""
+    conn = sqlite3.connect(db_path)
+    results = []
+    try:
+        row_counts = table_row_counts(conn)
+        for stmt in statements:
+            sql = stmt['sql']
+            result = dict(stmt, plan=[], issues=[], error=None)
+
+            for pattern, message in NON_SARGABLE_PATTERNS:
+                if pattern.search(sql):
+                    result['issues'].append(message)
+
+            if sql.lstrip().upper().startswith(EXPLAINABLE):
+                try:
+                    result['plan'] = explain(conn, sql)
+                    result['issues'].extend(analyze_plan(result['plan'], row_counts, min_rows))
+                except sqlite3.Error as e:
+                    result['error'] = str(e)
+            else:
+                result['plan'] = None
+            results.append(result)
+    finally:
+        conn.close()
+    return results
+
+
+def list_indexes(db_path):
+    """Veritabanındaki mevcut indeksleri döndür"""
+    conn = sqlite3.connect(db_path)
+    try:
+        return [dict(name=r[0], table=r[1], sql=r[2]) for r in conn.execute(
+            "SELECT name, tbl_name, sql FROM sqlite_master WHERE type='index' AND sql IS NOT NULL ORDER BY tbl_name, name"
+        ).fetchall()]
+    finally:
+        conn.close()
+
+
+def print_report(results, indexes):
+    print("🔍 EFES ROTA - İndeks Danışmanı")
+    print("=" * 70)
+    print(f"\n📇 Mevcut indeksler ({len(indexes)}):")
+    for idx in indexes:
+        print(f"   • {idx['name']:<32} {idx['table']}")
+
+    explained = [r for r in results if r['plan'] is not None]
+    flagged = [r for r in results if r['issues']]
+    errors = [r for r in results if r['error']]
+
+    print(f"\n📊 {len(results)} SQL ifadesi bulundu, {len(explained)} tanesi analiz edildi.")
+
+    for r in flagged:
+        print(f"\n  ⚠️  {r['file']}:{r['line']} ({r['function']})")
+        print(f"     {r['sql'][:110]}")
+        for issue in r['issues']:
+            print(f"     → {issue}")
+
+    if errors:
+        print(f"\n⏭️  {len(errors)} ifade analiz edilemedi (dinamik SQL veya eksik tablo):")
+        for r in errors:
+            print(f"   • {r['file']}:{r['line']} - {r['error']}")
+
+    print("\n" + "=" * 70)
+    if flagged:
+        print(f"⚠️  {len(flagged)} ifadede iyileştirme fırsatı var.")
+    else:
+        print("✅ Tüm ifadeler indeks kullanıyor.")
+    return flagged
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQL ifadeleri için EXPLAIN QUERY PLAN raporu")
+    parser.add_argument('--db', default=os.path.join(BASE_DIR, 'efes_factory.db'), help="Analiz edilecek veritabanı")
+    parser.add_argument('--json', dest='json_path', help="Sonuçları JSON olarak kaydet")
+    parser.add_argument('--min-rows', type=int, default=1000, help="Bu satır sayısının altındaki tablolardaki taramaları yok say")
+    parser.add_argument('--strict', action='store_true', help="Sorun bulunursa hata koduyla çık")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"❌ Veritabanı bulunamadı: {args.db}")
+        return 2
+
+    statements = collect_statements()
+    results = analyze_statements(args.db, statements, args.min_rows)
+    indexes = list_indexes(args.db)
+    flagged = print_report(results, indexes)
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump({'db': args.db, 'indexes': indexes, 'statements': results}, f, ensure_ascii=False, indent=2)
+        print(f"💾 JSON rapor kaydedildi: {args.json_path}")
+
+    return 1 if (args.strict and flagged) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,20 +3,26 @@ from PySide6.QtWidgets import QApplication, QMainWindow, QStackedWidget, QMessag
 from PySide6.QtGui import QFont, QIcon
 
 # Kendi modüllerimiz
-try:
-    from ui.theme import Theme
-    from views.login_view import LoginView
-    from views.dashboard_view import DashboardView
-    from views.operator_view import OperatorView
-    from views.daily_summary_dialog import DailySummaryDialog
-
-    # === YENİ IMPORT'LAR ===
-    from core.db_manager import db
-    from core.factory_config import factory_config
-    from core.logger import logger
-
-except ImportError as e:
-    print(f"UYARI: Modul yukleme hatasi: {e}")
+# (Süreç havuzu işçileri spawn ile bu dosyayı "__mp_main__" olarak yeniden yükler;
+#  işçilerde arayüz ve veritabanı kurulmasın diye importlar orada atlanır)
+if __name__ != "__mp_main__":
+    try:
+        from ui.theme import Theme
+        from views.login_view import LoginView
+        from views.dashboard_view import DashboardView
+        from views.operator_view import OperatorView
+        from views.daily_summary_dialog import DailySummaryDialog
+
+        # === YENİ IMPORT'LAR ===
+        from core.db_manager import db
+        from core.factory_config import factory_config
+        from core.logger import logger
+        from core.ui_watchdog import ui_watchdog
+        from core.capacity_learning import capacity_learner
+        from core.scan_ingest import scan_queue
+
+    except ImportError as e:
+        print(f"UYARI: Modul yukleme hatasi: {e}")
 
 class EfesRotaApp(QMainWindow):
     def __init__(self):
@@ -122,6 +128,26 @@ if __name__ == "__main__":
     # === YENİ: Başlangıç logu ===
     logger.info("REFLEKS 360 R başlatıldı")
     
+    # === Arayüz takılma dedektörü (logs/performance.log) ===
+    try:
+        ui_watchdog.start()
+        app.aboutToQuit.connect(ui_watchdog.stop)
+    except Exception as e:
+        print(f"UI izleyici başlatılamadı: {e}")
+    
+    # === Üretim geçmişinden kapasite öğrenme (ROTA_LEARNED_CAPACITY=1; özeti yalnız ROTA_SUMMARY_HOST=1 günceller) ===
+    try:
+        capacity_learner.start()
+        app.aboutToQuit.connect(capacity_learner.stop)
+    except Exception as e:
+        print(f"Kapasite öğrenme başlatılamadı: {e}")
+    
+    # === Operatör okutma kuyruğu: kapanışta bekleyenleri yazmayı dene (kalanlar terminal günlüğünde) ===
+    try:
+        app.aboutToQuit.connect(scan_queue.stop)
+    except Exception as e:
+        print(f"Okutma kuyruğu kapanışa bağlanamadı: {e}")
+    
     window = EfesRotaApp()
     window.show()
     
@@ -0,0 +1,171 @@
+"""
+EFES ROTA X - Komut Satırı Planlama (ekransız sunucu / cron için)
+Ekranlardaki planlama çıktılarını PySide6 olmadan üretir:
+sıralama (+ isteğe bağlı yerel arama) → karar destek tablosu (CR, tahmini bitiş)
+→ kapasite tahmini → haftalık iş emri PDF'i + CSV dosyaları. Her adımın süresi raporlanır.
+
+Kullanım:
+    python plan_cli.py                                     # plans/YYYYMMDD altına
+    python plan_cli.py --db /srv/efes/efes_factory.db --out /srv/plans --horizon 60
+    python plan_cli.py --improve 5 --no-pdf                # 5 sn yerel arama, PDF yok
+
+Cron örneği (her gece 02:00):
+    0 2 * * * cd /opt/rota && python plan_cli.py --out /srv/plans >> logs/plan_cli.log 2>&1
+
+Veritabanı ve istasyon ayarları (kapasite, aktiflik, alternatif, ayar matrisi)
+arayüzdeki gibi açılır: factory_config.set_database(db). --db verilirse varsayılan
+efes_factory.db hiç açılmaz (ROTA_DB_PATH).
+
+Çıkış kodu: 0 başarılı, 1 hata.
+"""
+
+import argparse
+import csv
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+ACTIVE_STATUSES = ["Beklemede", "Üretimde"]
+
+
+class StepTimer:
+    """Adım süreleri (sn), eklendiği sırayla"""
+
+    def __init__(self):
+        self.timings = {}
+
+    def step(self, name, fn, *args, **kwargs):
+        started = time.perf_counter()
+        result = fn(*args, **kwargs)
+        self.timings[name] = time.perf_counter() - started
+        return result
+
+
+def write_csv(path, header, rows):
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def station_load_rows(forecast, loads, start_date):
+    """Kapasite tahmini: istasyon / gün başına doluluk ve m²"""
+    rows = []
+    for station in sorted(forecast):
+        for day_idx, percent in enumerate(forecast[station]):
+            if percent <= 0:
+                continue
+            day = start_date + timedelta(days=day_idx)
+            rows.append([station, day.strftime('%Y-%m-%d'), f"{percent:.0f}", f"{loads[station][day_idx]:.1f}"])
+    return rows
+
+
+def open_database(path=None):
+    """
+    Planlama veritabanını arayüzle aynı şekilde aç: db + factory_config istasyon ayarları.
+    path verilirse core.db_manager bu dosyayla yüklenir. Döner: db
+    """
+    if path:
+        os.environ["ROTA_DB_PATH"] = path   # core.db_manager henüz yüklenmediyse varsayılan dosya açılmaz
+    from core.db_manager import db, DatabaseManager
+    if path and os.path.abspath(db.db_path) != path:
+        DatabaseManager(path)               # Önceden yüklenmiş: eksik tablo / kolonlar eklensin
+        db.db_path = path
+    from core.factory_config import factory_config
+    factory_config.set_database(db)
+    return db
+
+
+def run_plan(out_dir, horizon_days=None, improve_seconds=0, pdf=True, log=print):
+    """
+    Planı üret ve out_dir altına yaz.
+    Döner: (oluşturulan dosyalar, {adım: süre sn})
+    """
+    from core.db_manager import db
+    from core.smart_planner import planner
+    from core.decision_engine import SmartRecommendationEngine
+
+    os.makedirs(out_dir, exist_ok=True)
+    today = datetime.now()
+    stamp = today.strftime('%Y%m%d')
+    timer = StepTimer()
+    files = []
+
+    orders = timer.step("siparisler", db.get_orders_by_status, ACTIVE_STATUSES)
+    log(f"{len(orders)} aktif sipariş")
+
+    sequence = timer.step("siralama", planner.optimize_production_sequence, orders)
+    if improve_seconds and sequence:
+        sequence, report = timer.step("yerel_arama", planner.improve_sequence, sequence, improve_seconds)
+        log(f"Yerel arama: gecikme {report['initial']['tardiness']:.1f} -> {report['final']['tardiness']:.1f} gün, "
+            f"ayar {report['initial']['setups']} -> {report['final']['setups']}")
+
+    engine = SmartRecommendationEngine()
+    timer.step("karar_destek", engine.prepare, sequence)
+    plan_rows = timer.step("plan_tablosu", engine.plan_rows, sequence)
+    plan_path = os.path.join(out_dir, f"uretim_plani_{stamp}.csv")
+    write_csv(plan_path, engine.PLAN_COLUMNS, plan_rows)
+    files.append(plan_path)
+
+    forecast, details, loads = timer.step("kapasite_tahmini", planner.calculate_forecast, horizon_days=horizon_days)
+    load_path = os.path.join(out_dir, f"istasyon_yuku_{stamp}.csv")
+    write_csv(load_path, ["ISTASYON", "TARIH", "DOLULUK_%", "M2"], station_load_rows(forecast, loads, today.date()))
+    files.append(load_path)
+
+    if pdf:
+        try:
+            from core.pdf_engine import PDFEngine
+        except ImportError as e:
+            log(f"PDF atlandı (reportlab yok): {e}")
+        else:
+            pdf_path = os.path.join(out_dir, f"haftalik_is_emri_{stamp}.pdf")
+            success, msg = timer.step("haftalik_pdf", PDFEngine(pdf_path).generate_weekly_schedule_pdf, details)
+            if not success:
+                raise RuntimeError(f"PDF oluşturulamadı: {msg}")
+            files.append(pdf_path)
+
+    return files, timer.timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EFES ROTA gece planı (arayüzsüz)")
+    parser.add_argument('--db', help="Veritabanı dosyası (varsayılan: efes_factory.db)")
+    parser.add_argument('--out', default=os.path.join("plans", datetime.now().strftime('%Y%m%d')),
+                        help="Çıktı klasörü")
+    parser.add_argument('--horizon', type=int, help="Tahmin ufku (gün, en fazla 180)")
+    parser.add_argument('--improve', type=float, default=0, metavar='SN',
+                        help="Sırayı bu kadar saniye yerel aramayla iyileştir")
+    parser.add_argument('--no-pdf', action='store_true', help="Haftalık PDF üretme")
+    args = parser.parse_args()
+
+    path = os.path.abspath(args.db) if args.db else None
+    if path and not os.path.exists(path):
+        print(f"❌ Veritabanı bulunamadı: {path}")
+        return 1
+    db = open_database(path)
+
+    print("🗓️  EFES ROTA - Gece Planı")
+    print(f"   Veritabanı: {db.db_path}")
+    print("=" * 60)
+
+    started = time.perf_counter()
+    try:
+        files, timings = run_plan(args.out, args.horizon, args.improve, pdf=not args.no_pdf)
+    except Exception as e:
+        print(f"❌ Plan üretilemedi: {e}")
+        return 1
+
+    print("\n⏱️  Süreler:")
+    for name, seconds in timings.items():
+        print(f"   {name:<18} {seconds * 1000:>9.1f} ms")
+    print(f"   {'toplam':<18} {(time.perf_counter() - started) * 1000:>9.1f} ms")
+
+    print("\n📄 Dosyalar:")
+    for path in files:
+        print(f"   {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""
+EFES ROTA X - Performans Ölçüm Aracı
+benchmarks/ altındaki pytest-benchmark testlerini çalıştırır, sonuçları
+benchmarks/baselines altında JSON olarak saklar ve kayıtlı bir ölçümle karşılaştırır.
+
+Kullanım:
+    python run_benchmarks.py --save baseline                       # small veri seti, referans kaydet
+    python run_benchmarks.py --datasets small medium --save baseline
+    python run_benchmarks.py --compare baseline --threshold 25     # %25'ten fazla yavaşlarsa hata
+"""
+
+import argparse
+import glob
+import os
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BENCH_DIR = os.path.join(BASE_DIR, "benchmarks")
+BASELINE_DIR = os.path.join(BENCH_DIR, "baselines")
+
+
+def resolve_baseline(name):
+    """Kayıt adını (örn. 'baseline') pytest-benchmark çalışma numarasına çevir"""
+    if name.isdigit():
+        return name
+    matches = sorted(glob.glob(os.path.join(BASELINE_DIR, "*", f"[0-9][0-9][0-9][0-9]_{name}.json")))
+    if not matches:
+        return None
+    # Aynı adla birden fazla kayıt varsa en yenisi
+    return os.path.basename(matches[-1]).split("_", 1)[0]
+
+
+def build_pytest_args(args):
+    pytest_args = [
+        BENCH_DIR, "-q", "-p", "no:cacheprovider",
+        "--datasets", *args.datasets,
+        "--rounds", str(args.rounds),
+        f"--benchmark-storage=file://{BASELINE_DIR}",
+        "--benchmark-sort=fullname",
+        "--benchmark-columns=min,mean,median,max,rounds",
+    ]
+    if args.regenerate:
+        pytest_args.append("--regenerate")
+    if args.save:
+        pytest_args.append(f"--benchmark-save={args.save}")
+    if args.compare:
+        pytest_args.append(f"--benchmark-compare={resolve_baseline(args.compare)}")
+        pytest_args.append(f"--benchmark-compare-fail=mean:{args.threshold:g}%")
+    if args.keyword:
+        pytest_args += ["-k", args.keyword]
+    return pytest_args
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EFES ROTA performans ölçümleri")
+    parser.add_argument('--datasets', nargs='+', default=['small'], help="small / medium / large")
+    parser.add_argument('--rounds', type=int, default=3, help="Her ölçüm için tur sayısı")
+    parser.add_argument('--save', metavar='AD', help="Sonuçları referans olarak kaydet")
+    parser.add_argument('--compare', metavar='AD', help="Kayıtlı referansla karşılaştır (ad veya numara)")
+    parser.add_argument('--threshold', type=float, default=20.0, help="İzin verilen ortalama yavaşlama (%%)")
+    parser.add_argument('--regenerate', action='store_true', help="Veri setlerini yeniden üret")
+    parser.add_argument('-k', dest='keyword', help="Sadece eşleşen testleri çalıştır")
+    args = parser.parse_args()
+
+    try:
+        import pytest
+        import pytest_benchmark  # noqa: F401
+    except ImportError:
+        print("❌ pytest ve pytest-benchmark gerekli: pip install pytest pytest-benchmark")
+        return 2
+
+    if args.compare and not resolve_baseline(args.compare):
+        print(f"❌ Referans ölçüm bulunamadı: {args.compare} ({BASELINE_DIR})")
+        return 2
+
+    print("⏱️  EFES ROTA - Performans Ölçümü")
+    print(f"   Veri setleri: {', '.join(args.datasets)}  |  Tur: {args.rounds}")
+    if args.compare:
+        print(f"   Referans: {args.compare}  |  Eşik: %{args.threshold:g}")
+    print("=" * 70)
+
+    return pytest.main(build_pytest_args(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,29 @@
+"""
+EFES ROTA X - Doğruluk Testleri (pytest)
+Qt ve pytest-benchmark gerektirmez; elle hesaplanmış küçük örneklerle çalışır.
+
+Kullanım:
+    pytest tests
+"""
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.dirname(TESTS_DIR)
+
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+# Global db (core.db_manager) paylaşılan efes_factory.db yerine geçici dosyayı açsın
+os.environ.setdefault("ROTA_DB_PATH", os.path.join(tempfile.mkdtemp(prefix="rota-tests-"), "efes_factory.db"))
+
+
+@pytest.fixture
+def temp_db(tmp_path):
+    """Boş, şeması kurulmuş geçici veritabanı (paylaşılan efes_factory.db'ye dokunulmaz)"""
+    from core.db_manager import DatabaseManager
+    return DatabaseManager(str(tmp_path / "test_factory.db"))
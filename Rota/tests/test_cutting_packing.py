@@ -0,0 +1,124 @@
+"""GuillotineCutter yerleşim geçerliliği, kesim payı ve stok kuralları"""
+
+import random
+
+import pytest
+
+from core.cutting_packing import CuttingPlan, GuillotineCutter, build_variants, pack_variant
+
+
+def plate(plate_id, width, height, quantity=None):
+    return {'id': plate_id, 'width': width, 'height': height, 'quantity': quantity}
+
+
+def pieces(order_id, width, height, count):
+    return [(order_id, f"S{order_id}", width, height)] * count
+
+
+def is_guillotine(rects, x, y, w, h):
+    """Bölge kenardan kenara tek kesimlerle, her parçada bir parça kalana dek bölünebiliyor mu"""
+    if len(rects) <= 1:
+        return all(rx >= x and ry >= y and rx + rw <= x + w and ry + rh <= y + h
+                   for rx, ry, rw, rh in rects)
+    for cut in sorted({r[0] + r[2] for r in rects}):
+        left = [r for r in rects if r[0] + r[2] <= cut]
+        right = [r for r in rects if r[0] >= cut]
+        if left and right and len(left) + len(right) == len(rects):
+            return is_guillotine(left, x, y, cut - x, h) and is_guillotine(right, cut, y, x + w - cut, h)
+    for cut in sorted({r[1] + r[3] for r in rects}):
+        below = [r for r in rects if r[1] + r[3] <= cut]
+        above = [r for r in rects if r[1] >= cut]
+        if below and above and len(below) + len(above) == len(rects):
+            return is_guillotine(below, x, y, w, cut - y) and is_guillotine(above, x, cut, w, y + h - cut)
+    return False
+
+
+def assert_valid(plan, kerf):
+    for sheet in plan.sheets:
+        # Kesim payı parçaya eklenir; levha kenarına taşan pay kesilmez
+        rects = [(x, y, min(w + kerf, sheet.width - x), min(h + kerf, sheet.height - y))
+                 for _, _, x, y, w, h, _ in sheet.placements]
+        assert is_guillotine(rects, 0, 0, sheet.width, sheet.height)
+
+
+def test_single_piece_cuts_and_offcuts():
+    plan = GuillotineCutter([plate(1, 200, 100, 1)], kerf=0, min_offcut=20).pack(pieces(1, 100, 50, 1))
+    [sheet] = plan.sheets
+    # İki yön de sığar: döndürülünce levha boyu tam dolar (kısa kenar artığı 0)
+    assert sheet.placements == [(1, "S1", 0, 0, 50, 100, True)]
+    assert sheet.pieces() == pieces(1, 100, 50, 1)
+    assert sheet.cuts == [('D', 50, 0, 100)]
+    assert sheet.free_rects == [(50, 0, 150, 100)]
+    assert plan.stock_used == {1: 1}
+    assert plan.waste_pct == pytest.approx(75.0)
+
+
+def test_split_rule_orders_cuts():
+    # 100 x 50 parça (döndürmesiz): sağ artık 100, alt artık 50
+    slas = GuillotineCutter([plate(1, 200, 100, 1)], kerf=0, rotation="normal").pack(pieces(1, 100, 50, 1))
+    assert slas.sheets[0].cuts == [('D', 100, 0, 100), ('Y', 0, 50, 100)]
+    assert sorted(slas.sheets[0].free_rects) == [(0, 50, 100, 50), (100, 0, 100, 100)]
+
+    llas = GuillotineCutter([plate(1, 200, 100, 1)], kerf=0, rotation="normal", split_rule="LLAS").pack(
+        pieces(1, 100, 50, 1))
+    assert llas.sheets[0].cuts == [('Y', 0, 50, 200), ('D', 100, 0, 50)]
+    assert sorted(llas.sheets[0].free_rects) == [(0, 50, 200, 50), (100, 0, 100, 50)]
+
+
+def test_kerf_is_left_between_pieces():
+    wide = GuillotineCutter([plate(1, 201, 100, 2)], kerf=0.3).pack(pieces(1, 100, 100, 2))
+    assert len(wide.sheets) == 1
+    assert [p[2] for p in wide.sheets[0].placements] == pytest.approx([0, 100.3])
+
+    # 100 + 0.3 + 100 > 200: ikinci parça ikinci levhaya
+    tight = GuillotineCutter([plate(1, 200, 100, 2)], kerf=0.3).pack(pieces(1, 100, 100, 2))
+    assert len(tight.sheets) == 2
+    assert tight.stock_used == {1: 2}
+
+
+def test_piece_rotates_to_fit():
+    plan = GuillotineCutter([plate(1, 100, 200, 1)], kerf=0).pack(pieces(1, 150, 80, 1))
+    assert plan.sheets[0].placements == [(1, "S1", 0, 0, 80, 150, True)]
+
+
+def test_stock_limit_and_off_stock_sheets():
+    limited = GuillotineCutter([plate(1, 100, 100, 1)], kerf=0, allow_off_stock=False)
+    plan = limited.pack(pieces(1, 90, 90, 2))
+    assert len(plan.sheets) == 1
+    assert plan.unplaced == pieces(1, 90, 90, 1)
+
+    # Stok bitince aynı ölçüde satın alınacak levha (plate_id None)
+    plan = GuillotineCutter([plate(1, 100, 100, 1)], kerf=0).pack(pieces(1, 90, 90, 2))
+    assert plan.unplaced == []
+    assert plan.stock_used == {1: 1, None: 1}
+    assert sorted((s.width, s.height) for s in plan.sheets) == [(100, 100), (100, 100)]
+
+
+@pytest.mark.parametrize("variant", build_variants(12, [plate(1, 321, 225), plate(2, 250, 160)]))
+def test_random_orders_pack_to_valid_guillotine_layouts(variant):
+    rng = random.Random(7)
+    items = []
+    for order_id in range(1, 16):
+        items += pieces(order_id, rng.randint(20, 160), rng.randint(20, 120), rng.randint(1, 4))
+    stock = [plate(1, 321, 225, 5), plate(2, 250, 160, 5)]
+
+    _, plan = pack_variant(((6, "Düz Cam"), variant, stock, [], items, 0.3, 20))
+
+    assert plan.unplaced == []
+    placed = sorted((p[0], min(p[4], p[5]), max(p[4], p[5])) for s in plan.sheets for p in s.placements)
+    assert placed == sorted((p[0], min(p[2], p[3]), max(p[2], p[3])) for p in items)
+    for sheet in plan.sheets:
+        for order_id, _, x, y, w, h, rotated in sheet.placements:
+            original = next(p for p in items if p[0] == order_id)
+            assert (w, h) == ((original[3], original[2]) if rotated else (original[2], original[3]))
+    assert_valid(plan, 0.3)
+    assert sum(plan.stock_used.values()) == len(plan.sheets)
+    assert plan.stock_used.get(1, 0) <= 5 and plan.stock_used.get(2, 0) <= 5
+
+
+def test_plan_round_trips_through_dict():
+    plan = GuillotineCutter([plate(1, 321, 225, 3)], kerf=0.3).pack(
+        pieces(1, 100, 60, 5) + pieces(2, 40, 40, 3), CuttingPlan(6, "Düz Cam"))
+    restored = CuttingPlan.from_dict(plan.to_dict())
+    assert restored.get_summary() == plan.get_summary()
+    assert [s.placements for s in restored.sheets] == [s.placements for s in plan.sheets]
@@ -0,0 +1,86 @@
+"""FurnaceBatchPlanner yük kuralları ve fırın süresi payları"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from core.furnace_batcher import FurnaceBatchPlanner
+from core.scheduler import MINUTES_PER_DAY
+
+
+class FakeConfig:
+    """Tek fırın: 100 x 200 cm yatak, 6 mm için 60 dk çevrim"""
+
+    def get_batch_stations(self):
+        return ["TEMPER"]
+
+    def get_station(self, name):
+        return SimpleNamespace(bed_width=100, bed_length=200, cycle_minutes=60)
+
+
+def order(order_id, width, height, quantity, thickness=4, due="2026-11-02", route="INTERMAC,TEMPER"):
+    return {'id': order_id, 'order_code': f"S{order_id}", 'width': width, 'height': height,
+            'quantity': quantity, 'thickness': thickness, 'delivery_date': due, 'route': route}
+
+
+@pytest.fixture
+def batcher():
+    return FurnaceBatchPlanner(FakeConfig())
+
+
+def test_pieces_fill_shelves_with_gap(batcher):
+    plan = batcher.plan([order(1, 30, 30, 4)], progress={})
+    [load] = plan.loads["TEMPER"]
+    # 0, 33, 66 (66 + 30 <= 100) tek rafta; dördüncü parça 30 + 3 cm aralıklı yeni rafta
+    assert [(p[4], p[5]) for p in load.pieces] == [(0, 0), (33, 0), (66, 0), (0, 33)]
+    assert load.fill == pytest.approx(4 * 900 / 20000)
+
+
+def test_piece_is_rotated_to_fit_bed(batcher):
+    plan = batcher.plan([order(1, 150, 90, 1)], progress={})
+    [load] = plan.loads["TEMPER"]
+    assert load.pieces[0][2:7] == (90, 150, 0, 0, True)
+
+
+def test_oversize_piece_is_reported(batcher):
+    plan = batcher.plan([order(1, 250, 250, 2)], progress={})
+    assert plan.loads["TEMPER"] == []
+    assert plan.oversize == [{"code": "S1", "station": "TEMPER", "width": 250, "height": 250, "quantity": 2}]
+
+
+def test_loads_split_by_thickness_and_cycle_scales(batcher):
+    plan = batcher.plan([order(1, 50, 50, 1, thickness=4), order(2, 50, 50, 1, thickness=6)], progress={})
+    loads = sorted(plan.loads["TEMPER"], key=lambda l: l.thickness)
+    assert [l.thickness for l in loads] == [4, 6]
+    assert [l.cycle_minutes for l in loads] == pytest.approx([40.0, 60.0])
+
+
+def test_due_window_separates_loads(batcher):
+    near = batcher.plan([order(1, 50, 50, 1, due="2026-11-02"), order(2, 50, 50, 1, due="2026-11-05")],
+                        progress={})
+    assert len(near.loads["TEMPER"]) == 1
+
+    far = batcher.plan([order(1, 50, 50, 1, due="2026-11-02"), order(2, 50, 50, 1, due="2026-11-06")],
+                       progress={})
+    assert [l.order_ids for l in far.loads["TEMPER"]] == [[1], [2]]
+
+
+def test_progress_and_routes_limit_pieces(batcher):
+    orders = [order(1, 30, 30, 5), order(2, 30, 30, 3, route="INTERMAC,SEVKIYAT")]
+    plan = batcher.plan(orders, progress={1: {"TEMPER": 3}})
+    [load] = plan.loads["TEMPER"]
+    assert len(load.pieces) == 2
+    assert load.order_ids == [1]
+
+
+def test_order_minutes_split_cycle_by_area_share(batcher):
+    # 40 cm parçalar: rafta iki, iki rafta dört parça tek yüke sığar
+    plan = batcher.plan([order(1, 40, 40, 1), order(2, 40, 40, 3)], progress={})
+    [load] = plan.loads["TEMPER"]
+    assert load.cycle_minutes == pytest.approx(40.0)
+    # Yükteki alan payı: 1/4 ve 3/4
+    minutes = plan.order_minutes()
+    assert minutes == pytest.approx({(1, "TEMPER"): 10.0, (2, "TEMPER"): 30.0})
+    assert batcher.order_work_days(plan)[(2, "TEMPER")] == pytest.approx(30.0 / MINUTES_PER_DAY)
+    summary = plan.get_summary()["TEMPER"]
+    assert summary["loads"] == 1 and summary["pieces"] == 4 and summary["m2"] == 0.6
@@ -0,0 +1,114 @@
+"""Sipariş durum uzlaştırması (update_all_order_statuses) ve tamamlanma kuralı"""
+
+import random
+
+
+def add_order(db, code, quantity, route="KESIM,TEMPER", status="Beklemede"):
+    with db.get_connection() as conn:
+        cursor = conn.execute(
+            "INSERT INTO orders (order_code, customer_name, quantity, declared_total_m2, route, status) "
+            "VALUES (?, 'Test', ?, ?, ?, ?)", (code, quantity, quantity * 1.5, route, status))
+        return cursor.lastrowid
+
+
+def log_done(db, order_id, station, quantity):
+    with db.get_connection() as conn:
+        conn.execute("INSERT INTO production_logs (order_id, station_name, action, quantity, operator_name) "
+                     "VALUES (?, ?, 'Tamamlandi', ?, 'Test')", (order_id, station, quantity))
+
+
+def status_of(db, order_id):
+    with db.get_connection() as conn:
+        return conn.execute("SELECT status FROM orders WHERE id=?", (order_id,)).fetchone()[0]
+
+
+def test_fully_scrapped_order_is_not_completed(temp_db):
+    scrapped = add_order(temp_db, "S1", 0, status="Üretimde")
+    logged = add_order(temp_db, "S2", 0, status="Üretimde")
+    log_done(temp_db, logged, "KESIM", 0)
+    log_done(temp_db, logged, "TEMPER", 0)
+
+    assert temp_db.find_completed_orders() == []
+    assert temp_db.update_all_order_statuses() == 0
+    assert status_of(temp_db, scrapped) == status_of(temp_db, logged) == "Üretimde"
+
+
+def test_scan_on_scrapped_order_keeps_it_open(temp_db):
+    order_id = add_order(temp_db, "S1", 0, route="KESIM", status="Üretimde")
+    result = temp_db.record_production_event(order_id, "KESIM", 1)
+    assert result["status"] == "Üretimde"
+    assert status_of(temp_db, order_id) == "Üretimde"
+
+
+def test_event_rule_matches_reconciliation_rule(temp_db):
+    rng = random.Random(11)
+    routes = ["KESIM", "KESIM,TEMPER", " KESIM , TEMPER ", "KESIM,,TEMPER", "", "TEMPER,KESIM,PAKET"]
+    orders = {}
+    for i in range(60):
+        route, quantity = rng.choice(routes), rng.choice([0, 0, 1, 3, 5])
+        order_id = add_order(temp_db, f"S{i}", quantity, route=route)
+        progress = {}
+        for station in ("KESIM", "TEMPER", "PAKET"):
+            done = rng.choice([0, quantity, quantity + 1, max(0, quantity - 1)])
+            if rng.random() < 0.8:
+                log_done(temp_db, order_id, station, done)
+                progress[station] = done
+        orders[order_id] = (route, quantity, progress)
+
+    expected = sorted(oid for oid, (route, quantity, progress) in orders.items()
+                      if temp_db._route_completed(route, quantity, progress))
+    assert expected
+    assert [r["id"] for r in temp_db.find_completed_orders()] == expected
+
+
+def test_dry_run_counts_without_writing(temp_db):
+    done = add_order(temp_db, "S1", 2, status="Üretimde")
+    open_order = add_order(temp_db, "S2", 2, status="Üretimde")
+    for station in ("KESIM", "TEMPER"):
+        log_done(temp_db, done, station, 2)
+    log_done(temp_db, open_order, "KESIM", 2)
+
+    assert temp_db.update_all_order_statuses(dry_run=True) == 1
+    assert status_of(temp_db, done) == "Üretimde"
+
+    assert temp_db.update_all_order_statuses() == 1
+    assert status_of(temp_db, done) == "Tamamlandı"
+    assert status_of(temp_db, open_order) == "Üretimde"
+    assert temp_db.update_all_order_statuses(dry_run=True) == 0
+
+
+def test_closed_statuses_are_never_reconciled(temp_db):
+    closed = {status: add_order(temp_db, status, 2, status=status)
+              for status in ("Sevk Edildi", "Hatalı/Fire", "Tamamlandı")}
+    for order_id in closed.values():
+        for station in ("KESIM", "TEMPER"):
+            log_done(temp_db, order_id, station, 2)
+
+    assert temp_db.find_completed_orders() == []
+    assert temp_db.update_all_order_statuses(dry_run=True) == 0
+    assert temp_db.update_all_order_statuses() == 0
+    assert {status: status_of(temp_db, oid) for status, oid in closed.items()} == \
+        {status: status for status in closed}
+
+
+def test_event_without_qty_completes_remainder(temp_db):
+    order_id = add_order(temp_db, "S1", 5, route="KESIM,TEMPER")
+    first = temp_db.record_production_event(order_id, "KESIM", 2)
+    assert (first["logged"], first["station_done"], first["status"]) == (2, 2, "Üretimde")
+
+    rest = temp_db.record_production_event(order_id, "KESIM")
+    assert (rest["logged"], rest["station_done"], rest["status"]) == (3, 5, "Üretimde")
+    again = temp_db.record_production_event(order_id, "KESIM")
+    assert (again["logged"], again["station_done"]) == (0, 5)
+
+    final = temp_db.complete_station_process(order_id, "TEMPER")
+    assert (final["logged"], final["status"]) == (5, "Tamamlandı")
+    assert status_of(temp_db, order_id) == "Tamamlandı"
+
+
+def test_event_keeps_shipped_and_scrapped_status(temp_db):
+    for status in ("Sevk Edildi", "Hatalı/Fire"):
+        order_id = add_order(temp_db, status, 2, route="KESIM", status=status)
+        result = temp_db.record_production_event(order_id, "KESIM")
+        assert (result["logged"], result["status"]) == (2, status)
+        assert status_of(temp_db, order_id) == status
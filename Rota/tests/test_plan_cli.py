@@ -0,0 +1,45 @@
+"""plan_cli: arayüzle aynı veritabanı ve istasyon ayarları"""
+
+import pytest
+
+import plan_cli
+from core.db_manager import DatabaseManager, db
+from core.factory_config import FactoryConfig, factory_config
+from core.smart_planner import planner
+
+
+@pytest.fixture
+def plan_db(tmp_path, monkeypatch):
+    """INTERMAC kapasitesi stations tablosunda 1'e düşürülmüş veritabanı"""
+    path = str(tmp_path / "plan.db")
+    manager = DatabaseManager(path)
+    FactoryConfig().set_database(manager)          # stations tablosu kurulsun
+    with manager.get_connection() as conn:
+        conn.execute("UPDATE stations SET capacity = 1 WHERE name = 'INTERMAC'")
+
+    monkeypatch.setenv("ROTA_DB_PATH", path)
+    original_path, original_config_db = db.db_path, factory_config._db
+    yield path
+    db.db_path = original_path
+    factory_config._db = original_config_db
+    factory_config.refresh()
+
+
+def test_cli_plans_with_station_settings_from_db(plan_db):
+    plan_cli.open_database(plan_db)
+    assert db.db_path == plan_db
+
+    # Arayüz: factory_config.set_database(db) sonrası planlayıcı kapasiteleri
+    gui_config = FactoryConfig()
+    gui_config.set_database(DatabaseManager(plan_db))
+
+    capacities = planner.get_planning_capacities()
+    assert capacities["INTERMAC"] == 1
+    assert capacities == gui_config.get_capacities()
+
+
+def test_run_plan_writes_outputs(plan_db, tmp_path):
+    plan_cli.open_database(plan_db)
+    files, timings = plan_cli.run_plan(str(tmp_path / "out"), horizon_days=7, pdf=False, log=lambda *_: None)
+    assert [p.rsplit("_", 1)[0].split("/")[-1] for p in files] == ["uretim_plani", "istasyon_yuku"]
+    assert {"siparisler", "siralama", "kapasite_tahmini"} <= timings.keys()
@@ -0,0 +1,75 @@
+"""Artık dizini (RemnantBucket / RemnantIndex) ve kesimde artık kullanımı"""
+
+import pytest
+
+from core.cutting_packing import CuttingPlan, GuillotineCutter, RemnantBucket
+from core.remnant_inventory import RemnantIndex, RemnantInventory
+
+
+def remnant(remnant_id, width, height, thickness=6, glass_type="Düz Cam"):
+    return {'id': remnant_id, 'width': width, 'height': height, 'thickness': thickness, 'glass_type': glass_type}
+
+
+def test_bucket_finds_smallest_fitting_remnant_rotated():
+    bucket = RemnantBucket([remnant(1, 200, 100), remnant(2, 60, 120), remnant(3, 110, 55), remnant(4, 40, 40)])
+    assert len(bucket) == 4
+    # 100 x 50: 110 x 55 (alan 6050) en küçük; 120 x 60 döndürülerek de sığar ama daha büyük
+    assert bucket.find(100, 50)['id'] == 3
+    assert bucket.find(50, 115)['id'] == 2
+    assert bucket.find(210, 10) is None
+    assert [r['id'] for r in bucket.items()] == [4, 3, 2, 1]
+
+
+def test_bucket_take_and_remove():
+    bucket = RemnantBucket([remnant(1, 110, 55), remnant(2, 120, 60)])
+    assert bucket.take(100, 50)['id'] == 1
+    assert bucket.take(100, 50)['id'] == 2
+    assert bucket.take(100, 50) is None
+    assert bucket.remove(1) is None
+    assert len(bucket) == 0
+
+
+def test_index_keys_by_thickness_and_glass_type():
+    index = RemnantIndex([remnant(1, 120, 60), remnant(2, 120, 60, thickness=4),
+                          remnant(3, 120, 60, glass_type="Füme")])
+    assert len(index) == 3
+    assert index.find(6, "Düz Cam", 100, 50)['id'] == 1
+    assert index.find(4, "Düz Cam", 100, 50)['id'] == 2
+    assert index.find(8, "Düz Cam", 100, 50) is None
+    assert index.remove(remnant(1, 120, 60))['id'] == 1
+    assert index.find(6, "Düz Cam", 100, 50) is None
+
+
+def test_cutter_uses_smallest_remnant_before_stock():
+    stock = [{'id': 1, 'width': 321, 'height': 225, 'quantity': 5}]
+    remnants = [remnant(7, 120, 60, glass_type="Füme"), remnant(8, 110, 55)]
+    plan = GuillotineCutter(stock, kerf=0, remnants=remnants).pack([(1, "S1", 100, 50)], CuttingPlan(6, "Düz Cam"))
+
+    [sheet] = plan.sheets
+    assert (sheet.width, sheet.height, sheet.remnant_id, sheet.plate_id) == (110, 55, 8, None)
+    assert sheet.glass_type == "Düz Cam"
+    assert plan.remnants_used == [8]
+    assert dict(plan.stock_used) == {}
+    assert plan.get_summary()["remnant_sheets"] == 1
+
+
+def test_cutter_uses_each_remnant_once_then_buys_sheets():
+    # Plaka 130 x 50 parçayla tam dolar; 100 x 60 parçalar plakaya sığmaz
+    stock = [{'id': 1, 'width': 130, 'height': 50, 'quantity': 5}]
+    plan = GuillotineCutter(stock, kerf=0, remnants=[remnant(7, 120, 60)]).pack(
+        [(1, "S1", 130, 50), (2, "S2", 100, 60), (2, "S2", 100, 60)])
+
+    assert plan.unplaced == []
+    assert plan.remnants_used == [7]
+    assert dict(plan.stock_used) == {1: 1, None: 1}
+    assert sorted((s.remnant_id or 0, s.plate_id or 0, s.width, [p[0] for p in s.placements])
+                  for s in plan.sheets) == [(0, 0, 321, [2]), (0, 1, 130, [1]), (7, 0, 120, [2])]
+
+
+def test_collect_offcuts_reports_reusable_leftovers():
+    plan = GuillotineCutter([{'id': 1, 'width': 200, 'height': 100, 'quantity': 1}], kerf=0, min_offcut=20,
+                            rotation="normal").pack([(1, "S1", 100, 90)], CuttingPlan(6, "Düz Cam"))
+    # Sağda 100 x 100 artık; alttaki 100 x 10 şerit min_size altında
+    rows = RemnantInventory().collect_offcuts(plan, location="A-3")
+    assert rows == [(6, "Düz Cam", 100, 100, "A-3", 1)]
+    assert plan.get_summary()["offcut_m2"] == pytest.approx(1.0)
@@ -0,0 +1,100 @@
+"""Terminal günlüğünün tekrar oynatılması (event_uuid) ve okutma kuyruğunun hatalı olayları"""
+
+import time
+
+import pytest
+
+from core.offline_journal import OfflineJournal
+from core.scan_ingest import ScanIngestQueue
+
+
+def add_order(db, code, quantity, route="KESIM,TEMPER"):
+    with db.get_connection() as conn:
+        cursor = conn.execute(
+            "INSERT INTO orders (order_code, customer_name, quantity, declared_total_m2, route, status) "
+            "VALUES (?, 'Test', ?, ?, ?, 'Üretimde')", (code, quantity, quantity * 2.0, route))
+        return cursor.lastrowid
+
+
+def counts(db, order_code):
+    with db.get_connection() as conn:
+        logs = conn.execute("SELECT COUNT(*) FROM production_logs").fetchone()[0]
+        reworks = conn.execute("SELECT COUNT(*) FROM orders WHERE order_code LIKE ?",
+                               (order_code + "-R%",)).fetchone()[0]
+    return logs, reworks
+
+
+def drain(ingest, journal, timeout=10):
+    ingest.start()
+    try:
+        deadline = time.monotonic() + timeout
+        while journal.pending_count() and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        ingest.stop()
+
+
+@pytest.fixture
+def journal(tmp_path):
+    journal = OfflineJournal(str(tmp_path / "terminal_journal.db"))
+    yield journal
+    journal.close()
+
+
+def test_replayed_events_are_written_once(temp_db, journal):
+    order_id = add_order(temp_db, "J1", 5)
+    journal.append({'kind': 'production', 'order_id': order_id, 'station_name': "KESIM",
+                    'qty': 2, 'operator_name': "Test", 'code': "J1"})
+    journal.append({'kind': 'production', 'order_id': order_id, 'station_name': "KESIM",
+                    'qty': None, 'operator_name': "Test", 'code': "J1"})
+    journal.append({'kind': 'fire', 'order_id': order_id, 'station_name': "TEMPER",
+                    'qty': 1, 'operator_name': "Test", 'code': "J1"})
+
+    # Merkeze yazıldı, günlükte işaretlenemeden kesildi
+    first = temp_db.record_production_events(journal.pending())
+    assert [first[0]['logged'], first[1]['logged'], first[2]] == [2, 3, "J1-R1"]
+    written = counts(temp_db, "J1")
+    assert written == (3, 1)
+
+    again = temp_db.record_production_events(journal.pending())
+    assert again[0]['duplicate'] and again[1]['duplicate'] and again[2] is None
+    assert (again[0]['logged'], again[1]['logged']) == (0, 0)
+    assert counts(temp_db, "J1") == written
+
+    # Terminal yeniden açıldı: kuyruk günlükten geri yükler, yine tek kayıt
+    drain(ScanIngestQueue(temp_db, journal, batch_window_s=0), journal)
+    assert journal.pending_count() == 0 and not journal.failed()
+    assert counts(temp_db, "J1") == written
+
+
+def test_fire_on_deleted_order_writes_nothing(temp_db):
+    order_id = add_order(temp_db, "J1", 5)
+    with temp_db.get_connection() as conn:
+        conn.execute("DELETE FROM orders WHERE id=?", (order_id,))
+
+    event = {'kind': 'fire', 'order_id': order_id, 'station_name': "KESIM", 'qty': 1,
+             'operator_name': "Test", 'event_uuid': "deleted-fire"}
+    with pytest.raises(ValueError):
+        temp_db.record_production_events([event])
+    with pytest.raises(ValueError):
+        temp_db.report_fire(order_id, 1, "KESIM", "Test")
+    assert counts(temp_db, "J1") == (0, 0)
+
+
+def test_fire_on_deleted_order_is_marked_failed(temp_db, journal):
+    kept = add_order(temp_db, "J1", 5)
+    deleted = add_order(temp_db, "J2", 5)
+    with temp_db.get_connection() as conn:
+        conn.execute("DELETE FROM orders WHERE id=?", (deleted,))
+
+    ingest = ScanIngestQueue(temp_db, journal, batch_window_s=0.5)
+    scan = ingest.submit(kept, "KESIM", 2, "Test", "J1")
+    fire = ingest.submit_fire(deleted, 1, "KESIM", "Test", "J2")
+    drain(ingest, journal)
+
+    failed = journal.failed()
+    assert [e['event_uuid'] for e in failed] == [fire]
+    assert failed[0]['last_error']
+    with temp_db.get_connection() as conn:
+        logged = [r[0] for r in conn.execute("SELECT event_uuid FROM production_logs").fetchall()]
+    assert logged == [scan]
@@ -0,0 +1,175 @@
+"""FiniteCapacityScheduler, ShiftCalendar ve DayDetails doğruluğu"""
+
+from datetime import date
+
+import pytest
+
+from core.scheduler import (DayDetails, FiniteCapacityScheduler, MINUTES_PER_DAY,
+                            ScheduleCancelled, ShiftCalendar)
+
+MONDAY = date(2026, 10, 19)
+# Pazartesi..Cuma tam, Cumartesi yarım vardiya, Pazar kapalı
+WEEK = [1.0, 1.0, 1.0, 1.0, 1.0, 0.5, 0.0]
+
+
+def job(code, steps, thickness=4, product_type="Düz Cam"):
+    return {'order': {'order_code': code, 'customer_name': "Test", 'thickness': thickness,
+                      'product_type': product_type}, 'steps': steps}
+
+
+# === VARDİYA TAKVİMİ ===
+
+def test_advance_rolls_over_midnight():
+    calendar = ShiftCalendar(start_date=MONDAY)
+    end, chunks = calendar.advance(0.5, 1.0)
+    assert end == pytest.approx(1.5)
+    assert chunks == [(0, 0.5, 1.0, 1.0), (1, 1.0, 1.5, 1.0)]
+
+
+def test_half_shift_and_closed_day():
+    calendar = ShiftCalendar(WEEK, start_date=MONDAY)
+    # Cuma öğleden: Cuma 0.5 + Cumartesi (yarım vardiya, tam gün) 0.5
+    assert calendar.finish_time(4.5, 1.0) == pytest.approx(6.0)
+    # Kalan 0.2 gün Pazar atlanıp Pazartesi yapılır
+    end, chunks = calendar.advance(4.5, 1.2)
+    assert end == pytest.approx(7.2)
+    assert [c[0] for c in chunks] == [4, 5, 7]
+    assert chunks[1] == (5, 5.0, 6.0, 0.5)
+
+
+def test_holiday_is_skipped():
+    calendar = ShiftCalendar(start_date=MONDAY, holidays=["2026-10-20"])
+    assert calendar.factor(1) == 0.0
+    assert calendar.finish_time(0.0, 2.0) == pytest.approx(3.0)
+
+    result = FiniteCapacityScheduler({"A": 10}, calendar=calendar, horizon_days=4).run(
+        [job("S1", [("A", 20)])])
+    assert result.order_finish_times["S1"] == pytest.approx(3.0)
+    assert result.forecast_grid["A"] == pytest.approx([100.0, 0.0, 100.0, 0.0])
+    assert result.loads_grid["A"] == pytest.approx([10.0, 0.0, 10.0, 0.0])
+
+
+def test_all_zero_week_falls_back_to_full_shifts():
+    assert ShiftCalendar([0] * 7).weekday_factors == [1.0] * 7
+    with pytest.raises(ValueError):
+        ShiftCalendar([1.0] * 6)
+
+
+# === AYAR (CHANGEOVER) ===
+
+def test_changeover_charged_on_class_switch_only():
+    calls = []
+
+    def changeover(machine, old, new):
+        calls.append((machine, old, new))
+        return MINUTES_PER_DAY / 2
+
+    scheduler = FiniteCapacityScheduler({"A": 10}, calendar=ShiftCalendar(start_date=MONDAY),
+                                        horizon_days=4, changeover=changeover)
+    result = scheduler.run([
+        job("S1", [("A", 10)], thickness=4),
+        job("S2", [("A", 10)], thickness=6),
+        job("S3", [("A", 10)], thickness=6),
+    ])
+
+    # S1: 0-1, S2: yarım gün ayar + 1 gün (1-2.5), S3 aynı sınıf: ayarsız (2.5-3.5)
+    assert result.order_finish_times == pytest.approx({"S1": 1.0, "S2": 2.5, "S3": 3.5})
+    assert result.changeover_count == 1
+    assert result.setup_days["A"] == pytest.approx(0.5)
+    assert calls == [("A", (4, "Düz Cam"), (6, "Düz Cam"))]
+    # Ayar doluluğu artırır ama m² üretmez
+    assert result.forecast_grid["A"] == pytest.approx([100.0, 100.0, 100.0, 50.0])
+    assert result.loads_grid["A"] == pytest.approx([10.0, 5.0, 10.0, 5.0])
+    assert [bar["setup_days"] for bar in result.gantt["A"]] == pytest.approx([0.0, 0.5, 0.0])
+
+
+# === ALTERNATİF MAKİNE ===
+
+def test_alternative_skips_job_it_cannot_finish_before_home_backlog():
+    # A: 1 gün / iş. B (kapasite 5): 2 gün / iş; A'nın elindeki iş + kuyruk da 2. günde biter
+    scheduler = FiniteCapacityScheduler({"A": 10, "B": 5}, {"A": ["B"]},
+                                        ShiftCalendar(start_date=MONDAY), horizon_days=5)
+    result = scheduler.run([job("S1", [("A", 10)]), job("S2", [("A", 10)])])
+    assert result.alternative_count == 0
+    assert result.order_finish_times == pytest.approx({"S1": 1.0, "S2": 2.0})
+    assert result.gantt["B"] == []
+
+
+def test_alternative_takes_job_when_it_beats_home_backlog():
+    # B (kapasite 6): 10/6 gün < A'nın 2. gün biten birikmiş işi
+    scheduler = FiniteCapacityScheduler({"A": 10, "B": 6}, {"A": ["B"]},
+                                        ShiftCalendar(start_date=MONDAY), horizon_days=5)
+    result = scheduler.run([job("S1", [("A", 10)]), job("S2", [("A", 10)])])
+    assert result.alternative_count == 1
+    assert result.order_finish_times == pytest.approx({"S1": 1.0, "S2": 10 / 6})
+    [bar] = result.gantt["B"]
+    assert bar["code"] == "S2" and bar["station"] == "A" and bar["is_alternative"]
+    assert result.details_grid["B"][0] == [{"code": "S2", "customer": "Test", "m2": 10, "batch": "4mm",
+                                           "notes": "", "from_station": "A"}]
+
+
+def test_route_steps_run_in_order_and_unknown_stations_are_skipped():
+    scheduler = FiniteCapacityScheduler({"A": 10, "B": 20}, calendar=ShiftCalendar(start_date=MONDAY),
+                                        horizon_days=3)
+    result = scheduler.run([job("S1", [("A", 10), ("YOK", 10), ("B", 10)])])
+    assert result.operation_count == 2
+    assert result.gantt["B"][0]["start"] == pytest.approx(1.0)
+    assert result.order_finish_times["S1"] == pytest.approx(1.5)
+
+
+# === İPTAL / ARA SONUÇ ===
+
+def test_should_stop_cancels_run():
+    scheduler = FiniteCapacityScheduler({"A": 10}, calendar=ShiftCalendar(start_date=MONDAY))
+    scheduler.CANCEL_CHECK_EVENTS = 1
+    jobs = [job(f"S{i}", [("A", 10)]) for i in range(3)]
+    with pytest.raises(ScheduleCancelled):
+        scheduler.run(jobs, should_stop=lambda: True)
+    assert len(scheduler.run(jobs, should_stop=lambda: False).order_finish_times) == 3
+
+
+def test_partial_callback_reports_settled_days():
+    partials = []
+    scheduler = FiniteCapacityScheduler({"A": 10}, calendar=ShiftCalendar(start_date=MONDAY), horizon_days=4)
+    scheduler.run([job("S1", [("A", 30)])], partial_days=[2],
+                  partial_callback=lambda day, partial: partials.append((day, partial)))
+    [(day, partial)] = partials
+    assert day == 2 and partial.horizon_days == 2
+    # S1 hâlâ makinede: ilk iki günü ara sonuca yazılır
+    assert partial.forecast_grid["A"] == pytest.approx([100.0, 100.0])
+    assert [d["code"] for d in partial.details_grid["A"][1]] == ["S1"]
+
+
+# === SEYREK GÜN DETAYLARI ===
+
+def info(code, from_station=None):
+    return (code, "Müşteri", 1.5, "4mm", "", from_station)
+
+
+def test_day_details_indexing():
+    details = DayDetails(6)
+    details.add(info("S1"), [0, 1, 2, 5])
+    details.add(info("S2", "A"), [2])
+    details.add(info("S1"), [2, 3])          # Aynı sipariş aynı gün bir kez
+
+    assert len(details) == 6
+    assert [d["code"] for d in details[2]] == ["S1", "S2"]
+    assert [d["code"] for d in details[3]] == ["S1"]
+    assert details[4] == []
+    assert details[-1] == details[5] == [{"code": "S1", "customer": "Müşteri", "m2": 1.5,
+                                          "batch": "4mm", "notes": ""}]
+    assert details[2][1]["from_station"] == "A"
+    assert [[d["code"] for d in day] for day in details[0:2]] == [["S1"], ["S1"]]
+    assert len(list(details)) == 6
+    with pytest.raises(IndexError):
+        details[6]
+
+
+def test_day_details_copy_truncates_horizon():
+    details = DayDetails(6)
+    details.add(info("S1"), [4, 5])
+    short = details.copy(3)
+    assert len(short) == 3
+    assert [d["code"] for d in details.copy()[5]] == ["S1"]
+    details.add(info("S2"), [0])
+    assert short[0] == []
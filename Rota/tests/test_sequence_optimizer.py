@@ -0,0 +1,105 @@
+"""LocalSearchSequencer amaç fonksiyonu ve yerel arama"""
+
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from core.sequence_optimizer import LocalSearchSequencer
+
+
+def order(order_id, m2, due_in=None, thickness=4, product_type="Düz Cam", priority="Normal", route="A"):
+    due = (date.today() + timedelta(days=due_in)).strftime('%Y-%m-%d') if due_in is not None else None
+    return {'id': order_id, 'declared_total_m2': m2, 'quantity': 10, 'route': route, 'delivery_date': due,
+            'thickness': thickness, 'product_type': product_type, 'priority': priority}
+
+
+def ids(orders):
+    return [o['id'] for o in orders]
+
+
+def test_evaluate_weighted_tardiness():
+    sequencer = LocalSearchSequencer({"A": 10})
+    # 2 gün + 1 gün, ikisinin de termini 1 gün sonra: gecikmeler 1 ve 2
+    result = sequencer.evaluate([order(1, 20, due_in=1), order(2, 10, due_in=1)])
+    assert result["tardiness"] == pytest.approx(3.0)
+    assert result["late_orders"] == 2
+    assert result["setups"] == 0
+
+    critical = sequencer.evaluate([order(1, 20, due_in=1, priority="Kritik"), order(2, 10, due_in=1)])
+    assert critical["tardiness"] == pytest.approx(10 * 1 + 2)
+
+
+def test_processing_uses_slowest_station_and_progress():
+    sequencer = LocalSearchSequencer({"A": 10, "B": 5}, progress={1: {"B": 5}})
+    # B'de yarısı bitmiş: A 20/10 = 2 gün, B 20 * 0.5 / 5 = 2 gün; termin bugün
+    assert sequencer.evaluate([order(1, 20, due_in=0, route="A,B")])["tardiness"] == pytest.approx(2.0)
+    # Yeni siparişte ilerleme yok sayılır: B 20/5 = 4 gün
+    new = dict(order(1, 20, due_in=0, route="A,B"), is_new=True)
+    assert sequencer.evaluate([new])["tardiness"] == pytest.approx(4.0)
+
+
+def test_default_setup_costs():
+    sequencer = LocalSearchSequencer({"A": 10})
+    result = sequencer.evaluate([order(1, 10), order(2, 10, thickness=6), order(3, 10, thickness=6, product_type="Füme")])
+    assert result["setups"] == 2
+    assert result["setup_days"] == pytest.approx(LocalSearchSequencer.THICKNESS_SETUP_DAYS
+                                                 + LocalSearchSequencer.PRODUCT_SETUP_DAYS)
+
+
+def test_changeover_callable_is_used():
+    calls = []
+
+    def changeover(old, new):
+        calls.append((old, new))
+        return 0.5
+
+    sequencer = LocalSearchSequencer({"A": 10}, changeover=changeover)
+    # 1 gün + 0.5 ayar + 1 gün: ikinci sipariş termininden (1. gün) 1.5 gün geç
+    result = sequencer.evaluate([order(1, 10, due_in=1), order(2, 10, due_in=1, thickness=6)])
+    assert result["setup_days"] == pytest.approx(0.5)
+    assert result["tardiness"] == pytest.approx(1.5)
+    assert result["cost"] == pytest.approx(2.0)
+    assert calls == [((4, "Düz Cam"), (6, "Düz Cam"))]
+
+
+def test_optimize_moves_short_job_first():
+    sequence, report = LocalSearchSequencer({"A": 10}).optimize(
+        [order(1, 20, due_in=1), order(2, 10, due_in=1)], time_budget=5)
+    assert ids(sequence) == [2, 1]
+    assert report["initial"]["cost"] == pytest.approx(3.0)
+    assert report["final"]["cost"] == pytest.approx(2.0)
+    assert report["delta"] == pytest.approx(-1.0)
+
+
+def test_optimize_groups_setup_classes():
+    orders = [order(1, 10), order(2, 10, thickness=6), order(3, 10), order(4, 10, thickness=6)]
+    sequence, report = LocalSearchSequencer({"A": 10}).optimize(orders, time_budget=5)
+    assert report["initial"]["setups"] == 3
+    assert report["final"]["setups"] == 1
+    assert report["delta"] == pytest.approx(-2 * LocalSearchSequencer.THICKNESS_SETUP_DAYS)
+    assert [o['thickness'] for o in sequence] in ([4, 4, 6, 6], [6, 6, 4, 4])
+
+
+def test_incremental_cost_matches_full_evaluation():
+    rng = random.Random(3)
+    orders = [order(i, rng.uniform(1, 40), due_in=rng.randint(-5, 30), thickness=rng.choice([4, 6, 8]),
+                     product_type=rng.choice(["Düz Cam", "Füme"]),
+                     priority=rng.choice(["Normal", "Normal", "Acil", "Kritik"]))
+              for i in range(80)]
+    sequence, report = LocalSearchSequencer({"A": 10}, seed=5).optimize(orders, time_budget=5)
+
+    assert sorted(ids(sequence)) == list(range(80))
+    assert report["accepted_moves"] > 0
+    assert report["delta"] < 0
+    # Artımlı hesaplanan son değer, sıranın baştan hesaplanmasıyla aynı
+    fresh = LocalSearchSequencer({"A": 10}).evaluate(sequence)
+    assert report["final"]["cost"] == pytest.approx(fresh["cost"])
+    assert report["final"]["tardiness"] == pytest.approx(fresh["tardiness"])
+    assert report["final"]["setups"] == fresh["setups"]
+
+
+def test_single_order_is_returned_unchanged():
+    sequence, report = LocalSearchSequencer({"A": 10}).optimize([order(1, 10)])
+    assert ids(sequence) == [1]
+    assert report["delta"] == 0.0 and report["iterations"] == 0
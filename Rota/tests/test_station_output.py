@@ -0,0 +1,65 @@
+"""Risk modelinin üretim geçmişi: özet (station_output_summary) ve doğrudan log okuması"""
+
+from core.risk_simulator import DeliveryRiskSimulator
+
+
+def add_order(db, code, quantity, m2):
+    with db.get_connection() as conn:
+        cursor = conn.execute(
+            "INSERT INTO orders (order_code, customer_name, quantity, declared_total_m2, route, status) "
+            "VALUES (?, 'Test', ?, ?, 'KESIM', 'Üretimde')", (code, quantity, m2))
+        return cursor.lastrowid
+
+
+def log(db, order_id, station, action, quantity, days_ago=0):
+    with db.get_connection() as conn:
+        conn.execute("INSERT INTO production_logs (order_id, station_name, action, quantity, operator_name, timestamp) "
+                     "VALUES (?, ?, ?, ?, 'Test', datetime('now', ?))",
+                     (order_id, station, action, quantity, f"-{days_ago} days"))
+
+
+def totals(rows):
+    result = {}
+    for row in rows:
+        done = result.setdefault(row['station_name'], [0.0, 0, 0])
+        done[0] += row['done_m2']
+        done[1] += row['done_qty']
+        done[2] += row['fire_qty']
+    return {station: (round(m2, 6), qty, fire) for station, (m2, qty, fire) in result.items()}
+
+
+def seed_history(db):
+    order_id = add_order(db, "R1", 10, 20.0)
+    for day in range(6):
+        log(db, order_id, "KESIM", "Tamamlandi", day + 1, days_ago=day)
+    log(db, order_id, "TEMPER", "Fire/Kırık", 2, days_ago=1)
+    log(db, order_id, "KESIM", "Tamamlandi", 4, days_ago=200)     # Pencere dışı
+    return order_id
+
+
+def test_daily_output_without_summary_reads_logs(temp_db):
+    seed_history(temp_db)
+    rows = temp_db.get_station_daily_output(90)
+
+    assert totals(rows) == {"KESIM": (42.0, 21, 0), "TEMPER": (0.0, 0, 2)}
+    assert len([r for r in rows if r['station_name'] == "KESIM"]) == 6
+
+    model = DeliveryRiskSimulator().fit(rows)
+    assert model["KESIM"]["days"] == 6
+    assert model["TEMPER"]["fire_alpha"] > DeliveryRiskSimulator.FIRE_PRIOR_RATE * DeliveryRiskSimulator.FIRE_PRIOR_WEIGHT
+
+
+def test_daily_output_adds_logs_after_stale_summary(temp_db):
+    order_id = seed_history(temp_db)
+    expected = totals(temp_db.get_station_daily_output(90))
+
+    assert temp_db.refresh_station_output_summary() > 0
+    assert totals(temp_db.get_station_daily_output(90)) == expected
+
+    # Özet makinesi yenilemeden gelen loglar da sayılır, özetlenmiş olanlar iki kez sayılmaz
+    log(temp_db, order_id, "KESIM", "Tamamlandi", 5)
+    log(temp_db, order_id, "TEMPER", "Fire/Kırık", 1)
+    assert totals(temp_db.get_station_daily_output(90)) == {"KESIM": (52.0, 26, 0), "TEMPER": (0.0, 0, 3)}
+
+    temp_db.refresh_station_output_summary()
+    assert totals(temp_db.get_station_daily_output(90)) == {"KESIM": (52.0, 26, 0), "TEMPER": (0.0, 0, 3)}
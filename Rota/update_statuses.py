@@ -1,17 +1,38 @@
 """
 Veritabanı Bakım Scripti
 Tüm siparişlerin durumlarını kontrol edip günceller
+
+Kullanım:
+    python update_statuses.py              # Güncelle
+    python update_statuses.py --dry-run    # Yalnız raporla, değiştirme
 """
 
+import argparse
+import time
+
 from core.db_manager import db
 
+parser = argparse.ArgumentParser(description="Tüm istasyonları biten siparişleri 'Tamamlandı' yap")
+parser.add_argument('--dry-run', action='store_true', help="Değişiklik yapmadan güncellenecekleri listele")
+parser.add_argument('--limit', type=int, default=20, help="Deneme modunda listelenecek sipariş sayısı")
+args = parser.parse_args()
+
 print("=== SİPARİŞ DURUM GÜNCELLEMESİ ===")
 print("Tüm siparişlerin durumları kontrol ediliyor...")
 
-updated = db.update_all_order_statuses()
+started = time.perf_counter()
+if args.dry_run:
+    pending = db.find_completed_orders()
+    print(f"\n🔎 Deneme modu: {len(pending)} sipariş 'Tamamlandı' olacak ({time.perf_counter() - started:.2f} sn)")
+    for order in pending[:args.limit]:
+        print(f"   {order['order_code']}: {order['status']} -> Tamamlandı")
+    if len(pending) > args.limit:
+        print(f"   ... ve {len(pending) - args.limit} sipariş daha")
+else:
+    updated = db.update_all_order_statuses()
 
-print(f"\n✅ Güncelleme tamamlandı!")
-print(f"📊 {updated} sipariş güncellendi.")
+    print(f"\n✅ Güncelleme tamamlandı! ({time.perf_counter() - started:.2f} sn)")
+    print(f"📊 {updated} sipariş güncellendi.")
 
 # Kontrol için durumları göster
 print("\n📋 Sipariş Durumları:")
@@ -2,6 +2,7 @@
 EFES ROTA X - Yeni Siparis Ekleme Dialogu
 Excel temali, kompakt tasarim
 Tahmini teslimat suresi hesaplama (istasyon kapasitelerine gore)
+Guven seviyeli teslim tarihi (P50 / P90, arka planda Monte Carlo simulasyonu)
 """
 
 from PySide6.QtWidgets import (
@@ -22,6 +23,15 @@ except ImportError:
     db = None
     planner = None
 
+try:
+    from core.db_async import BackgroundTask
+except ImportError:
+    BackgroundTask = None
+
+
+RISK_RUNS = 200             # Teslim riski simulasyonundaki kosu sayisi
+_detached_tasks = set()     # Dialog kapandiktan sonra biten risk hesaplari
+
 
 # =============================================================================
 # TEMA
@@ -181,6 +191,7 @@ class AddOrderDialog(QDialog):
     
     def __init__(self, parent=None):
         super().__init__(parent)
+        self._risk_task = None
         self.setWindowTitle("Yeni Siparis")
         self.setMinimumSize(700, 650)
         self.resize(750, 700)
@@ -505,6 +516,10 @@ class AddOrderDialog(QDialog):
         
         content_layout.addWidget(estimate_frame)
         
+        self.lbl_risk = QLabel("")
+        self.lbl_risk.setStyleSheet(f"font-size: 11px; color: {Colors.TEXT_SECONDARY};")
+        content_layout.addWidget(self.lbl_risk)
+        
         content_layout.addStretch()
         
         scroll.setWidget(content)
@@ -859,6 +874,72 @@ class AddOrderDialog(QDialog):
             f"Tahmini: {days} gun ({station_count} istasyon, {total_m2:.0f} m²) → {estimated_date.toString('dd.MM.yyyy')}"
         )
         self.lbl_estimate.setStyleSheet(f"color: {Colors.SUCCESS}; font-size: 11px; font-weight: bold;")
+        
+        self.start_risk_estimate(route_str, total_m2, priority)
+    
+    def start_risk_estimate(self, route_str, total_m2, priority):
+        """Mevcut is yukuyle P50 / P90 teslim tarihini arka planda hesapla"""
+        if not planner or BackgroundTask is None:
+            return
+        if self._risk_task is not None and self._risk_task.isRunning():
+            return
+        
+        order_data = {
+            "width": 0,
+            "height": 0,
+            "quantity": self.spin_qty.value(),
+            "total_m2": total_m2,
+            "thickness": self.spin_thickness.value(),
+            "product": self.combo_type.currentText(),
+            "route": FactoryCapacity.fix_route_order(route_str),
+            "priority": "Çok Acil" if priority == "Cok Acil" else priority,
+            "date": self.date_picker.date().toString("yyyy-MM-dd"),
+        }
+        
+        self.lbl_risk.setText("Teslim riski hesaplaniyor...")
+        self.lbl_risk.setStyleSheet(f"font-size: 11px; color: {Colors.TEXT_SECONDARY};")
+        
+        self._risk_task = BackgroundTask(
+            planner.calculate_delivery_risk, order_data,
+            runs=RISK_RUNS, progress_callback=BackgroundTask.PROGRESS
+        )
+        self._risk_task.progress_updated.connect(self.on_risk_progress)
+        self._risk_task.finished_ok.connect(self.on_risk_ready)
+        self._risk_task.failed.connect(self.on_risk_failed)
+        self._risk_task.start()
+    
+    def on_risk_progress(self, done, total):
+        self.lbl_risk.setText(f"Teslim riski hesaplaniyor... %{done * 100 // max(total, 1)}")
+    
+    def on_risk_ready(self, risk):
+        summary = risk.summary('>>> HESAPLANAN <<<') if risk else None
+        if not summary:
+            self.lbl_risk.setText("Teslim riski hesaplanamadi (rota kapasitesi tanimsiz)")
+            return
+        
+        p50 = summary['p50_date'].strftime('%d.%m.%Y')
+        p90 = summary['p90_date'].strftime('%d.%m.%Y')
+        text = f"Guven: %50 → {p50}   |   %90 → {p90}"
+        if summary['on_time_prob'] is not None:
+            text += f"   |   Secili tarihe yetisme olasiligi: %{summary['on_time_prob'] * 100:.0f}"
+        self.lbl_risk.setText(text)
+        color = Colors.SUCCESS if (summary['on_time_prob'] or 0) >= 0.9 else Colors.WARNING
+        self.lbl_risk.setStyleSheet(f"font-size: 11px; color: {color}; font-weight: bold;")
+    
+    def on_risk_failed(self, message):
+        self.lbl_risk.setText(f"Teslim riski hesaplanamadi: {message}")
+    
+    def done(self, result):
+        """Dialog kapanirken suren risk hesabini birak (bitince kendiliginden silinir)"""
+        task = self._risk_task
+        if task is not None and task.isRunning():
+            task.progress_updated.disconnect()
+            task.finished_ok.disconnect()
+            task.failed.disconnect()
+            task.setParent(None)
+            _detached_tasks.add(task)
+            task.finished.connect(lambda: _detached_tasks.discard(task))
+        super().done(result)
     
     def save_order(self):
         """Siparisi kaydet"""
@@ -755,24 +755,22 @@ class DashboardView(QWidget):
             self.lbl_time.setText(datetime.now().strftime("Son guncelleme: %H:%M:%S"))
             
             # === TEMEL ISTATISTIKLER ===
-            stats = db.get_dashboard_stats()
+            # Tek cagri: veritabani servisi uzerinden calisirken tek istek
+            snapshot = db.get_dashboard_snapshot()
+            stats = snapshot['stats']
 
             # Proje metrikleri
-            try:
-                active_projects_count = db.get_active_projects_count()
-                self.metric_projects.set_value(active_projects_count)
-            except:
-                self.metric_projects.set_value(0)
+            self.metric_projects.set_value(snapshot.get('active_projects') or 0)
 
             self.metric_active.set_value(stats.get('active', 0))
             self.metric_urgent.set_value(stats.get('urgent', 0))
             self.metric_fire.set_value(stats.get('fire', 0))
 
             # Detaylı sayımlar
-            all_orders = db.get_all_orders()
+            all_orders = snapshot['orders']
             
              # Doğrudan veritabanından bugünün sayısını al
-            today_completed = db.get_today_completed_count()
+            today_completed = snapshot['today_completed']
             self.metric_today_done.set_value(today_completed)
             
             # === GECIKEN SIPARISLER ===
@@ -809,7 +807,7 @@ class DashboardView(QWidget):
                 if item.widget():
                     item.widget().deleteLater()
             
-            station_loads = db.get_station_loads()
+            station_loads = snapshot['station_loads']
             for station in station_loads:
                 bar = CapacityBar(station['name'], station['percent'], station['status'])
                 self.capacity_layout.addWidget(bar)
@@ -5,14 +5,17 @@ Ozellikler:
 - Critical Ratio (CR) hesaplama
 - Darbogaz analizi
 - Alternatif rota onerileri
-- Batch optimizasyonu (kalinlik bazli gruplama)
+- Batch optimizasyonu (firin yuku yerlesimi, kalinlik bazli gruplama)
 - Istasyon bazli kuyruk simulasyonu
 - Gercek zamanli oneri motoru
+- Stokastik CR: Monte Carlo P90 bitis suresiyle (arka planda)
+
+Hesap katmani core/decision_engine.py'dedir (arayuzsuz, plan_cli.py de kullanir).
 """
 
+import csv
 import sys
-from datetime import datetime, timedelta
-from collections import defaultdict
+from datetime import datetime
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
     QPushButton, QTableWidget, QTableWidgetItem,
@@ -31,6 +34,18 @@ except ImportError:
     db = None
     planner = None
 
+try:
+    from core.db_async import BackgroundTask
+except ImportError:
+    BackgroundTask = None
+
+# Hesap katmani arayuzsuz modulde; eski importlar icin buradan da erisilir
+from core.decision_engine import (
+    FactoryConfig, OrderProgressSnapshot, get_completed_stations,
+    StationQueueManager, CriticalRatioCalculator, AlternativeRouteOptimizer,
+    BatchOptimizer, SmartRecommendationEngine
+)
+
 
 # =============================================================================
 # TEMA RENKLERI (Excel Tarzi)
@@ -55,505 +70,6 @@ class Colors:
     SUCCESS_BG = "#E6F4EA"
     INFO = "#0066CC"
     INFO_BG = "#E3F2FD"
-    
-    # Istasyon durumlari
-    IDLE = "#4CAF50"       # Bos
-    NORMAL = "#2196F3"     # Normal
-    BUSY = "#FF9800"       # Yogun
-    OVERLOAD = "#F44336"   # Asiri yuk
-
-
-# =============================================================================
-# FABRIKA YAPISI VE KURALLARI
-# =============================================================================
-class FactoryConfig:
-    """Cam fabrikasi yapilandirmasi"""
-    
-    # Istasyon gruplari
-    STATION_GROUPS = {
-        "KESIM": ["INTERMAC", "LIVA KESIM", "LAMINE KESIM"],
-        "ISLEME": ["CNC RODAJ", "DOUBLEDGER", "ZIMPARA"],
-        "YUZEY": ["TESIR A1", "TESIR B1", "TESIR B1-1", "TESIR B1-2", "DELIK", "OYGU"],
-        "TEMPER": ["TEMPER A1", "TEMPER B1", "TEMPER BOMBE"],
-        "BIRLESTIRME": ["LAMINE A1", "ISICAM B1"],
-        "SEVKIYAT": ["SEVKIYAT"]
-    }
-    
-    # Alternatif istasyonlar (ayni isi yapabilenler)
-    ALTERNATIVE_STATIONS = {
-        "INTERMAC": ["LIVA KESIM"],
-        "LIVA KESIM": ["INTERMAC"],
-        "TEMPER A1": ["TEMPER B1"],
-        "TEMPER B1": ["TEMPER A1"],
-        "TESIR A1": ["TESIR B1", "TESIR B1-1", "TESIR B1-2"],
-        "TESIR B1": ["TESIR A1", "TESIR B1-1", "TESIR B1-2"],
-        "TESIR B1-1": ["TESIR A1", "TESIR B1", "TESIR B1-2"],
-        "TESIR B1-2": ["TESIR A1", "TESIR B1", "TESIR B1-1"],
-    }
-    
-    # Gunluk kapasiteler (m2/gun)
-    DEFAULT_CAPACITIES = {
-        "INTERMAC": 800, "LIVA KESIM": 800, "LAMINE KESIM": 600,
-        "CNC RODAJ": 100, "DOUBLEDGER": 400, "ZIMPARA": 300,
-        "TESIR A1": 400, "TESIR B1": 400, "TESIR B1-1": 400, "TESIR B1-2": 400,
-        "DELIK": 200, "OYGU": 200,
-        "TEMPER A1": 550, "TEMPER B1": 750, "TEMPER BOMBE": 300,
-        "LAMINE A1": 250, "ISICAM B1": 500, "SEVKIYAT": 5000
-    }
-    
-    # Istasyon sirasi (uretim akisi)
-    STATION_ORDER = [
-        "INTERMAC", "LIVA KESIM", "LAMINE KESIM",
-        "CNC RODAJ", "DOUBLEDGER", "ZIMPARA",
-        "TESIR A1", "TESIR B1", "TESIR B1-1", "TESIR B1-2", "DELIK", "OYGU",
-        "TEMPER A1", "TEMPER B1", "TEMPER BOMBE",
-        "LAMINE A1", "ISICAM B1",
-        "SEVKIYAT"
-    ]
-    
-    # Batch islemleri icin istasyonlar (kalinlik bazli gruplama)
-    BATCH_STATIONS = ["TEMPER A1", "TEMPER B1", "TEMPER BOMBE"]
-    
-    @classmethod
-    def get_station_group(cls, station_name):
-        for group, stations in cls.STATION_GROUPS.items():
-            if station_name in stations:
-                return group
-        return None
-    
-    @classmethod
-    def get_alternatives(cls, station_name):
-        return cls.ALTERNATIVE_STATIONS.get(station_name, [])
-    
-    @classmethod
-    def is_cutting_station(cls, station_name):
-        return station_name in cls.STATION_GROUPS.get("KESIM", [])
-
-
-# =============================================================================
-# ISTASYON KUYRUK YONETICISI
-# =============================================================================
-class StationQueueManager:
-    """Her istasyon icin kuyruk yonetimi"""
-    
-    def __init__(self):
-        self.capacities = FactoryConfig.DEFAULT_CAPACITIES.copy()
-        self.queues = defaultdict(list)  # station -> [orders]
-        self.loads = defaultdict(float)   # station -> total m2
-        
-        if db:
-            try:
-                self.capacities = db.get_all_capacities()
-            except:
-                pass
-    
-    def build_queues(self, orders):
-        """Siparislerden istasyon kuyruklarini olustur"""
-        self.queues = defaultdict(list)
-        self.loads = defaultdict(float)
-        
-        for order in orders:
-            route = order.get('route', '')
-            m2 = order.get('declared_total_m2', 0)
-            
-            if not route:
-                continue
-            
-            # Tamamlanmis istasyonlari al
-            completed = []
-            if db:
-                try:
-                    completed = db.get_completed_stations_list(order['id'])
-                except:
-                    pass
-            
-            # Rotadaki her istasyon icin
-            for station in route.split(','):
-                station = station.strip()
-                if station and station not in completed:
-                    self.queues[station].append(order)
-                    self.loads[station] += m2
-    
-    def get_station_status(self, station_name):
-        """Istasyon durumunu dondur"""
-        cap = self.capacities.get(station_name, 500)
-        load = self.loads.get(station_name, 0)
-        queue_count = len(self.queues.get(station_name, []))
-        
-        if cap <= 0:
-            cap = 500
-        
-        ratio = load / cap
-        queue_days = ratio
-        
-        if load == 0:
-            status = "idle"
-            color = Colors.IDLE
-        elif ratio <= 1:
-            status = "normal"
-            color = Colors.NORMAL
-        elif ratio <= 2:
-            status = "busy"
-            color = Colors.BUSY
-        else:
-            status = "overload"
-            color = Colors.OVERLOAD
-        
-        return {
-            "station": station_name,
-            "load_m2": load,
-            "capacity": cap,
-            "ratio": ratio,
-            "queue_days": queue_days,
-            "queue_count": queue_count,
-            "status": status,
-            "color": color
-        }
-    
-    def get_all_station_statuses(self):
-        """Tum istasyonlarin durumunu dondur"""
-        statuses = []
-        for station in FactoryConfig.STATION_ORDER:
-            statuses.append(self.get_station_status(station))
-        return statuses
-    
-    def get_idle_stations(self):
-        """Bos istasyonlari dondur"""
-        idle = []
-        for station in FactoryConfig.STATION_ORDER:
-            if station == "SEVKIYAT":
-                continue
-            status = self.get_station_status(station)
-            if status['status'] == 'idle':
-                idle.append(station)
-        return idle
-    
-    def get_bottlenecks(self):
-        """Darbogaz istasyonlari dondur"""
-        bottlenecks = []
-        for station in FactoryConfig.STATION_ORDER:
-            status = self.get_station_status(station)
-            if status['ratio'] > 2:  # 2 gunluk kuyruktan fazla
-                bottlenecks.append(status)
-        return sorted(bottlenecks, key=lambda x: x['ratio'], reverse=True)
-
-
-# =============================================================================
-# CRITICAL RATIO HESAPLAYICI
-# =============================================================================
-class CriticalRatioCalculator:
-    """
-    Critical Ratio (CR) = (Teslim Tarihi - Bugun) / Kalan Islem Suresi
-    
-    CR < 1.0: Gecikme riski (oncelikli)
-    CR = 1.0: Tam zamaninda
-    CR > 1.0: Guvenli
-    """
-    
-    def __init__(self, queue_manager):
-        self.queue_manager = queue_manager
-    
-    def calculate_remaining_time(self, order):
-        """Kalan islem suresini gun olarak hesapla"""
-        route = order.get('route', '')
-        m2 = order.get('declared_total_m2', 0)
-        
-        if not route or m2 <= 0:
-            return 0
-        
-        # Tamamlanmis istasyonlar
-        completed = []
-        if db:
-            try:
-                completed = db.get_completed_stations_list(order['id'])
-            except:
-                pass
-        
-        total_days = 0
-        capacities = self.queue_manager.capacities
-        
-        for station in route.split(','):
-            station = station.strip()
-            if station and station not in completed:
-                cap = capacities.get(station, 500)
-                if cap > 0:
-                    # Kuyruk bekleme suresi + islem suresi
-                    queue_load = self.queue_manager.loads.get(station, 0)
-                    queue_wait = queue_load / cap
-                    process_time = m2 / cap
-                    total_days += queue_wait + process_time
-        
-        return max(total_days, 0.1)  # Minimum 0.1 gun
-    
-    def calculate_cr(self, order):
-        """Critical Ratio hesapla"""
-        delivery_str = order.get('delivery_date', '')
-        
-        if not delivery_str:
-            return None, "unknown"
-        
-        try:
-            delivery_date = datetime.strptime(delivery_str, '%Y-%m-%d')
-            today = datetime.now()
-            
-            # Kalan gun
-            days_until_due = (delivery_date - today).days
-            
-            # Kalan islem suresi
-            remaining_time = self.calculate_remaining_time(order)
-            
-            if remaining_time <= 0:
-                remaining_time = 0.1
-            
-            cr = days_until_due / remaining_time
-            
-            # Durum belirleme
-            if cr < 0:
-                status = "late"  # Zaten gecmis
-            elif cr < 0.8:
-                status = "critical"  # Kritik gecikme riski
-            elif cr < 1.0:
-                status = "risk"  # Risk altinda
-            elif cr < 1.5:
-                status = "tight"  # Sikisik ama yapilabilir
-            else:
-                status = "safe"  # Guvenli
-            
-            return round(cr, 2), status
-            
-        except:
-            return None, "unknown"
-    
-    def estimate_completion_date(self, order, queue_position, all_orders):
-        """Tahmini tamamlanma tarihi"""
-        remaining_days = self.calculate_remaining_time(order)
-        completion_date = datetime.now() + timedelta(days=remaining_days)
-        return completion_date, remaining_days
-
-
-# =============================================================================
-# ALTERNATIF ROTA OPTIMIZER
-# =============================================================================
-class AlternativeRouteOptimizer:
-    """Alternatif rota ve istasyon onerileri"""
-    
-    def __init__(self, queue_manager):
-        self.queue_manager = queue_manager
-    
-    def find_alternative_routes(self, order):
-        """Siparis icin alternatif rota onerileri"""
-        suggestions = []
-        route = order.get('route', '')
-        
-        if not route:
-            return suggestions
-        
-        # Tamamlanmis istasyonlar
-        completed = []
-        if db:
-            try:
-                completed = db.get_completed_stations_list(order['id'])
-            except:
-                pass
-        
-        for station in route.split(','):
-            station = station.strip()
-            if not station or station in completed:
-                continue
-            
-            # Mevcut istasyon durumu
-            current_status = self.queue_manager.get_station_status(station)
-            
-            # Alternatif istasyonlar
-            alternatives = FactoryConfig.get_alternatives(station)
-            
-            for alt in alternatives:
-                alt_status = self.queue_manager.get_station_status(alt)
-                
-                # Alternatif daha bossa oner
-                if alt_status['ratio'] < current_status['ratio'] - 0.5:
-                    time_saved = current_status['queue_days'] - alt_status['queue_days']
-                    suggestions.append({
-                        "order_code": order['order_code'],
-                        "current_station": station,
-                        "alternative_station": alt,
-                        "current_queue_days": round(current_status['queue_days'], 1),
-                        "alt_queue_days": round(alt_status['queue_days'], 1),
-                        "time_saved_days": round(time_saved, 1),
-                        "message": f"{order['order_code']}: {station} yerine {alt} kullanilabilir ({time_saved:.1f} gun kazanc)"
-                    })
-        
-        return suggestions
-
-
-# =============================================================================
-# BATCH OPTIMIZER (Kalinlik Bazli Gruplama)
-# =============================================================================
-class BatchOptimizer:
-    """Temper icin kalinlik bazli gruplama onerileri"""
-    
-    def __init__(self, queue_manager):
-        self.queue_manager = queue_manager
-    
-    def find_batch_opportunities(self, orders):
-        """Batch firsatlarini bul"""
-        suggestions = []
-        
-        # Temper bekleyen siparisleri kalinliga gore grupla
-        thickness_groups = defaultdict(list)
-        
-        for order in orders:
-            route = order.get('route', '')
-            thickness = order.get('thickness', 0)
-            
-            # Temper istasyonu rotada var mi?
-            has_temper = any(st in route for st in FactoryConfig.BATCH_STATIONS)
-            
-            if has_temper and thickness:
-                # Tamamlanmis istasyonlar
-                completed = []
-                if db:
-                    try:
-                        completed = db.get_completed_stations_list(order['id'])
-                    except:
-                        pass
-                
-                # Temper henuz yapilmamissa
-                temper_pending = any(
-                    st in route and st not in completed 
-                    for st in FactoryConfig.BATCH_STATIONS
-                )
-                
-                if temper_pending:
-                    thickness_groups[thickness].append(order)
-        
-        # 2'den fazla siparis olan gruplari oner
-        for thickness, group_orders in thickness_groups.items():
-            if len(group_orders) >= 2:
-                total_m2 = sum(o.get('declared_total_m2', 0) for o in group_orders)
-                order_codes = [o['order_code'] for o in group_orders[:5]]
-                
-                suggestions.append({
-                    "type": "batch",
-                    "thickness": thickness,
-                    "count": len(group_orders),
-                    "total_m2": round(total_m2, 1),
-                    "orders": order_codes,
-                    "message": f"Temper Batch: {len(group_orders)} siparis {thickness}mm kalinlikta ({total_m2:.0f} m2). Birlikte islenmeli."
-                })
-        
-        return suggestions
-
-
-# =============================================================================
-# AKILLI ONERI MOTORU
-# =============================================================================
-class SmartRecommendationEngine:
-    """Tum analizleri birlestiren oneri motoru"""
-    
-    def __init__(self):
-        self.queue_manager = StationQueueManager()
-        self.cr_calculator = CriticalRatioCalculator(self.queue_manager)
-        self.route_optimizer = AlternativeRouteOptimizer(self.queue_manager)
-        self.batch_optimizer = BatchOptimizer(self.queue_manager)
-    
-    def analyze(self, orders):
-        """Kapsamli analiz yap"""
-        # Kuyruklari olustur
-        self.queue_manager.build_queues(orders)
-        
-        recommendations = []
-        
-        # 1. Critical Ratio analizi
-        for order in orders:
-            cr, status = self.cr_calculator.calculate_cr(order)
-            if status in ["late", "critical"]:
-                recommendations.append({
-                    "type": "critical",
-                    "priority": 1,
-                    "message": f"{order['order_code']}: CR={cr:.2f} - Gecikme riski yuksek! Hemen one alinmali."
-                })
-            elif status == "risk":
-                recommendations.append({
-                    "type": "warning",
-                    "priority": 2,
-                    "message": f"{order['order_code']}: CR={cr:.2f} - Teslim tarihine yakin, dikkat."
-                })
-        
-        # 2. Darbogaz analizi
-        bottlenecks = self.queue_manager.get_bottlenecks()
-        for bn in bottlenecks[:3]:  # En kritik 3 darbogaz
-            recommendations.append({
-                "type": "warning",
-                "priority": 3,
-                "message": f"Darbogaz: {bn['station']} - {bn['load_m2']:.0f} m2 yuk, {bn['queue_days']:.1f} gunluk kuyruk"
-            })
-        
-        # 3. Alternatif rota onerileri
-        for order in orders[:10]:  # Ilk 10 siparis icin
-            alt_routes = self.route_optimizer.find_alternative_routes(order)
-            for alt in alt_routes:
-                if alt['time_saved_days'] >= 0.5:  # Yarim gun veya daha fazla kazanc
-                    recommendations.append({
-                        "type": "info",
-                        "priority": 4,
-                        "message": alt['message']
-                    })
-        
-        # 4. Batch onerileri
-        batch_suggestions = self.batch_optimizer.find_batch_opportunities(orders)
-        for batch in batch_suggestions:
-            recommendations.append({
-                "type": "info",
-                "priority": 5,
-                "message": batch['message']
-            })
-        
-        # 5. Bos istasyonlar
-        idle = self.queue_manager.get_idle_stations()
-        if idle:
-            recommendations.append({
-                "type": "info",
-                "priority": 6,
-                "message": f"Bos istasyonlar: {', '.join(idle)}"
-            })
-        
-        # Oncelik sirasina gore sirala
-        recommendations.sort(key=lambda x: x['priority'])
-        
-        return recommendations
-    
-    def get_order_current_station(self, order):
-        """Siparisin mevcut istasyonunu bul"""
-        if not db:
-            return None
-        
-        try:
-            route = order.get('route', '')
-            if not route:
-                return None
-            
-            completed = db.get_completed_stations_list(order['id'])
-            
-            for station in route.split(','):
-                station = station.strip()
-                if station and station not in completed:
-                    return station
-            
-            return None
-        except:
-            return None
-    
-    def can_reorder(self, order_to_move, target_order):
-        """Siparis yer degistirebilir mi?"""
-        if order_to_move.get('status') == 'Beklemede':
-            return True, ""
-        
-        current_station = self.get_order_current_station(order_to_move)
-        if current_station and FactoryConfig.is_cutting_station(current_station):
-            return False, f"Siparis {current_station} istasyonunda, one alinamaz"
-        
-        return True, ""
 
 
 # =============================================================================
@@ -567,6 +83,7 @@ class DecisionView(QWidget):
         self.all_orders = []
         self.original_orders = []
         self.engine = SmartRecommendationEngine()
+        self._risk_task = None
         self.panel_visible = False
         self.setup_ui()
         self.load_orders()
@@ -725,6 +242,20 @@ class DecisionView(QWidget):
         btn_export.clicked.connect(self.export_to_excel)
         layout.addWidget(btn_export)
         
+        btn_optimize = QPushButton("Sirayi Iyilestir")
+        btn_optimize.setToolTip("Gecikme + ayar (kalinlik/urun degisimi) maliyetini yerel aramayla azaltir.\n"
+                                "Sonucu kaydetmek icin 'Uygula'ya basin.")
+        btn_optimize.setStyleSheet(btn_style)
+        btn_optimize.clicked.connect(self.optimize_sequence)
+        layout.addWidget(btn_optimize)
+        
+        self.btn_risk = QPushButton("Teslim Riski")
+        self.btn_risk.setToolTip("Kapasite ve fire degiskenligiyle Monte Carlo simulasyonu.\n"
+                                 "CR ve Tahmini sutunlari %90 guvenli bitis gunune gore hesaplanir.")
+        self.btn_risk.setStyleSheet(btn_style)
+        self.btn_risk.clicked.connect(self.run_risk_analysis)
+        layout.addWidget(self.btn_risk)
+        
         btn_apply = QPushButton("Uygula")
         btn_apply.setStyleSheet(f"""
             QPushButton {{
@@ -1063,7 +594,10 @@ class DecisionView(QWidget):
                 self.all_orders = []
             
             self.original_orders = self.all_orders.copy()
-            self.engine.queue_manager.build_queues(self.all_orders)
+            # Yeni veriyle eski risk sonucu gecersiz
+            self.engine.cr_calculator.set_risk(None)
+            # Ilerleme tek sorguda; tablo/siralama/oneri bu goruntuden okur
+            self.engine.prepare(self.all_orders)
             self.refresh_table()
             self.update_stats()
             
@@ -1368,26 +902,10 @@ class DecisionView(QWidget):
             return
         
         try:
-            with open(filename, 'w', encoding='utf-8-sig') as f:
-                f.write("SIRA,KOD,MUSTERI,URUN,M2,CR,TERMIN,TAHMINI,FARK,DURUM,ISTASYON\n")
-                
-                for idx, order in enumerate(self.all_orders):
-                    cr, _ = self.engine.cr_calculator.calculate_cr(order)
-                    est_date, _ = self.engine.cr_calculator.estimate_completion_date(order, idx, self.all_orders)
-                    est_str = est_date.strftime('%Y-%m-%d') if est_date else ""
-                    current_st = self.engine.get_order_current_station(order)
-                    
-                    f.write(f"{idx+1},")
-                    f.write(f"{order['order_code']},")
-                    f.write(f"{order['customer_name']},")
-                    f.write(f"{order['product_type']},")
-                    f.write(f"{order.get('declared_total_m2', 0):.1f},")
-                    f.write(f"{cr if cr else ''},")
-                    f.write(f"{order.get('delivery_date', '')},")
-                    f.write(f"{est_str},")
-                    f.write(f",")
-                    f.write(f"{order.get('status', 'Beklemede')},")
-                    f.write(f"{current_st or ''}\n")
+            with open(filename, 'w', encoding='utf-8-sig', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(self.engine.PLAN_COLUMNS)
+                writer.writerows(self.engine.plan_rows(self.all_orders))
             
             self.status_label.setText(f"Kaydedildi: {filename}")
             
@@ -1400,6 +918,70 @@ class DecisionView(QWidget):
         except Exception as e:
             QMessageBox.critical(self, "Hata", f"Kayit hatasi:\n{str(e)}")
     
+    def optimize_sequence(self):
+        """Ekrandaki sirayi yerel aramayla iyilestir (kaydetmez; 'Uygula' kaydeder)"""
+        if not self.all_orders or not planner:
+            self.status_label.setText("Veri yok")
+            return
+        
+        self.status_label.setText("Sira iyilestiriliyor...")
+        QApplication.processEvents()
+        try:
+            sequence, report = planner.improve_sequence(self.all_orders)
+        except Exception as e:
+            self.status_label.setText(f"Hata: {str(e)}")
+            return
+        
+        self.all_orders = sequence
+        self.refresh_table()
+        self.update_stats()
+        if self.panel_visible:
+            self.update_side_panel()
+        
+        before, after = report['initial'], report['final']
+        self.status_label.setText(
+            f"Sira iyilestirildi: gecikme {before['tardiness']:.1f} -> {after['tardiness']:.1f} gun, "
+            f"ayar {before['setups']} -> {after['setups']}, amac {report['delta']:+.1f} "
+            f"({report['accepted_moves']} hamle) - kaydetmek icin Uygula"
+        )
+    
+    def run_risk_analysis(self):
+        """P50 / P90 bitis gunlerini arka planda hesapla; bitince CR stokastik moda gecer"""
+        if not planner or BackgroundTask is None:
+            self.status_label.setText("Risk simulasyonu kullanilamiyor")
+            return
+        if self._risk_task is not None and self._risk_task.isRunning():
+            return
+        
+        self.btn_risk.setEnabled(False)
+        self.status_label.setText("Teslim riski hesaplaniyor...")
+        self._risk_task = BackgroundTask(planner.calculate_delivery_risk,
+                                         progress_callback=BackgroundTask.PROGRESS, parent=self)
+        self._risk_task.progress_updated.connect(
+            lambda done, total: self.status_label.setText(f"Teslim riski hesaplaniyor... %{done * 100 // max(total, 1)}")
+        )
+        self._risk_task.finished_ok.connect(self.on_risk_ready)
+        self._risk_task.failed.connect(self.on_risk_failed)
+        self._risk_task.start()
+    
+    def on_risk_ready(self, risk):
+        self.btn_risk.setEnabled(True)
+        self.engine.cr_calculator.set_risk(risk)
+        self.refresh_table()
+        self.update_stats()
+        if self.panel_visible:
+            self.update_side_panel()
+        
+        late = [r for r in risk.summaries() if r['on_time_prob'] is not None and r['on_time_prob'] < 0.5]
+        self.status_label.setText(
+            f"Teslim riski: {risk.runs} kosu, {risk.elapsed:.1f} sn - CR %90 guvenli bitise gore. "
+            f"{len(late)} siparisin termine yetisme olasiligi %50'nin altinda"
+        )
+    
+    def on_risk_failed(self, message):
+        self.btn_risk.setEnabled(True)
+        self.status_label.setText(f"Risk hatasi: {message}")
+    
     def apply_order(self):
         if not self.all_orders:
             self.status_label.setText("Veri yok")
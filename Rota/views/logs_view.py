@@ -2,12 +2,14 @@ import sys
 from datetime import datetime
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                                QTableWidget, QTableWidgetItem, QHeaderView, 
-                               QPushButton, QLineEdit, QAbstractItemView)
+                               QPushButton, QLineEdit, QAbstractItemView,
+                               QTabWidget, QMessageBox)
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QColor, QFont
 
 try:
     from core.db_manager import db
+    from core.query_tracer import query_tracer
     from ui.theme import Theme
 except ImportError:
     pass
@@ -83,7 +85,112 @@ class LogsView(QWidget):
             QTableWidget::item { padding: 5px; border-bottom: 1px solid #F2F3F4; }
         """)
         
-        layout.addWidget(self.table)
+        # --- SEKMELER ---
+        self.tabs = QTabWidget()
+        self.tabs.addTab(self.table, "İşlem Geçmişi")
+        self.tabs.addTab(self._create_sql_tab(), "Yavaş Sorgular")
+        self.tabs.currentChanged.connect(lambda idx: self.refresh_sql_stats() if idx == 1 else None)
+        layout.addWidget(self.tabs)
+
+    def _create_sql_tab(self):
+        """SQL izleme sekmesi: hangi ekran veritabanını ne kadar meşgul ediyor?"""
+        page = QWidget()
+        page_layout = QVBoxLayout(page)
+        page_layout.setContentsMargins(10, 10, 10, 10)
+        page_layout.setSpacing(10)
+
+        toolbar = QHBoxLayout()
+        self.lbl_sql_summary = QLabel()
+        self.lbl_sql_summary.setStyleSheet("color: #7F8C8D; font-size: 12px;")
+        toolbar.addWidget(self.lbl_sql_summary)
+        toolbar.addStretch()
+
+        btn_style = "padding: 6px 12px; background-color: #2C3E50; color: white; border-radius: 6px; font-weight: bold;"
+        self.btn_sql_toggle = QPushButton()
+        self.btn_sql_toggle.setCursor(Qt.PointingHandCursor)
+        self.btn_sql_toggle.clicked.connect(self.toggle_sql_trace)
+        self.btn_sql_toggle.setStyleSheet(btn_style)
+        toolbar.addWidget(self.btn_sql_toggle)
+
+        for text, slot in (("⟳ YENİLE", self.refresh_sql_stats), ("SIFIRLA", self.reset_sql_stats), ("JSON KAYDET", self.dump_sql_stats)):
+            btn = QPushButton(text)
+            btn.setCursor(Qt.PointingHandCursor)
+            btn.clicked.connect(slot)
+            btn.setStyleSheet(btn_style)
+            toolbar.addWidget(btn)
+        page_layout.addLayout(toolbar)
+
+        page_layout.addWidget(QLabel("ÇAĞRI YERLERİ (toplam süreye göre)"))
+        self.table_sites = self._create_stats_table(["EKRAN", "DB METODU", "SORGU", "TOPLAM ms", "ORT. ms", "MAKS ms", "SATIR"])
+        page_layout.addWidget(self.table_sites)
+
+        page_layout.addWidget(QLabel("YAVAŞ SORGULAR (en yeni önce)"))
+        self.table_slow = self._create_stats_table(["ZAMAN", "SÜRE ms", "SATIR", "EKRAN", "DB METODU", "SQL"])
+        page_layout.addWidget(self.table_slow)
+        return page
+
+    def _create_stats_table(self, columns):
+        table = QTableWidget()
+        table.setColumnCount(len(columns))
+        table.setHorizontalHeaderLabels(columns)
+        table.verticalHeader().setVisible(False)
+        table.setAlternatingRowColors(True)
+        table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        header_obj = table.horizontalHeader()
+        header_obj.setSectionResizeMode(QHeaderView.ResizeToContents)
+        header_obj.setStretchLastSection(True)
+        header_obj.setStyleSheet("QHeaderView::section { background-color: #ECF0F1; color: #2C3E50; font-weight: bold; padding: 6px; border: none; }")
+        table.setStyleSheet("QTableWidget { background-color: white; border: 1px solid #BDC3C7; border-radius: 6px; }")
+        return table
+
+    def refresh_sql_stats(self):
+        """İzleyici istatistiklerini tablolara yükle"""
+        summary = query_tracer.get_summary()
+        state = "AÇIK" if summary['enabled'] else "KAPALI"
+        self.btn_sql_toggle.setText("İZLEMEYİ KAPAT" if summary['enabled'] else "İZLEMEYİ AÇ")
+        self.lbl_sql_summary.setText(
+            f"İzleme: {state}  |  {summary['since']} itibarıyla {summary['statement_count']} sorgu, "
+            f"toplam {summary['total_ms']:.0f} ms  |  Yavaş (≥{summary['slow_threshold_ms']:.0f} ms): {summary['slow_count']}"
+        )
+
+        sites = query_tracer.get_call_site_stats(limit=100)
+        self.table_sites.setRowCount(len(sites))
+        for row, s in enumerate(sites):
+            values = [s['screen'], s['method'], str(s['count']), f"{s['total_ms']:.1f}",
+                      f"{s['avg_ms']:.2f}", f"{s['max_ms']:.1f}", str(s['rows'])]
+            for col, value in enumerate(values):
+                self.table_sites.setItem(row, col, QTableWidgetItem(value))
+
+        slow = query_tracer.get_slow_queries()
+        self.table_slow.setRowCount(len(slow))
+        for row, q in enumerate(slow):
+            values = [q['timestamp'], f"{q['duration_ms']:.1f}", str(q['rows']), q['screen'], q['method'], q['sql']]
+            for col, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if col == 1:
+                    item.setForeground(QColor("#C0392B"))
+                if col == 5:
+                    item.setToolTip(q['sql'])
+                self.table_slow.setItem(row, col, item)
+
+    def toggle_sql_trace(self):
+        if query_tracer.enabled:
+            query_tracer.disable()
+        else:
+            query_tracer.enable()
+        self.refresh_sql_stats()
+
+    def reset_sql_stats(self):
+        query_tracer.reset()
+        self.refresh_sql_stats()
+
+    def dump_sql_stats(self):
+        try:
+            path = query_tracer.dump_json()
+            QMessageBox.information(self, "Kaydedildi", f"SQL izleme raporu kaydedildi:\n{path}")
+        except Exception as e:
+            QMessageBox.critical(self, "Hata", f"Rapor kaydedilemedi:\n{e}")
 
     def refresh_data(self):
         """Tüm logları getir"""
@@ -2,27 +2,32 @@ import sys
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                                QPushButton, QTableWidget, QTableWidgetItem, 
                                QHeaderView, QFrame, QMessageBox, QLineEdit, 
-                               QAbstractItemView, QInputDialog, QComboBox)
+                               QAbstractItemView, QInputDialog, QComboBox, QCheckBox)
 from PySide6.QtCore import Qt, QTimer, QTime, Signal
 from PySide6.QtGui import QFont, QColor, QIcon
 
 try:
     from core.db_manager import db
+    from core.scan_ingest import scan_queue
     from ui.theme import Theme
 except ImportError:
     pass
 
 class OperatorView(QWidget):
     logout_signal = Signal() 
+    scan_acked = Signal(dict, object, object)   # olay, sonuç, hata (okutma kuyruğu thread'inden)
 
     def __init__(self, user_data):
         super().__init__()
         self.user = user_data
         self.current_order = None 
         self.barcode_buffer = ""
+        self.orders_by_code = {}
+        self.last_queue_message = ""
         
         self.setup_ui()
         self.setup_timer() 
+        self.setup_scan_queue()
         self.refresh_list() 
         self.setFocusPolicy(Qt.StrongFocus)
 
@@ -67,6 +72,25 @@ class OperatorView(QWidget):
         header_layout.addWidget(lbl_station_title)
         header_layout.addWidget(self.combo_station)
 
+        # Okutunca tamamla: vardiya değişiminde toplu okutma, onay penceresi yok
+        self.chk_scan_complete = QCheckBox("OKUTUNCA TAMAMLA")
+        self.chk_scan_complete.setStyleSheet("color: white; font-weight: bold; margin-left: 20px;")
+        self.chk_scan_complete.setFocusPolicy(Qt.NoFocus)
+        header_layout.addWidget(self.chk_scan_complete)
+
+        self.lbl_queue = QLabel("")
+        self.lbl_queue.setStyleSheet("color: #BDC3C7; font-size: 12px; margin-left: 15px;")
+        header_layout.addWidget(self.lbl_queue)
+
+        # Merkezde uygulanamayan okutmalar (terminal günlüğünde bekler, operatör karar verir)
+        self.btn_failed = QPushButton("")
+        self.btn_failed.setCursor(Qt.PointingHandCursor)
+        self.btn_failed.setFocusPolicy(Qt.NoFocus)
+        self.btn_failed.setStyleSheet("QPushButton { background-color: #E67E22; color: white; border: none; border-radius: 4px; font-weight: bold; padding: 5px 10px; margin-left: 10px; }")
+        self.btn_failed.clicked.connect(self.show_failed_scans)
+        self.btn_failed.hide()
+        header_layout.addWidget(self.btn_failed)
+
         header_layout.addStretch()
 
         self.lbl_clock = QLabel("00:00:00")
@@ -202,16 +226,24 @@ class OperatorView(QWidget):
             self.txt_barcode.clear()
 
     def process_scanned_barcode(self, code):
-        found = False
+        order = self.orders_by_code.get(code)
+        if not order:
+            if self.chk_scan_complete.isChecked():
+                self.show_queue_message(f"'{code}' listede yok!", error=True)
+            else:
+                QMessageBox.warning(self, "Bulunamadı", f"'{code}' kodlu sipariş bu istasyonun listesinde yok!")
+            return
+
+        if self.chk_scan_complete.isChecked():
+            self.submit_completion(order)
+            return
+
         for row in range(self.table.rowCount()):
             item = self.table.item(row, 0)
-            if item and item.text() == code:
+            if item and item.data(Qt.UserRole)['order_code'] == code:
                 self.table.selectRow(row)
                 self.load_selected_job()
-                found = True
                 break
-        if not found:
-            QMessageBox.warning(self, "Bulunamadı", f"'{code}' kodlu sipariş bu istasyonun listesinde yok!")
 
     def setup_timer(self):
         self.timer = QTimer(self)
@@ -221,12 +253,19 @@ class OperatorView(QWidget):
 
     def update_clock(self):
         self.lbl_clock.setText(QTime.currentTime().toString("HH:mm:ss"))
+        self.update_queue_label()
 
     def refresh_list(self):
         self.table.setRowCount(0)
         self.current_order = None
         self.reset_controls()
-        orders = db.get_orders_by_status(["Beklemede", "Üretimde"])
+        try:
+            orders = db.get_orders_by_status(["Beklemede", "Üretimde"])
+        except Exception:
+            # Merkezi veritabanına ulaşılamıyor: son listeyle çalışmaya devam (okutmalar günlükte)
+            orders = list(self.orders_by_code.values())
+            self.show_queue_message("⚠ Merkez erişilemiyor, son liste gösteriliyor", error=True)
+        self.orders_by_code = {data['order_code']: data for data in orders}
         self.table.setRowCount(len(orders))
         for row, data in enumerate(orders):
             item_code = QTableWidgetItem(str(data['order_code']))
@@ -283,7 +322,11 @@ class OperatorView(QWidget):
 
     def start_job(self):
         if not self.current_order: return
-        db.update_order_status(self.current_order['id'], "Üretimde")
+        try:
+            db.update_order_status(self.current_order['id'], "Üretimde")
+        except Exception:
+            self.show_queue_message("⚠ Merkez erişilemiyor, iş başlatılamadı", error=True)
+            return
         self.refresh_list()
 
     def finish_job(self):
@@ -294,9 +337,89 @@ class OperatorView(QWidget):
         
         reply = QMessageBox.question(self, "Onay", f"Bu iş {selected_station} istasyonunda tamamlandı mı?", QMessageBox.Yes | QMessageBox.No)
         if reply == QMessageBox.Yes:
-            db.complete_station_process(self.current_order['id'], selected_station)
-            QMessageBox.information(self, "Başarılı", f"{selected_station} işlemi kaydedildi.")
-            self.refresh_list()
+            self.submit_completion(self.current_order)
+
+    # --- OKUTMA KUYRUĞU ---
+    def setup_scan_queue(self):
+        """Tamamlama olayları arka planda toplu yazılır; onaylar sinyalle GUI thread'ine gelir"""
+        self.scan_acked.connect(self.on_scan_acked)
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setSingleShot(True)
+        self.refresh_timer.setInterval(500)     # Peş peşe onaylarda listeyi bir kez yenile
+        self.refresh_timer.timeout.connect(self.refresh_list)
+        scan_queue.add_listener(self.forward_scan_ack)
+        scan_queue.start()
+        self.update_queue_label()
+
+    def forward_scan_ack(self, event, result, error):
+        self.scan_acked.emit(event, result, error)
+
+    def submit_completion(self, order):
+        station = self.combo_station.currentText()
+        scan_queue.submit(order['id'], station, None, self.user.get('full_name', 'Operatör'), order['order_code'])
+        self.show_queue_message(f"✔ {order['order_code']} → {station} kuyrukta")
+
+    def on_scan_acked(self, event, result, error):
+        if error:
+            self.show_queue_message(f"❌ {event.get('code')} kaydedilemedi: {error}", error=True)
+        elif event['kind'] == 'fire':
+            self.show_queue_message(f"🔥 {event.get('code')} fire kaydedildi" + (f", rework: {result}" if result else ""))
+        else:
+            self.show_queue_message(f"✔ {event.get('code')} {event['station_name']}: {result['status']} ({event['ack_ms']:.0f} ms)")
+        self.refresh_timer.start()
+
+    def show_queue_message(self, text, error=False):
+        self.lbl_queue.setStyleSheet(f"color: {'#E74C3C' if error else '#BDC3C7'}; font-size: 12px; margin-left: 15px;")
+        self.update_queue_label(text)
+
+    def update_queue_label(self, text=None):
+        if text is not None:
+            self.last_queue_message = text
+        pending = scan_queue.pending_count()
+        suffix = f"  |  Kuyruk: {pending}" if pending else ""
+        if not scan_queue.online:
+            suffix += "  |  ÇEVRİMDIŞI"
+        self.lbl_queue.setText(self.last_queue_message + suffix)
+
+        try:
+            failed = scan_queue.failed_count()
+        except Exception:
+            failed = 0
+        self.btn_failed.setText(f"⚠ HATALI OKUTMA: {failed}")
+        self.btn_failed.setVisible(failed > 0)
+
+    def show_failed_scans(self):
+        """Merkeze yazılamayan okutmaları göster: yeniden dene / sil / kapat"""
+        events = scan_queue.failed_events()
+        if not events:
+            self.update_queue_label()
+            return
+
+        lines = []
+        for e in events[:20]:
+            kind = "Fire" if e['kind'] == 'fire' else "Üretim"
+            lines.append(f"{e['created_at'] or ''}  {e['code'] or e['order_id']}  {e['station_name'] or ''}  ({kind}): {e['last_error'] or ''}")
+        if len(events) > 20:
+            lines.append(f"... ve {len(events) - 20} kayıt daha")
+
+        box = QMessageBox(self)
+        box.setIcon(QMessageBox.Warning)
+        box.setWindowTitle("Hatalı Okutmalar")
+        box.setText(f"{len(events)} okutma merkezi veritabanına yazılamadı.")
+        box.setInformativeText("\n".join(lines))
+        btn_retry = box.addButton("YENİDEN DENE", QMessageBox.AcceptRole)
+        btn_discard = box.addButton("SİL", QMessageBox.DestructiveRole)
+        box.addButton("KAPAT", QMessageBox.RejectRole)
+        box.exec()
+
+        if box.clickedButton() == btn_retry:
+            count = scan_queue.retry_failed()
+            self.show_queue_message(f"↻ {count} okutma yeniden kuyrukta")
+        elif box.clickedButton() == btn_discard:
+            count = scan_queue.discard_failed()
+            self.show_queue_message(f"{count} hatalı okutma silindi")
+        else:
+            self.update_queue_label()
 
     def report_breakage(self):
         if not self.current_order: return
@@ -307,11 +430,10 @@ class OperatorView(QWidget):
         
         qty, ok = QInputDialog.getInt(self, "Fire Girişi", "Kaç adet cam kırıldı?", 1, 1, self.current_order['quantity'])
         if ok:
-            # Artık istasyon adını ve operatörü de gönderiyoruz
-            db.report_fire(self.current_order['id'], qty, current_station, operator_name)
+            # Terminal günlüğüne yazılır, merkeze kuyruktan aktarılır (rework siparişi orada açılır)
+            scan_queue.submit_fire(self.current_order['id'], qty, current_station, operator_name, self.current_order['order_code'])
             
-            QMessageBox.critical(self, "FİRE KAYDEDİLDİ", f"{qty} adet cam için fire kaydı oluşturuldu.\nOtomatik rework siparişi açıldı.")
-            self.refresh_list()
+            QMessageBox.critical(self, "FİRE KAYDEDİLDİ", f"{qty} adet cam için fire kaydı oluşturuldu.\nOtomatik rework siparişi açılacak.")
 
     def reset_controls(self):
         self.lbl_job_code.setText("İŞ SEÇİNİZ")
@@ -324,4 +446,5 @@ class OperatorView(QWidget):
         self.btn_fire.setEnabled(False)
 
     def handle_logout(self):
+        scan_queue.remove_listener(self.forward_scan_ack)
         self.logout_signal.emit()
\ No newline at end of file
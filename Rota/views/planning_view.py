@@ -2,6 +2,8 @@
 EFES ROTA X - İş Yükü ve Kapasite Planlama (Delegate Düzeltildi)
 - İstasyon isimlerinin görünmeme sorunu çözüldü (Delegate column 0 check).
 - Isı haritası renkleri mavi tonlarında sabitlendi.
+- Tahmin arka planda (QThreadPool) hesaplanır; ilk günler kesinleşince önce boyanır,
+  yeni yenileme süren hesaplamayı iptal eder.
 """
 
 import sys
@@ -13,18 +15,23 @@ from PySide6.QtWidgets import (
     QDialog, QListWidget, QMessageBox, QApplication, QStyle, QFrame,
     QGraphicsDropShadowEffect
 )
-from PySide6.QtCore import Qt, QTimer, QRect
+from PySide6.QtCore import Qt, QTimer, QRect, QThreadPool
 from PySide6.QtGui import QColor, QFont, QPainter, QPen, QBrush
 
 # Modülleri güvenli şekilde içeri al
 factory_config = None
 planner = None
 WeeklyScheduleView = None
+PoolTask = None
 
 try:
     from ui.theme import Theme
     from core.smart_planner import planner 
     from core.factory_config import factory_config 
+    try:
+        from core.db_async import PoolTask
+    except ImportError:
+        pass
     try:
         from views.weekly_schedule_dialog import WeeklyScheduleView
     except ImportError:
@@ -208,8 +215,14 @@ class PlanningView(QWidget):
     def __init__(self):
         super().__init__()
 
-        self.DAYS_RANGE = 30
+        self.DAYS_RANGE = planner.FORECAST_DAYS if planner else 30
         self.cached_details = {}
+        self._partial_details = None    # (gün sayısı, details): son ara sonuç
+
+        # Tahmin arka planda: tek iş parçacığı, yeni yenileme eskisini iptal eder
+        self._forecast_pool = QThreadPool(self)
+        self._forecast_pool.setMaxThreadCount(1)
+        self._forecast_task = None
 
         # --- MAKİNE LİSTESİNİ YÜKLETablo başlatma yap
         self.load_machines()
@@ -402,24 +415,57 @@ class PlanningView(QWidget):
         if 'planner' not in globals() or planner is None:
             return
 
-        try:
-            result = planner.calculate_forecast()
-            if isinstance(result, tuple) and len(result) >= 3:
-                forecast, details, loads = result
-                self.cached_details = details
-            else:
-                return
-        except Exception as e:
-            print(f"Planlama hatası: {e}")
+        if PoolTask is None:
+            try:
+                self.on_forecast_ready(None, planner.calculate_forecast(horizon_days=self.DAYS_RANGE))
+            except Exception as e:
+                print(f"Planlama hatası: {e}")
+            return
+
+        # Süren hesaplama artık geçersiz: iptal et, sonucu / ara sonucu yok sayılır
+        if self._forecast_task is not None:
+            self._forecast_task.cancel()
+
+        task = PoolTask(planner.calculate_forecast, horizon_days=self.DAYS_RANGE,
+                        progress_callback=PoolTask.PARTIAL, should_stop=PoolTask.SHOULD_STOP)
+        task.signals.partial.connect(lambda payload, t=task: self.on_forecast_partial(t, payload))
+        task.signals.finished_ok.connect(lambda result, t=task: self.on_forecast_ready(t, result))
+        task.signals.failed.connect(lambda msg, t=task: self.on_forecast_failed(t, msg))
+        self._forecast_task = task
+        self._forecast_pool.start(task)
+
+    def on_forecast_partial(self, task, payload):
+        """İlk günler kesinleşti: o sütunları hemen boya, kalanı eski haliyle kalsın"""
+        if task is not self._forecast_task:
             return
+        days, (forecast, details, loads) = payload
+        self._partial_details = (days, details)
+        self.fill_heat_map(forecast, loads, days)
 
+    def on_forecast_ready(self, task, result):
+        if task is not self._forecast_task:
+            return
+        self._forecast_task = None
+        if isinstance(result, tuple) and len(result) >= 3:
+            forecast, details, loads = result
+            self.cached_details = details
+            self._partial_details = None
+            self.fill_heat_map(forecast, loads, self.DAYS_RANGE)
+
+    def on_forecast_failed(self, task, message):
+        if task is self._forecast_task:
+            self._forecast_task = None
+            print(f"Planlama hatası: {message}")
+
+    def fill_heat_map(self, forecast, loads, day_count):
+        """Isı haritasının ilk day_count gün sütununu doldur"""
         for row_idx, machine_name in enumerate(self.machines):
             machine_key = machine_name.upper()
 
             daily_percents = forecast.get(machine_key, [0]*self.DAYS_RANGE)
             daily_loads = loads.get(machine_key, [0]*self.DAYS_RANGE)
 
-            for day_idx in range(self.DAYS_RANGE):
+            for day_idx in range(min(day_count, self.DAYS_RANGE)):
                 col_idx = day_idx + 1
 
                 percent = daily_percents[day_idx] if day_idx < len(daily_percents) else 0
@@ -445,9 +491,13 @@ class PlanningView(QWidget):
         machine_name = self.machines[row]
         machine_key = machine_name.upper()
         
-        if machine_key in self.cached_details:
+        details = self.cached_details
+        if self._partial_details and day_idx < self._partial_details[0]:
+            details = self._partial_details[1]     # Yeni hesaplamanın kesinleşmiş günleri
+
+        if machine_key in details:
             try:
-                orders = self.cached_details[machine_key][day_idx]
+                orders = details[machine_key][day_idx]
                 if not orders: return 
                 
                 today = datetime.now()
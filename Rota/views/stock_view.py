@@ -22,6 +22,16 @@ try:
 except ImportError:
     db = None
 
+try:
+    from core.cutting_optimizer import cutting_optimizer
+except ImportError:
+    cutting_optimizer = None
+
+try:
+    from core.db_async import BackgroundTask
+except ImportError:
+    BackgroundTask = None
+
 
 # =============================================================================
 # TEMA VE RENKLER
@@ -375,6 +385,8 @@ class StockView(QWidget):
     def __init__(self):
         super().__init__()
         self.all_stocks = []
+        self._cutting_task = None
+        self._cutting_rerun = False     # Hesap sürerken plaka verisi yenilendi
         self.setup_ui()
         
         self.timer = QTimer(self)
@@ -436,10 +448,14 @@ class StockView(QWidget):
         plate_tab = QWidget()
         plate_layout = QVBoxLayout(plate_tab)
         plate_layout.setContentsMargins(0, 0, 0, 0)
+        self.lbl_cutting = QLabel("Kesim planı: -")
+        self.lbl_cutting.setStyleSheet(f"color: {Colors.TEXT}; font-size: 12px; padding: 6px;")
+        plate_layout.addWidget(self.lbl_cutting)
         self.plate_table = self._create_plate_table()
         plate_layout.addWidget(self.plate_table)
         self.tab_widget.addTab(plate_tab, "📦 Plaka Stoku")
 
+        self.tab_widget.currentChanged.connect(lambda _: self.update_cutting_summary())
         layout.addWidget(self.tab_widget)
 
         # Status Bar
@@ -688,11 +704,50 @@ class StockView(QWidget):
             # Plaka stok verisi
             self.all_plates = db.get_all_plates()
             self.populate_plate_table()
+            self.update_cutting_summary()
 
             self.lbl_status.setText(f"Veriler güncellendi: {datetime.now().strftime('%H:%M:%S')}")
         except Exception as e:
             self.lbl_status.setText(f"Hata: {e}")
 
+    def update_cutting_summary(self):
+        """Bekleyen kesim işlerinin plaka ihtiyacı, arka planda (girdiler aynıysa önbellekten)"""
+        if not cutting_optimizer or BackgroundTask is None or self.tab_widget.currentIndex() != 1:
+            return
+        if self._cutting_task is not None and self._cutting_task.isRunning():
+            self._cutting_rerun = True
+            return
+
+        self._cutting_rerun = False
+        self._cutting_task = BackgroundTask(cutting_optimizer.optimize, plates=list(self.all_plates), parent=self)
+        self._cutting_task.finished_ok.connect(self.on_cutting_ready)
+        self._cutting_task.failed.connect(self.on_cutting_failed)
+        self._cutting_task.finished.connect(self.on_cutting_finished)
+        self._cutting_task.start()
+
+    def on_cutting_ready(self, plans):
+        summaries = [p.get_summary() for p in plans.values()]
+        sheets = sum(s['sheets'] for s in summaries)
+        sheet_m2 = sum(s['sheet_m2'] for s in summaries)
+        piece_m2 = sum(s['piece_m2'] for s in summaries)
+        off_stock = sum(s['off_stock_sheets'] for s in summaries)
+        waste = (1 - piece_m2 / sheet_m2) * 100 if sheet_m2 else 0
+
+        text = f"✂️ Bekleyen kesim: {sheets} levha, {piece_m2:.0f} m² parça, fire %{waste:.1f}"
+        if off_stock:
+            text += f"  |  ⚠️ Stok yetersiz: {off_stock} levha satın alınmalı"
+        self.lbl_cutting.setText(text)
+
+    def on_cutting_failed(self, message):
+        self.lbl_cutting.setText(f"Kesim planı hesaplanamadı: {message}")
+
+    def on_cutting_finished(self):
+        self._cutting_task.deleteLater()
+        self._cutting_task = None
+        # Hesap sürerken gelen yenileme: güncel plakalarla bir kez daha
+        if self._cutting_rerun:
+            self.update_cutting_summary()
+
     def update_stats(self):
         total_items = len(self.all_stocks)
         total_m2 = sum(s.get('quantity_m2', 0) for s in self.all_stocks)
@@ -920,6 +975,7 @@ class StockView(QWidget):
                     cursor = conn.cursor()
                     cursor.execute("DELETE FROM plates WHERE id = ?", (plate_id,))
                     conn.commit()
+                db.clear_cutting_plan_cache()
 
                 self.lbl_status.setText("✓ Plaka silindi.")
                 self.refresh_data()